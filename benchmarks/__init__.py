@@ -0,0 +1,10 @@
+"""
+Benchmark suite for the VOP interwoven pipeline.
+
+    scene_gen   parametric synthetic FakeDoc scenes (element count, TINY/LINEAR/AREAL
+                mix, occlusion depth, links, annotation density)
+    run         phase-isolated timings -> results JSON (wall time, peak RSS, cells/sec)
+    compare     regression gate against a stored baseline (exit 0/1/2)
+
+See benchmarks/README.md for usage.
+"""
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark regression gate: compare a results JSON against a stored baseline.
+
+Usage:
+    python -m benchmarks.compare --baseline benchmarks/baseline.json \\
+        --current bench_results.json --threshold 0.15
+
+Exit codes:
+    0 - No phase regressed beyond the threshold
+    1 - At least one phase regressed (regression detected)
+    2 - Error (missing files, invalid arguments, schema mismatch)
+
+Comparison rules:
+- wall_s: regression if current > baseline * (1 + threshold) AND the absolute
+  slowdown exceeds --min-delta-ms (sub-millisecond phases are timer noise)
+- peak_rss_kb: regression if current > baseline * (1 + rss threshold); only
+  checked when --rss-threshold is given and both runs report RSS
+- Phases missing from either run are reported, never failed
+"""
+
+import argparse
+import json
+import sys
+
+
+def load_results(path):
+    """Load a benchmarks.run results JSON (raises ValueError on bad schema)."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    if int(data.get("schema", 0)) != 1 or not isinstance(data.get("phases"), dict):
+        raise ValueError("{0}: not a benchmark results file (schema 1)".format(path))
+    return data
+
+
+def compare_results(baseline, current, threshold=0.15, min_delta_ms=1.0, rss_threshold=None):
+    """Compare two results dicts phase by phase.
+
+    Args:
+        baseline: results dict from benchmarks.run (the reference)
+        current: results dict from benchmarks.run
+        threshold: allowed fractional wall-time slowdown (0.15 = +15%)
+        min_delta_ms: ignore slowdowns smaller than this in absolute terms
+        rss_threshold: allowed fractional peak-RSS growth, or None to skip
+
+    Returns:
+        dict with:
+          'rows': [{phase, baseline_s, current_s, ratio, status}] in baseline order
+          'regressions': [row, ...] where status == 'REGRESSION'
+          'missing': phases only present in one of the runs
+    """
+    if threshold < 0 or min_delta_ms < 0:
+        raise ValueError("threshold and min_delta_ms must be >= 0")
+
+    b_phases = baseline.get("phases", {})
+    c_phases = current.get("phases", {})
+    rows = []
+    regressions = []
+
+    for phase, b in b_phases.items():
+        c = c_phases.get(phase)
+        if c is None:
+            continue
+        b_s = float(b.get("wall_s") or 0.0)
+        c_s = float(c.get("wall_s") or 0.0)
+        ratio = (c_s / b_s) if b_s > 0 else None
+        status = "OK"
+        if b_s > 0 and c_s > b_s * (1.0 + threshold) and (c_s - b_s) * 1000.0 > min_delta_ms:
+            status = "REGRESSION"
+        elif b_s > 0 and c_s < b_s / (1.0 + threshold):
+            status = "IMPROVED"
+
+        row = {"phase": phase, "metric": "wall_s", "baseline": b_s, "current": c_s, "ratio": ratio, "status": status}
+        rows.append(row)
+        if status == "REGRESSION":
+            regressions.append(row)
+
+        if rss_threshold is not None:
+            b_rss, c_rss = b.get("peak_rss_kb"), c.get("peak_rss_kb")
+            if b_rss and c_rss:
+                rss_ratio = float(c_rss) / float(b_rss)
+                rss_status = "REGRESSION" if rss_ratio > 1.0 + rss_threshold else "OK"
+                rss_row = {"phase": phase, "metric": "peak_rss_kb", "baseline": b_rss, "current": c_rss,
+                           "ratio": rss_ratio, "status": rss_status}
+                rows.append(rss_row)
+                if rss_status == "REGRESSION":
+                    regressions.append(rss_row)
+
+    missing = sorted(set(b_phases) ^ set(c_phases))
+    return {"rows": rows, "regressions": regressions, "missing": missing}
+
+
+def _scene_key(results):
+    scene = dict(results.get("scene") or {})
+    scene.pop("model_elements_in_view", None)
+    return json.dumps(scene, sort_keys=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flag benchmark regressions against a stored baseline")
+    parser.add_argument("--baseline", required=True, help="Baseline results JSON")
+    parser.add_argument("--current", required=True, help="Current results JSON")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed wall-time slowdown (default: 0.15)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Noise floor in ms (default: 1.0)")
+    parser.add_argument("--rss-threshold", type=float, default=None, help="Allowed peak-RSS growth (default: off)")
+    args = parser.parse_args(argv)
+
+    try:
+        baseline = load_results(args.baseline)
+        current = load_results(args.current)
+        report = compare_results(
+            baseline, current,
+            threshold=args.threshold,
+            min_delta_ms=args.min_delta_ms,
+            rss_threshold=args.rss_threshold,
+        )
+    except (OSError, ValueError) as e:
+        print("Error: {0}".format(e), file=sys.stderr)
+        return 2
+
+    if _scene_key(baseline) != _scene_key(current):
+        print("Warning: baseline and current were produced from different scenes")
+
+    for row in report["rows"]:
+        ratio = "{0:6.2f}x".format(row["ratio"]) if row["ratio"] is not None else "    n/a"
+        print("{0:<16} {1:<12} {2:>12.6g} -> {3:>12.6g} {4} {5}".format(
+            row["phase"], row["metric"], row["baseline"], row["current"], ratio, row["status"]))
+    for phase in report["missing"]:
+        print("{0:<16} present in only one run (not compared)".format(phase))
+
+    if report["regressions"]:
+        print("\n{0} regression(s) beyond threshold".format(len(report["regressions"])))
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
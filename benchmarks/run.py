@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Phase-isolated VOP benchmarks over synthetic FakeDoc scenes.
+
+Each phase is timed on its own, with its inputs prepared outside the timed
+region, so a regression points at one stage of the pipeline rather than at
+"the export got slower":
+
+    classification   bbox -> cell rect -> classify_by_uv, per model element
+    silhouette       get_element_silhouette, per model element (no cache)
+    rasterization    replay of pre-extracted loops into a fresh ViewRaster
+    model_render     render_model_front_to_back (integrated model pass)
+    anno_merge       rasterize_annotations + finalize_anno_over_model
+    metrics          compute_all_cell_metrics
+    png              export_raster_to_png
+    csv              view_result_to_core_row + view_result_to_vop_row
+    pipeline         process_document_views end-to-end (first view only)
+
+Usage:
+    python -m benchmarks.run --elements 500 --occlusion-depth 3 --links 1 \\
+        --out bench_results.json
+    python -m benchmarks.run --scene scene.json --phases silhouette,rasterization
+
+Results (JSON):
+    {"schema": 1, "created": ..., "env": {...}, "scene": {...},
+     "grid": {"width": W, "height": H, "cells": W*H},
+     "phases": {name: {"wall_s": median, "min_s": ..., "max_s": ...,
+                       "repeats": n, "items": count, "peak_rss_kb": ...,
+                       "cells_per_sec": ...}}}
+
+Commentary:
+    ✔ Runs under fakedoc.FakeRevit; no Revit or numpy required
+    ✔ wall_s is the median over repeats; min/max kept for noise inspection
+    ✔ peak_rss_kb is the process high-water mark after the phase (None where
+      the resource module is unavailable, e.g. Windows)
+    ⚠ cells_per_sec is grid cells / wall_s; it normalises across scene sizes
+      but is not a per-phase cell count
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+if __package__ in (None, ""):
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.scene_gen import generate_scene, normalize_mix  # noqa: E402
+
+
+PHASES = (
+    "classification",
+    "silhouette",
+    "rasterization",
+    "model_render",
+    "anno_merge",
+    "metrics",
+    "png",
+    "csv",
+    "pipeline",
+)
+
+
+def peak_rss_kb():
+    """Process peak resident set size in KiB, or None if unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    try:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except Exception:
+        return None
+    # macOS reports bytes, Linux reports KiB
+    if sys.platform == "darwin":
+        peak = peak // 1024
+    return int(peak)
+
+
+def _time_phase(fn, repeats, prepare=None):
+    """Run fn(prepare()) `repeats` times; only fn is timed."""
+    samples = []
+    items = None
+    for _ in range(max(1, int(repeats))):
+        arg = prepare() if prepare is not None else None
+        t0 = time.perf_counter()
+        items = fn(arg)
+        samples.append(time.perf_counter() - t0)
+    return {
+        "wall_s": statistics.median(samples),
+        "min_s": min(samples),
+        "max_s": max(samples),
+        "repeats": len(samples),
+        "items": items,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+class _ViewFixture(object):
+    """Per-view inputs shared by the phases (built outside timed regions)."""
+
+    def __init__(self, doc, view, cfg):
+        from vop_interwoven.pipeline import export_view_raster, render_model_front_to_back
+        from vop_interwoven.revit.annotation import rasterize_annotations
+        from vop_interwoven.revit.collection import (
+            collect_view_elements,
+            expand_host_link_import_model_elements,
+            sort_front_to_back,
+        )
+        from vop_interwoven.revit.view_basis import make_view_basis
+
+        self.doc = doc
+        self.view = view
+        self.cfg = cfg
+        self.vb = make_view_basis(view)
+
+        raster = self.new_raster()
+        self.elements = collect_view_elements(doc, view, raster, cfg=cfg)
+        expanded = expand_host_link_import_model_elements(doc, view, self.elements, cfg)
+        self.wrappers = sort_front_to_back(expanded, view, raster)
+        self.width, self.height = int(raster.W), int(raster.H)
+
+        # Fully rendered raster + exported result for the downstream phases
+        render_model_front_to_back(doc, view, raster, self.elements, cfg)
+        rasterize_annotations(doc, view, raster, cfg)
+        raster.finalize_anno_over_model(cfg)
+        self.raster = raster
+        self.view_result = export_view_raster(view, raster, cfg)
+
+    def new_raster(self):
+        from vop_interwoven.pipeline import init_view_raster
+
+        return init_view_raster(self.doc, self.view, self.cfg)
+
+
+def _phase_fns(fx, tmp_dir):
+    """Map phase name -> (fn, prepare) for one view fixture."""
+    from vop_interwoven.core.geometry import classify_by_uv
+    from vop_interwoven.core.silhouette import get_element_silhouette
+    from vop_interwoven.csv_export import compute_all_cell_metrics, view_result_to_core_row, view_result_to_vop_row
+    from vop_interwoven.pipeline import process_document_views, rasterize_areal_loops, render_model_front_to_back
+    from vop_interwoven.png_export import export_raster_to_png
+    from vop_interwoven.revit.annotation import rasterize_annotations
+    from vop_interwoven.revit.collection import _project_element_bbox_to_cell_rect, estimate_nearest_depth_from_bbox
+
+    doc, view, vb, cfg = fx.doc, fx.view, fx.vb, fx.cfg
+
+    def classification(_):
+        n = 0
+        for w in fx.wrappers:
+            rect = _project_element_bbox_to_cell_rect(w["element"], vb, fx.raster, bbox=w.get("bbox"), view=view)
+            if rect is not None:
+                classify_by_uv(rect.width(), rect.height(), cfg)
+                n += 1
+        return n
+
+    def silhouette(_):
+        n = 0
+        for w in fx.wrappers:
+            if get_element_silhouette(w["element"], view, vb, fx.raster, cfg):
+                n += 1
+        return n
+
+    # Loops and depths are extracted once; the rasterization phase replays them
+    replay = []
+    for w in fx.wrappers:
+        elem = w["element"]
+        try:
+            loops = get_element_silhouette(elem, view, vb, fx.raster, cfg)
+            depth = estimate_nearest_depth_from_bbox(elem, w.get("world_transform"), view, fx.raster, bbox=w.get("bbox"))
+        except Exception:
+            continue
+        if loops:
+            elem_id = elem.Id.IntegerValue
+            category = elem.Category.Name if elem.Category else "Unknown"
+            replay.append((elem_id, category, w.get("source_type", "HOST"), loops, float(depth or 0.0)))
+
+    def rasterization(raster):
+        for elem_id, category, source_type, loops, depth in replay:
+            key_index = raster.get_or_create_element_meta_index(elem_id, category, source_id=source_type, source_type=source_type)
+            strategy = loops[0].get("strategy", "unknown")
+            rasterize_areal_loops(loops, raster, key_index, depth, source_type, "HIGH", strategy, elem_id=elem_id, category=category)
+        return len(replay)
+
+    def model_render(raster):
+        render_model_front_to_back(doc, view, raster, fx.elements, cfg)
+        return len(fx.wrappers)
+
+    def anno_merge(raster):
+        rasterize_annotations(doc, view, raster, cfg)
+        raster.finalize_anno_over_model(cfg)
+        return len(raster.anno_meta)
+
+    def metrics(_):
+        compute_all_cell_metrics(fx.raster)
+        return fx.width * fx.height
+
+    png_path = os.path.join(tmp_dir, "bench_view.png")
+
+    def png(_):
+        export_raster_to_png(fx.view_result, png_path, pixels_per_cell=1)
+        return 1
+
+    def csv_rows(_):
+        view_result_to_core_row(fx.view_result, cfg, doc, run_id="bench")
+        view_result_to_vop_row(fx.view_result, cfg, doc, run_id="bench")
+        return 2
+
+    def pipeline(_):
+        process_document_views(doc, [view.Id.IntegerValue], cfg)
+        return 1
+
+    return {
+        "classification": (classification, None),
+        "silhouette": (silhouette, None),
+        "rasterization": (rasterization, fx.new_raster),
+        "model_render": (model_render, fx.new_raster),
+        "anno_merge": (anno_merge, fx.new_raster),
+        "metrics": (metrics, None),
+        "png": (png, None),
+        "csv": (csv_rows, None),
+        "pipeline": (pipeline, None),
+    }
+
+
+def run_benchmarks(scene, cfg=None, phases=None, repeats=3, view_index=0, quiet=True):
+    """Time each phase on one view of `scene`.
+
+    Args:
+        scene: FakeDoc scene dict (e.g. from generate_scene) or scene file path
+        cfg: Config (default: Config(element_cache_persist=False))
+        phases: iterable of phase names (default: all PHASES)
+        repeats: timed repetitions per phase (median is reported)
+        view_index: index into the scene's views
+        quiet: discard the pipeline's console logging while running
+
+    Returns:
+        results dict (see module docstring)
+    """
+    from vop_interwoven.config import Config
+    from vop_interwoven.fakedoc import FakeRevit
+
+    cfg = cfg or Config(element_cache_persist=False)
+    phases = list(phases or PHASES)
+    unknown = [p for p in phases if p not in PHASES]
+    if unknown:
+        raise ValueError("Unknown phases: {0}".format(", ".join(unknown)))
+
+    results = {
+        "schema": 1,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "env": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+        },
+        "phases": {},
+    }
+
+    with contextlib.ExitStack() as stack:
+        if quiet:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        fake = stack.enter_context(FakeRevit(scene))
+        tmp_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        results["scene"] = dict(fake.scene.get("bench") or {"title": fake.scene.get("title")})
+        view = fake.doc.GetElement(fake.view_ids[view_index])
+        fx = _ViewFixture(fake.doc, view, cfg)
+        cells = fx.width * fx.height
+        results["grid"] = {"width": fx.width, "height": fx.height, "cells": cells}
+        results["scene"]["model_elements_in_view"] = len(fx.wrappers)
+
+        fns = _phase_fns(fx, tmp_dir)
+        for name in phases:
+            fn, prepare = fns[name]
+            rec = _time_phase(fn, repeats, prepare)
+            rec["cells_per_sec"] = (cells / rec["wall_s"]) if rec["wall_s"] > 0 else None
+            results["phases"][name] = rec
+
+    return results
+
+
+def _parse_mix(text):
+    return normalize_mix([float(x) for x in text.split(",")])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Phase-isolated VOP benchmarks on synthetic scenes")
+    parser.add_argument("--scene", help="Scene file (.json/.msgpack); overrides generator options")
+    parser.add_argument("--elements", type=int, default=200, help="Model elements (default: 200)")
+    parser.add_argument("--mix", type=_parse_mix, default=None, help="TINY,LINEAR,AREAL weights (default: 0.4,0.35,0.25)")
+    parser.add_argument("--occlusion-depth", type=int, default=2, help="Stacked occlusion layers (default: 2)")
+    parser.add_argument("--links", type=int, default=0, help="Revit link instances (default: 0)")
+    parser.add_argument("--anno-density", type=float, default=0.1, help="Text notes per model element (default: 0.1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--phases", default=",".join(PHASES), help="Comma-separated phases (default: all)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--out", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--verbose", action="store_true", help="Keep the pipeline's console logging")
+    args = parser.parse_args(argv)
+
+    if args.scene:
+        scene = args.scene
+    else:
+        scene = generate_scene(
+            n_elements=args.elements,
+            mix=args.mix,
+            occlusion_depth=args.occlusion_depth,
+            link_count=args.links,
+            anno_density=args.anno_density,
+            seed=args.seed,
+        )
+
+    phases = [p.strip() for p in args.phases.split(",") if p.strip()]
+    try:
+        results = run_benchmarks(scene, phases=phases, repeats=args.repeats, quiet=not args.verbose)
+    except ValueError as e:
+        print("Error: {0}".format(e), file=sys.stderr)
+        return 2
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+        for name, rec in results["phases"].items():
+            print("{0:<16} {1:9.2f} ms  rss={2} KiB".format(name, rec["wall_s"] * 1000.0, rec["peak_rss_kb"]))
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+Parametric synthetic scenes for benchmarking (FakeDoc scene dicts).
+
+generate_scene() emits a scene dict that vop_interwoven.fakedoc.build_document()
+turns into a replayable document: one or more floor plans over a square site,
+N model elements with a controlled TINY/LINEAR/AREAL mix, stacked occlusion
+layers, optional Revit links and view-owned text notes.
+
+Element footprints are sized in *cells* of the target view (cell size is
+cfg.cell_size_paper_in * scale / 12 ft) and rejection-sampled until
+core.geometry.classify_by_uv() agrees with the requested class, so the mix
+tracks the thresholds of whatever Config is passed in.
+
+Commentary:
+    ✔ Deterministic for a given (parameters, seed)
+    ✔ Each element records its intended class under "bench_class" (ignored by the loader)
+    ✔ Occlusion depth = number of stacked z layers below the cut plane
+    ⚠ Footprints are axis-aligned boxes; rotated geometry is out of scope
+"""
+
+import math
+import random
+
+from vop_interwoven.config import Config
+from vop_interwoven.core.geometry import Mode, classify_by_uv
+
+
+CLASSES = ("TINY", "LINEAR", "AREAL")
+
+DEFAULT_MIX = {"TINY": 0.4, "LINEAR": 0.35, "AREAL": 0.25}
+
+# Categories per class (all are part of the default model category policy)
+_CATEGORIES = {
+    "TINY": ("OST_Furniture", "OST_PlumbingFixtures", "OST_GenericModel"),
+    "LINEAR": ("OST_Walls", "OST_StructuralFraming", "OST_Railings"),
+    "AREAL": ("OST_Floors", "OST_Roofs", "OST_Ceilings"),
+}
+
+_LAYER_PITCH_FT = 1.5   # vertical spacing between occlusion layers
+_LAYER_THICK_FT = 1.0   # element thickness (view depth)
+_CUT_FT = 4.0           # plan cut plane above level
+
+
+def normalize_mix(mix):
+    """Return {class: fraction} summing to 1.0.
+
+    Args:
+        mix: dict keyed by TINY/LINEAR/AREAL, or a 3-sequence in that order
+    """
+    if mix is None:
+        mix = DEFAULT_MIX
+    if not isinstance(mix, dict):
+        vals = list(mix)
+        if len(vals) != 3:
+            raise ValueError("mix must have 3 entries (TINY, LINEAR, AREAL)")
+        mix = dict(zip(CLASSES, vals))
+    unknown = set(mix) - set(CLASSES)
+    if unknown:
+        raise ValueError("Unknown mix classes: {0}".format(sorted(unknown)))
+    weights = [max(0.0, float(mix.get(c, 0.0))) for c in CLASSES]
+    total = sum(weights)
+    if total <= 0:
+        raise ValueError("mix must have a positive weight")
+    return dict(zip(CLASSES, [w / total for w in weights]))
+
+
+def _class_counts(n, mix):
+    # Largest-remainder apportionment so counts always sum to n
+    raw = [(c, mix[c] * n) for c in CLASSES]
+    counts = {c: int(math.floor(v)) for c, v in raw}
+    rest = n - sum(counts.values())
+    for c, v in sorted(raw, key=lambda cv: (-(cv[1] - math.floor(cv[1])), CLASSES.index(cv[0])))[:rest]:
+        counts[c] += 1
+    return counts
+
+
+def _sample_dims(rng, cls, cfg, extent_cells):
+    """(w, h) in cells such that classify_by_uv(w, h, cfg) is `cls`."""
+    target = getattr(Mode, cls)
+    tiny, thin = float(cfg.tiny_max), float(cfg.thin_max)
+    long_max = max(thin + 2.0, min(24.0, extent_cells * 0.5))
+    areal_max = max(thin + 2.0, min(30.0, extent_cells * 0.4))
+    for _ in range(64):
+        if cls == "TINY":
+            w, h = rng.uniform(0.2, max(tiny, 0.3)), rng.uniform(0.2, max(tiny, 0.3))
+        elif cls == "LINEAR":
+            w, h = rng.uniform(0.2, max(thin, 0.3)), rng.uniform(thin + 1.0, long_max)
+            if rng.random() < 0.5:
+                w, h = h, w
+        else:
+            w, h = rng.uniform(thin + 1.0, areal_max), rng.uniform(thin + 1.0, areal_max)
+        if classify_by_uv(w, h, cfg) == target:
+            return w, h
+    raise ValueError("Cannot sample {0} dimensions for tiny_max={1}, thin_max={2}".format(cls, cfg.tiny_max, cfg.thin_max))
+
+
+def generate_scene(
+    n_elements=200,
+    mix=None,
+    occlusion_depth=2,
+    link_count=0,
+    link_fraction=0.25,
+    anno_density=0.1,
+    n_views=1,
+    scale=96,
+    extent_ft=None,
+    seed=0,
+    cfg=None,
+):
+    """Build a synthetic FakeDoc scene.
+
+    Args:
+        n_elements: total model elements (host + linked)
+        mix: TINY/LINEAR/AREAL fractions (dict or 3-sequence); default DEFAULT_MIX
+        occlusion_depth: number of stacked z layers (>= 1); deeper stacks mean
+            more elements behind already-occluded cells
+        link_count: number of RevitLinkInstances; linked elements are placed in
+            link-local coordinates behind a translated link transform
+        link_fraction: share of n_elements living in links (when link_count > 0)
+        anno_density: text notes per model element, owned by each plan view
+        n_views: number of identical floor plans over the site
+        scale: view scale (96 = 1/8" = 1'-0")
+        extent_ft: square site size; default grows with sqrt(n_elements)
+        seed: RNG seed
+        cfg: Config whose cell size and tiny/thin thresholds drive the mix
+
+    Returns:
+        scene dict (see vop_interwoven.fakedoc.scene), with a "bench" entry
+        recording the generator parameters and realised class counts
+    """
+    cfg = cfg or Config()
+    n_elements = int(n_elements)
+    occlusion_depth = int(occlusion_depth)
+    link_count = int(link_count)
+    n_views = int(n_views)
+    if n_elements < 0:
+        raise ValueError("n_elements must be >= 0")
+    if occlusion_depth < 1:
+        raise ValueError("occlusion_depth must be >= 1")
+    if link_count < 0 or n_views < 1:
+        raise ValueError("link_count must be >= 0 and n_views >= 1")
+    if not (0.0 <= float(link_fraction) <= 1.0):
+        raise ValueError("link_fraction must be in [0, 1]")
+    if float(anno_density) < 0:
+        raise ValueError("anno_density must be >= 0")
+
+    mix = normalize_mix(mix)
+    rng = random.Random(seed)
+
+    cell_ft = float(cfg.cell_size_paper_in) * float(scale) / 12.0
+    if extent_ft is None:
+        extent_ft = min(400.0, max(40.0, 10.0 * math.sqrt(max(1, n_elements)) * cell_ft))
+    extent_ft = float(extent_ft)
+    extent_cells = extent_ft / cell_ft
+
+    counts = _class_counts(n_elements, mix)
+    classes = [c for c in CLASSES for _ in range(counts[c])]
+    rng.shuffle(classes)
+
+    n_linked = int(round(n_elements * float(link_fraction))) if link_count else 0
+    link_offsets = [
+        (round(rng.uniform(-0.25, 0.25) * extent_ft, 3), round(rng.uniform(-0.25, 0.25) * extent_ft, 3))
+        for _ in range(link_count)
+    ]
+
+    host_elements = []
+    link_elements = [[] for _ in range(link_count)]
+    for k, cls in enumerate(classes):
+        w_cells, h_cells = _sample_dims(rng, cls, cfg, extent_cells)
+        w, h = w_cells * cell_ft, h_cells * cell_ft
+        x0 = rng.uniform(0.0, max(0.0, extent_ft - w))
+        y0 = rng.uniform(0.0, max(0.0, extent_ft - h))
+        layer = rng.randrange(occlusion_depth)
+        z1 = _CUT_FT - 0.5 - layer * _LAYER_PITCH_FT
+        z0 = z1 - _LAYER_THICK_FT
+
+        dx, dy = 0.0, 0.0
+        target = host_elements
+        if k < n_linked:
+            li = k % link_count
+            dx, dy = link_offsets[li]
+            target = link_elements[li]
+
+        target.append({
+            "id": 1000 + len(target),
+            "category": rng.choice(_CATEGORIES[cls]),
+            "bench_class": cls,
+            "geometry": [{
+                "type": "box",
+                "min": [round(x0 - dx, 4), round(y0 - dy, 4), round(z0, 4)],
+                "max": [round(x0 + w - dx, 4), round(y0 + h - dy, 4), round(z1, 4)],
+            }],
+        })
+
+    bottom = _CUT_FT - 1.0 - occlusion_depth * _LAYER_PITCH_FT
+    views = []
+    for v in range(n_views):
+        views.append({
+            "id": 100 + v,
+            "name": "Bench Plan {0}".format(v + 1),
+            "view_type": "FloorPlan",
+            "scale": int(scale),
+            "crop_box": {"min": [0.0, 0.0, -50.0], "max": [extent_ft, extent_ft, 0.0]},
+            "crop_active": True,
+            "view_range": {"level": 1, "cut": _CUT_FT, "top": _CUT_FT * 2, "bottom": bottom, "depth": bottom},
+        })
+
+    n_anno = int(round(n_elements * float(anno_density)))
+    next_id = 1000 + len(host_elements)
+    for view in views:
+        for _ in range(n_anno):
+            w = rng.uniform(2.0, 8.0) * cell_ft
+            h = rng.uniform(0.5, 1.5) * cell_ft
+            x0 = rng.uniform(0.0, max(0.0, extent_ft - w))
+            y0 = rng.uniform(0.0, max(0.0, extent_ft - h))
+            host_elements.append({
+                "id": next_id,
+                "category": "OST_TextNotes",
+                "class": "TextNote",
+                "view_specific": True,
+                "owner_view": view["id"],
+                "bbox": {"min": [round(x0, 4), round(y0, 4), 0.0], "max": [round(x0 + w, 4), round(y0 + h, 4), 0.0]},
+            })
+            next_id += 1
+
+    links = []
+    for li, (dx, dy) in enumerate(link_offsets):
+        links.append({
+            "id": 500 + li,
+            "transform": {"origin": [dx, dy, 0.0]},
+            "document": {"schema": 1, "title": "Bench Link {0}".format(li + 1), "elements": link_elements[li]},
+        })
+
+    return {
+        "schema": 1,
+        "title": "bench-{0}-seed{1}".format(n_elements, seed),
+        "levels": [{"id": 1, "name": "L1", "elevation": 0.0}],
+        "views": views,
+        "elements": host_elements,
+        "links": links,
+        "bench": {
+            "n_elements": n_elements,
+            "mix": mix,
+            "class_counts": counts,
+            "occlusion_depth": occlusion_depth,
+            "link_count": link_count,
+            "linked_elements": n_linked,
+            "anno_density": float(anno_density),
+            "annotations_per_view": n_anno,
+            "n_views": n_views,
+            "scale": int(scale),
+            "extent_ft": extent_ft,
+            "cell_size_ft": cell_ft,
+            "seed": seed,
+        },
+    }
+
+
+def scene_class_counts(scene):
+    """Count bench_class tags over host and linked model elements."""
+    counts = dict.fromkeys(CLASSES, 0)
+    docs = [scene] + [l.get("document") or {} for l in scene.get("links", ())]
+    for d in docs:
+        for e in d.get("elements", ()):
+            cls = e.get("bench_class")
+            if cls in counts:
+                counts[cls] += 1
+    return counts
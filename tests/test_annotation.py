@@ -0,0 +1,131 @@
+import contextlib
+import io
+
+from benchmarks.scene_gen import generate_scene
+from vop_interwoven.config import Config
+from vop_interwoven.fakedoc import FakeRevit
+from vop_interwoven.pipeline import process_document_views
+from vop_interwoven.revit import annotation
+from vop_interwoven.revit.document_snapshot import DocumentSnapshot
+
+
+SCENE = generate_scene(n_elements=30, link_count=0, n_views=2, occlusion_depth=2, anno_density=0.6, seed=4)
+
+
+def test_annotation_set_matches_pairs_and_driver_flags():
+    with contextlib.redirect_stdout(io.StringIO()):
+        with FakeRevit(SCENE) as fake:
+            view = fake.doc.GetElement(fake.view_ids[0])
+            snapshot = DocumentSnapshot(fake.doc)
+            anno_set = annotation.collect_annotation_set(fake.doc, view, snapshot=snapshot)
+
+            assert len(anno_set) > 0
+            assert annotation.collect_annotation_set(fake.doc, view, snapshot=snapshot) is anno_set
+            assert annotation.collect_2d_annotations(fake.doc, view, snapshot=snapshot) == anno_set.pairs()
+            assert annotation.collect_2d_annotations(fake.doc, view) == anno_set.pairs()
+            for rec in anno_set:
+                assert rec.is_driver == annotation.is_extent_driver_annotation(rec.elem)
+                assert rec.elem_id == rec.elem.Id.IntegerValue and rec.bbox is not None
+            assert {r.elem_id for r in anno_set.drivers()} <= {r.elem_id for r in anno_set}
+
+
+def test_pipeline_collects_annotations_once_per_view(monkeypatch):
+    calls = []
+    original = annotation._collect_annotation_set
+
+    def counting(doc, view, diag=None, snapshot=None):
+        calls.append(view.Id.IntegerValue)
+        return original(doc, view, diag=diag, snapshot=snapshot)
+
+    monkeypatch.setattr(annotation, "_collect_annotation_set", counting)
+    cfg = Config(retain_rasters_in_memory=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        with FakeRevit(SCENE) as fake:
+            results = process_document_views(fake.doc, fake.view_ids, cfg)
+
+    assert any((r.get("raster") or {}).get("anno_meta") for r in results)
+    assert sorted(calls) == sorted(int(v) for v in fake.view_ids)
+
+
+class _Raster(object):
+    def __init__(self, w, h):
+        self.W, self.H = w, h
+        self.anno_key = [-1] * (w * h)
+
+
+def _ref_cell(raster, cx, cy, idx):
+    if 0 <= cx < raster.W and 0 <= cy < raster.H:
+        raster.anno_key[cy * raster.W + cx] = idx
+
+
+def _ref_line(raster, x0, y0, x1, y1, idx):
+    dx, dy = abs(x1 - x0), -abs(y1 - y0)
+    sx, sy = (1 if x0 < x1 else -1), (1 if y0 < y1 else -1)
+    err, cx, cy = dx + dy, x0, y0
+    while True:
+        _ref_cell(raster, cx, cy, idx)
+        if cx == x1 and cy == y1:
+            break
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            cx += sx
+        if e2 <= dx:
+            err += dx
+            cy += sy
+
+
+def _ref_band(raster, cx0, cy0, cx1, cy1, idx, half):
+    dx, dy = float(cx1 - cx0), float(cy1 - cy0)
+    if dx * dx + dy * dy < 0.01:
+        _ref_cell(raster, cx0, cy0, idx)
+        return
+    length = (dx * dx + dy * dy) ** 0.5
+    offx, offy = -(dy / length) * half, (dx / length) * half
+    corners = [(cx0 + offx, cy0 + offy), (cx1 + offx, cy1 + offy), (cx1 - offx, cy1 - offy), (cx0 - offx, cy0 - offy)]
+    xs = [int(round(c[0])) for c in corners]
+    ys = [int(round(c[1])) for c in corners]
+    for cy in range(max(0, min(ys)), min(raster.H, max(ys)) + 1):
+        for cx in range(max(0, min(xs)), min(raster.W, max(xs)) + 1):
+            if annotation._point_in_quad(cx, cy, corners):
+                _ref_cell(raster, cx, cy, idx)
+
+
+def test_stamper_matches_per_cell_stamping():
+    import random
+    from types import SimpleNamespace
+
+    rng = random.Random(21)
+    cfg = SimpleNamespace(linear_band_thickness_cells=1.0)
+    for trial in range(60):
+        w, h = rng.randint(1, 40), rng.randint(1, 40)
+        ref, fast = _Raster(w, h), _Raster(w, h)
+        stamper = annotation.AnnotationStamper(fast)
+        cfg.linear_band_thickness_cells = rng.choice([0.0, 1.0, 2.0, 3.5])
+        for idx in range(25):
+            x0, y0, x1, y1 = (rng.randint(-8, 48) for _ in range(4))
+            kind = rng.choice(["fill", "outline", "line", "band"])
+            if kind == "fill":
+                for cy in range(max(0, y0), min(h, y1)):
+                    for cx in range(max(0, x0), min(w, x1)):
+                        _ref_cell(ref, cx, cy, idx)
+                stamper.fill_rect(x0, y0, x1, y1, idx)
+            elif kind == "outline":
+                rect = SimpleNamespace(x0=x0, y0=y0, x1=x1, y1=y1)
+                cx0, cy0, cx1, cy1 = max(0, x0), max(0, y0), min(w, x1), min(h, y1)
+                if cx1 > cx0 and cy1 > cy0:
+                    for cx in range(cx0, cx1):
+                        _ref_cell(ref, cx, cy0, idx)
+                        _ref_cell(ref, cx, cy1 - 1, idx)
+                    for cy in range(cy0, cy1):
+                        _ref_cell(ref, cx0, cy, idx)
+                        _ref_cell(ref, cx1 - 1, cy, idx)
+                stamper.rect_outline(rect, idx)
+            elif kind == "line":
+                _ref_line(ref, x0, y0, x1, y1, idx)
+                stamper.line(x0, y0, x1, y1, idx)
+            else:
+                _ref_band(ref, x0, y0, x1, y1, idx, cfg.linear_band_thickness_cells * 0.5)
+                stamper.band(x0, y0, x1, y1, idx, cfg)
+        stamper.commit()
+        assert fast.anno_key == ref.anno_key, trial
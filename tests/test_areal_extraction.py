@@ -9,13 +9,21 @@ Tests the 3-tier fallback hierarchy and confidence level assignment:
   - Failure: all strategies fail
 """
 
+import copy
 import unittest
+from unittest import mock
+
+from vop_interwoven.core import areal_extraction
 from vop_interwoven.core.areal_extraction import (
+    ArealExtractionCache,
+    areal_cache_key,
+    areal_view_signature,
     extract_areal_geometry,
     _safe_elem_id,
     _safe_category,
     _get_aabb_loops_from_bbox
 )
+from vop_interwoven.revit.view_basis import ViewBasis
 from vop_interwoven.diagnostics import StrategyDiagnostics
 
 
@@ -391,5 +399,203 @@ class TestArealExtractionIntegration(unittest.TestCase):
         self.assertIsInstance(strat2, str)
 
 
+class TestArealExtractionCache(unittest.TestCase):
+    """Cross-view reuse of AREAL extraction results."""
+
+    PLAN = ViewBasis((0.0, 0.0, 4.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, -1.0))
+    PLAN_L2 = ViewBasis((-5.0, -5.0, 14.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, -1.0))
+    PLAN_ROT = ViewBasis((0.0, 0.0, 4.0), (0.0, 1.0, 0.0), (-1.0, 0.0, 0.0), (0.0, 0.0, -1.0))
+
+    def _square(self, vb):
+        pts = [vb.transform_to_view_uvw(p) for p in [(2, 2, 0), (10, 2, 0), (10, 8, 0), (2, 8, 0), (2, 2, 0)]]
+        return [{'points': pts, 'is_hole': False, 'strategy': 'planar_face_loops'}]
+
+    def test_hit_is_reprojected_into_requesting_view(self):
+        cache = ArealExtractionCache(max_items=8)
+        cache.set('k', self.PLAN, self._square(self.PLAN), 'HIGH', 'planar_face_loops')
+
+        for vb in (self.PLAN, self.PLAN_L2, self.PLAN_ROT):
+            loops, conf, strat = cache.get('k', vb)
+            self.assertEqual((conf, strat), ('HIGH', 'planar_face_loops'))
+            expected = self._square(vb)[0]['points']
+            for got, exp in zip(loops[0]['points'], expected):
+                for a, b in zip(got, exp):
+                    self.assertAlmostEqual(a, b, places=9)
+            self.assertEqual(loops[0]['strategy'], 'planar_face_loops')
+            self.assertNotIn('_dims', loops[0])
+        self.assertEqual(cache.stats()['hits'], 3)
+
+    def test_low_confidence_entries_are_orientation_specific(self):
+        cache = ArealExtractionCache(max_items=8)
+        loops = [{'points': [(0.0, 0.0), (4.0, 0.0), (4.0, 3.0), (0.0, 3.0)], 'is_hole': False}]
+        cache.set('k', self.PLAN, loops, 'LOW', 'aabb_fallback')
+
+        hit = cache.get('k', self.PLAN_L2)
+        self.assertEqual(hit[0][0]['points'][1], (9.0, 5.0))  # 2D stays 2D, shifted by origin
+        self.assertIsNone(cache.get('k', self.PLAN_ROT))
+        self.assertEqual(cache.stats()['orientation_misses'], 1)
+
+    def test_failures_and_disabled_cache_store_nothing(self):
+        cache = ArealExtractionCache(max_items=8)
+        cache.set('k', self.PLAN, None, None, 'failed')
+        self.assertEqual(len(cache), 0)
+
+        off = ArealExtractionCache(max_items=0)
+        off.set('k', self.PLAN, self._square(self.PLAN), 'HIGH', 'planar_face_loops')
+        self.assertFalse(off.enabled)
+        self.assertIsNone(off.get('k', self.PLAN))
+
+    def test_key_uses_fingerprint_direction_and_detail_level(self):
+        class _Fp(object):
+            def __init__(self, sig):
+                self.sig = sig
+
+            def to_signature_string(self):
+                return self.sig
+
+        class _ElemCache(object):
+            sig = 'a'
+
+            def get_or_create_fingerprint(self, elem, elem_id, source_id='HOST'):
+                return _Fp(self.sig)
+
+        class _View(object):
+            DetailLevel = 2
+
+        SIG = ((), None, None)
+        ec = _ElemCache()
+        k1 = areal_cache_key(object(), 10, 'HOST', _View(), self.PLAN, elem_cache=ec, view_signature=SIG)
+        self.assertEqual(k1, areal_cache_key(object(), 10, 'HOST', _View(), self.PLAN_L2, elem_cache=ec, view_signature=SIG))
+        self.assertEqual(k1, areal_cache_key(object(), 10, 'HOST', _View(), self.PLAN_ROT, elem_cache=ec, view_signature=SIG))
+        ec.sig = 'b'
+        self.assertNotEqual(k1, areal_cache_key(object(), 10, 'HOST', _View(), self.PLAN, elem_cache=ec, view_signature=SIG))
+        fine = _View()
+        fine.DetailLevel = 3
+        ec.sig = 'a'
+        self.assertNotEqual(k1, areal_cache_key(object(), 10, 'HOST', fine, self.PLAN, elem_cache=ec, view_signature=SIG))
+        self.assertIsNone(areal_cache_key(object(), None, 'HOST', _View(), self.PLAN, view_signature=SIG))
+        # Host elements are never keyed without the view signature
+        self.assertIsNone(areal_cache_key(object(), 10, 'HOST', _View(), self.PLAN, elem_cache=ec))
+
+    def test_key_separates_host_geometry_by_view_phase(self):
+        from tests.test_fakedoc import SCENE
+        from vop_interwoven.fakedoc import FakeRevit
+
+        class _Id(object):
+            def __init__(self, v):
+                self.IntegerValue = v
+
+        class _Param(object):
+            def __init__(self, v):
+                self.v = v
+
+            def AsElementId(self):
+                return _Id(self.v)
+
+        class _View(object):
+            DetailLevel = 2
+
+            def __init__(self, phase):
+                self.phase = phase
+
+            def get_Parameter(self, bip):
+                return _Param(self.phase) if bip.name == 'VIEW_PHASE' else None
+
+        class _LinkedProxy(object):
+            transform = None
+
+        sig = ((), None, None)
+        with FakeRevit(SCENE):
+            existing = areal_cache_key(object(), 10, 'HOST', _View(1), self.PLAN, view_signature=sig)
+            self.assertEqual(existing, areal_cache_key(object(), 10, 'HOST', _View(1), self.PLAN_L2, view_signature=sig))
+            self.assertNotEqual(existing, areal_cache_key(object(), 10, 'HOST', _View(2), self.PLAN, view_signature=sig))
+            # Linked proxies are fetched without a view: phase does not split them
+            link = _LinkedProxy()
+            self.assertEqual(
+                areal_cache_key(link, 10, 'LINK', _View(1), self.PLAN),
+                areal_cache_key(link, 10, 'LINK', _View(2), self.PLAN, view_signature=sig),
+            )
+
+    def test_views_differing_in_subcategory_visibility_do_not_share_loops(self):
+        from tests.test_fakedoc import SCENE
+        from vop_interwoven.fakedoc import FakeRevit
+        from vop_interwoven.fakedoc.api import CategoryType, ElementId
+
+        class _Cat(object):
+            def __init__(self, cid, subs=()):
+                self.Id = ElementId(cid)
+                self.CategoryType = CategoryType.Model
+                self.SubCategories = list(subs)
+
+        slab_edges = _Cat(9001)
+        floors = _Cat(-2000032, subs=[slab_edges])
+
+        class _Doc(object):
+            Settings = type('Settings', (), {'Categories': [floors]})()
+
+        class _View(object):
+            DetailLevel = 2
+            Document = _Doc()
+
+            def __init__(self, hidden):
+                self.hidden = set(hidden)
+
+            def get_Parameter(self, bip):
+                return None
+
+            def GetCategoryHidden(self, cat_id):
+                return cat_id.IntegerValue in self.hidden
+
+            def GetViewRange(self):
+                return None
+
+        with FakeRevit(SCENE):
+            shown, hidden = _View(()), _View((9001,))
+            sig_shown, sig_hidden = areal_view_signature(shown), areal_view_signature(hidden)
+            self.assertEqual(sig_shown, ((), None, None))
+            self.assertEqual(sig_hidden, ((9001,), None, None))
+
+            cache = ArealExtractionCache(max_items=8)
+            k_shown = areal_cache_key(object(), 10, 'HOST', shown, self.PLAN, view_signature=sig_shown)
+            k_hidden = areal_cache_key(object(), 10, 'HOST', hidden, self.PLAN_L2, view_signature=sig_hidden)
+            cache.set(k_shown, self.PLAN, self._square(self.PLAN), 'HIGH', 'planar_face_loops')
+            self.assertIsNone(cache.get(k_hidden, self.PLAN_L2))
+            self.assertIsNotNone(cache.get(k_shown, self.PLAN_L2))
+
+    def test_typical_floors_reuse_extraction_across_views(self):
+        from tests.test_fakedoc import SCENE
+        from vop_interwoven.config import Config
+        from vop_interwoven.fakedoc import FakeRevit
+        from vop_interwoven.pipeline import process_document_views
+
+        scene = copy.deepcopy(SCENE)
+        plan = scene['views'][0]
+        shifted = dict(copy.deepcopy(plan), id=101, crop_box={'min': [-5, -5, -20], 'max': [35, 25, 0]})
+        rotated = dict(copy.deepcopy(plan), id=102, right=[0, 1, 0], up=[-1, 0, 0],
+                       crop_box={'min': [0, -40, -20], 'max': [30, 0, 0]})
+        scene['views'] = [plan, shifted, rotated]
+
+        runs = {}
+        for size in (0, 64):
+            tiers = mock.Mock(side_effect=areal_extraction._extract_areal_geometry_tiers)
+            cfg = Config(element_cache_persist=False, retain_rasters_in_memory=True, areal_cache_max_items=size)
+            with mock.patch.object(areal_extraction, '_extract_areal_geometry_tiers', tiers):
+                with FakeRevit(scene) as fake:
+                    res = process_document_views(fake.doc, fake.view_ids, cfg)
+            runs[size] = ([(r['view_id'], r['filled_cells'], r['raster']['model_mask']) for r in res], tiers.call_count)
+
+        self.assertEqual(runs[0][0], runs[64][0])
+        self.assertEqual(runs[0][1], 3)   # floor extracted once per view
+        self.assertEqual(runs[64][1], 1)  # ...and once per run with the cache
+
+    def test_config_knob_is_not_part_of_signature(self):
+        from vop_interwoven.config import Config
+
+        self.assertEqual(Config().areal_cache_max_items, 4096)
+        self.assertNotIn('areal_cache_max_items', Config(areal_cache_max_items=0).to_dict())
+        with self.assertRaises(ValueError):
+            Config(areal_cache_max_items=-1)
+
+
 if __name__ == '__main__':
     unittest.main()
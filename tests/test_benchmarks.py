@@ -0,0 +1,77 @@
+import copy
+import json
+
+import pytest
+
+from benchmarks.compare import compare_results, main as compare_main
+from benchmarks.run import PHASES, run_benchmarks
+from benchmarks.scene_gen import generate_scene, scene_class_counts
+from vop_interwoven.config import Config
+from vop_interwoven.core.geometry import classify_by_uv
+
+
+def test_scene_mix_matches_classify_by_uv():
+    cfg = Config()
+    scene = generate_scene(n_elements=60, mix=(1, 1, 1), occlusion_depth=3, link_count=2, anno_density=0.5, seed=7, cfg=cfg)
+
+    assert scene_class_counts(scene) == {"TINY": 20, "LINEAR": 20, "AREAL": 20}
+    assert scene["bench"]["linked_elements"] == 15
+    assert sum(len(l["document"]["elements"]) for l in scene["links"]) == 15
+    assert sum(1 for e in scene["elements"] if e.get("class") == "TextNote") == 30
+
+    cell = scene["bench"]["cell_size_ft"]
+    zs = set()
+    for e in scene["elements"] + [e for l in scene["links"] for e in l["document"]["elements"]]:
+        if "bench_class" not in e:
+            continue
+        box = e["geometry"][0]
+        w = (box["max"][0] - box["min"][0]) / cell
+        h = (box["max"][1] - box["min"][1]) / cell
+        assert classify_by_uv(w, h, cfg).name == e["bench_class"]
+        zs.add(box["max"][2])
+    assert len(zs) == 3
+
+    assert generate_scene(n_elements=60, seed=7) == generate_scene(n_elements=60, seed=7)
+
+
+def test_run_benchmarks_reports_every_phase():
+    scene = generate_scene(n_elements=25, link_count=1, seed=1)
+    results = run_benchmarks(scene, repeats=1)
+
+    assert list(results["phases"]) == list(PHASES)
+    assert results["grid"]["cells"] == results["grid"]["width"] * results["grid"]["height"] > 0
+    assert results["scene"]["model_elements_in_view"] == 25
+    for name, rec in results["phases"].items():
+        assert rec["wall_s"] >= 0 and rec["repeats"] == 1, name
+        assert "peak_rss_kb" in rec and "cells_per_sec" in rec
+    json.dumps(results)
+
+
+def test_compare_flags_regressions_beyond_threshold(tmp_path):
+    base = {"schema": 1, "phases": {
+        "silhouette": {"wall_s": 0.100, "peak_rss_kb": 1000},
+        "png": {"wall_s": 0.0002, "peak_rss_kb": 1000},
+        "csv": {"wall_s": 0.050},
+    }}
+    cur = copy.deepcopy(base)
+    cur["phases"]["silhouette"]["wall_s"] = 0.130   # +30%
+    cur["phases"]["png"]["wall_s"] = 0.0006         # 3x, but below the noise floor
+    cur["phases"]["csv"]["wall_s"] = 0.030          # faster
+    cur["phases"]["metrics"] = {"wall_s": 0.01}
+
+    report = compare_results(base, cur, threshold=0.15, min_delta_ms=1.0)
+    assert [r["phase"] for r in report["regressions"]] == ["silhouette"]
+    assert {r["phase"]: r["status"] for r in report["rows"]}["csv"] == "IMPROVED"
+    assert report["missing"] == ["metrics"]
+    assert compare_results(base, cur, threshold=0.5)["regressions"] == []
+
+    rss = copy.deepcopy(base)
+    rss["phases"]["silhouette"]["peak_rss_kb"] = 2000
+    assert [r["metric"] for r in compare_results(base, rss, rss_threshold=0.2)["regressions"]] == ["peak_rss_kb"]
+
+    b, c = tmp_path / "base.json", tmp_path / "cur.json"
+    b.write_text(json.dumps(base))
+    c.write_text(json.dumps(cur))
+    assert compare_main(["--baseline", str(b), "--current", str(c)]) == 1
+    assert compare_main(["--baseline", str(b), "--current", str(b)]) == 0
+    assert compare_main(["--baseline", str(b), "--current", str(tmp_path / "missing.json")]) == 2
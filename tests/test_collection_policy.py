@@ -1,3 +1,13 @@
+import pytest
+
+from vop_interwoven.revit.collection_policy import (
+    CompiledCategoryPolicy,
+    PolicyStats,
+    compiled_category_policy,
+    should_include_element,
+)
+
+
 def _get_excluded_3d_category_ids(doc):
     """Compatibility wrapper for legacy code; delegates to collection_policy.
 
@@ -5,3 +15,99 @@ def _get_excluded_3d_category_ids(doc):
     """
     from .collection_policy import resolve_category_ids, excluded_bic_names_global
     return resolve_category_ids(doc, excluded_bic_names_global())
+
+
+class _Id(object):
+    def __init__(self, v):
+        self.IntegerValue = v
+
+
+class _Cat(object):
+    def __init__(self, cid, name):
+        self.Id = _Id(cid)
+        self.Name = name
+
+
+class _BadIdCat(object):
+    Name = "Walls"
+
+    @property
+    def Id(self):
+        raise RuntimeError("no id")
+
+
+class _Elem(object):
+    def __init__(self, cat, view_specific=False):
+        self.Category = cat
+        self.ViewSpecific = view_specific
+
+
+def _fake_elements():
+    cats = [_Cat(-2000011, "Walls"), _Cat(-2000051, "Lines"), _Cat(-2000160, "Rooms"),
+            _Cat(-2000500, "Text Notes"), _Cat(-2000023, "Doors")]
+    out = [_Elem(None), _Elem(_BadIdCat()), _Elem(_BadIdCat(), view_specific=True)]
+    for c in cats:
+        out.extend([_Elem(c), _Elem(c, view_specific=True)])
+    return out
+
+
+def _stats_tuple(st):
+    return (st.seen_total, st.included_total, st.excluded_total, st.excluded_by_reason, st.excluded_by_category)
+
+
+@pytest.mark.parametrize("source_type", ["HOST", "LINK", "DWG"])
+def test_compiled_policy_matches_should_include_element(source_type):
+    doc = object()
+    elems = _fake_elements() * 3
+    ref_stats, fast_stats = PolicyStats(), PolicyStats()
+    policy = CompiledCategoryPolicy(doc, source_type)
+
+    for e in elems:
+        ref = should_include_element(elem=e, doc=doc, source_type=source_type, stats=ref_stats)
+        assert policy.decide(e, stats=fast_stats) == ref
+
+    assert _stats_tuple(fast_stats) == _stats_tuple(ref_stats)
+    assert len(policy) == 5  # one compiled entry per category id
+
+
+def test_compiled_policy_matches_on_fakedoc_with_resolved_ids():
+    from benchmarks.scene_gen import generate_scene
+    from vop_interwoven.fakedoc import FakeRevit
+
+    scene = generate_scene(n_elements=40, link_count=0, n_views=1, anno_density=0.5, seed=4)
+    with FakeRevit(scene) as fake:
+        from Autodesk.Revit.DB import FilteredElementCollector
+
+        elems = list(FilteredElementCollector(fake.doc).WhereElementIsNotElementType())
+        cache = {}
+        policy = compiled_category_policy(fake.doc, "host", cache=cache)
+        assert compiled_category_policy(fake.doc, "HOST", cache=cache) is policy
+        assert compiled_category_policy(fake.doc, "HOST") is not policy  # no cache: fresh policy
+        assert policy.included_ids  # resolved through doc.Settings.Categories
+
+        ref_stats, fast_stats = PolicyStats(), PolicyStats()
+        for e in elems:
+            ref = should_include_element(elem=e, doc=fake.doc, source_type="HOST", stats=ref_stats)
+            assert policy.decide(e, stats=fast_stats) == ref
+        assert _stats_tuple(fast_stats) == _stats_tuple(ref_stats)
+        assert ref_stats.included_total > 0 and ref_stats.excluded_total > 0
+
+
+def test_session_shares_one_policy_per_document_for_the_run():
+    import contextlib
+    import io
+
+    from benchmarks.scene_gen import generate_scene
+    from vop_interwoven.config import Config
+    from vop_interwoven.fakedoc import FakeRevit
+    from vop_interwoven.session import PipelineSession
+
+    scene = generate_scene(n_elements=30, link_count=1, n_views=2, anno_density=0.2, seed=4)
+    with contextlib.redirect_stdout(io.StringIO()):
+        with FakeRevit(scene, link_collector_2024=True) as fake:
+            session = PipelineSession(fake.doc, Config(element_cache_persist=False))
+            session.process_views(fake.view_ids)
+
+    host = list(session.snapshot.category_policies.values())
+    assert [p.source_type for p in host] == ["HOST"] and host[0].doc is fake.doc
+    assert [p.source_type for p in session.link_index.category_policies.values()] == ["LINK"]
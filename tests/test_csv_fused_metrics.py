@@ -0,0 +1,145 @@
+import random
+
+import pytest
+
+from vop_interwoven import csv_export as ce
+from vop_interwoven.core.math_utils import Bounds2D
+from vop_interwoven.core.raster import ViewRaster
+
+
+MODES = ("occ", "edge", "proxy", "ink", "any")
+
+
+def _random_raster(seed, backend="list"):
+    from vop_interwoven.config import Config
+
+    rng = random.Random(seed)
+    W, H = 13, 9
+    r = ViewRaster(width=W, height=H, cell_size=1.0, bounds=Bounds2D(0, 0, W, H), tile_size=4,
+                   cfg=Config(raster_backend=backend))
+    r.element_meta = [
+        {"source_type": "HOST"},
+        {"source_type": "HOST"},
+        {"source_type": "DWG"},
+        {"source_type": "LINK"},
+    ]
+    r.anno_meta = [{"type": "TEXT"}, {"type": "tag"}, {"type": "WEIRD"}, {}]
+    for idx in range(W * H):
+        r.model_mask[idx] = rng.random() < 0.3
+        r.model_edge_key[idx] = rng.choice([-1, -1, 0, 1, 2, 3, 7])
+        r.model_proxy_key[idx] = rng.choice([-1, -1, -1, 1, 2, 3])
+        r.model_proxy_mask[idx] = rng.random() < 0.1
+        r.anno_key[idx] = rng.choice([-1, -1, 0, 1, 2, 3, 9])
+        r.anno_over_model[idx] = rng.random() < 0.2
+    return r
+
+
+def _legacy_cells(r, mode):
+    """Straightforward per-cell reference for compute_cell_metrics."""
+    out = {"TotalCells": r.W * r.H, "Empty": 0, "ModelOnly": 0, "AnnoOnly": 0, "Overlap": 0}
+    for idx in range(r.W * r.H):
+        occ = bool(r.model_mask[idx])
+        edge = r.model_edge_key[idx] != -1
+        proxy = r.model_proxy_key[idx] != -1 or bool(r.model_proxy_mask[idx])
+        has_model = {"occ": occ, "edge": edge, "proxy": proxy, "ink": edge or proxy, "any": occ or edge or proxy}[mode]
+        if has_model and bool(r.anno_over_model[idx]):
+            out["Overlap"] += 1
+        elif has_model:
+            out["ModelOnly"] += 1
+        elif r.anno_key[idx] != -1:
+            out["AnnoOnly"] += 1
+        else:
+            out["Empty"] += 1
+    return out
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_fused_cells_match_reference(mode):
+    for seed in range(5):
+        r = _random_raster(seed)
+        metrics, _, _ = ce.compute_all_cell_metrics(r, model_presence_mode=mode)
+        assert metrics == _legacy_cells(r, mode)
+        assert ce.compute_cell_metrics(r, model_presence_mode=mode) == metrics
+
+
+def test_numpy_and_python_paths_agree():
+    np = pytest.importorskip("numpy")
+    for seed in range(5):
+        for backend in ("list", "numpy"):
+            r = _random_raster(seed, backend)
+            layers = (
+                r.model_mask, r.model_edge_key, r.model_proxy_key,
+                r.model_proxy_mask, r.anno_over_model, r.anno_key,
+            )
+            for mode in MODES:
+                a = ce._fused_metrics_numpy(np, r, r.W * r.H, mode, layers, True, True, True)
+                b = ce._fused_metrics_python(r, r.W * r.H, mode, layers, True, True, True)
+                assert a == b
+
+
+def test_anno_and_ext_buckets():
+    r = _random_raster(3)
+    _, anno, ext = ce.compute_all_cell_metrics(r)
+
+    keys = list(r.anno_key)
+    assert anno["AnnoCells_TEXT"] == keys.count(0)
+    assert anno["AnnoCells_TAG"] == keys.count(1)
+    assert anno["AnnoCells_OTHER"] == keys.count(2) + keys.count(3)
+    assert sum(anno.values()) == sum(1 for k in keys if 0 <= k < 4)
+
+    src = {2: "DWG", 3: "LINK", 1: "HOST"}
+    dwg = rvt = any_ = only = 0
+    for e, p in zip(r.model_edge_key, r.model_proxy_key):
+        s = {src.get(e), src.get(p)}
+        is_dwg, is_rvt = "DWG" in s, "LINK" in s
+        dwg += is_dwg
+        rvt += is_rvt
+        if is_dwg or is_rvt:
+            any_ += 1
+            only += "HOST" not in s
+    assert ext == {"Ext_Cells_Any": any_, "Ext_Cells_Only": only, "Ext_Cells_DWG": dwg, "Ext_Cells_RVT": rvt}
+    assert ce.compute_external_cell_metrics(r) == ext
+    assert ce.compute_annotation_type_metrics(r) == anno
+
+
+def test_partial_layers_and_unknown_mode():
+    r = ViewRaster(width=2, height=2, cell_size=1.0, bounds=Bounds2D(0, 0, 2, 2), tile_size=2)
+    r.model_edge_key = [5]
+    r.model_proxy_key = []
+    r.anno_key = [-1, 0]
+    r.anno_over_model = []
+    m, _, ext = ce.compute_all_cell_metrics(r)
+    assert (m["ModelOnly"], m["AnnoOnly"], m["Empty"]) == (1, 1, 2)
+    assert ext["Ext_Cells_Any"] == 0
+    with pytest.raises(ValueError):
+        ce.compute_cell_metrics(r, model_presence_mode="bogus")
+
+
+def test_ext_failure_zeroes_only_ext_counts(monkeypatch):
+    r = _random_raster(4)
+    cells, anno, _ = ce.compute_all_cell_metrics(r)
+
+    def boom(_raster, _key):
+        raise KeyError("element_meta")
+
+    monkeypatch.setattr(ce, "_element_source_code", boom)
+    np = None
+    try:
+        import numpy as np
+    except ImportError:
+        pass
+    layers = (r.model_mask, r.model_edge_key, r.model_proxy_key, r.model_proxy_mask, r.anno_over_model, r.anno_key)
+    impls = [lambda: ce._fused_metrics_python(r, r.W * r.H, "ink", layers, True, True, True)]
+    if np is not None:
+        impls.append(lambda: ce._fused_metrics_numpy(np, r, r.W * r.H, "ink", layers, True, True, True))
+    for impl in impls:
+        out = impl()
+        assert out["ext"] == ce._EXT_ZERO and isinstance(out["ext_error"], KeyError)
+
+    errors = []
+    assert ce.compute_all_cell_metrics(r, ext_errors=errors) == (cells, anno, ce._EXT_ZERO)
+    assert len(errors) == 1 and isinstance(errors[0], KeyError)
+    with pytest.raises(KeyError):
+        ce.compute_all_cell_metrics(r)
+    with pytest.raises(KeyError):
+        ce.compute_external_cell_metrics(r)
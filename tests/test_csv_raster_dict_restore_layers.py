@@ -47,4 +47,5 @@ def test_csv_restore_includes_edge_key_and_proxy_mask():
     rr.model_proxy_mask = raster_dict.get("model_proxy_mask", raster_dict.get("model_proxy_presence", []))
 
     assert rr.model_edge_key[idx] == 7
-    assert rr.model_proxy_mask[idx] is True
+    # Dense bool layers may be array/numpy-backed: compare truthiness, not identity.
+    assert bool(rr.model_proxy_mask[idx]) is True
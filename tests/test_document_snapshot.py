@@ -0,0 +1,93 @@
+import pytest
+
+from vop_interwoven.config import Config
+from vop_interwoven.revit.document_snapshot import DocumentSnapshot, ElementRecord
+
+
+def _fixture():
+    return {
+        "schema": 1,
+        "elements": {
+            "10": {"category_id": -2000011, "category": "Walls", "bbox": [0, 0, 0, 10, 1, 10], "view_specific": False},
+            "11": {"category_id": -2000011, "category": "Walls", "bbox": [0, 5, 0, 10, 6, 10], "view_specific": False},
+            "20": {"category_id": -2000300, "category": "Text Notes", "bbox": None, "view_specific": True},
+            "30": {"category_id": None, "category": None},
+        },
+        "views": {"100": [10, 11, 20], "200": [11, 30]},
+    }
+
+
+def test_offline_view_elements_and_category_index():
+    snap = DocumentSnapshot.from_dict(_fixture())
+
+    elems = snap.view_elements(100)
+    assert [e.elem_id for e in elems] == [10, 11, 20]
+    assert all(isinstance(e, ElementRecord) for e in elems)
+    assert snap.view_element_ids(200) == [11, 30]
+
+    walls = snap.view_elements_of_category(100, -2000011)
+    assert [e.elem_id for e in walls] == [10, 11]
+    assert snap.view_elements_of_category(200, -2000300) == []
+    assert snap.view_elements(999) == []
+
+    # Second access is served from the per-view index
+    snap.view_elements(100)
+    assert snap.stats()["view_hits"] >= 1
+    assert snap.stats()["collector_calls"] == 0
+
+
+def test_memo_is_per_view_and_released():
+    snap = DocumentSnapshot.from_dict(_fixture())
+    calls = []
+
+    def build():
+        calls.append(1)
+        return ["x"]
+
+    assert snap.memo(100, "anno", build) == ["x"]
+    assert snap.memo(100, "anno", build) == ["x"]
+    snap.memo(200, "anno", build)
+    assert len(calls) == 2
+
+    snap.release_view(100)
+    snap.memo(100, "anno", build)
+    assert len(calls) == 3
+    # Offline snapshots keep their element lists after release
+    assert snap.view_element_ids(100) == [10, 11, 20]
+
+
+def test_json_round_trip(tmp_path):
+    snap = DocumentSnapshot.from_dict(_fixture())
+    path = str(tmp_path / "snap.json")
+    snap.to_json(path)
+
+    again = DocumentSnapshot.from_json(path)
+    assert again.to_dict() == snap.to_dict()
+    assert [e.elem_id for e in again.view_elements_of_category(100, -2000300)] == [20]
+
+
+def test_live_collector_failure_is_not_raised():
+    class _Diag(object):
+        def __init__(self):
+            self.warnings = []
+
+        def warn(self, **kw):
+            self.warnings.append(kw)
+
+    class _View(object):
+        class Id(object):
+            IntegerValue = 7
+
+    diag = _Diag()
+    snap = DocumentSnapshot(doc=object(), diag=diag)
+    # Revit API is unavailable here: the collector import fails and is recorded
+    assert snap.view_elements(_View()) == []
+    assert snap.view_element_ids(_View()) == []
+    assert diag.warnings and diag.warnings[0]["callsite"] == "DocumentSnapshot.view_elements"
+
+
+def test_config_knob_is_not_part_of_signature():
+    assert Config().use_document_snapshot is True
+    cfg = Config(use_document_snapshot=False)
+    assert cfg.use_document_snapshot is False
+    assert "use_document_snapshot" not in cfg.to_dict()
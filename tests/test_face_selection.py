@@ -6,6 +6,8 @@ These tests are Revit-free and use stubs that mimic the minimal PlanarFace surfa
 - Origin (XYZ-like)
 """
 
+import math
+import random
 import unittest
 import sys
 import os
@@ -15,6 +17,10 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 
 from vop_interwoven.revit.view_basis import ViewBasis
 from vop_interwoven.core.face_selection import (
+    _canonicalize_plane,
+    _plane_eq_close,
+    _plane_from_planar_face,
+    front_facing_plane_groups,
     iter_front_facing_planar_faces,
     group_faces_by_plane,
     select_dominant_face_per_plane_group,
@@ -116,6 +122,53 @@ class TestFaceSelection(unittest.TestCase):
         top2 = select_top_plane_groups(selections, top_n=2)
         self.assertEqual([t["plane"] for t in top], [t["plane"] for t in top2])
 
+    def test_hashed_grouping_matches_linear_scan(self):
+        rng = random.Random(11)
+        normal_eps, offset_eps = 1e-4, 1e-2
+
+        def unit(v):
+            m = math.sqrt(sum(c * c for c in v))
+            return tuple(c / m for c in v)
+
+        # Few base planes + jitter near the tolerances, both normal signs, near-zero components
+        bases = [unit((rng.choice([0.0, 1e-9, -1e-9, rng.uniform(-1, 1)]), rng.uniform(-1, 1), rng.uniform(-1, 1)))
+                 for _ in range(6)] + [(0.0, 0.0, 1.0), (1.0, 0.0, 0.0)]
+        faces = []
+        for k in range(400):
+            n = unit(tuple(c + rng.gauss(0.0, 0.006) for c in rng.choice(bases)))
+            if rng.random() < 0.5:
+                n = tuple(-c for c in n)
+            o = tuple(c * rng.choice([0.0, 1.0, 2.0]) + rng.gauss(0.0, 0.004) for c in n)
+            faces.append(_FaceStub(normal=n, origin=o, name=str(k)))
+
+        def linear(fs):
+            entries = []
+            for f in fs:
+                n_unit, d = _plane_from_planar_face(f)
+                nx, ny, nz, dc = _canonicalize_plane(n_unit, d)
+                entries.append(((round(nx, 12), round(ny, 12), round(nz, 12), round(dc, 8)), (nx, ny, nz), dc, f))
+            entries.sort(key=lambda t: t[0])
+            groups = []
+            for _sk, n, d, f in entries:
+                for g in groups:
+                    if _plane_eq_close(g[0][:3], g[0][3], n, d, normal_eps=normal_eps, offset_eps=offset_eps):
+                        g[1].append(f)
+                        break
+                else:
+                    groups.append(((n[0], n[1], n[2], d), [f]))
+            return groups
+
+        expected = linear(faces)
+        got = group_faces_by_plane(faces, normal_eps=normal_eps, offset_eps=offset_eps)
+        self.assertGreater(len(expected), 8)
+        self.assertEqual([(g["plane"], g["faces"]) for g in got], [(p, fs) for p, fs in expected])
+
+        front = front_facing_plane_groups(faces, self.vb.forward, normal_eps=normal_eps, offset_eps=offset_eps)
+        front_expected = group_faces_by_plane(
+            list(iter_front_facing_planar_faces(faces, self.vb.forward)), normal_eps=normal_eps, offset_eps=offset_eps
+        )
+        self.assertEqual(front, front_expected)
+
 
 if __name__ == "__main__":
     unittest.main()
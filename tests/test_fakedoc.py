@@ -0,0 +1,114 @@
+import math
+import sys
+
+import pytest
+
+from vop_interwoven.config import Config
+from vop_interwoven.fakedoc import FakeRevit, api, build_document, is_installed, load_scene, save_scene
+
+
+SCENE = {
+    "schema": 1,
+    "title": "fakedoc-test",
+    "levels": [{"id": 1, "name": "L1", "elevation": 0.0}],
+    "views": [
+        {
+            "id": 100, "name": "L1 Plan", "view_type": "FloorPlan", "scale": 96,
+            "crop_box": {"min": [0, 0, -20], "max": [40, 30, 0]},
+            "view_range": {"level": 1, "cut": 4.0, "top": 8.0, "bottom": 0.0, "depth": -1.0},
+        },
+        {"id": 200, "name": "Drafting", "view_type": "DraftingView", "scale": 48},
+        {"id": 300, "name": "Template", "view_type": "FloorPlan", "is_template": True},
+    ],
+    "elements": [
+        {"id": 10, "category": "OST_Floors", "geometry": [{"type": "box", "min": [2, 2, -1], "max": [30, 25, 0]}]},
+        {"id": 11, "category": "OST_Walls", "geometry": [{"type": "box", "min": [2, 2, 0], "max": [30, 3, 10]}]},
+        {"id": 20, "category": "OST_TextNotes", "class": "TextNote", "view_specific": True, "owner_view": 100,
+         "bbox": {"min": [5, 5, 0], "max": [9, 6, 0]}},
+        {"id": 21, "category": "OST_Lines", "class": "Element", "view_specific": True, "owner_view": 200,
+         "geometry": [{"type": "line", "points": [[0, 0, 0], [10, 0, 0]]}]},
+    ],
+    "links": [
+        {"id": 500, "transform": {"origin": [5, 0, 0]}, "document": {"elements": [
+            {"id": 10, "category": "OST_Walls", "geometry": [{"type": "box", "min": [0, 15, 0], "max": [20, 16, 10]}]},
+        ]}},
+    ],
+}
+
+
+def test_transform_inverse_and_prism_geometry():
+    trf = api.Transform(origin=api.XYZ(3, -2, 1)).Multiply(api.Transform.CreateRotation(api.XYZ.BasisZ, math.radians(30)))
+    p = api.XYZ(1.5, 2.0, -4.0)
+    assert trf.Inverse.OfPoint(trf.OfPoint(p)).IsAlmostEqualTo(p, 1e-9)
+
+    solid = api.make_prism([(0, 0), (4, 0), (4, 3), (0, 3)], 0.0, 2.0)
+    assert solid.Volume == pytest.approx(24.0)
+    assert solid.Faces.Size == 6
+    normals = sorted((round(f.FaceNormal.X), round(f.FaceNormal.Y), round(f.FaceNormal.Z)) for f in solid.Faces)
+    assert normals == [(-1, 0, 0), (0, -1, 0), (0, 0, -1), (0, 0, 1), (0, 1, 0), (1, 0, 0)]
+
+
+def test_collector_filters_and_view_visibility():
+    doc = build_document(SCENE)
+    FEC = api.FilteredElementCollector
+
+    in_plan = [e.Id.IntegerValue for e in FEC(doc, api.ElementId(100)).WhereElementIsNotElementType()]
+    assert in_plan == [10, 11, 20, 500]
+    in_drafting = [e.Id.IntegerValue for e in FEC(doc, api.ElementId(200))]
+    assert in_drafting == [21]
+
+    walls = FEC(doc, api.ElementId(100)).OfCategory(api.BuiltInCategory.OST_Walls)
+    assert [e.Id.IntegerValue for e in walls] == [11]
+    links = FEC(doc).OfClass(api.RevitLinkInstance).ToElements()
+    assert links.Size == 1 and links[0].GetLinkDocument().IsLinked
+
+
+def test_install_is_reversible():
+    assert not is_installed()
+    before = sys.modules.get("Autodesk.Revit.DB")
+    with FakeRevit(SCENE):
+        from Autodesk.Revit.DB import XYZ  # noqa: F401 - provided by the fake
+
+        from vop_interwoven.revit import linked_documents
+
+        assert linked_documents.RevitLinkInstance is api.RevitLinkInstance
+    assert not is_installed()
+    assert sys.modules.get("Autodesk.Revit.DB") is before
+
+
+def test_scene_round_trip(tmp_path):
+    path = str(tmp_path / "scene.json")
+    save_scene(SCENE, path)
+    assert load_scene(path) == SCENE
+
+
+def test_process_document_views_end_to_end():
+    from vop_interwoven.pipeline import process_document_views
+
+    cfg = Config(element_cache_persist=False, retain_rasters_in_memory=True)
+    runs = []
+    for _ in range(2):
+        with FakeRevit(SCENE) as fake:
+            runs.append(process_document_views(fake.doc, fake.view_ids, cfg))
+
+    plan, drafting, template = runs[0]
+    assert plan["view_mode"] == "MODEL_AND_ANNOTATION"
+    assert plan["total_elements"] == 3  # floor, wall, linked wall
+    assert plan["filled_cells"] > 0
+    assert drafting["view_mode"] == "ANNOTATION_ONLY"
+    assert template["success"] is False and template["view_mode"] == "REJECTED"
+
+    # Deterministic replay
+    key = lambda r: (r.get("view_id"), r.get("filled_cells"), r.get("width"), r.get("height"))
+    assert [key(r) for r in runs[0]] == [key(r) for r in runs[1]]
+
+
+def test_streaming_export_writes_outputs(tmp_path):
+    from vop_interwoven.streaming import run_vop_pipeline_streaming
+
+    with FakeRevit(SCENE) as fake:
+        out = run_vop_pipeline_streaming(fake.doc, fake.view_ids[:2], Config(), output_dir=str(tmp_path), pixels_per_cell=1)
+
+    assert out["views_processed"] == 2 and out["views_failed"] == 0
+    assert len(out["png_files"]) == 2
+    assert out["csv_rows_written"] == 2
@@ -42,7 +42,8 @@ def test_csv_export_records_error_on_metrics_failure(monkeypatch, tmp_path):
     def boom_metrics(_raster, *args, **kwargs):
         raise AssertionError("CSV invariant failed: TotalCells (4) != ... (3)")
 
-    monkeypatch.setattr(csv_export, "compute_cell_metrics", boom_metrics, raising=True)
+    # export_pipeline_to_csv computes all per-cell metrics in one fused pass.
+    monkeypatch.setattr(csv_export, "compute_all_cell_metrics", boom_metrics, raising=True)
 
     diag = Diagnostics(max_events=50, capture_traceback=False)
 
@@ -125,3 +126,61 @@ def test_csv_export_records_error_on_write_failure(monkeypatch, tmp_path):
         e.get("level") == "ERROR" and e.get("phase") == "export_csv"
         for e in d.get("events", [])
     ), "Expected an ERROR diagnostic event for CSV write failure"
+
+
+def test_csv_export_writes_zero_ext_cells_on_ext_metrics_failure(monkeypatch, tmp_path):
+    """
+    Fault injection: external-cell metrics fail.
+    Expectation: the view row is still written with zero Ext_* columns and a WARN is recorded.
+    """
+    import csv
+
+    import vop_interwoven.csv_export as csv_export
+
+    def boom_ext(_raster, *args, **kwargs):
+        raise KeyError("element_meta")
+
+    # Fails inside the fused metrics pass, on the ext-cell accumulation only
+    monkeypatch.setattr(csv_export, "_element_source_code", boom_ext, raising=True)
+
+    diag = Diagnostics(max_events=50, capture_traceback=False)
+
+    class Cfg:
+        tiny_max = 2
+        thin_max = 2
+        adaptive_tile_size = True
+        proxy_mask_mode = "minmask"
+        over_model_includes_proxies = True
+        tile_size = 16
+        depth_eps_ft = 0.01
+        anno_crop_margin_in = 6.0
+        anno_expand_cap_cells = 500
+        cell_size_paper_in = 0.125
+        max_sheet_width_in = 48.0
+        max_sheet_height_in = 36.0
+        bounds_buffer_in = 0.5
+
+    result = _minimal_pipeline_result()
+    raster = result["views"][0]["raster"]
+    raster["model_edge_key"] = [1, -1, -1, 1]
+    raster["element_meta"] = [{}, {"source_type": "LINK"}]
+
+    out = csv_export.export_pipeline_to_csv(
+        pipeline_result=result,
+        output_dir=str(tmp_path),
+        config=Cfg(),
+        doc=None,
+        diag=diag,
+    )
+
+    assert out["rows_exported"] == 1
+    with open(out["vop_csv_path"], newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[-1]["Ext_Cells_Any"] == "0" and rows[-1]["Ext_Cells_RVT"] == "0"
+    assert rows[-1]["TotalCells"] == "4" and rows[-1]["ModelOnly"] == "2"
+
+    d = diag.to_dict()
+    assert any(
+        e.get("level") == "WARN" and e.get("callsite") == "export_pipeline_to_csv.ext_cells"
+        for e in d.get("events", [])
+    ), "Expected a WARN diagnostic event for ext-cell metrics failure"
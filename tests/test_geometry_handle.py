@@ -0,0 +1,141 @@
+import types
+
+from vop_interwoven.core.cache import LRUCache
+from vop_interwoven.core.geometry_handle import (
+    GeometryHandle,
+    PROFILE_CAD,
+    PROFILE_CAD_VIEW,
+    PROFILE_SOLID,
+    handle_for,
+)
+from vop_interwoven.fakedoc import FakeRevit
+
+
+SCENE = {
+    "schema": 1,
+    "views": [{"id": 100, "view_type": "FloorPlan", "scale": 96,
+               "crop_box": {"min": [0, 0, -20], "max": [40, 30, 0]}}],
+    "elements": [
+        {"id": 10, "category": "OST_Floors", "geometry": [{"type": "box", "min": [2, 2, -1], "max": [30, 25, 0]}]},
+        {"id": 12, "category": "OST_Furniture", "geometry": [{"type": "box", "min": [10, 10, 0], "max": [10.5, 10.5, 3]}]},
+    ],
+}
+
+
+class _LinkedProxy(object):
+    """Stand-in for LinkedElementProxy: exposes .transform and a source_id."""
+
+    def __init__(self, elem, source_id="LINK_500"):
+        self.Id = elem.Id
+        self.Category = elem.Category
+        self.transform = None
+        self.source_id = source_id
+        self._elem = elem
+
+    def get_Geometry(self, opts):
+        return self._elem.get_Geometry(opts)
+
+
+def test_handle_is_lazy_and_fetches_each_profile_once():
+    with FakeRevit(SCENE) as fake:
+        floor, view = fake.doc.GetElement(10), fake.doc.GetElement(100)
+        handle = GeometryHandle(floor, view)
+        assert floor.geometry_fetches == 0
+
+        assert len(handle.solids()) == 1
+        assert len(handle.faces()) == 6
+        handle.geometry(PROFILE_SOLID)
+        assert floor.geometry_fetches == 1
+
+        handle.geometry(PROFILE_CAD)
+        handle.geometry(PROFILE_CAD)
+        assert floor.geometry_fetches == 2 and handle.fetch_count == 2
+
+
+def test_handle_memoizes_failures():
+    calls = []
+
+    class _Broken(object):
+        def get_Geometry(self, opts):
+            calls.append(opts)
+            raise RuntimeError("boom")
+
+    with FakeRevit(SCENE):
+        handle = GeometryHandle(_Broken(), None)
+        assert handle.geometry() is None
+        assert handle.solids() == [] and handle.faces() == []
+    assert len(calls) == 1
+
+
+def test_silhouette_cache_hit_and_bbox_strategy_never_fetch():
+    from vop_interwoven.config import Config
+    from vop_interwoven.core.silhouette import get_element_silhouette
+    from vop_interwoven.pipeline import init_view_raster
+    from vop_interwoven.revit.view_basis import make_view_basis
+
+    with FakeRevit(SCENE) as fake:
+        cfg = Config(element_cache_persist=False)
+        view = fake.doc.GetElement(100)
+        raster, vb = init_view_raster(fake.doc, view, cfg), make_view_basis(view)
+
+        # Plain (non-FamilyInstance) TINY element: bbox strategy wins without geometry
+        tiny = fake.doc.GetElement(12)
+        tiny.__class__ = type("PlainElement", (tiny.__class__.__mro__[1],), {})
+        loops = get_element_silhouette(tiny, view, vb, raster, cfg)
+        assert loops and loops[0]["strategy"] in ("bbox", "obb")
+        assert tiny.geometry_fetches == 0
+
+        floor = fake.doc.GetElement(10)
+        cache = LRUCache(max_items=8)
+        cache.set(("k",), [{"points": [(0, 0), (1, 0), (1, 1)], "is_hole": False}])
+        assert get_element_silhouette(floor, view, vb, raster, cfg, cache=cache, cache_key=("k",))
+        assert floor.geometry_fetches == 0
+
+
+def test_areal_tiers_share_one_fetch():
+    from vop_interwoven.config import Config
+    from vop_interwoven.core import silhouette
+    from vop_interwoven.core.areal_extraction import extract_areal_geometry
+    from vop_interwoven.pipeline import init_view_raster
+    from vop_interwoven.revit.view_basis import make_view_basis
+
+    with FakeRevit(SCENE) as fake:
+        cfg = Config(element_cache_persist=False)
+        view = fake.doc.GetElement(100)
+        raster, vb = init_view_raster(fake.doc, view, cfg), make_view_basis(view)
+        floor = fake.doc.GetElement(10)
+
+        # Force Tier 1A to miss so Tier 1B runs on the same handle
+        orig = silhouette._front_face_loops_silhouette
+        silhouette._front_face_loops_silhouette = lambda e, v, b, cfg=None, handle=None: (handle.solids(), [])[1]
+        try:
+            loops, confidence, strategy = extract_areal_geometry(floor, view, vb, raster, cfg)
+        finally:
+            silhouette._front_face_loops_silhouette = orig
+
+        assert (confidence, strategy) == ("HIGH", "silhouette_edges") and loops
+        assert floor.geometry_fetches == 1
+
+
+def test_handle_for_shares_only_linked_proxies():
+    registry = LRUCache(max_items=8)
+    with FakeRevit(SCENE) as fake:
+        floor = fake.doc.GetElement(10)
+        v1 = fake.doc.GetElement(100)
+        v2 = types.SimpleNamespace(Id=types.SimpleNamespace(IntegerValue=101))
+
+        assert handle_for(floor, v1, registry) is not handle_for(floor, v1, registry)
+        assert len(registry) == 0
+
+        proxy = _LinkedProxy(floor)
+        h1 = handle_for(proxy, v1, registry)
+        h1.geometry(PROFILE_SOLID)
+        h1.geometry(PROFILE_CAD_VIEW)
+        h2 = handle_for(_LinkedProxy(floor), v2, registry)
+        assert h2 is h1 and h2.view is v2
+        h2.geometry(PROFILE_SOLID)
+        assert floor.geometry_fetches == 2  # solid reused; view-bound cad profile dropped
+        h2.geometry(PROFILE_CAD_VIEW)
+        assert floor.geometry_fetches == 3
+
+        assert handle_for(_LinkedProxy(floor, "LINK_501"), v1, registry) is not h1
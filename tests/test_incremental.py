@@ -0,0 +1,175 @@
+import contextlib
+import copy
+import io
+
+import pytest
+
+from benchmarks.scene_gen import generate_scene
+from vop_interwoven.config import Config
+from vop_interwoven.core.element_cache import ElementCache, ElementFingerprint
+from vop_interwoven.fakedoc import FakeRevit
+from vop_interwoven.incremental import IncrementalPlanner, ViewIndex
+from vop_interwoven.root_cache import open_root_cache
+from vop_interwoven.session import PipelineSession
+
+
+def _split_scene():
+    """Two plan views cropped to the left / right half, collectors honouring the crop."""
+    scene = generate_scene(n_elements=30, link_count=0, n_views=2, occlusion_depth=2, anno_density=0.3, seed=9)
+    ext = scene["bench"]["extent_ft"]
+    left, right = scene["views"]
+    left["crop_box"] = {"min": [0.0, 0.0, -50.0], "max": [ext / 2 - 5.0, ext, 0.0]}
+    right["crop_box"] = {"min": [ext / 2 + 5.0, 0.0, -50.0], "max": [ext, ext, 0.0]}
+    left["visible"], right["visible"] = [], []
+    for e in scene["elements"]:
+        if e.get("view_specific"):
+            (left if e["owner_view"] == left["id"] else right)["visible"].append(e["id"])
+            continue
+        boxes = [g for g in e.get("geometry") or [] if g.get("type") == "box"]
+        xmin = min((g["min"][0] for g in boxes), default=0.0)
+        xmax = max((g["max"][0] for g in boxes), default=ext)
+        if xmin < ext / 2 - 5.0:
+            left["visible"].append(e["id"])
+        if xmax > ext / 2 + 5.0:
+            right["visible"].append(e["id"])
+    return scene
+
+
+def _run(scene, out_dir, incremental=True, **cfg_kwargs):
+    cfg = Config(retain_rasters_in_memory=True, incremental_reexport=incremental, **cfg_kwargs)
+    cfg.output_dir = str(out_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        root_cache = open_root_cache(str(out_dir), "proj", "test", "cfg")
+        root_cache.load()
+        with FakeRevit(scene) as fake:
+            session = PipelineSession(fake.doc, cfg, root_cache=root_cache)
+            results = session.process_views(fake.view_ids)
+            session.finalize()
+    return [bool(r.get("from_cache")) for r in results], session.planner
+
+
+def _move_left_wall(scene):
+    ext = scene["bench"]["extent_ft"]
+    for e in scene["elements"]:
+        if e["id"] in scene["views"][0]["visible"] and e["id"] not in scene["views"][1]["visible"]:
+            box = e["geometry"][0]
+            box["min"][1] += 1.0
+            box["max"][1] += 1.0
+            assert box["max"][0] < ext / 2
+            return e["id"]
+    raise AssertionError("no left-only element")
+
+
+def test_unchanged_views_skip_signature_and_moved_element_dirties_its_view(tmp_path):
+    scene = _split_scene()
+
+    cached, planner = _run(scene, tmp_path)
+    assert cached == [False, False]
+    assert planner.stats()["reason"] == "no_previous_run" and planner.recorded == 2
+
+    cached, planner = _run(scene, tmp_path)
+    assert cached == [True, True] and planner.reused == 2 and planner.recorded == 0
+
+    moved = copy.deepcopy(scene)
+    _move_left_wall(moved)
+    cached, planner = _run(moved, tmp_path)
+    assert planner.stats()["moved"] == 1
+    assert cached == [False, True]
+    assert planner.dirty == {scene["views"][0]["id"]}
+
+    cached, planner = _run(moved, tmp_path)
+    assert cached == [True, True]
+
+
+def test_hidden_element_dirties_only_the_view_that_hides_it(tmp_path):
+    scene = _split_scene()
+    _run(scene, tmp_path)
+    _run(scene, tmp_path)
+
+    hidden = copy.deepcopy(scene)
+    left = hidden["views"][0]
+    left["visible"].remove(left["visible"][0])  # hide in view, element untouched
+    cached, planner = _run(hidden, tmp_path)
+    assert planner.stats()["moved"] == 0 and not planner.dirty
+    assert cached == [False, True] and planner.reused == 1
+
+    cached, planner = _run(hidden, tmp_path)
+    assert cached == [True, True]
+
+
+def test_planner_fingerprints_documents_larger_than_the_element_cache(tmp_path):
+    scene = generate_scene(n_elements=10200, link_count=0, n_views=1, occlusion_depth=2, anno_density=0.0, seed=9)
+    view = scene["views"][0]
+    view["visible"] = [e["id"] for e in scene["elements"][:20]]
+    for e in scene["elements"][20:]:
+        # Bbox-only elements keep the fake document cheap; the view never draws them
+        boxes = [g for g in e.get("geometry") or [] if g.get("type") == "box"]
+        e["geometry"] = []
+        if boxes:
+            e["bbox"] = {"min": boxes[0]["min"], "max": boxes[0]["max"]}
+
+    cached, planner = _run(scene, tmp_path)
+    assert planner.stats()["reason"] == "no_previous_run"
+    assert len(planner.elem_cache.cache) > Config().element_cache_max_items
+
+    cached, planner = _run(scene, tmp_path)
+    assert cached == [True] and planner.ready and planner.reused == 1
+
+    cached, planner = _run(scene, tmp_path, incremental_max_elements=10000)
+    assert planner.stats()["reason"] == "fingerprint_capacity" and planner.reused == 0
+
+
+def test_incremental_max_elements_knob():
+    assert Config().incremental_max_elements == 1000000
+    assert "incremental_max_elements" not in Config(incremental_max_elements=5).to_dict()
+    with pytest.raises(ValueError):
+        Config(incremental_max_elements=0)
+
+
+def test_moved_element_invalidates_signature_without_planner(tmp_path):
+    scene = _split_scene()
+    _run(scene, tmp_path, incremental=False)
+    moved = copy.deepcopy(scene)
+    _move_left_wall(moved)
+    cached, planner = _run(moved, tmp_path, incremental=False)
+    assert planner is None and cached == [False, True]
+
+
+def _fp(elem_id, lo, hi):
+    fp = ElementFingerprint(elem_id)
+    fp.centroid = tuple((a + b) / 2.0 for a, b in zip(lo, hi))
+    fp.size = tuple(b - a for a, b in zip(lo, hi))
+    return fp
+
+
+def test_change_mapping_rules():
+    plan_basis = {"origin": [0.0, 0.0, 0.0], "right": [1.0, 0.0, 0.0], "up": [0.0, 1.0, 0.0]}
+    index = ViewIndex({
+        1: {"keys": ["10:HOST"], "region": dict(plan_basis, rect=[0.0, 0.0, 10.0, 10.0])},
+        2: {"keys": [], "region": dict(plan_basis, rect=[20.0, 0.0, 30.0, 10.0])},
+        3: {"keys": [], "region": None},
+    })
+
+    def plan(prev_fps, cur_fps, owner=None):
+        prev, cur = ElementCache(), ElementCache()
+        for fp in prev_fps:
+            prev.cache[(fp.elem_id, "HOST")] = fp
+        for fp in cur_fps:
+            cur.cache[(fp.elem_id, "HOST")] = fp
+        p = IncrementalPlanner(None, Config(), cur, prev, index)
+        p._owner = owner or {}
+        p.changes = cur.detect_changes(prev, tolerance=0.0)
+        p._map_changes()
+        return p
+
+    wall = _fp(10, (1.0, 1.0, 0.0), (2.0, 2.0, 1.0))
+    # Removal: only views that contained it
+    assert plan([wall], []).dirty == {1}
+    # Added in view 2's crop: view 2 + uncropped view 3
+    assert plan([], [_fp(11, (25.0, 5.0, 0.0), (26.0, 6.0, 1.0))]).dirty == {2, 3}
+    # Moved from view 1 into view 2: old and new positions both count
+    assert plan([wall], [_fp(10, (21.0, 1.0, 0.0), (22.0, 2.0, 1.0))]).dirty == {1, 2, 3}
+    # View-specific element: owner view only
+    assert plan([], [_fp(12, (25.0, 5.0, 0.0), (26.0, 6.0, 0.0))], owner={(12, "HOST"): 1}).dirty == {1}
+    # Added without a bbox or owner: cannot be located -> everything dirty
+    assert plan([], [ElementFingerprint(13)]).all_dirty
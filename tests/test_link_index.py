@@ -0,0 +1,79 @@
+import contextlib
+import hashlib
+import io
+import json
+import random
+
+import pytest
+
+from benchmarks.scene_gen import generate_scene
+from vop_interwoven.config import Config
+from vop_interwoven.fakedoc import FakeRevit
+from vop_interwoven.session import PipelineSession
+
+
+def _scene():
+    return generate_scene(n_elements=40, link_count=2, n_views=3, occlusion_depth=2, anno_density=0.2, seed=5)
+
+
+def _run(scene, link_collector_2024, use_link_index):
+    cfg = Config(element_cache_persist=False, retain_rasters_in_memory=True, use_link_index=use_link_index)
+    with contextlib.redirect_stdout(io.StringIO()):
+        with FakeRevit(scene, link_collector_2024=link_collector_2024) as fake:
+            session = PipelineSession(fake.doc, cfg)
+            results = session.process_views(fake.view_ids)
+    digests = [
+        (hashlib.md5(json.dumps(r.get("raster"), sort_keys=True, default=str).encode()).hexdigest(), r.get("total_elements"))
+        for r in results
+    ]
+    return digests, session.link_index
+
+
+@pytest.mark.parametrize("link_collector_2024", [True, False])
+def test_link_index_matches_per_view_link_resolution(link_collector_2024):
+    scene = _scene()
+    indexed, index = _run(scene, link_collector_2024, True)
+    plain, no_index = _run(scene, link_collector_2024, False)
+
+    assert no_index is None
+    assert indexed == plain
+    st = index.stats()
+    # Three views over the same two links: instances and proxies resolved once
+    assert st["links"] == 2 and st["link_hits"] == 4
+    assert st["proxy_hits"] == 2 * st["proxies_created"] > 0
+    if not link_collector_2024:
+        assert st["link_docs_indexed"] == 2 and st["queries"] == 6
+
+
+def test_indexed_clip_query_matches_bbox_filter_collector():
+    scene = _scene()
+    ext = scene["bench"]["extent_ft"]
+    rng = random.Random(11)
+    with FakeRevit(scene, link_collector_2024=False) as fake:
+        from Autodesk.Revit.DB import XYZ, FilteredElementCollector, RevitLinkInstance
+        from vop_interwoven.revit import linked_documents as ld
+        from vop_interwoven.revit.link_index import LinkIndex
+
+        index = LinkIndex(fake.doc)
+        for link_inst in FilteredElementCollector(fake.doc).OfClass(RevitLinkInstance).ToElements():
+            link = index.link(link_inst)
+            assert index.link(link_inst) is link
+
+            for trial in range(25):
+                x, y = rng.uniform(-10, ext), rng.uniform(-10, ext)
+                w, h = rng.uniform(0, ext / 2), rng.uniform(0, ext / 2)
+                z0, z1 = rng.uniform(-20, 5), rng.uniform(5, 40)
+                corners = [XYZ(cx, cy, cz) for cx in (x, x + w) for cy in (y, y + h) for cz in (z0, z1)]
+                clip = {"is_valid": trial % 5 != 0, "corners_host": corners}
+                cats = None if trial % 2 else {e[1] for e in index.elements_in_box(link.link_doc)[::2]}
+
+                args = (link_inst, link.link_doc, link.link_trf, None, clip, cats, link.source_key, link.source_label, None)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    expected = ld._collect_link_elements_with_clipping(*args)
+                    got = ld._collect_link_elements_with_clipping(*args, link_index=index, link=link)
+
+                assert [p.Id.IntegerValue for p in got] == [p.Id.IntegerValue for p in expected]
+                for a, b in zip(got, expected):
+                    bb_a, bb_b = a.get_BoundingBox(None), b.get_BoundingBox(None)
+                    assert (bb_a.Min.X, bb_a.Min.Y, bb_a.Max.Z) == (bb_b.Min.X, bb_b.Min.Y, bb_b.Max.Z)
+                    assert a.doc_key == b.doc_key
@@ -0,0 +1,63 @@
+import struct
+import zlib
+
+from vop_interwoven import png_export as pe
+
+
+def _read_png(data):
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    pos = 8
+    chunks = {}
+    order = []
+    while pos < len(data):
+        (n,) = struct.unpack(">I", data[pos:pos + 4])
+        tag = data[pos + 4:pos + 8]
+        body = data[pos + 8:pos + 8 + n]
+        (crc,) = struct.unpack(">I", data[pos + 8 + n:pos + 12 + n])
+        assert crc == zlib.crc32(tag + body) & 0xFFFFFFFF
+        chunks[tag] = chunks.get(tag, b"") + body
+        order.append(tag)
+        pos += 12 + n
+    assert order[0] == b"IHDR" and order[-1] == b"IEND"
+    w, h, depth, ctype, _, _, _ = struct.unpack(">IIBBBBB", chunks[b"IHDR"])
+    raw = zlib.decompress(chunks[b"IDAT"])
+    rows = []
+    for y in range(h):
+        line = raw[y * (w + 1):(y + 1) * (w + 1)]
+        assert line[0] == 0
+        rows.append(list(line[1:]))
+    return w, h, depth, ctype, chunks[b"PLTE"], rows
+
+
+def test_encode_indexed_png_upscales_rows_and_bytes():
+    data = pe.encode_indexed_png([bytes([0, 1]), bytes([2, 3])], 2, pe.DEFAULT_PALETTE, scale=3)
+    w, h, depth, ctype, plte, rows = _read_png(data)
+    assert (w, h, depth, ctype) == (6, 6, 8, 3)
+    assert plte == bytes([255, 255, 255, 0, 255, 0, 0, 128, 0, 255, 0, 0])
+    assert rows[0] == [0, 0, 0, 1, 1, 1] and rows[2] == rows[0]
+    assert rows[3] == [2, 2, 2, 3, 3, 3] and rows[5] == rows[3]
+
+
+def test_export_raster_to_png_priority_and_flip(tmp_path):
+    # 3x2 raster: edge beats proxy beats anno; j=0 is the bottom image row.
+    view = {
+        "width": 3,
+        "height": 2,
+        "raster": {
+            "model_edge_key": [5, -1, -1, -1, -1, -1],
+            "model_proxy_key": [2, 2, -1, -1, -1, -1],
+            "anno_key": [0, 0, 0, -1, -1, 1],
+        },
+    }
+    out = tmp_path / "sub" / "v.png"
+    assert pe.export_raster_to_png(view, str(out), pixels_per_cell=1) == str(out)
+
+    _, _, _, _, _, rows = _read_png(out.read_bytes())
+    assert rows == [
+        [pe.PAL_EMPTY, pe.PAL_EMPTY, pe.PAL_ANNO],
+        [pe.PAL_MODEL_EDGE, pe.PAL_MODEL_PROXY, pe.PAL_ANNO],
+    ]
+
+
+def test_export_raster_to_png_invalid_input_returns_none(tmp_path):
+    assert pe.export_raster_to_png({"raster": {}}, str(tmp_path / "x.png")) is None
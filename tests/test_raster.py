@@ -294,6 +294,114 @@ def run_tests():
     return result
 
 
+class TestTryWriteSpan(unittest.TestCase):
+    """try_write_span must match per-cell try_write_cell exactly."""
+
+    BACKENDS = ("list", "array", "numpy")
+
+    def _raster(self, backend, clip=None):
+        r = ViewRaster(width=37, height=21, cell_size=1.0, bounds=Bounds2D(0, 0, 37, 21),
+                       tile_size=8, cfg=Config(raster_backend=backend))
+        r.model_clip_bounds = clip
+        for k in range(4):
+            r.get_or_create_element_meta_index(100 + k, "Walls", "HOST")
+        return r
+
+    def _ops(self):
+        import random
+        rng = random.Random(7)
+        ops = []
+        for _ in range(200):
+            j = rng.randrange(-2, 23)
+            x0 = rng.randrange(-3, 40)
+            x1 = x0 + rng.randrange(0, 25)
+            depth = rng.choice([1.0, 2.0, 2.0000001, 3.5, 5.0])
+            src = rng.choice(["HOST", "LINK", "DWG"])
+            eps = rng.choice([0.0, 1e-6])
+            ops.append((j, x0, x1, depth, src, eps, rng.randrange(4)))
+        return ops
+
+    def _assert_same(self, backend, clip):
+        ref = self._raster(backend, clip)
+        bulk = self._raster(backend, clip)
+        for (j, x0, x1, depth, src, eps, key) in self._ops():
+            n_ref = 0
+            for i in range(max(0, x0), min(ref.W, x1)):
+                if 0 <= j < ref.H and ref.try_write_cell(i, j, depth, source=src, tie_breaker_eps=eps, key_index=key):
+                    n_ref += 1
+            n_bulk = bulk.try_write_span(j, x0, x1, depth, source=src, tie_breaker_eps=eps, key_index=key)
+            self.assertEqual(n_ref, n_bulk)
+
+        self.assertEqual(ref.to_dict(), bulk.to_dict())
+        self.assertEqual(ref.tile.filled_count, bulk.tile.filled_count)
+        self.assertEqual(ref.tile.w_min_tile, bulk.tile.w_min_tile)
+        self.assertEqual(ref.tile.w_max_tile, bulk.tile.w_max_tile)
+        self.assertEqual(
+            (ref.depth_test_attempted, ref.depth_test_wins, ref.depth_test_rejects),
+            (bulk.depth_test_attempted, bulk.depth_test_wins, bulk.depth_test_rejects),
+        )
+
+    def test_span_matches_cell_writes(self):
+        for backend in self.BACKENDS:
+            with self.subTest(backend=backend):
+                self._assert_same(backend, None)
+
+    def test_span_matches_cell_writes_with_model_clip(self):
+        for backend in self.BACKENDS:
+            with self.subTest(backend=backend):
+                self._assert_same(backend, Bounds2D(3.2, 2.0, 30.0, 17.5))
+
+
+class TestHiZPyramid(unittest.TestCase):
+    """hi-Z pyramid must agree with the exact per-tile early-out walk."""
+
+    @staticmethod
+    def _walk(tm, i0, j0, i1, j1, w):
+        for t in tm.get_tiles_for_rect(i0, j0, i1, j1):
+            if not tm.is_tile_full(t) or tm.w_max_tile[t] >= w:
+                return False
+        return True
+
+    def test_root_tracks_full_coverage(self):
+        r = ViewRaster(width=64, height=64, cell_size=1.0, bounds=Bounds2D(0, 0, 64, 64), tile_size=4)
+        tm = r.tile
+        self.assertEqual(len(tm.hiz_levels[-1]), 1)
+        self.assertFalse(tm.hiz_rect_occluded(0, 0, 15, 15, 10.0))
+
+        for j in range(64):
+            r.try_write_span(j, 0, 64, 2.0)
+        self.assertEqual(tm.hiz_levels[-1][0], 2.0)
+        self.assertTrue(tm.hiz_rect_occluded(0, 0, 15, 15, 10.0))
+        self.assertFalse(tm.hiz_rect_occluded(0, 0, 15, 15, 2.0))
+
+    def test_pyramid_never_contradicts_tile_walk(self):
+        import random
+        from vop_interwoven.core.footprint import CellRectFootprint
+        from vop_interwoven.core.math_utils import CellRect
+        from vop_interwoven.pipeline import _tiles_fully_covered_and_nearer
+
+        rng = random.Random(11)
+        r = ViewRaster(width=64, height=44, cell_size=1.0, bounds=Bounds2D(0, 0, 64, 44), tile_size=4)
+        tm = r.tile
+        proven = 0
+        for step in range(400):
+            j = rng.randrange(44)
+            x0 = rng.randrange(64)
+            r.try_write_span(j, x0, x0 + rng.randrange(1, 40), rng.choice([1.0, 2.0, 4.0]))
+            if step % 4 == 0:
+                i0, j0 = rng.randrange(-5, 64), rng.randrange(-5, 44)
+                i1, j1 = i0 + rng.randrange(0, 12), j0 + rng.randrange(0, 12)
+                w = rng.choice([1.5, 3.0, 5.0])
+                expected = self._walk(tm, i0, j0, i1, j1, w)
+                fp = CellRectFootprint(CellRect(i0, j0, i1, j1))
+                self.assertEqual(_tiles_fully_covered_and_nearer(tm, fp, w), expected)
+                ti = tm.tile_rect_for_cells(i0, j0, i1, j1)
+                if tm.hiz_rect_occluded(ti[0], ti[1], ti[2], ti[3], w):
+                    proven += 1
+                    self.assertTrue(expected)
+        self.assertGreater(proven, 0)
+
+
 if __name__ == "__main__":
     result = run_tests()
     sys.exit(0 if result.wasSuccessful() else 1)
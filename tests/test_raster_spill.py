@@ -0,0 +1,111 @@
+import contextlib
+import gc
+import io
+import json
+import os
+import pickle
+
+from benchmarks.scene_gen import generate_scene
+from vop_interwoven.config import Config
+from vop_interwoven.core.math_utils import Bounds2D
+from vop_interwoven.core.raster import ViewRaster
+from vop_interwoven.core.raster_spill import RasterSpillStore, SpilledLayer, SpilledRaster, json_default
+from vop_interwoven.fakedoc import FakeRevit
+from vop_interwoven.pipeline import process_document_views
+from vop_interwoven.session import PipelineSession
+
+
+SCENE = generate_scene(n_elements=40, link_count=1, n_views=2, occlusion_depth=2, anno_density=0.3, seed=5)
+
+
+def _raster_dict():
+    r = ViewRaster(6, 4, 1.0, Bounds2D(0.0, 0.0, 6.0, 4.0), tile_size=4, cfg=Config())
+    r.try_write_cell(3, 0, 2.5)
+    r.model_edge_key[5] = 7
+    r.anno_key[0] = 2
+    r.anno_over_model[3] = True
+    return r.to_dict()
+
+
+def test_spill_round_trips_to_dict(tmp_path):
+    d = _raster_dict()
+    store = RasterSpillStore(root_dir=str(tmp_path))
+    spilled = store.spill(d, name="view 1/a")
+
+    assert isinstance(spilled, SpilledRaster) and isinstance(spilled["w_occ"], SpilledLayer)
+    assert not spilled["w_occ"].mapped
+    assert spilled["w_occ"][3] == 2.5 and spilled["w_occ"][0] is None
+    assert spilled["model_mask"][3] is True and spilled["anno_key"][1:3] == [-1, -1]
+    assert spilled.to_dict() == d
+    assert json.loads(json.dumps(spilled, default=json_default)) == json.loads(json.dumps(d))
+
+    # Restores through the regular consumer path
+    back = ViewRaster.from_dict(spilled)
+    assert back.to_dict() == d
+    spilled.release()
+    assert not spilled["w_occ"].mapped and list(spilled["model_edge_key"]) == d["model_edge_key"]
+
+    # Same name twice gets distinct files
+    again = store.spill(d, name="view 1/a")
+    assert again["w_occ"].path != spilled["w_occ"].path
+    assert store.stats()["views_spilled"] == 2
+
+
+def test_layers_pickle_as_file_references_and_close_removes_dir(tmp_path):
+    store = RasterSpillStore(root_dir=str(tmp_path))
+    spilled = store.spill(_raster_dict(), name="v")
+    layer = spilled["w_occ"]
+    assert layer[3] == 2.5
+
+    clone = pickle.loads(pickle.dumps(layer))
+    assert len(pickle.dumps(layer)) < 300
+    assert clone.tolist() == layer.tolist()
+    clone.release()
+
+    spill_dir = store.path
+    assert os.path.isdir(spill_dir)
+    store.close()
+    assert not os.path.exists(spill_dir) and not layer.mapped
+
+
+def test_spill_dir_removed_when_last_raster_is_dropped(tmp_path):
+    store = RasterSpillStore(root_dir=str(tmp_path))
+    spilled = store.spill(_raster_dict(), name="v")
+    spill_dir = store.path
+    assert spilled["model_mask"][3] is True
+
+    del store
+    gc.collect()
+    assert os.path.isdir(spill_dir)  # layers keep the store alive
+
+    spilled.release()
+    del spilled
+    gc.collect()
+    assert not os.path.exists(spill_dir)
+
+
+def test_batch_pipeline_spills_identical_rasters(tmp_path):
+    def run(**kw):
+        cfg = Config(retain_rasters_in_memory=True, **kw)
+        cfg.output_dir = str(tmp_path)
+        with FakeRevit(SCENE) as fake:
+            return process_document_views(fake.doc, fake.view_ids, cfg)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        plain = run()
+        spilled = run(raster_spill_enabled=True, raster_spill_dir=str(tmp_path / "spill"))
+
+    rasters = [r for r in spilled if r.get("raster") is not None]
+    assert rasters and all(isinstance(r["raster"], SpilledRaster) for r in rasters)
+    for a, b in zip(plain, spilled):
+        if a.get("raster") is not None:
+            assert b["raster"].to_dict() == a["raster"]
+
+
+def test_streaming_sessions_do_not_spill(tmp_path):
+    cfg = Config(retain_rasters_in_memory=True, raster_spill_enabled=True)
+    cfg.output_dir = str(tmp_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        with FakeRevit(SCENE) as fake:
+            assert PipelineSession(fake.doc, cfg).spill_store is not None
+            assert PipelineSession(fake.doc, cfg, on_view_complete=lambda r: None).spill_store is None
@@ -0,0 +1,94 @@
+import array
+
+import pytest
+
+from vop_interwoven.config import Config
+from vop_interwoven.core.math_utils import Bounds2D
+from vop_interwoven.core.raster import ViewRaster
+from vop_interwoven.core import raster_storage as rs
+
+
+BACKENDS = ["list", "array"] + (["numpy"] if rs.numpy_available() else [])
+
+
+def _raster(backend, w=8, h=6):
+    cfg = Config(raster_backend=backend)
+    return ViewRaster(width=w, height=h, cell_size=1.0, bounds=Bounds2D(0.0, 0.0, w, h), tile_size=4, cfg=cfg)
+
+
+def test_resolve_backend_auto_and_fallback():
+    expected = "numpy" if rs.numpy_available() else "array"
+    assert rs.resolve_backend(None) == expected
+    assert rs.resolve_backend("auto") == expected
+    assert rs.resolve_backend("numpy") == expected
+    assert rs.resolve_backend("array") == "array"
+    assert rs.resolve_backend("list") == "list"
+    with pytest.raises(ValueError):
+        rs.resolve_backend("bogus")
+
+
+def test_array_backend_uses_compact_typecodes():
+    r = _raster("array")
+    assert r.layer_backend == "array"
+    assert isinstance(r.w_occ, array.array) and r.w_occ.typecode == "d"
+    assert r.model_edge_key.typecode == "i"
+    assert r.model_mask.typecode == "b"
+    assert len(r.anno_key) == r.W * r.H
+
+
+def test_config_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        Config(raster_backend="gpu")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_try_write_cell_semantics_identical_across_backends(backend):
+    r = _raster(backend)
+    idx = r.get_cell_index(3, 2)
+
+    assert r.try_write_cell(3, 2, w_depth=5.0, source="HOST") is True
+    assert r.try_write_cell(3, 2, w_depth=9.0, source="LINK") is False
+    assert r.try_write_cell(3, 2, w_depth=1.25, source="LINK", key_index=4) is True
+
+    depth = r.w_occ[idx]
+    assert depth == 1.25
+    assert r.w_occ_key[idx] == 4
+    assert bool(r.occ_link[idx]) and not bool(r.occ_host[idx])
+    assert bool(r.model_mask[idx])
+    assert r.tile.filled_count[0] == 1
+    assert r.tile.w_min_tile[0] == 1.25
+    assert (r.depth_test_wins, r.depth_test_rejects) == (2, 1)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_to_dict_is_plain_lists_and_round_trips(backend):
+    r = _raster(backend)
+    r.try_write_cell(1, 1, w_depth=2.5, source="DWG")
+    r.model_edge_key[r.get_cell_index(2, 2)] = 7
+    r.anno_key[r.get_cell_index(0, 0)] = 0
+
+    d = r.to_dict()
+    for k in ("occ_host", "occ_dwg", "model_mask", "model_edge_key", "anno_key", "anno_over_model"):
+        assert isinstance(d[k], list)
+    assert d["occ_dwg"][r.get_cell_index(1, 1)] is True
+    assert d["model_edge_key"][r.get_cell_index(2, 2)] == 7
+    depths = d["w_occ"]
+    assert depths[r.get_cell_index(1, 1)] == 2.5
+    assert depths[0] is None
+
+    rr = ViewRaster.from_dict(d, cfg=Config(raster_backend=backend))
+    assert rr.layer_backend == r.layer_backend
+    assert rr.to_dict() == d
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_model_present_predicates_return_plain_bools(backend):
+    r = _raster(backend)
+    idx = r.get_cell_index(1, 1)
+    r.model_edge_key[idx] = 0
+    r.model_proxy_mask[idx] = True
+
+    for mode in ("occ", "edge", "proxy", "any"):
+        assert type(r.has_model_present(idx, mode=mode)) is bool
+    assert r.has_model_edge(idx) is True
+    assert r.has_model_edge(r.get_cell_index(0, 0)) is False
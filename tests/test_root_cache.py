@@ -0,0 +1,103 @@
+import contextlib
+import io
+import json
+
+import pytest
+
+from vop_interwoven.config import Config
+from vop_interwoven.root_cache import RootStyleCache, SqliteRootStyleCache, open_root_cache
+
+
+def _quiet():
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _meta(view_id):
+    return {"view_id": view_id, "view_name": "View {0}".format(view_id), "view_type": "FloorPlan"}
+
+
+def test_sqlite_round_trip_and_signature_miss(tmp_path):
+    with _quiet():
+        cache = SqliteRootStyleCache(str(tmp_path), "P", "v1", "cfgA")
+        assert cache.load() is False
+        cache.set_view(7, "sig1", _meta(7), {"model_cells": 12}, timings={"total_ms": 3.0})
+        cache.set_view(7, "sig2", _meta(7), {"model_cells": 13})
+        assert cache.save() is True
+        cache.close()
+
+        reopened = SqliteRootStyleCache(str(tmp_path), "P", "v1", "cfgA")
+        assert reopened.load() is True
+        hit = reopened.get_view(7, "sig2")
+        assert hit["metrics"] == {"model_cells": 13}
+        assert hit["row_payload"]["ViewName"] == "View 7"
+        assert reopened.get_view(7, "sig1") is None
+        assert reopened.get_view(8, "sig2") is None
+        assert reopened.get_view_any(7)["view_signature"] == "sig2"
+
+        stats = reopened.stats()
+    assert (stats["hits"], stats["misses"], stats["cached_views"], stats["backend"]) == (1, 2, 1, "sqlite")
+
+
+def test_sqlite_config_shards_coexist_and_version_invalidates(tmp_path):
+    with _quiet():
+        a = SqliteRootStyleCache(str(tmp_path), "P", "v1", "cfgA")
+        a.set_view(1, "s", _meta(1), {"m": "A"})
+        a.close()
+
+        b = SqliteRootStyleCache(str(tmp_path), "P", "v1", "cfgB")
+        assert b.get_view(1, "s") is None
+        b.set_view(1, "s", _meta(1), {"m": "B"})
+        b.close()
+
+        a = SqliteRootStyleCache(str(tmp_path), "P", "v1", "cfgA")
+        assert a.get_view(1, "s")["metrics"] == {"m": "A"}
+        a.close()
+
+        bumped = SqliteRootStyleCache(str(tmp_path), "P", "v2", "cfgA")
+        assert bumped.load() is False and bumped.invalidations == 1
+        assert bumped.get_view_any(1) is None
+
+
+def test_sqlite_migrates_json_once(tmp_path):
+    with _quiet():
+        legacy = RootStyleCache(str(tmp_path), "P", "v1", "cfgA")
+        legacy.load()
+        for vid in (1, 2, 3):
+            legacy.set_view(vid, "sig{0}".format(vid), _meta(vid), {"model_cells": vid})
+        legacy.save()
+
+        cache = SqliteRootStyleCache(str(tmp_path), "P", "v1", "cfgA")
+        assert cache.load() is True
+        assert cache.get_view(2, "sig2")["metrics"] == {"model_cells": 2}
+        cache.set_view(2, "sig2b", _meta(2), {"model_cells": 20})
+        cache.close()
+
+        # JSON is left in place, but never re-imported over newer rows
+        with open(legacy.cache_path) as f:
+            assert set(json.load(f)["views"]) == {"1", "2", "3"}
+        again = SqliteRootStyleCache(str(tmp_path), "P", "v1", "cfgA")
+        assert again.get_view(2, "sig2b")["metrics"] == {"model_cells": 20}
+        assert again.stats()["cached_views"] == 3
+
+
+def test_sqlite_migration_skips_json_without_config_hash(tmp_path):
+    with _quiet():
+        legacy = RootStyleCache(str(tmp_path), "P", "v1", None)
+        legacy.load()
+        legacy.set_view(1, "sig1", _meta(1), {"model_cells": 1})
+        legacy.save()
+
+        # A hash-less JSON cache must not turn into rows another hash-less cache hits
+        cache = SqliteRootStyleCache(str(tmp_path), "P", "v1", None)
+        assert cache.load() is False
+        assert cache.get_view(1, "sig1") is None
+        assert cache.stats()["cached_views"] == 0
+
+
+def test_open_root_cache_backend_selection(tmp_path):
+    assert type(open_root_cache(str(tmp_path), "P", "v1", "c")) is RootStyleCache
+    assert isinstance(open_root_cache(str(tmp_path), "P", "v1", "c", backend="sqlite"), SqliteRootStyleCache)
+    assert Config(root_cache_backend="SQLite").root_cache_backend == "sqlite"
+    assert "root_cache_backend" not in Config().to_dict()
+    with pytest.raises(ValueError):
+        Config(root_cache_backend="redis")
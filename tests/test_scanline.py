@@ -0,0 +1,87 @@
+import math
+import random
+
+from vop_interwoven.config import Config
+from vop_interwoven.core.math_utils import Bounds2D
+from vop_interwoven.core.raster import ViewRaster
+from vop_interwoven.core import scanline as sl
+
+
+def _legacy_cells(points_ij, W, H):
+    """Reference copy of the pre-span per-cell scanline (set of (i, j))."""
+    out = set()
+    js = [j for _, j in points_ij]
+    for j in range(min(js), max(js) + 1):
+        xs = []
+        for k in range(len(points_ij) - 1):
+            i0, j0 = points_ij[k]
+            i1, j1 = points_ij[k + 1]
+            if j0 == j1:
+                continue
+            if (j0 < j <= j1) or (j1 < j <= j0):
+                t = float(j - j0) / float(j1 - j0)
+                xs.append(float(i0 + t * (i1 - i0)))
+        xs.sort()
+        if len(xs) % 2:
+            continue
+        for k in range(0, len(xs), 2):
+            for i in range(int(math.ceil(xs[k])), int(math.floor(xs[k + 1])) + 1):
+                if 0 <= i < W and 0 <= j < H:
+                    out.add((i, j))
+    return out
+
+
+def _random_ring(rng, W, H, n):
+    pts = [(rng.randrange(W), rng.randrange(H)) for _ in range(n)]
+    return pts + [pts[0]]
+
+
+def test_spans_match_legacy_cells_on_random_polygons():
+    rng = random.Random(1234)
+    for _ in range(300):
+        ring = _random_ring(rng, 24, 18, rng.randint(3, 9))
+        spans = sl.polygon_spans([ring], 24, 18)
+        assert set(sl.iter_span_cells(spans)) == _legacy_cells(ring, 24, 18)
+
+
+def test_outer_minus_holes_matches_set_difference():
+    outer = [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]
+    hole = [(3, 3), (6, 3), (6, 6), (3, 6), (3, 3)]
+    target, o, h = sl.outer_minus_holes_spans([outer], [hole], 12, 12)
+    expected = _legacy_cells(outer, 12, 12) - _legacy_cells(hole, 12, 12)
+    assert set(sl.iter_span_cells(target)) == expected
+    assert sl.span_cell_count(target) == len(expected)
+    assert sl.span_cell_count(o) - sl.span_cell_count(h) == len(expected)
+
+
+def test_nonzero_fills_self_overlap_that_evenodd_leaves_empty():
+    # Two same-orientation squares in one edge table: overlap has winding 2.
+    a = [(0, 0), (6, 0), (6, 6), (0, 6), (0, 0)]
+    b = [(3, 0), (9, 0), (9, 6), (3, 6), (3, 0)]
+    even = set(sl.iter_span_cells(sl.polygon_spans([a, b], 12, 12, sl.FILL_EVENODD)))
+    nonzero = set(sl.iter_span_cells(sl.polygon_spans([a, b], 12, 12, sl.FILL_NONZERO)))
+    assert (4, 3) not in even
+    assert (4, 3) in nonzero
+    assert even < nonzero
+
+
+def test_subtract_and_clip_spans():
+    a = {0: [(0, 10)], 1: [(2, 4)]}
+    b = {0: [(3, 5), (7, 8)], 1: [(0, 10)]}
+    assert sl.subtract_spans(a, b) == {0: [(0, 3), (5, 7), (8, 10)]}
+    assert sl.clip_spans(a, 1, 3, 1, 2) == {1: [(2, 3)]}
+
+
+def test_polygon_to_proxy_respects_model_clip_window():
+    r = ViewRaster(width=10, height=10, cell_size=1.0, bounds=Bounds2D(0.0, 0.0, 10.0, 10.0), cfg=Config())
+    r.model_clip_bounds = Bounds2D(2.0, 2.0, 8.0, 8.0)
+    loops = [{"points": [(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)], "is_hole": False}]
+
+    n = r.rasterize_polygon_to_proxy(loops, key_index=3)
+
+    expected = [(i, j) for j in range(10) for i in range(10)
+                if bool(r.model_proxy_mask[r.get_cell_index(i, j)])]
+    assert n == len(expected) > 0
+    assert all(r._cell_in_model_clip(i, j) for (i, j) in expected)
+    assert r.model_proxy_key[r.get_cell_index(4, 4)] == 3
+    assert r.rasterize_polygon_to_proxy(loops, key_index=3) == 0
@@ -0,0 +1,115 @@
+import contextlib
+import io
+import json
+
+from benchmarks.scene_gen import generate_scene
+from vop_interwoven.config import Config
+from vop_interwoven.core.element_cache import ElementCache
+from vop_interwoven.fakedoc import FakeRevit
+from vop_interwoven.pipeline import process_document_views
+from vop_interwoven.session import PipelineSession
+from vop_interwoven.streaming import process_document_views_streaming
+
+
+SCENE = generate_scene(n_elements=60, link_count=1, n_views=3, occlusion_depth=3, anno_density=0.3, seed=9)
+
+
+def _cfg(tmp_path, **kw):
+    cfg = Config(retain_rasters_in_memory=True, **kw)
+    cfg.output_dir = str(tmp_path)
+    return cfg
+
+
+def _count_element_cache_io(monkeypatch):
+    calls = {"load": 0, "save": 0}
+    orig_load, orig_save = ElementCache.load_from_json.__func__, ElementCache.save_to_json
+
+    def _load(cls, *a, **kw):
+        calls["load"] += 1
+        return orig_load(cls, *a, **kw)
+
+    def _save(self, *a, **kw):
+        calls["save"] += 1
+        return orig_save(self, *a, **kw)
+
+    monkeypatch.setattr(ElementCache, "load_from_json", classmethod(_load))
+    monkeypatch.setattr(ElementCache, "save_to_json", _save)
+    return calls
+
+
+def _raster_json(result):
+    return json.dumps(result["raster"], sort_keys=True, default=str)
+
+
+def test_streaming_session_matches_batch_and_persists_once(tmp_path, monkeypatch):
+    with contextlib.redirect_stdout(io.StringIO()):
+        with FakeRevit(SCENE) as fake:
+            batch = process_document_views(fake.doc, fake.view_ids, _cfg(tmp_path / "batch"))
+
+        calls = _count_element_cache_io(monkeypatch)
+        streamed = []
+        with FakeRevit(SCENE) as fake:
+            summaries = process_document_views_streaming(
+                fake.doc, fake.view_ids, _cfg(tmp_path / "stream"), on_view_complete=streamed.append
+            )
+
+    assert calls == {"load": 1, "save": 1}
+    assert [s["view_id"] for s in summaries] == [r["view_id"] for r in batch]
+    assert all("raster" not in s for s in summaries)
+    for a, b in zip(batch, streamed):
+        if a.get("raster") is not None:
+            assert _raster_json(b) == _raster_json(a)
+
+
+def test_session_caches_stay_warm_and_checkpoint(tmp_path, monkeypatch):
+    calls = _count_element_cache_io(monkeypatch)
+    seen = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        with FakeRevit(SCENE) as fake:
+            session = PipelineSession(fake.doc, _cfg(tmp_path), on_view_complete=seen.append, checkpoint_every=2)
+            elem_cache, snapshot = session.elem_cache, session.snapshot
+            for view_id in fake.view_ids:
+                assert session.render_view(view_id)["success"] is not False
+            assert session.elem_cache is elem_cache and session.snapshot is snapshot
+            assert len(elem_cache.cache) > 0
+            session.finalize()
+            session.finalize()
+
+    assert len(seen) == len(fake.view_ids) == session.views_rendered
+    assert session.checkpoints == 1
+    assert calls == {"load": 1, "save": 2}  # one checkpoint + finalize
+    assert set(session.view_elements) >= {r["view_id"] for r in seen if r.get("view_mode") == "MODEL_AND_ANNOTATION"}
+
+
+def test_private_session_is_finalized_when_the_run_raises(tmp_path, monkeypatch):
+    import os
+
+    import pytest
+
+    from vop_interwoven.core import tracing
+
+    finalized = []
+    orig_finalize = PipelineSession.finalize
+
+    def _finalize(self, diag=None):
+        finalized.append(self)
+        return orig_finalize(self, diag=diag)
+
+    monkeypatch.setattr(PipelineSession, "finalize", _finalize)
+    prev_tracer = tracing.get_tracer()
+
+    def _view_ids(ids):
+        yield ids[0]
+        raise RuntimeError("view list failed")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with FakeRevit(SCENE) as fake:
+            cfg = _cfg(tmp_path, trace_level="info", raster_spill_enabled=True)
+            with pytest.raises(RuntimeError):
+                process_document_views(fake.doc, _view_ids(fake.view_ids), cfg)
+
+    assert len(finalized) == 1
+    session = finalized[0]
+    assert tracing.get_tracer() is prev_tracer
+    assert session.spill_store is not None and session.spill_store.path is None
+    assert os.path.exists(session.trace_path)
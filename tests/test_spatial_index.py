@@ -0,0 +1,91 @@
+import random
+
+from vop_interwoven.core.spatial_index import PointGrid, RectGrid, chain_polylines, dedupe_points, order_points_greedy
+
+
+def _brute_nearest(points, alive, x, y):
+    best, best_d2 = None, float("inf")
+    for idx in sorted(alive):
+        p = points[idx]
+        d2 = (p[0] - x) ** 2 + (p[1] - y) ** 2
+        if d2 < best_d2:
+            best, best_d2 = idx, d2
+    return best
+
+
+def test_nearest_matches_linear_scan_with_ties_and_removal():
+    rng = random.Random(7)
+    # Integer lattice: lots of exact distance ties
+    points = [(float(rng.randint(0, 12)), float(rng.randint(0, 8)), rng.random()) for _ in range(150)]
+    grid = PointGrid(points)
+    alive = set(range(len(points)))
+
+    for _ in range(140):
+        x, y = rng.uniform(-3, 15), rng.uniform(-3, 11)
+        assert grid.nearest(x, y)[0] == _brute_nearest(points, alive, x, y)
+        victim = rng.choice(sorted(alive))
+        grid.remove(victim)
+        alive.discard(victim)
+        assert victim not in grid and len(grid) == len(alive)
+
+
+def test_within_and_max_dist():
+    points = [(0.0, 0.0), (0.5, 0.0), (3.0, 4.0)]
+    grid = PointGrid(points)
+    assert grid.within(0.0, 0.0, 0.5) == [0, 1]
+    assert grid.nearest(3.0, 3.0, max_dist=0.5) == (None, float("inf"))
+    assert grid.nearest(3.0, 3.0, max_dist=1.0)[0] == 2
+
+
+def test_dedupe_and_greedy_order():
+    pts = [(0.0, 0.0, 1.0), (1.0, 0.0, 2.0), (0.0, 0.0, 9.0), (1.0 + 1e-9, 0.0, 3.0), (0.5, 0.0, 4.0)]
+    assert dedupe_points(pts, tol=1e-6) == [pts[0], pts[1], pts[4]]
+    assert order_points_greedy(dedupe_points(pts)) == [pts[0], pts[4], pts[1]]
+
+
+def test_chain_polylines_closes_shuffled_reversed_edges():
+    a, b, c, d = (0.0, 0.0, 1.0), (4.0, 0.0, 1.0), (4.0, 3.0, 2.0), (0.0, 3.0, 2.0)
+    jitter = (4.0 + 5e-7, 3.0, 2.0)
+    edges = [[c, d], [b, a], [jitter, b], [d, (0.0, 1.5, 1.5), a]]
+    closed, open_chains = chain_polylines(edges, tol=1e-6)
+
+    assert open_chains == [] and len(closed) == 1
+    loop = closed[0]
+    assert loop[0] == loop[-1] and len(loop) == 6
+    assert {p[:2] for p in loop} == {(0.0, 0.0), (4.0, 0.0), (4.0, 3.0), (0.0, 3.0), (0.0, 1.5)}
+
+    closed, open_chains = chain_polylines([[a, b], [b, c]], tol=1e-6)
+    assert closed == [] and open_chains == [[c, b, a]]
+
+
+def test_silhouette_edge_chaining_labels_holes():
+    from vop_interwoven.core.silhouette import _chain_edge_loops
+
+    def square(x0, y0, s):
+        q = [(x0, y0, 0.0), (x0 + s, y0, 0.0), (x0 + s, y0 + s, 0.0), (x0, y0 + s, 0.0)]
+        return [[q[k], q[(k + 1) % 4]] for k in range(4)]
+
+    loops = _chain_edge_loops(square(0.0, 0.0, 10.0) + square(3.0, 3.0, 2.0) + square(20.0, 0.0, 1.0))
+    assert sorted(lp["is_hole"] for lp in loops) == [False, False, True]
+
+    # Dangling edge: refuse to guess, caller falls back to point ordering
+    assert _chain_edge_loops(square(0.0, 0.0, 10.0)[:3]) == []
+
+
+def test_rect_grid_matches_brute_force_overlap():
+    rng = random.Random(3)
+    rects = []
+    for _ in range(120):
+        x, y = rng.uniform(0, 100), rng.uniform(0, 100)
+        rects.append((x, y, x + rng.uniform(0, 8), y + rng.uniform(0, 8)))
+    rects.append((-1e9, -1e9, 1e9, 1e9))  # oversize rect lives in the overflow list
+    grid = RectGrid(rects)
+
+    for _ in range(100):
+        x, y = rng.uniform(-10, 110), rng.uniform(-10, 110)
+        q = (x, y, x + rng.uniform(0, 20), y + rng.uniform(0, 20))
+        expected = [k for k, r in enumerate(rects) if r[0] <= q[2] and q[0] <= r[2] and r[1] <= q[3] and q[1] <= r[3]]
+        assert grid.query(*q) == expected
+
+    # Touching edges count as overlap
+    assert RectGrid([(0.0, 0.0, 1.0, 1.0)]).query(1.0, 1.0, 2.0, 2.0) == [0]
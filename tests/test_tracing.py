@@ -0,0 +1,98 @@
+import contextlib
+import io
+import json
+
+import pytest
+
+from benchmarks.scene_gen import generate_scene
+from vop_interwoven.config import Config
+from vop_interwoven.core import tracing
+from vop_interwoven.core.diagnostics import Diagnostics
+from vop_interwoven.fakedoc import FakeRevit
+from vop_interwoven.pipeline import process_document_views
+
+
+SCENE = generate_scene(n_elements=150, link_count=1, n_views=2, occlusion_depth=3, anno_density=0.2, seed=5)
+
+
+class _Unformattable(object):
+    def __format__(self, spec):
+        raise AssertionError("formatted while tracing is off")
+
+
+@pytest.fixture(autouse=True)
+def _no_tracer():
+    prev = tracing.install(None)
+    yield
+    tracing.install(prev)
+
+
+def test_disabled_tracing_is_a_no_op():
+    assert tracing.get_tracer() is None and not tracing.enabled()
+    assert tracing.span("a") is tracing.span("b")
+    with tracing.span("model"):
+        tracing.debug("[DEBUG] {0}", _Unformattable())
+    tracing.count("x")
+    tracing.complete("phase", 0.0, 1.0)
+
+    diag = Diagnostics(debug_enabled=False)
+    diag.debug(phase="p", callsite="c", message="m")
+    diag.debug_dedupe(dedupe_key="k", phase="p", callsite="c", message="m")
+    assert diag.events == [] and diag.counts == {}
+
+
+def test_tracer_records_spans_counters_and_ring_buffer():
+    tracer = tracing.Tracer(level=tracing.LEVEL_DEBUG, capacity=4, echo=False)
+    tracing.install(tracer)
+    with tracing.span("view", cat="view", args={"view_id": 1}):
+        with tracing.span("model"):
+            tracing.count("elements", 3)
+            batches = tracing.batches("elements", size=2)
+            for _ in range(5):
+                batches.tick()
+            batches.close()
+    tracing.debug("[DEBUG] element {0}", 7)
+
+    # 3 batches + model + view + debug message = 6 events, ring keeps newest 4
+    assert tracer.recorded == 6 and len(tracer.events) == 4 and tracer.dropped == 2
+
+    trace = json.loads(json.dumps(tracer.to_chrome_trace()))
+    names = [(e["name"], e["ph"]) for e in trace["traceEvents"]]
+    assert ("model", "X") in names and ("view", "X") in names and ("log", "i") in names
+    assert ("elements", "C") in names
+    assert trace["otherData"] == {"counters": {"elements": 3}, "dropped_events": 2}
+    assert trace["traceEvents"][-2]["args"] == {"msg": "[DEBUG] element 7"}
+
+    with pytest.raises(ValueError):
+        tracing.parse_level("verbose")
+
+
+def _run(tmp_path, level):
+    cfg = Config(element_cache_persist=False, retain_rasters_in_memory=True, trace_level=level)
+    cfg.output_dir = str(tmp_path)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        with FakeRevit(SCENE) as fake:
+            results = process_document_views(fake.doc, fake.view_ids, cfg)
+    return results, out.getvalue()
+
+
+def test_pipeline_trace_export_and_debug_gating(tmp_path):
+    off_results, off_out = _run(tmp_path / "off", "off")
+    assert "[DEBUG" not in off_out and "[diag][raster]" not in off_out
+    assert not (tmp_path / "off" / "vop_trace.json").exists()
+    assert all(e["level"] != "DEBUG" for r in off_results for e in (r.get("diag") or {}).get("events", []))
+
+    info_results, info_out = _run(tmp_path / "info", "info")
+    assert "[DEBUG" not in info_out
+    trace = json.loads((tmp_path / "info" / "vop_trace.json").read_text())
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert sum(1 for e in spans if e["name"] == "view") == len(info_results)
+    assert {"collect", "anno", "model", "export", "elements"} <= {e["name"] for e in spans}
+    rasters = lambda rs: json.dumps([r.get("raster") for r in rs], sort_keys=True, default=str)
+    assert rasters(info_results) == rasters(off_results)
+
+    _, debug_out = _run(tmp_path / "debug", "debug")
+    assert "[DEBUG] Element" in debug_out and "[diag][raster]" in debug_out
+    assert "[DEBUG RASTER] Element" in debug_out
+    assert tracing.get_tracer() is None
@@ -0,0 +1,114 @@
+from vop_interwoven.config import Config
+from vop_interwoven.core.math_utils import Bounds2D
+from vop_interwoven.core.raster import ViewRaster
+from vop_interwoven.core.tri_zbuffer import loop_depth_field, triangulate_polygon
+
+
+def _raster():
+    # 32x32 cells of 1 ft, 8x8 tiles -> 4x4 tiles
+    return ViewRaster(32, 32, 1.0, Bounds2D(0.0, 0.0, 32.0, 32.0), tile_size=8, cfg=Config())
+
+
+def _area(tri, pts):
+    (ax, ay), (bx, by), (cx, cy) = (pts[k] for k in tri)
+    return abs((bx - ax) * (cy - ay) - (cx - ax) * (by - ay)) / 2.0
+
+
+def _ramp(w_at_u0=0.0, slope=1.0):
+    # 0..16 ft square whose depth rises with u (a ramp seen from above)
+    pts = [(0.0, 0.0), (16.0, 0.0), (16.0, 16.0), (0.0, 16.0), (0.0, 0.0)]
+    return [{"points": [(u, v, w_at_u0 + slope * u) for (u, v) in pts], "is_hole": False}]
+
+
+def test_triangulate_concave_polygon_covers_area():
+    l_shape = [(0, 0), (4, 0), (4, 1), (1, 1), (1, 4), (0, 4)]
+    tris = triangulate_polygon(l_shape)
+    assert len(tris) == len(l_shape) - 2
+    assert abs(sum(_area(t, l_shape) for t in tris) - 7.0) < 1e-9
+
+    # Clockwise input and explicit closure are accepted
+    assert len(triangulate_polygon(list(reversed(l_shape)) + [l_shape[-1]])) == 4
+
+
+def test_depth_field_only_in_ambiguous_tiles_and_interpolated():
+    raster = _raster()
+    assert loop_depth_field(_ramp(), raster, set()) is None
+
+    # Tile 1 covers cells i in [8, 16), j in [0, 8)
+    field = loop_depth_field(_ramp(), raster, {1}, floor_w=0.0)
+    cells = [(i, j) for j, row in field.items() for i in row]
+    assert cells and all(raster.tile.get_tile_index(i, j) == 1 for (i, j) in cells)
+
+    # W follows the plane at cell centres
+    assert abs(field[3][10] - 10.5) < 1e-9
+    assert field[3][12] > field[3][10]
+
+
+def test_flat_or_2d_loops_need_no_resolution():
+    raster = _raster()
+    assert loop_depth_field(_ramp(w_at_u0=2.0, slope=0.0), raster, {0, 1, 4, 5}) is None
+    flat_2d = [{"points": [(0.0, 0.0), (8.0, 0.0), (8.0, 8.0)], "is_hole": False}]
+    assert loop_depth_field(flat_2d, raster, {0}) is None
+
+
+def test_resolved_ramp_lets_nearer_slab_win_where_ramp_is_deeper():
+    slab = [{"points": [(0.0, 0.0, 8.0), (16.0, 0.0, 8.0), (16.0, 16.0, 8.0), (0.0, 16.0, 8.0)], "is_hole": False}]
+
+    def render(ambiguous):
+        raster = _raster()
+        ramp = _ramp()
+        field = loop_depth_field(ramp, raster, ambiguous, floor_w=0.0)
+        # Front-to-back by nearest depth: ramp (w from 0) then slab (w = 8)
+        raster.rasterize_silhouette_loops(ramp, 0, depth=0.0, depth_field=field)
+        raster.rasterize_silhouette_loops(slab, 1, depth=8.0)
+        return raster
+
+    def owner(raster, i, j):
+        return int(raster.w_occ_key[raster.get_cell_index(i, j)])
+
+    # Bbox depth only: the ramp's nearest W owns every cell
+    plain = render(set())
+    assert owner(plain, 12, 4) == 0 and owner(plain, 4, 4) == 0
+
+    # Triangle z-buffer in tile 1: the slab is nearer where the ramp is past w = 8
+    resolved = render({1})
+    assert owner(resolved, 12, 4) == 1
+    assert owner(resolved, 4, 4) == 0          # tile 0 keeps the cheap path
+    assert owner(resolved, 12, 12) == 0        # tile 5 not ambiguous either
+
+
+def test_view_volume_culling_follows_cull_outside_view_volume():
+    import contextlib
+    import io
+
+    from benchmarks.scene_gen import generate_scene
+    from vop_interwoven.fakedoc import FakeRevit
+    from vop_interwoven.pipeline import process_document_views
+
+    scene = generate_scene(n_elements=12, link_count=0, n_views=1, occlusion_depth=1, anno_density=0.0, seed=1)
+    # A slab far above the view range: its bbox depth range misses [W0, Wmax]
+    scene["elements"].append({
+        "id": 5000, "category": "OST_Floors", "bench_class": "AREAL",
+        "geometry": [{"type": "box", "min": [5.0, 5.0, 100.0], "max": [20.0, 20.0, 101.0]}],
+    })
+
+    def run(cull):
+        cfg = Config(element_cache_persist=False, retain_rasters_in_memory=True, cull_outside_view_volume=cull)
+        with contextlib.redirect_stdout(io.StringIO()):
+            with FakeRevit(scene) as fake:
+                result = process_document_views(fake.doc, fake.view_ids, cfg)[0]
+        ids = {m.get("elem_id") for m in result["raster"]["element_meta"]}
+        return result["diagnostics"]["skipped_outside_view_volume"], ids
+
+    skipped, ids = run(True)
+    assert skipped == 1 and 5000 not in ids and len(ids) == 12
+
+    # Off (default): no culling, the slab is rendered as at baseline
+    skipped, ids = run(False)
+    assert skipped == 0 and 5000 in ids and len(ids) == 13
+    assert Config().cull_outside_view_volume is False
+    assert Config.from_dict(Config(cull_outside_view_volume=True).to_dict()).cull_outside_view_volume is True
+
+    # The z-buffer flag no longer drives culling
+    cfg = Config(ambiguous_tile_zbuffer=False, cull_outside_view_volume=True)
+    assert cfg.to_dict()["ambiguous_tile_zbuffer"] is False and cfg.to_dict()["cull_outside_view_volume"] is True
@@ -0,0 +1,104 @@
+import contextlib
+import io
+import json
+
+import pytest
+
+from benchmarks.scene_gen import generate_scene
+from vop_interwoven.config import Config
+from vop_interwoven.fakedoc import FakeRevit
+from vop_interwoven.pipeline import (
+    capture_model_draw_list,
+    collect_view_elements,
+    init_view_raster,
+    process_document_views,
+    render_model_front_to_back,
+    replay_model_draw_list,
+)
+from vop_interwoven.view_scheduler import (
+    build_raster,
+    dump_view_job,
+    load_view_job,
+    make_render_pool,
+    render_view_job,
+    snapshot_raster_spec,
+)
+
+
+SCENE = generate_scene(n_elements=80, link_count=1, n_views=2, occlusion_depth=3, anno_density=0.3, seed=4)
+
+
+def _cfg(**kw):
+    return Config(element_cache_persist=False, retain_rasters_in_memory=True, **kw)
+
+
+def _run(cfg):
+    with contextlib.redirect_stdout(io.StringIO()):
+        with FakeRevit(SCENE) as fake:
+            return process_document_views(fake.doc, fake.view_ids, cfg)
+
+
+def _raster_json(raster_dict):
+    return json.dumps(raster_dict, sort_keys=True, default=str)
+
+
+def test_capture_then_replay_matches_interwoven_render():
+    cfg = _cfg()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with FakeRevit(SCENE) as fake:
+            view = fake.doc.GetElement(fake.view_ids[0])
+
+            live = init_view_raster(fake.doc, view, cfg)
+            render_model_front_to_back(fake.doc, view, live, collect_view_elements(fake.doc, view, live, cfg=cfg), cfg)
+
+            capture = init_view_raster(fake.doc, view, cfg)
+            draw_list = capture_model_draw_list(fake.doc, view, capture, collect_view_elements(fake.doc, view, capture, cfg=cfg), cfg)
+
+        # Capture writes no model ink; the draw list is plain data
+        assert not any(capture.model_mask) and capture.element_meta == []
+        draw_list = json.loads(json.dumps(draw_list))
+        assert draw_list["items"] and draw_list["header"]["view_id"] == fake.view_ids[0]
+
+        replayed = build_raster(snapshot_raster_spec(capture), cfg)
+        replay_model_draw_list(replayed, draw_list, cfg)
+
+    assert _raster_json(replayed.to_dict()) == _raster_json(live.to_dict())
+
+
+def test_render_pool_matches_serial_results():
+    serial = _run(_cfg())
+    pooled = _run(_cfg(view_render_workers=2))
+
+    assert [r["view_id"] for r in pooled] == [r["view_id"] for r in serial]
+    for a, b in zip(serial, pooled):
+        assert b.get("success", True) is not False
+        assert _raster_json(b["raster"]) == _raster_json(a["raster"])
+        assert "capture_ms" in b["timings"] and "export_ms" in b["timings"]
+
+
+def test_saved_view_job_replays_offline(tmp_path):
+    from vop_interwoven.revit.view_basis import resolve_view_mode
+    from vop_interwoven.view_scheduler import capture_view_job
+
+    cfg = _cfg()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with FakeRevit(SCENE) as fake:
+            view = fake.doc.GetElement(fake.view_ids[1])
+            raster = init_view_raster(fake.doc, view, cfg)
+            job = capture_view_job(fake.doc, view, raster, cfg, resolve_view_mode(view)[0])
+        dump_view_job(job, str(tmp_path / "view.job"))
+
+        # Revit stand-in is gone: replay needs only the job
+        out = render_view_job(load_view_job(str(tmp_path / "view.job")))
+
+    serial = [r for r in _run(cfg) if r["view_id"] == fake.view_ids[1]][0]
+    assert out["view_id"] == fake.view_ids[1]
+    assert _raster_json(out["raster"]) == _raster_json(serial["raster"])
+
+
+def test_render_pool_selection():
+    assert make_render_pool(Config()) is None
+    assert make_render_pool(Config(view_render_workers=1)) is None
+    assert make_render_pool(Config(view_render_workers=4, export_strategy_diagnostics=True)) is None
+    with pytest.raises(ValueError):
+        Config(view_render_workers=-1)
@@ -0,0 +1,58 @@
+from vop_interwoven.core.cache import LRUCache, WeightedLRUCache, estimate_entry_bytes
+
+
+def _loops(n_points, n_loops=1):
+    return [{"points": [(float(i), 0.0) for i in range(n_points)], "is_hole": False} for _ in range(n_loops)]
+
+
+def test_estimate_scales_with_points_and_loops():
+    obb = estimate_entry_bytes(_loops(4))
+    silhouette = estimate_entry_bytes(_loops(2000, n_loops=3))
+    assert silhouette > 100 * obb
+    assert estimate_entry_bytes({"loops": _loops(4)}) > obb
+    assert estimate_entry_bytes(object()) > 0
+
+
+def test_uniform_cost_and_size_behaves_like_lru():
+    c = WeightedLRUCache(max_items=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1
+    c.set("c", 3)
+    assert c.get("b") is None and c.get("a") == 1 and c.get("c") == 3
+    assert c.evictions == 1
+
+
+def test_byte_budget_evicts_cheap_entries_before_expensive_ones():
+    big = _loops(500)
+    budget = estimate_entry_bytes(big) + 10 * estimate_entry_bytes(_loops(4))
+    c = WeightedLRUCache(max_items=1000, max_bytes=budget)
+
+    c.set("silhouette", big, cost=0.5)
+    for i in range(40):
+        c.set(("obb", i), _loops(4), cost=0.0001)
+
+    assert c.get("silhouette") is big
+    assert c.bytes <= budget and c.evictions > 0
+    assert c.get(("obb", 0)) is None and c.get(("obb", 39)) is not None
+
+
+def test_oversized_entries_are_rejected_and_stats_match_lru_contract():
+    c = WeightedLRUCache(max_items=10, max_bytes=estimate_entry_bytes(_loops(10)))
+    c.set("huge", _loops(1000), cost=1.0)
+    assert c.get("huge") is None and c.rejected == 1 and len(c) == 0
+
+    assert set(LRUCache(4).stats()) <= set(c.stats())
+    disabled = WeightedLRUCache()
+    disabled.set("a", 1)
+    assert disabled.get("a") is None and len(disabled) == 0
+
+
+def test_replacing_a_key_keeps_byte_accounting_exact():
+    c = WeightedLRUCache(max_items=10, max_bytes=10 ** 6)
+    for n in (10, 400, 3):
+        c.set("k", _loops(n), cost=0.01)
+        c.get("k")
+    assert len(c) == 1 and c.bytes == estimate_entry_bytes(_loops(3))
+    c.clear()
+    assert c.bytes == 0 and c.get("k") is None
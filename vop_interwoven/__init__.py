@@ -15,8 +15,16 @@ Modules:
 - core.raster: ViewRaster and TileMap data structures
 - core.geometry: UV classification and proxy generation
 - core.math_utils: Geometric utilities for bounds and rectangles
+- core.tracing: Spans/counters with Chrome trace export (off by default)
+- core.spatial_index: Grid hashes for nearest-point ordering, edge chaining and rect overlap
+- core.tri_zbuffer: Per-cell triangle depths for depth-ambiguous tiles
+- core.raster_spill: Memory-mapped spill store for retained view rasters
 - revit: Revit-specific element collection and view basis extraction
+- revit.link_index: Per-run index of linked documents, transforms and linked proxies
 - pipeline: Main interwoven model pass (ProcessDocumentViews)
+- view_scheduler: Capture/render split and process-pool render phase
+- session: PipelineSession (run-scoped caches, streaming render_view)
+- incremental: Change-driven planner reusing root-cache results for untouched views
 - entry_dynamo: Dynamo entry point for testing
 
 """
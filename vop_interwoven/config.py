@@ -33,6 +33,25 @@ class Config:
         include_linked_rvt (bool): Include elements from linked RVT files (default: True)
         include_dwg_imports (bool): Include elements from DWG/DXF imports (default: True)
         linear_band_thickness_cells (float): Band width for detail/drafting lines in cells (default: 1.0)
+        raster_backend (str): Dense raster layer storage - "auto", "numpy", "array" or "list" (default: "auto")
+        use_document_snapshot (bool): Share one per-run DocumentSnapshot across all views (default: True)
+        use_link_index (bool): Share one per-run LinkIndex (linked documents, transforms, proxies) across views (default: True)
+        areal_cache_max_items (int): Cross-view AREAL extraction cache size; 0 disables (default: 4096)
+        view_render_workers (int): Worker processes for the raster render phase; 0/1 renders in-process (default: 0)
+        root_cache_backend (str): Streaming root cache storage - "json" or "sqlite" (default: "json")
+        streaming_checkpoint_every (int): Persist session caches every N streamed views; 0 = only at the end (default: 0)
+        trace_level (str): Structured tracing - "off", "info" (spans/counters) or "debug" (+ gated debug output) (default: "off")
+        trace_buffer_events (int): Trace ring-buffer capacity in events (default: 65536)
+        trace_path (str): Chrome trace JSON output path; None = <output_dir>/vop_trace.json (default: None)
+        geometry_cache_max_bytes (int): Geometry cache byte budget, cost-weighted eviction; 0 = count bound only (default: 64 MiB)
+        ambiguous_tile_zbuffer (bool): Interpolate AREAL W per cell (triangle z-buffer) inside depth-ambiguous tiles;
+            changes output (default: True)
+        cull_outside_view_volume (bool): Skip elements whose bbox depth range lies outside the view volume [W0, Wmax];
+            changes output (default: False)
+        raster_spill_enabled (bool): Spill retained view rasters to memory-mapped temp files (batch runs) (default: False)
+        raster_spill_dir (str): Parent directory for raster spill files; None = system temp (default: None)
+        incremental_reexport (bool): Skip the signature pass for views no changed element reaches; serve them from the root cache (default: False)
+        incremental_max_elements (int): Capacity of the planner's own fingerprint table; larger documents disable planning (default: 1000000)
 
     Commentary:
         ✔ overModelIncludesProxies controls whether tiny/linear proxies count as "model presence"
@@ -90,6 +109,12 @@ class Config:
         tierb_area_thresh_min=50,
         tierb_area_thresh_max=2000,
 
+        # Phase 4.5: per-cell triangle depths for AREAL loops in ambiguous tiles (changes output)
+        ambiguous_tile_zbuffer=True,
+
+        # View-volume culling by bbox depth range against [W0, Wmax] (changes output)
+        cull_outside_view_volume=False,
+
         # PR11: Collector consolidation / broad-phase performance knobs
         enable_multicategory_filter=True,
         coarse_spatial_filter_enabled=False,
@@ -101,6 +126,8 @@ class Config:
         
         # PR12: Geometry caching (bounded LRU)
         geometry_cache_max_items=2048,
+        # Byte budget for the geometry cache; eviction weighs recompute cost per byte
+        geometry_cache_max_bytes=64 * 1024 * 1024,
         
         # Perf: per-view timings (coarse always; optional sub-step)
         perf_collect_timings=True,
@@ -137,6 +164,48 @@ class Config:
         # True = keep full rasters in memory (needed for streaming exports)
         # False = discard rasters after cache writes (memory efficient)
         retain_rasters_in_memory=False,  # Default True for backward compatibility
+
+        # Dense raster layer storage: "auto" | "numpy" | "array" | "list"
+        # "auto" = numpy when importable, else stdlib array.array
+        raster_backend="auto",
+
+        # Raster spill (core/raster_spill.py): retained rasters of finished views are
+        # written to mmap-backed temp files and reloaded lazily at export time
+        raster_spill_enabled=False,
+        raster_spill_dir=None,
+
+        # Incremental re-export (incremental.py): element changes since the last run
+        # are mapped to views; untouched views skip the signature collector pass
+        incremental_reexport=False,
+        incremental_max_elements=1000000,
+
+        # Per-run document snapshot: one view-scoped collector pass per view,
+        # shared by signature, bounds, collection and annotation phases
+        use_document_snapshot=True,
+
+        # Per-run link index: link instances/transforms, linked proxies and
+        # pre-2024 link-document candidates resolved once, reused by every view
+        use_link_index=True,
+
+        # Cross-view AREAL extraction cache: model-space loops + confidence tier,
+        # keyed by element fingerprint, view direction, detail level and phase
+        areal_cache_max_items=4096,
+
+        # Process-pool render phase: views are captured in-process (Revit) into
+        # draw lists and replayed through ViewRaster by N worker processes
+        view_render_workers=0,
+
+        # Streaming root cache storage: "json" (single file) or "sqlite" (per-row upserts)
+        root_cache_backend="json",
+
+        # Streaming session: periodic cache checkpoints (crash resilience for long runs)
+        streaming_checkpoint_every=0,
+
+        # Structured tracing (core/tracing.py): spans + counters exported as Chrome trace JSON.
+        # "debug" also enables the per-element debug prints and Diagnostics DEBUG events.
+        trace_level="off",
+        trace_buffer_events=65536,
+        trace_path=None,
         
     ):
         """Initialize VOP configuration.
@@ -158,6 +227,23 @@ class Config:
             include_linked_rvt: Include elements from linked RVT files (default: True)
             include_dwg_imports: Include elements from DWG/DXF imports (default: True)
             linear_band_thickness_cells: Band width for detail lines in cells (default: 1.0)
+            raster_backend: Dense raster layer storage ("auto", "numpy", "array", "list")
+            raster_spill_enabled: Spill retained rasters to memory-mapped temp files (default: False)
+            raster_spill_dir: Parent directory for spill files, None = system temp (default: None)
+            incremental_reexport: Plan root-cache reuse from element changes since the last run (default: False)
+            incremental_max_elements: Planner fingerprint table capacity (default: 1000000)
+            use_document_snapshot: Share one per-run DocumentSnapshot across views (default: True)
+            use_link_index: Share one per-run LinkIndex across views (default: True)
+            areal_cache_max_items: Cross-view AREAL extraction cache size, 0 disables (default: 4096)
+            view_render_workers: Render-phase worker processes, 0/1 = in-process (default: 0)
+            root_cache_backend: Streaming root cache storage, "json" or "sqlite" (default: "json")
+            streaming_checkpoint_every: Persist session caches every N streamed views, 0 = at end (default: 0)
+            trace_level: Structured tracing level, "off" | "info" | "debug" (default: "off")
+            trace_buffer_events: Trace ring-buffer capacity in events (default: 65536)
+            trace_path: Chrome trace JSON path, None = <output_dir>/vop_trace.json (default: None)
+            geometry_cache_max_bytes: Geometry cache byte budget, 0 = count bound only (default: 64 MiB)
+            ambiguous_tile_zbuffer: Per-cell triangle depths for AREAL loops in ambiguous tiles (default: True)
+            cull_outside_view_volume: Skip elements whose bbox depth range misses [W0, Wmax] (default: False)
         """
         self.tile_size = int(tile_size)
         self.adaptive_tile_size = bool(adaptive_tile_size)
@@ -190,6 +276,7 @@ class Config:
 
         # PR12: geometry cache
         self.geometry_cache_max_items = int(geometry_cache_max_items) if geometry_cache_max_items is not None else 0
+        self.geometry_cache_max_bytes = int(geometry_cache_max_bytes) if geometry_cache_max_bytes is not None else 0
 
         # Perf: timings
         self.perf_collect_timings = bool(perf_collect_timings)
@@ -210,6 +297,12 @@ class Config:
         self.tierb_area_thresh_min = int(tierb_area_thresh_min)
         self.tierb_area_thresh_max = int(tierb_area_thresh_max)
 
+        # Phase 4.5: selective triangle z-buffer
+        self.ambiguous_tile_zbuffer = bool(ambiguous_tile_zbuffer)
+
+        # View-volume culling
+        self.cull_outside_view_volume = bool(cull_outside_view_volume)
+
         # Tie anno_crop_margin_in to bounds_buffer_in if not specified
         if anno_crop_margin_in is None:
             self.anno_crop_margin_in = self.bounds_buffer_in
@@ -267,6 +360,8 @@ class Config:
         # PR12 validation: 0 disables caching (explicit).
         if self.geometry_cache_max_items < 0:
             raise ValueError("geometry_cache_max_items must be >= 0")
+        if self.geometry_cache_max_bytes < 0:
+            raise ValueError("geometry_cache_max_bytes must be >= 0")
 
         # Persistent view-level cache
         self.view_cache_enabled = view_cache_enabled
@@ -289,6 +384,57 @@ class Config:
 
         # Memory management
         self.retain_rasters_in_memory = bool(retain_rasters_in_memory)
+
+        # Raster layer storage (storage-only; never changes raster contents)
+        self.raster_backend = str(raster_backend or "auto").strip().lower()
+        if self.raster_backend not in ("auto", "numpy", "array", "list"):
+            raise ValueError("raster_backend must be 'auto', 'numpy', 'array' or 'list'")
+
+        # Raster spill (storage-only; spilled layers read back identical values)
+        self.raster_spill_enabled = bool(raster_spill_enabled)
+        self.raster_spill_dir = str(raster_spill_dir) if raster_spill_dir else None
+
+        # Incremental re-export (cache planning only; changed views render as before)
+        self.incremental_reexport = bool(incremental_reexport)
+        self.incremental_max_elements = int(incremental_max_elements)
+        if self.incremental_max_elements < 1:
+            raise ValueError("incremental_max_elements must be >= 1")
+
+        # Collector reuse (never changes which elements are processed)
+        self.use_document_snapshot = bool(use_document_snapshot)
+
+        # Linked-document reuse (same linked elements per view; never changes results)
+        self.use_link_index = bool(use_link_index)
+
+        # AREAL extraction reuse (loops are re-projected per view; identical results when the
+        # view-bound geometry depends only on direction, detail level and phase)
+        self.areal_cache_max_items = int(areal_cache_max_items) if areal_cache_max_items is not None else 0
+        if self.areal_cache_max_items < 0:
+            raise ValueError("areal_cache_max_items must be >= 0")
+
+        # Render-phase scheduling (replay is deterministic; never changes results)
+        self.view_render_workers = int(view_render_workers) if view_render_workers is not None else 0
+        if self.view_render_workers < 0:
+            raise ValueError("view_render_workers must be >= 0")
+
+        # Root cache storage (same cached metrics either way)
+        self.root_cache_backend = str(root_cache_backend or "json").strip().lower()
+        if self.root_cache_backend not in ("json", "sqlite"):
+            raise ValueError("root_cache_backend must be 'json' or 'sqlite'")
+
+        # Streaming checkpoints (persistence cadence only; never changes results)
+        self.streaming_checkpoint_every = int(streaming_checkpoint_every) if streaming_checkpoint_every is not None else 0
+        if self.streaming_checkpoint_every < 0:
+            raise ValueError("streaming_checkpoint_every must be >= 0")
+
+        # Tracing (observability only; never changes results)
+        self.trace_level = str(trace_level or "off").strip().lower()
+        if self.trace_level not in ("off", "info", "debug"):
+            raise ValueError("trace_level must be 'off', 'info' or 'debug'")
+        self.trace_buffer_events = int(trace_buffer_events)
+        if self.trace_buffer_events < 1:
+            raise ValueError("trace_buffer_events must be >= 1")
+        self.trace_path = trace_path
         
     def compute_adaptive_tile_size(self, grid_width, grid_height):
         """Compute optimal tile size based on grid dimensions.
@@ -467,6 +613,9 @@ class Config:
             "include_dwg_imports": self.include_dwg_imports,
             # Detail line rendering
             "linear_band_thickness_cells": self.linear_band_thickness_cells,
+            # Phase 4.5: selective triangle z-buffer
+            "ambiguous_tile_zbuffer": self.ambiguous_tile_zbuffer,
+            "cull_outside_view_volume": self.cull_outside_view_volume,
             # PR11 knobs
             "enable_multicategory_filter": self.enable_multicategory_filter,
             "coarse_spatial_filter_enabled": self.coarse_spatial_filter_enabled,
@@ -516,6 +665,9 @@ class Config:
             include_dwg_imports=d.get("include_dwg_imports", True),
             # Detail line rendering
             linear_band_thickness_cells=d.get("linear_band_thickness_cells", 1.0),
+            # Phase 4.5: selective triangle z-buffer
+            ambiguous_tile_zbuffer=d.get("ambiguous_tile_zbuffer", True),
+            cull_outside_view_volume=d.get("cull_outside_view_volume", False),
             # PR11 knobs
             enable_multicategory_filter=d.get("enable_multicategory_filter", True),
             coarse_spatial_filter_enabled=d.get("coarse_spatial_filter_enabled", False),
@@ -11,8 +11,15 @@ with a clear fallback hierarchy:
 
 The extraction function tracks which strategy succeeded and assigns appropriate
 confidence levels for downstream quality assessment.
+
+ArealExtractionCache lets a run reuse a tier result across views that share the
+same view direction, detail level and phase (e.g. typical floor plans): loops are
+kept in model coordinates and only re-projected through each view's ViewBasis.
 """
 
+from . import tracing
+
+
 def _safe_elem_id(elem):
     """Safely extract element ID as integer.
 
@@ -137,7 +144,256 @@ def _get_aabb_loops_from_bbox(bbox, view_basis):
         return None
 
 
-def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strategy_diag=None):
+# Cross-view reuse: loops are stored in model coordinates and re-projected per view.
+# View directions are quantized so float noise in ViewDirection does not split keys.
+_AREAL_DIR_QUANTUM = 1e-3
+
+# LOW tiers build rectangles in the view's UV frame (AABB/OBB of bbox corners), so their
+# shape also depends on the in-plane orientation (view right vector).
+_ORIENTATION_DEPENDENT_CONFIDENCE = ('LOW',)
+
+
+def _quantize_dir(vec):
+    try:
+        return tuple(int(round(float(c) / _AREAL_DIR_QUANTUM)) for c in vec)
+    except Exception:
+        return None
+
+
+def _view_detail_level(view):
+    try:
+        return int(view.DetailLevel)
+    except Exception:
+        return str(getattr(view, 'DetailLevel', None))
+
+
+def _view_phase_key(view):
+    """(phase id, phase filter id) of a view; None entries where unreadable."""
+    try:
+        from Autodesk.Revit.DB import BuiltInParameter
+    except Exception:
+        return None
+    out = []
+    for name in ("VIEW_PHASE", "VIEW_PHASE_FILTER"):
+        try:
+            p = view.get_Parameter(getattr(BuiltInParameter, name))
+            out.append(p.AsElementId().IntegerValue if p is not None else None)
+        except Exception:
+            out.append(None)
+    return tuple(out)
+
+
+def _round_xyz(p):
+    return (round(float(p.X), 6), round(float(p.Y), 6), round(float(p.Z), 6))
+
+
+def areal_view_signature(view):
+    """Per-view inputs of view-bound host geometry that the direction does not capture.
+
+    Returns (hidden category / subcategory ids, section box, view range), or None
+    when any part is unreadable. Computed once per view; areal_cache_key() refuses
+    to key host elements without it, so an unreadable view never shares loops.
+    """
+    try:
+        from Autodesk.Revit.DB import CategoryType, PlanViewPlane
+    except Exception:
+        return None
+    try:
+        hidden = []
+        for cat in view.Document.Settings.Categories:
+            if cat is None or cat.CategoryType != CategoryType.Model:
+                continue
+            for c in [cat] + list(getattr(cat, 'SubCategories', None) or ()):
+                if view.GetCategoryHidden(c.Id):
+                    hidden.append(c.Id.IntegerValue)
+
+        section_box = None
+        if getattr(view, 'IsSectionBoxActive', False):
+            box = view.GetSectionBox()
+            trf = box.Transform
+            section_box = (_round_xyz(box.Min), _round_xyz(box.Max), _round_xyz(trf.Origin),
+                           _round_xyz(trf.BasisX), _round_xyz(trf.BasisY))
+
+        view_range = None
+        get_range = getattr(view, 'GetViewRange', None)
+        vr = get_range() if get_range is not None else None
+        if vr is not None:
+            view_range = tuple(
+                (vr.GetLevelId(plane).IntegerValue, round(float(vr.GetOffset(plane)), 6))
+                for plane in (PlanViewPlane.CutPlane, PlanViewPlane.TopClipPlane,
+                              PlanViewPlane.BottomClipPlane, PlanViewPlane.ViewDepthPlane)
+            )
+        return (tuple(sorted(hidden)), section_box, view_range)
+    except Exception:
+        return None
+
+
+def _uvw_to_model(p, vb):
+    """Inverse of ViewBasis.transform_to_view_uvw (orthonormal basis)."""
+    u, v = float(p[0]), float(p[1])
+    w = float(p[2]) if len(p) > 2 else 0.0
+    o, r, up, f = vb.origin, vb.right, vb.up, vb.forward
+    return (
+        o[0] + u * r[0] + v * up[0] + w * f[0],
+        o[1] + u * r[1] + v * up[1] + w * f[1],
+        o[2] + u * r[2] + v * up[2] + w * f[2],
+    )
+
+
+def areal_cache_key(elem, elem_id, source_id, view, view_basis, elem_cache=None, view_signature=None):
+    """Build an ArealExtractionCache key, or None if the element cannot be keyed.
+
+    Key: (source_id, elem_id, fingerprint, quantized view direction, detail level,
+    view phase, view signature). The fingerprint comes from ElementCache when
+    available, so an element whose bbox changed never reuses loops extracted for
+    its old geometry.
+
+    Host geometry is fetched with Options.View, so host keys also carry the view
+    inputs that differ between same-direction views: phase / phase filter and
+    view_signature (areal_view_signature(): hidden categories and subcategories,
+    section box, view range). Host elements without a view_signature are not
+    keyed. Linked proxies are fetched without a view and skip both.
+    """
+    try:
+        if elem_id is None:
+            return None
+        from .geometry_handle import _is_linked_proxy
+        if _is_linked_proxy(elem):
+            phase = None
+            view_signature = None
+        elif view_signature is None:
+            return None
+        else:
+            phase = _view_phase_key(view)
+        fingerprint = None
+        if elem_cache is not None:
+            fp = elem_cache.get_or_create_fingerprint(elem, elem_id, source_id=source_id)
+            fingerprint = fp.to_signature_string() if fp is not None else None
+        fwd = _quantize_dir(view_basis.forward)
+        if fwd is None:
+            return None
+        return (str(source_id), int(elem_id), fingerprint, fwd, _view_detail_level(view), phase, view_signature)
+    except Exception:
+        return None
+
+
+class ArealExtractionCache(object):
+    """Run-scoped cache of AREAL extraction results shared across views.
+
+    Stores the tiered extraction result (loops, confidence, strategy) with loop
+    points converted from view UVW to model coordinates. A hit re-projects the
+    points through the requesting view's ViewBasis, so only the projection is
+    per-view work.
+
+    Args:
+        max_items: LRU capacity; <= 0 disables the cache
+
+    Commentary:
+        ✔ Backed by core.cache.LRUCache (bounded, never raises)
+        ✔ 2D loops stay 2D: points are lifted with w=0 and dropped back to (u, v)
+        ✔ LOW-confidence entries also record the view right vector; a view with a
+          different in-plane rotation misses instead of reusing a UV-aligned box
+        ✔ Host keys carry the view's phase and areal_view_signature(), so views
+          that differ in category / subcategory visibility, section box or view
+          range never share loops
+        ⚠ Failed extractions are not cached
+    """
+
+    def __init__(self, max_items=0):
+        from .cache import LRUCache
+
+        self._lru = LRUCache(max_items=max_items)
+        self.orientation_misses = 0
+
+    def __len__(self):
+        return len(self._lru)
+
+    @property
+    def enabled(self):
+        return self._lru.max_items > 0
+
+    def get(self, key, view_basis):
+        """Return (loops_uvw, confidence, strategy) re-projected into view_basis, or None."""
+        if key is None:
+            return None
+        entry = self._lru.get(key, default=None)
+        if entry is None:
+            return None
+        try:
+            right_q = entry.get('right_q')
+            if right_q is not None and right_q != _quantize_dir(view_basis.right):
+                self.orientation_misses += 1
+                return None
+
+            loops = []
+            for loop in entry['loops']:
+                out = dict(loop)
+                dims = out.pop('_dims', 3)
+                pts = [view_basis.transform_to_view_uvw(p) for p in loop['points']]
+                out['points'] = pts if dims == 3 else [(p[0], p[1]) for p in pts]
+                loops.append(out)
+            return (loops, entry['confidence'], entry['strategy'])
+        except Exception:
+            return None
+
+    def set(self, key, view_basis, loops, confidence, strategy):
+        """Store a successful extraction (loops in view_basis UVW)."""
+        if key is None or not loops or confidence is None or not self.enabled:
+            return
+        try:
+            model_loops = []
+            for loop in loops:
+                pts = loop.get('points') or []
+                stored = dict(loop)
+                stored['_dims'] = 3 if (pts and len(pts[0]) > 2) else 2
+                stored['points'] = [_uvw_to_model(p, view_basis) for p in pts]
+                model_loops.append(stored)
+            entry = {
+                'loops': model_loops,
+                'confidence': confidence,
+                'strategy': strategy,
+                'right_q': _quantize_dir(view_basis.right) if confidence in _ORIENTATION_DEPENDENT_CONFIDENCE else None,
+            }
+            self._lru.set(key, entry)
+        except Exception:
+            pass
+
+    def stats(self):
+        out = self._lru.stats()
+        out['orientation_misses'] = self.orientation_misses
+        return out
+
+
+def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strategy_diag=None, cache=None, cache_key=None, handle=None):
+    """Extract AREAL element geometry, reusing results across views when cached.
+
+    Args:
+        elem, view, view_basis, raster, cfg, diag, strategy_diag: see _extract_areal_geometry_tiers
+        cache: Optional ArealExtractionCache (run-scoped)
+        cache_key: Key from areal_cache_key(); None disables lookup for this element
+        handle: Optional GeometryHandle shared with the silhouette fallback path
+
+    Returns:
+        Tuple of (loops, confidence, strategy_name), as _extract_areal_geometry_tiers
+
+    Commentary:
+        ✔ Cache hits return freshly projected loops (callers may mutate them)
+        ⚠ Bypassed while strategy_diag is active so per-view strategy records stay exact
+    """
+    use_cache = cache is not None and cache_key is not None and strategy_diag is None
+    if use_cache:
+        hit = cache.get(cache_key, view_basis)
+        if hit is not None:
+            return hit
+
+    result = _extract_areal_geometry_tiers(elem, view, view_basis, raster, cfg, diag=diag, strategy_diag=strategy_diag, handle=handle)
+
+    if use_cache:
+        cache.set(cache_key, view_basis, *result)
+    return result
+
+
+def _extract_areal_geometry_tiers(elem, view, view_basis, raster, cfg, diag=None, strategy_diag=None, handle=None):
     """Extract AREAL element geometry with confidence-based fallback hierarchy.
 
     Implements a 3-tier fallback strategy:
@@ -153,6 +409,7 @@ def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strat
         cfg: Config object
         diag: Diagnostics instance for error tracking (optional)
         strategy_diag: StrategyDiagnostics instance for strategy tracking (optional)
+        handle: GeometryHandle (optional); Tier 1 strategies share its single fetch
 
     Returns:
         Tuple of (loops, confidence, strategy_name):
@@ -170,6 +427,11 @@ def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strat
     elem_id = _safe_elem_id(elem)
     category = _safe_category(elem)
 
+    # Tier 1A and 1B read the same Medium-detail geometry: fetch it once
+    if handle is None:
+        from .geometry_handle import GeometryHandle
+        handle = GeometryHandle(elem, view)
+
     # ========================================================================
     # TIER 1: HIGH CONFIDENCE - Planar face loops or silhouette edges
     # ========================================================================
@@ -186,9 +448,9 @@ def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strat
         from .silhouette import _front_face_loops_silhouette
 
         # DEBUG: Log Tier 1A attempt
-        print("[DEBUG] Element {} ({}): Tier 1A - Attempting planar_face extraction".format(elem_id, category))
+        tracing.debug("[DEBUG] Element {} ({}): Tier 1A - Attempting planar_face extraction", elem_id, category)
 
-        loops = _front_face_loops_silhouette(elem, view, view_basis, cfg=cfg)
+        loops = _front_face_loops_silhouette(elem, view, view_basis, cfg=cfg, handle=handle)
 
         if loops and len(loops) > 0:
             # Success! Track with strategy_diag if available
@@ -219,16 +481,15 @@ def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strat
                     pass
 
             # DEBUG: Log Tier 1A success
-            print("[DEBUG] Element {} ({}): Tier 1A - planar_face SUCCESS ({} loops)".format(
-                elem_id, category, len(loops)))
+            tracing.debug("[DEBUG] Element {} ({}): Tier 1A - planar_face SUCCESS ({} loops)", elem_id, category, len(loops))
 
             return (loops, 'HIGH', 'planar_face_loops')
         else:
             # DEBUG: Log Tier 1A failure
-            print("[DEBUG] Element {} ({}): Tier 1A - planar_face FAILED (0 loops)".format(elem_id, category))
+            tracing.debug("[DEBUG] Element {} ({}): Tier 1A - planar_face FAILED (0 loops)", elem_id, category)
     except Exception as e:
         # DEBUG: Log Tier 1A exception
-        print("[DEBUG] Element {} ({}): Tier 1A - planar_face EXCEPTION: {}".format(elem_id, category, e))
+        tracing.debug("[DEBUG] Element {} ({}): Tier 1A - planar_face EXCEPTION: {}", elem_id, category, e)
         pass
 
     # Try silhouette edges (preserves concave shapes like L, U, C)
@@ -243,9 +504,9 @@ def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strat
         from .silhouette import _silhouette_edges
 
         # DEBUG: Log Tier 1B attempt
-        print("[DEBUG] Element {} ({}): Tier 1B - Attempting silhouette extraction".format(elem_id, category))
+        tracing.debug("[DEBUG] Element {} ({}): Tier 1B - Attempting silhouette extraction", elem_id, category)
 
-        loops = _silhouette_edges(elem, view, view_basis, cfg)
+        loops = _silhouette_edges(elem, view, view_basis, cfg, handle=handle)
 
         if loops and len(loops) > 0:
             # Success! Track with strategy_diag if available
@@ -276,16 +537,15 @@ def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strat
                     pass
 
             # DEBUG: Log Tier 1B success
-            print("[DEBUG] Element {} ({}): Tier 1B - silhouette SUCCESS ({} loops), confidence=HIGH".format(
-                elem_id, category, len(loops)))
+            tracing.debug("[DEBUG] Element {} ({}): Tier 1B - silhouette SUCCESS ({} loops), confidence=HIGH", elem_id, category, len(loops))
 
             return (loops, 'HIGH', 'silhouette_edges')
         else:
             # DEBUG: Log Tier 1B failure
-            print("[DEBUG] Element {} ({}): Tier 1B - silhouette FAILED (0 loops)".format(elem_id, category))
+            tracing.debug("[DEBUG] Element {} ({}): Tier 1B - silhouette FAILED (0 loops)", elem_id, category)
     except Exception as e:
         # DEBUG: Log Tier 1B exception
-        print("[DEBUG] Element {} ({}): Tier 1B - silhouette EXCEPTION: {}".format(elem_id, category, e))
+        tracing.debug("[DEBUG] Element {} ({}): Tier 1B - silhouette EXCEPTION: {}", elem_id, category, e)
         pass
 
     # Track Tier 1 failure
@@ -311,7 +571,7 @@ def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strat
     # ========================================================================
 
     # DEBUG: Log Tier 2 start
-    print("[DEBUG] Element {} ({}): Tier 2 - Attempting geometry extraction".format(elem_id, category))
+    tracing.debug("[DEBUG] Element {} ({}): Tier 2 - Attempting geometry extraction", elem_id, category)
 
     # Phase 3.1: Record method attempt for geometry_polygon
     if strategy_diag is not None and elem_id is not None:
@@ -354,8 +614,7 @@ def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strat
                 method_name = strategy_name
 
             # DEBUG: Log Tier 2 success
-            print("[DEBUG] Element {} ({}): Tier 2 - {} SUCCESS ({} loops), confidence={}".format(
-                elem_id, category, strategy_name, len(loops), confidence))
+            tracing.debug("[DEBUG] Element {} ({}): Tier 2 - {} SUCCESS ({} loops), confidence={}", elem_id, category, strategy_name, len(loops), confidence)
 
             # Phase 3.1: Record successful extraction method
             if strategy_diag is not None and elem_id is not None:
@@ -374,10 +633,10 @@ def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strat
             return (loops, confidence, strategy_name)
         else:
             # DEBUG: Log Tier 2 failure
-            print("[DEBUG] Element {} ({}): Tier 2 - geometry extraction FAILED (0 loops)".format(elem_id, category))
+            tracing.debug("[DEBUG] Element {} ({}): Tier 2 - geometry extraction FAILED (0 loops)", elem_id, category)
     except Exception as e:
         # DEBUG: Log Tier 2 exception
-        print("[DEBUG] Element {} ({}): Tier 2 - geometry extraction EXCEPTION: {}".format(elem_id, category, e))
+        tracing.debug("[DEBUG] Element {} ({}): Tier 2 - geometry extraction EXCEPTION: {}", elem_id, category, e)
         pass
 
     # ========================================================================
@@ -385,7 +644,7 @@ def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strat
     # ========================================================================
 
     # DEBUG: Log Tier 3 start
-    print("[DEBUG] Element {} ({}): Tier 3 - Attempting AABB from bbox".format(elem_id, category))
+    tracing.debug("[DEBUG] Element {} ({}): Tier 3 - Attempting AABB from bbox", elem_id, category)
 
     # Phase 3.1: Record method attempt for aabb
     if strategy_diag is not None and elem_id is not None:
@@ -409,8 +668,7 @@ def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strat
 
             if loops and len(loops) > 0:
                 # DEBUG: Log Tier 3 success
-                print("[DEBUG] Element {} ({}): Tier 3 - AABB SUCCESS ({} loops), confidence=LOW".format(
-                    elem_id, category, len(loops)))
+                tracing.debug("[DEBUG] Element {} ({}): Tier 3 - AABB SUCCESS ({} loops), confidence=LOW", elem_id, category, len(loops))
 
                 # Track AABB strategy
                 if strategy_diag is not None and elem_id is not None:
@@ -443,13 +701,13 @@ def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strat
                 return (loops, 'LOW', 'aabb_fallback')
             else:
                 # DEBUG: Log Tier 3 failure
-                print("[DEBUG] Element {} ({}): Tier 3 - AABB FAILED (0 loops)".format(elem_id, category))
+                tracing.debug("[DEBUG] Element {} ({}): Tier 3 - AABB FAILED (0 loops)", elem_id, category)
         else:
             # DEBUG: Log no bbox
-            print("[DEBUG] Element {} ({}): Tier 3 - No bbox available".format(elem_id, category))
+            tracing.debug("[DEBUG] Element {} ({}): Tier 3 - No bbox available", elem_id, category)
     except Exception as e:
         # DEBUG: Log Tier 3 exception
-        print("[DEBUG] Element {} ({}): Tier 3 - AABB EXCEPTION: {}".format(elem_id, category, e))
+        tracing.debug("[DEBUG] Element {} ({}): Tier 3 - AABB EXCEPTION: {}", elem_id, category, e)
         pass
 
     # ========================================================================
@@ -457,7 +715,7 @@ def extract_areal_geometry(elem, view, view_basis, raster, cfg, diag=None, strat
     # ========================================================================
 
     # DEBUG: Log total failure
-    print("[DEBUG] Element {} ({}): ALL TIERS FAILED - No extraction strategy succeeded".format(elem_id, category))
+    tracing.debug("[DEBUG] Element {} ({}): ALL TIERS FAILED - No extraction strategy succeeded", elem_id, category)
 
     if strategy_diag is not None and elem_id is not None:
         try:
@@ -8,8 +8,14 @@ Design requirements:
   - LRU eviction semantics
   - Safe under partial failures (cache must never crash the pipeline)
   - Minimal surface area (avoid semantic drift into a "global state" tool)
+
+LRUCache bounds by item count. WeightedLRUCache additionally enforces a byte
+budget and evicts by recompute cost per byte (GreedyDual-Size), so cheap
+4-point OBBs go before multi-thousand-point silhouettes that took a geometry
+fetch to build.
 """
 
+import heapq
 from collections import OrderedDict
 
 
@@ -51,7 +57,8 @@ class LRUCache(object):
             self.misses += 1
             return default
 
-    def set(self, key, value):
+    def set(self, key, value, cost=None):
+        # cost is accepted for WeightedLRUCache compatibility and ignored here.
         if self.max_items <= 0:
             return
         try:
@@ -87,3 +94,172 @@ class LRUCache(object):
             "misses": self.misses,
             "evictions": self.evictions,
         }
+
+
+# Rough CPython footprints for estimate_entry_bytes() (not exact; used for budgeting only)
+_ENTRY_BYTES = 64
+_LOOP_BYTES = 240    # loop dict + its points list
+_POINT_BYTES = 72    # (u, v[, w]) float tuple + list slot
+
+
+def estimate_entry_bytes(value):
+    """Approximate in-memory size of a cached geometry value, in bytes.
+
+    Understands the shapes the pipeline caches: lists of loop dicts with a
+    'points' list, dicts holding 'loops', and plain point tuples. Anything
+    else counts as one small entry.
+    """
+    try:
+        if isinstance(value, dict):
+            if "points" in value:
+                return _LOOP_BYTES + _POINT_BYTES * len(value.get("points") or ())
+            if "loops" in value:
+                return _ENTRY_BYTES + estimate_entry_bytes(value.get("loops") or [])
+            return _ENTRY_BYTES
+        if isinstance(value, (list, tuple)):
+            if value and isinstance(value[0], (int, float)):
+                return _POINT_BYTES
+            return _ENTRY_BYTES + sum(estimate_entry_bytes(v) for v in value)
+    except Exception:
+        pass
+    return _ENTRY_BYTES
+
+
+class WeightedLRUCache(object):
+    """Bounded cache with a byte budget and cost-aware (GreedyDual-Size) eviction.
+
+    Each entry gets priority H = L + cost / size, where cost is the recompute
+    time reported at insert (seconds) and L is the priority of the last
+    evicted entry. Eviction removes the lowest H; a hit refreshes H. With
+    uniform cost and size this degrades to plain LRU.
+
+    Args:
+        max_items: Item bound (<= 0: unbounded by count)
+        max_bytes: Byte budget from estimate_entry_bytes() (<= 0: unbounded by size)
+        default_cost: Cost assumed when set() is called without one (seconds)
+        size_fn: Optional value -> bytes estimator (default: estimate_entry_bytes)
+
+    Notes:
+        - Both bounds <= 0 disables caching (same contract as LRUCache(0)).
+        - Entries larger than max_bytes are not stored (counted as 'rejected').
+        - get/set/stats/len/clear match LRUCache; set() takes an optional cost.
+    """
+
+    def __init__(self, max_items=0, max_bytes=0, default_cost=0.001, size_fn=None):
+        try:
+            self.max_items = int(max_items)
+        except Exception:
+            self.max_items = 0
+        try:
+            self.max_bytes = int(max_bytes)
+        except Exception:
+            self.max_bytes = 0
+        self.default_cost = float(default_cost)
+        self._size_fn = size_fn or estimate_entry_bytes
+
+        self._entries = {}  # key -> [value, size, cost, seq]
+        self._heap = []     # (priority, seq, key); stale rows skipped lazily
+        self._inflation = 0.0
+        self._seq = 0
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejected = 0
+
+    @property
+    def enabled(self):
+        return self.max_items > 0 or self.max_bytes > 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _push(self, key, entry):
+        self._seq += 1
+        entry[3] = self._seq
+        heapq.heappush(self._heap, (self._inflation + entry[2] / float(max(1, entry[1])), self._seq, key))
+        # Compact once stale rows dominate (hits leave their previous row behind)
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [
+                (p, q, k) for (p, q, k) in self._heap
+                if k in self._entries and self._entries[k][3] == q
+            ]
+            heapq.heapify(self._heap)
+
+    def get(self, key, default=None):
+        if not self.enabled:
+            self.misses += 1
+            return default
+        try:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._push(key, entry)
+            return entry[0]
+        except Exception:
+            # Cache must never break callers.
+            self.misses += 1
+            return default
+
+    def set(self, key, value, cost=None):
+        """Store value; cost = seconds it took to compute (default: default_cost)."""
+        if not self.enabled:
+            return
+        try:
+            size = max(1, int(self._size_fn(value)))
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+
+            if self.max_bytes > 0 and size > self.max_bytes:
+                self.rejected += 1
+                return
+
+            cost = self.default_cost if cost is None else max(0.0, float(cost))
+            entry = [value, size, cost, 0]
+            self._entries[key] = entry
+            self.bytes += size
+            self._push(key, entry)
+            self._evict()
+        except Exception:
+            # Never crash on cache writes.
+            pass
+
+    def _over_budget(self):
+        if self.max_items > 0 and len(self._entries) > self.max_items:
+            return True
+        return self.max_bytes > 0 and self.bytes > self.max_bytes
+
+    def _evict(self):
+        while self._heap and self._over_budget():
+            priority, seq, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is None or entry[3] != seq:
+                continue  # stale row
+            del self._entries[key]
+            self.bytes -= entry[1]
+            self._inflation = priority
+            self.evictions += 1
+
+    def clear(self):
+        try:
+            self._entries.clear()
+            self._heap = []
+            self.bytes = 0
+        except Exception:
+            pass
+
+    def stats(self):
+        return {
+            "max_items": self.max_items,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "max_bytes": self.max_bytes,
+            "bytes": self.bytes,
+            "rejected": self.rejected,
+        }
@@ -17,11 +17,15 @@ class Diagnostics(object):
     - No dependency on dataclasses / traceback / __future__
     """
 
-    def __init__(self, max_events=200, capture_traceback=False):
+    def __init__(self, max_events=200, capture_traceback=False, debug_enabled=True):
         # capture_traceback is accepted for API stability but is a no-op in Dynamo-safe mode.
         self.max_events = max_events
         self.capture_traceback = bool(capture_traceback)
 
+        # DEBUG gating: the pipeline passes tracing.enabled(LEVEL_DEBUG) so hot-path
+        # debug()/debug_dedupe() calls cost a single attribute check in production.
+        self.debug_enabled = bool(debug_enabled)
+
         self.events = []
         self.counts = {}
         self.dropped_events = 0
@@ -63,6 +67,8 @@ class Diagnostics(object):
         doc_key=None,
         extra=None,
     ):
+        if not self.debug_enabled:
+            return
         payload = {
             "level": "DEBUG",
             "phase": phase,
@@ -125,6 +131,8 @@ class Diagnostics(object):
 
         This is intended for "optimization disabled; continuing" paths.
         """
+        if not self.debug_enabled:
+            return
         entry = self._dedupe.get(dedupe_key)
         if entry is None:
             payload_extra = dict(extra or {})
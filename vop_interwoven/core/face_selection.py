@@ -8,7 +8,10 @@ Goals:
 
 Key operations:
 1) front-facing planar filter (dot(view_forward, face_normal) < -eps)
-2) group faces by plane (normal + offset tolerance, sign-canonical)
+2) group faces by plane (normal + offset tolerance, sign-canonical), using a
+   tolerance-aware hash over quantized (normal, offset) so grouping is linear
+   in the number of faces; front_facing_plane_groups() does 1) + 2) with one
+   plane extraction per face
 3) select dominant face per plane by projected UV outer-loop area
 4) select top N plane-groups by area with stable ordering + tie-breakers
 
@@ -17,6 +20,8 @@ NOTE: This module intentionally does not import pipeline modules.
 
 from __future__ import annotations
 
+import math
+
 
 # ----------------------------
 # Small math helpers (no numpy)
@@ -113,6 +118,123 @@ def _plane_eq_close(n1, d1, n2, d2, normal_eps, offset_eps):
     return True
 
 
+def _plane_sort_key(nc, dc):
+    """Total-order key for canonical plane params (rounded for ordering only)."""
+    return (round(nc[0], 12), round(nc[1], 12), round(nc[2], 12), round(dc, 8))
+
+
+def _face_plane_entries(faces):
+    """One plane extraction per face.
+
+    Returns:
+        (entries, nonplanar_count); entries are
+        (sort_key, canonical_normal, canonical_d, raw_unit_normal, face) in input order.
+    """
+    entries = []
+    nonplanar = 0
+    for f in (faces or []):
+        n_unit, d = _plane_from_planar_face(f)
+        if n_unit is None:
+            nonplanar += 1
+            continue
+        nx, ny, nz, dc = _canonicalize_plane(n_unit, float(d))
+        nc = (nx, ny, nz)
+        entries.append((_plane_sort_key(nc, dc), nc, float(dc), n_unit, f))
+    return entries, nonplanar
+
+
+def _report_nonplanar(diag, nonplanar, view_id, elem_id, callsite):
+    if not nonplanar or diag is None:
+        return
+    try:
+        dedupe_key = "face_selection.nonplanar|{}|{}".format(view_id, elem_id)
+        diag.debug_dedupe(
+            dedupe_key=dedupe_key,
+            phase="face_selection",
+            callsite=callsite + ".nonplanar",
+            message="Non-planar faces encountered; ignored for planar front-face selection",
+            view_id=view_id,
+            elem_id=elem_id,
+            extra={"nonplanar_count": int(nonplanar)},
+        )
+    except Exception:
+        pass
+
+
+class _PlaneHash(object):
+    """Spatial hash over (nx, ny, nz, d) with cells no smaller than the match tolerance.
+
+    Two planes that pass _plane_eq_close() differ by at most `tn` per normal
+    component (for |n1 - n2|, or |n1 + n2| when the normals are antiparallel)
+    and by at most `td` in offset, so probing the cells overlapped by
+    [x - tol, x + tol] per axis (for n and -n) finds every candidate.
+    """
+
+    def __init__(self, normal_eps, offset_eps):
+        # |n1 - n2|^2 = 2 (1 - n1.n2) for unit normals; pad for float rounding
+        self.tn = math.sqrt(2.0 * max(float(normal_eps), 0.0) + 1e-14) * 1.01 + 1e-12
+        self.td = max(float(offset_eps), 0.0) * (1.0 + 1e-9) + 1e-12
+        self._buckets = {}
+
+    def _cells(self, x, tol):
+        return range(int(math.floor((x - tol) / tol)), int(math.floor((x + tol) / tol)) + 1)
+
+    def add(self, idx, n, d):
+        tn = self.tn
+        key = (
+            int(math.floor(n[0] / tn)),
+            int(math.floor(n[1] / tn)),
+            int(math.floor(n[2] / tn)),
+            int(math.floor(d / self.td)),
+        )
+        self._buckets.setdefault(key, []).append(idx)
+
+    def candidates(self, n, d):
+        """Sorted group indices that may match plane (n, d)."""
+        tn = self.tn
+        buckets = self._buckets
+        out = set()
+        d_cells = self._cells(d, self.td)
+        for sgn in (1.0, -1.0):
+            xs = self._cells(sgn * n[0], tn)
+            ys = self._cells(sgn * n[1], tn)
+            zs = self._cells(sgn * n[2], tn)
+            for ix in xs:
+                for iy in ys:
+                    for iz in zs:
+                        for idd in d_cells:
+                            hit = buckets.get((ix, iy, iz, idd))
+                            if hit:
+                                out.update(hit)
+        return sorted(out)
+
+
+def _group_sorted_entries(entries, normal_eps, offset_eps):
+    """Group entries (already in sort-key order); first matching group wins."""
+    groups = []
+    index = _PlaneHash(normal_eps, offset_eps)
+    for _sk, n, d, _raw, f in entries:
+        placed = False
+        for gi in index.candidates(n, d):
+            g = groups[gi]
+            gn = (g["plane"][0], g["plane"][1], g["plane"][2])
+            gd = g["plane"][3]
+            if _plane_eq_close(gn, gd, n, d, normal_eps=normal_eps, offset_eps=offset_eps):
+                g["faces"].append(f)
+                placed = True
+                break
+        if not placed:
+            index.add(len(groups), n, d)
+            groups.append(
+                {
+                    "plane": (float(n[0]), float(n[1]), float(n[2]), float(d)),
+                    "faces": [f],
+                    "rep": f,
+                }
+            )
+    return groups
+
+
 def signed_polygon_area_2d(poly_uv):
     """
     Shoelace formula; positive for CCW.
@@ -167,41 +289,24 @@ def iter_front_facing_planar_faces(
         eps: float
         diag: Diagnostics (optional)
     """
-    vf = _normalize(_to_xyz_tuple(view_forward))
-    nonplanar = 0
+    entries = _front_facing_entries(faces, view_forward, eps, diag, view_id, elem_id, callsite)
+    for e in entries:
+        yield e[4]
 
-    candidates = []
-    for f in (faces or []):
-        n_unit, d = _plane_from_planar_face(f)
-        if n_unit is None:
-            nonplanar += 1
-            continue
 
-        # front-facing: dot(n, vf) < -eps
-        if _dot(n_unit, vf) < -float(eps):
-            # stable key based on canonical plane params (rounded for total order only)
-            nx, ny, nz, dc = _canonicalize_plane(n_unit, float(d))
-            sort_key = (round(nx, 12), round(ny, 12), round(nz, 12), round(dc, 8))
-            candidates.append((sort_key, f))
+def _front_facing_entries(faces, view_forward, eps, diag, view_id, elem_id, callsite):
+    """Front-facing plane entries sorted by canonical plane key (stable)."""
+    vf = _normalize(_to_xyz_tuple(view_forward))
+    entries, nonplanar = _face_plane_entries(faces)
+
+    # front-facing: dot(n, vf) < -eps
+    neg_eps = -float(eps)
+    front = [e for e in entries if _dot(e[3], vf) < neg_eps]
 
-    if nonplanar and diag is not None:
-        try:
-            dedupe_key = "face_selection.nonplanar|{}|{}".format(view_id, elem_id)
-            diag.debug_dedupe(
-                dedupe_key=dedupe_key,
-                phase="face_selection",
-                callsite=callsite + ".nonplanar",
-                message="Non-planar faces encountered; ignored for planar front-face selection",
-                view_id=view_id,
-                elem_id=elem_id,
-                extra={"nonplanar_count": int(nonplanar)},
-            )
-        except Exception:
-            pass
+    _report_nonplanar(diag, nonplanar, view_id, elem_id, callsite)
 
-    candidates.sort(key=lambda t: t[0])
-    for _k, f in candidates:
-        yield f
+    front.sort(key=lambda t: t[0])
+    return front
 
 
 def group_faces_by_plane(
@@ -224,37 +329,29 @@ def group_faces_by_plane(
               "rep": face,               # representative face
             }
     """
-    entries = []
-    for f in (faces or []):
-        n_unit, d = _plane_from_planar_face(f)
-        if n_unit is None:
-            continue
-        nx, ny, nz, dc = _canonicalize_plane(n_unit, float(d))
-        sort_key = (round(nx, 12), round(ny, 12), round(nz, 12), round(dc, 8))
-        entries.append((sort_key, (nx, ny, nz), float(dc), f))
-
+    entries, _nonplanar = _face_plane_entries(faces)
     entries.sort(key=lambda t: t[0])
+    return _group_sorted_entries(entries, normal_eps, offset_eps)
 
-    groups = []
-    for _sk, n, d, f in entries:
-        placed = False
-        for g in groups:
-            gn = (g["plane"][0], g["plane"][1], g["plane"][2])
-            gd = g["plane"][3]
-            if _plane_eq_close(gn, gd, n, d, normal_eps=normal_eps, offset_eps=offset_eps):
-                g["faces"].append(f)
-                placed = True
-                break
-        if not placed:
-            groups.append(
-                {
-                    "plane": (float(n[0]), float(n[1]), float(n[2]), float(d)),
-                    "faces": [f],
-                    "rep": f,
-                }
-            )
 
-    return groups
+def front_facing_plane_groups(
+    faces,
+    view_forward,
+    eps=1e-6,
+    normal_eps=1e-6,
+    offset_eps=1e-4,
+    diag=None,
+    *,
+    view_id=None,
+    elem_id=None,
+    callsite="face_selection.front_facing_plane_groups",
+):
+    """
+    group_faces_by_plane(list(iter_front_facing_planar_faces(...))) with one
+    plane extraction per face (same groups, same order).
+    """
+    entries = _front_facing_entries(faces, view_forward, eps, diag, view_id, elem_id, callsite)
+    return _group_sorted_entries(entries, normal_eps, offset_eps)
 
 
 def projected_outer_loop_area_uv(
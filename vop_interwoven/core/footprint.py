@@ -9,6 +9,11 @@ class CellRectFootprint:
         r = self.rect
         return tile_map.get_tiles_for_rect(r.i_min, r.j_min, r.i_max, r.j_max)
 
+    def tile_rect(self, tile_map):
+        """Inclusive tile-index rect (ti_min, tj_min, ti_max, tj_max) for hi-Z queries."""
+        r = self.rect
+        return tile_map.tile_rect_for_cells(r.i_min, r.j_min, r.i_max, r.j_max)
+
     def cells(self):
         return self.rect.cells()
         
@@ -34,6 +39,12 @@ class HullFootprint:
             self.u_max, self.v_max
         )
 
+    def tile_rect(self, tile_map):
+        return tile_map.tile_rect_for_cells(
+            self.u_min, self.v_min,
+            self.u_max, self.v_max
+        )
+
     def cells(self):
         # simple even-odd scanline fill
         hull = self.hull
@@ -0,0 +1,204 @@
+"""
+Fetch-once element geometry for silhouette extraction.
+
+Silhouette and AREAL strategies used to call ``elem.get_Geometry(Options())``
+independently, and get_element_silhouette fetched faces up front even when the
+result was already cached or a bbox-only strategy won. A GeometryHandle wraps
+one element (in one view) and materializes each Options profile at most once,
+on first use:
+
+    solid      Medium detail, visible objects, view-bound for host elements
+               (planar faces, front-face loops, silhouette edges)
+    symbolic   Fine detail, view-bound for host elements (family symbolic curves)
+    cad        Fine detail incl. non-visible objects, no view (import curves)
+    cad_view   as cad, view-bound (import curve fallback)
+
+Example:
+    >>> handle = GeometryHandle(elem, view)
+    >>> faces = handle.faces()          # first call fetches 'solid' geometry
+    >>> solids = handle.solids()        # memoized, no second fetch
+
+Commentary:
+    ✔ Lazy: constructing a handle never touches the Revit API
+    ✔ Failures are memoized as None (a profile is attempted once)
+    ✔ Linked proxies (objects exposing .transform) are fetched without a view, so
+      handle_for(registry=...) shares their handles across views
+    ⚠ Callers must treat returned geometry/solids/faces as read-only
+"""
+
+
+PROFILE_SOLID = "solid"
+PROFILE_SYMBOLIC = "symbolic"
+PROFILE_CAD = "cad"
+PROFILE_CAD_VIEW = "cad_view"
+
+_PROFILES = (PROFILE_SOLID, PROFILE_SYMBOLIC, PROFILE_CAD, PROFILE_CAD_VIEW)
+
+
+def _is_linked_proxy(elem):
+    # Same rule as the strategies: never set opts.View for linked elements
+    return hasattr(elem, "transform")
+
+
+def _unwrap(elem):
+    try:
+        inner = getattr(elem, "element", None)
+        return inner if inner is not None else elem
+    except Exception:
+        return elem
+
+
+class GeometryHandle(object):
+    """Lazily fetched, memoized geometry for one element.
+
+    Args:
+        elem: Revit Element or LinkedElementProxy
+        view: Revit View used for view-bound profiles (host elements only)
+
+    Attributes:
+        fetch_count: number of get_Geometry calls issued through this handle
+    """
+
+    __slots__ = ("elem", "view", "fetch_count", "_geom", "_solids", "_faces")
+
+    def __init__(self, elem, view):
+        self.elem = elem
+        self.view = view
+        self.fetch_count = 0
+        self._geom = {}
+        self._solids = None
+        self._faces = None
+
+    def _options(self, profile):
+        from Autodesk.Revit.DB import Options, ViewDetailLevel
+
+        opts = Options()
+        opts.ComputeReferences = False
+        if profile in (PROFILE_CAD, PROFILE_CAD_VIEW):
+            # Imports can hide curve primitives unless this is True in some cases
+            try:
+                opts.IncludeNonVisibleObjects = True
+            except Exception:
+                pass
+        else:
+            opts.IncludeNonVisibleObjects = False
+
+        try:
+            opts.DetailLevel = ViewDetailLevel.Medium if profile == PROFILE_SOLID else ViewDetailLevel.Fine
+        except Exception:
+            pass
+
+        if profile == PROFILE_CAD_VIEW:
+            bind_view = True
+        elif profile == PROFILE_CAD:
+            bind_view = False
+        else:
+            bind_view = not _is_linked_proxy(self.elem)
+        if bind_view:
+            try:
+                opts.View = self.view
+            except Exception:
+                pass
+        return opts
+
+    def geometry(self, profile=PROFILE_SOLID):
+        """GeometryElement for `profile` (fetched on first call), or None."""
+        if profile in self._geom:
+            return self._geom[profile]
+        if profile not in _PROFILES:
+            raise ValueError("Unknown geometry profile: {0!r}".format(profile))
+
+        geom = None
+        try:
+            opts = self._options(profile)
+            # Solid profile fetches through the (possibly proxied) element, the
+            # curve profiles through the underlying DB element, as before.
+            target = self.elem if profile == PROFILE_SOLID else _unwrap(self.elem)
+            if hasattr(target, "get_Geometry"):
+                self.fetch_count += 1
+                geom = target.get_Geometry(opts)
+        except Exception:
+            geom = None
+        self._geom[profile] = geom
+        return geom
+
+    def rebind_view(self, view):
+        """Point a handle at another view, dropping view-bound profiles.
+
+        For linked proxies only cad_view is view-bound; every other profile is
+        fetched without a view and stays valid.
+        """
+        if view is self.view:
+            return
+        self.view = view
+        self._geom.pop(PROFILE_CAD_VIEW, None)
+        if not _is_linked_proxy(self.elem):
+            self._geom.clear()
+            self._solids = None
+            self._faces = None
+
+    def solids(self):
+        """Solids (recursing into instances) of the solid profile, memoized."""
+        if self._solids is None:
+            from .silhouette import _iter_solids
+
+            try:
+                self._solids = list(_iter_solids(self.geometry(PROFILE_SOLID)))
+            except Exception:
+                self._solids = []
+        return self._solids
+
+    def faces(self):
+        """All faces of solids(), memoized (PlanarFace filtering is left to callers)."""
+        if self._faces is None:
+            faces = []
+            for solid in self.solids():
+                try:
+                    solid_faces = getattr(solid, "Faces", None)
+                except Exception:
+                    solid_faces = None
+                if not solid_faces:
+                    continue
+                try:
+                    for f in solid_faces:
+                        if f is not None:
+                            faces.append(f)
+                except Exception:
+                    continue
+            self._faces = faces
+        return self._faces
+
+
+def handle_for(elem, view, registry=None):
+    """Return a GeometryHandle for elem, shared through `registry` when possible.
+
+    Host elements get a fresh handle (their solid/symbolic profiles are view-bound,
+    so one handle serves every strategy for that element in this view pass).
+    Linked proxies are fetched without a view, so their handles are shared across
+    views through `registry`.
+
+    Args:
+        elem: Revit Element or LinkedElementProxy
+        view: Revit View
+        registry: Optional run-scoped cache with get(key, default)/set(key, value)
+            (e.g. core.cache.LRUCache)
+
+    Returns:
+        GeometryHandle (never None)
+    """
+    if registry is None or not _is_linked_proxy(elem):
+        return GeometryHandle(elem, view)
+    try:
+        elem_id = getattr(getattr(elem, "Id", None), "IntegerValue", None)
+        if elem_id is None:
+            return GeometryHandle(elem, view)
+        key = (str(getattr(elem, "source_id", "LINK")), int(elem_id))
+        handle = registry.get(key, None)
+        if handle is None:
+            handle = GeometryHandle(elem, view)
+            registry.set(key, handle)
+        else:
+            handle.rebind_view(view)
+        return handle
+    except Exception:
+        return GeometryHandle(elem, view)
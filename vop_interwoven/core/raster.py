@@ -5,6 +5,43 @@ Provides ViewRaster and TileMap classes for tracking occlusion state,
 depth buffers, and edge/annotation layers per view.
 """
 
+from . import tracing
+from .raster_storage import (
+    LAYER_BOOL,
+    LAYER_FLOAT,
+    LAYER_INT,
+    coerce_layer,
+    count_equal,
+    fill_range,
+    layer_to_list,
+    make_layer,
+    resolve_backend,
+)
+from .scanline import (
+    clip_spans,
+    iter_span_cells,
+    polygon_spans,
+    span_cell_count,
+    subtract_spans,
+    union_spans,
+)
+
+# Dense per-cell layers and their storage kinds (see raster_storage).
+_DENSE_LAYER_KINDS = (
+    ("w_occ", LAYER_FLOAT),
+    ("w_occ_key", LAYER_INT),
+    ("occ_host", LAYER_BOOL),
+    ("occ_link", LAYER_BOOL),
+    ("occ_dwg", LAYER_BOOL),
+    ("model_mask", LAYER_BOOL),
+    ("model_edge_key", LAYER_INT),
+    ("model_proxy_key", LAYER_INT),
+    ("model_proxy_mask", LAYER_BOOL),
+    ("anno_key", LAYER_INT),
+    ("anno_over_model", LAYER_BOOL),
+)
+
+
 def _extract_source_type(doc_key):
     """Extract simple source type from doc_key.
 
@@ -45,6 +82,9 @@ def _cell_in_model_clip(self, i, j):
 class TileMap:
     """Tile-based spatial acceleration structure for early-out occlusion testing.
 
+    Maintains a hierarchical-Z pyramid (hiz_levels) over the tiles so element
+    occlusion can be proven in O(log n) via hiz_rect_occluded().
+
     Attributes:
         tile_size: Size of each tile in cells (e.g., 16x16)
         tiles_x, tiles_y: Number of tiles in X and Y dimensions
@@ -61,6 +101,8 @@ class TileMap:
         5
     """
 
+    HIZ_FANOUT = 4
+
     def __init__(self, tile_size, width, height):
         """Initialize tile map.
 
@@ -77,7 +119,22 @@ class TileMap:
         # Per-tile statistics for early-out testing
         self.filled_count = [0] * num_tiles  # Count of filled cells in tile
         self.w_min_tile = [float("inf")] * num_tiles
-        self.w_max_tile = [float("-inf")] * num_tiles  # Minimum W-depth in tile (view-space depth)
+        self.w_max_tile = [float("-inf")] * num_tiles  # Maximum W-depth in tile (view-space depth)
+
+        # Hierarchical-Z (hi-Z) pyramid of occluder depths, HIZ_FANOUT x HIZ_FANOUT
+        # children per node. Level 0 holds one value per tile: w_max_tile when the
+        # tile is full, +inf otherwise. Each parent holds the max of its children,
+        # so a node value < elem_min_w proves every tile under it is full and nearer.
+        self.hiz_levels = []
+        self.hiz_dims = []
+        nx, ny = self.tiles_x, self.tiles_y
+        while True:
+            self.hiz_levels.append([float("inf")] * (nx * ny))
+            self.hiz_dims.append((nx, ny))
+            if nx <= 1 and ny <= 1:
+                break
+            nx = (nx + self.HIZ_FANOUT - 1) // self.HIZ_FANOUT
+            ny = (ny + self.HIZ_FANOUT - 1) // self.HIZ_FANOUT
 
     def get_tile_index(self, cell_i, cell_j):
         """Get tile index for cell (i, j).
@@ -114,6 +171,11 @@ class TileMap:
                     tiles.append(tj * self.tiles_x + ti)
         return tiles
 
+    def tile_rect_for_cells(self, i_min, j_min, i_max, j_max):
+        """Inclusive tile-index rect covering a cell rect (same tiles as get_tiles_for_rect)."""
+        ts = self.tile_size
+        return (i_min // ts, j_min // ts, i_max // ts, j_max // ts)
+
     def is_tile_full(self, tile_idx):
         """Check if tile is completely filled.
 
@@ -136,6 +198,7 @@ class TileMap:
         tile_idx = self.get_tile_index(cell_i, cell_j)
         if 0 <= tile_idx < len(self.filled_count):
             self.filled_count[tile_idx] += increment
+            self._hiz_update(tile_idx)
 
     def update_w_min(self, cell_i, cell_j, depth):
         """Update minimum W-depth for tile containing cell.
@@ -146,10 +209,90 @@ class TileMap:
         """
         tile_idx = self.get_tile_index(cell_i, cell_j)
         if 0 <= tile_idx < len(self.w_min_tile):
-            if depth < self.w_min_tile[tile_idx]:
-                self.w_min_tile[tile_idx] = depth
-            if depth > self.w_max_tile[tile_idx]:
-                self.w_max_tile[tile_idx] = depth
+            self.update_tile(tile_idx, depth)
+
+    def update_tile(self, tile_idx, depth, filled_increment=0):
+        """Fold a written depth (and newly filled cells) into one tile's stats.
+
+        Bulk writers (ViewRaster.try_write_span) call this once per tile touched.
+
+        Args:
+            tile_idx: Tile index
+            depth: W-depth written into the tile
+            filled_increment: Number of previously-empty cells now filled
+        """
+        if not (0 <= tile_idx < len(self.w_min_tile)):
+            return
+        if depth < self.w_min_tile[tile_idx]:
+            self.w_min_tile[tile_idx] = depth
+        if depth > self.w_max_tile[tile_idx]:
+            self.w_max_tile[tile_idx] = depth
+        if filled_increment:
+            self.filled_count[tile_idx] += filled_increment
+        self._hiz_update(tile_idx)
+
+    def _hiz_update(self, tile_idx):
+        """Recompute the hi-Z value of a tile and propagate changes to the root."""
+        inf = float("inf")
+        v = self.w_max_tile[tile_idx] if self.is_tile_full(tile_idx) else inf
+        level0 = self.hiz_levels[0]
+        if level0[tile_idx] == v:
+            return
+        level0[tile_idx] = v
+
+        f = self.HIZ_FANOUT
+        x = tile_idx % self.tiles_x
+        y = tile_idx // self.tiles_x
+        for lvl in range(1, len(self.hiz_levels)):
+            cnx, cny = self.hiz_dims[lvl - 1]
+            child = self.hiz_levels[lvl - 1]
+            x //= f
+            y //= f
+
+            # Parent = max over existing children (missing border children are ignored)
+            m = float("-inf")
+            for cy in range(y * f, min(cny, y * f + f)):
+                row = cy * cnx
+                for cx in range(x * f, min(cnx, x * f + f)):
+                    c = child[row + cx]
+                    if c > m:
+                        m = c
+
+            nx = self.hiz_dims[lvl][0]
+            node = self.hiz_levels[lvl]
+            if node[y * nx + x] == m:
+                return
+            node[y * nx + x] = m
+
+    def hiz_rect_occluded(self, ti_min, tj_min, ti_max, tj_max, elem_min_w):
+        """Conservative O(log n) occlusion test for a tile rectangle (inclusive).
+
+        Walks up the pyramid to the lowest level where the rect is covered by at
+        most 2x2 nodes and checks those nodes. A True result guarantees every
+        tile in the rect is full and has w_max_tile < elem_min_w; False only
+        means the pyramid could not prove it (callers fall back to the tile walk).
+        """
+        ti_min = max(0, ti_min)
+        tj_min = max(0, tj_min)
+        ti_max = min(self.tiles_x - 1, ti_max)
+        tj_max = min(self.tiles_y - 1, tj_max)
+        if ti_max < ti_min or tj_max < tj_min:
+            return False
+
+        f = self.HIZ_FANOUT
+        for lvl, (nx, _ny) in enumerate(self.hiz_dims):
+            if (ti_max - ti_min) <= 1 and (tj_max - tj_min) <= 1:
+                node = self.hiz_levels[lvl]
+                for y in range(tj_min, tj_max + 1):
+                    for x in range(ti_min, ti_max + 1):
+                        if not (node[y * nx + x] < elem_min_w):
+                            return False
+                return True
+            ti_min //= f
+            tj_min //= f
+            ti_max //= f
+            tj_max //= f
+        return False
 
 def _fix_loop_points_uv(points_uv, tol_ft):
     """Merge consecutive points closer than tol_ft (UV space, feet).
@@ -190,6 +333,10 @@ class ViewRaster:
     Stores all occlusion state, depth buffers, edge layers, and annotation
     data for one Revit view.
 
+    Dense [W*H] layers are allocated through core.raster_storage on the
+    backend selected by cfg.raster_backend (numpy / array.array / list).
+    Every backend supports the same indexing API.
+
     Attributes:
         W, H: Raster dimensions in cells
         cell_size_ft: Cell size in model units (feet)
@@ -262,6 +409,40 @@ class ViewRaster:
             (b.ymin + half) <= v <= (b.ymax - half)
         )
 
+    def _model_clip_window(self):
+        """Half-open cell window (i0, i1, j0, j1) equivalent to _cell_in_model_clip.
+
+        The clip predicate is separable (u depends only on i, v only on j), so
+        evaluating it once per column and once per row yields the exact same
+        cell set as the per-cell test, in O(W + H) instead of O(W * H).
+        """
+        clip = getattr(self, "model_clip_bounds", None)
+        if clip is None:
+            return (0, self.W, 0, self.H)
+
+        # model_clip_bounds is assigned after construction; cache per bounds object.
+        cached = getattr(self, "_clip_window_cache", None)
+        if cached is not None and cached[0] is clip:
+            return cached[1]
+        window = self._compute_model_clip_window(clip)
+        self._clip_window_cache = (clip, window)
+        return window
+
+    def _compute_model_clip_window(self, b):
+        # Cell centers are monotonic in i / j, so the passing columns and rows are contiguous.
+        half = 0.5 * self.cell_size_ft
+        cols = [
+            i for i in range(self.W)
+            if (b.xmin + half) <= (self.bounds_xy.xmin + (i + 0.5) * self.cell_size_ft) <= (b.xmax - half)
+        ]
+        rows = [
+            j for j in range(self.H)
+            if (b.ymin + half) <= (self.bounds_xy.ymin + (j + 0.5) * self.cell_size_ft) <= (b.ymax - half)
+        ]
+        if not cols or not rows:
+            return (0, 0, 0, 0)
+        return (cols[0], cols[-1] + 1, rows[0], rows[-1] + 1)
+
     def rasterize_open_polylines(self, polylines, key_index, depth=0.0, source="HOST"):
         """Rasterize OPEN polyline paths as edges only (no interior fill).
 
@@ -330,6 +511,12 @@ class ViewRaster:
             for k in range(len(pts_ij) - 1):
                 i0, j0 = pts_ij[k]
                 i1, j1 = pts_ij[k + 1]
+
+                # Occluding cells are batched into same-row runs and committed via
+                # try_write_span. Bresenham cells of one segment are distinct, so
+                # deferring the writes to the end of a run cannot change any w_here.
+                run = None  # [row, i_lo, i_hi, i_last]
+
                 for (ii, jj) in _bresenham_line(i0, j0, i1, j1):
 
                     # MODEL CLIP GUARD — open polyline stamping
@@ -358,12 +545,22 @@ class ViewRaster:
                         else:
                             self.stamp_model_edge_idx(idx, key_index, depth=depth)
 
-                            # Contribute to occlusion along the curve using try_write_cell
+                            # Contribute to occlusion along the curve (bulk try_write_cell)
                             # This ensures DWG curves participate in depth testing
                             if depth < w_here:
-                                self.try_write_cell(ii, jj, w_depth=depth, source=source)
+                                if run is not None and run[0] == jj and abs(ii - run[3]) == 1:
+                                    run[1] = min(run[1], ii)
+                                    run[2] = max(run[2], ii)
+                                    run[3] = ii
+                                else:
+                                    if run is not None:
+                                        self.try_write_span(run[0], run[1], run[2] + 1, depth, source=source)
+                                    run = [jj, ii, ii, ii]
                     filled += 1
 
+                if run is not None:
+                    self.try_write_span(run[0], run[1], run[2] + 1, depth, source=source)
+
         return filled
     
     def __init__(self, width, height, cell_size, bounds, tile_size=16, cfg=None):
@@ -387,33 +584,37 @@ class ViewRaster:
 
         N = self.W * self.H
 
+        # Dense layer storage backend ("numpy" | "array" | "list"); see raster_storage.
+        self.layer_backend = resolve_backend(getattr(cfg, "raster_backend", None))
+        backend = self.layer_backend
+
         # Global per-cell occlusion depth buffer (W-depth from view-space UVW)
-        self.w_occ = [float("inf")] * N
+        self.w_occ = make_layer(LAYER_FLOAT, N, float("inf"), backend)
 
         # Track which key_index last won the w_occ depth test (for debugging occlusion ownership).
-        self.w_occ_key = [-1] * N
+        self.w_occ_key = make_layer(LAYER_INT, N, -1, backend)
 
         # Tile acceleration
         self.tile = TileMap(tile_size, self.W, self.H)
 
         # Per-source occupancy layers (depth-tested)
-        self.occ_host = [False] * N
-        self.occ_link = [False] * N
-        self.occ_dwg = [False] * N
+        self.occ_host = make_layer(LAYER_BOOL, N, False, backend)
+        self.occ_link = make_layer(LAYER_BOOL, N, False, backend)
+        self.occ_dwg = make_layer(LAYER_BOOL, N, False, backend)
 
         # Legacy model presence (unified, for backward compatibility)
-        self.model_mask = [False] * N
+        self.model_mask = make_layer(LAYER_BOOL, N, False, backend)
 
         # Edge rasters
-        self.model_edge_key = [-1] * N
-        self.model_proxy_key = [-1] * N
+        self.model_edge_key = make_layer(LAYER_INT, N, -1, backend)
+        self.model_proxy_key = make_layer(LAYER_INT, N, -1, backend)
 
         # Proxy presence (optional)
-        self.model_proxy_mask = [False] * N
+        self.model_proxy_mask = make_layer(LAYER_BOOL, N, False, backend)
 
         # Annotation
-        self.anno_key = [-1] * N
-        self.anno_over_model = [False] * N
+        self.anno_key = make_layer(LAYER_INT, N, -1, backend)
+        self.anno_over_model = make_layer(LAYER_BOOL, N, False, backend)
 
         # Metadata tracking
         self.element_meta_index_by_key = {}
@@ -497,7 +698,7 @@ class ViewRaster:
 
     def has_model_edge(self, idx):
         """True if a visible model edge label is present at idx."""
-        return (0 <= idx < len(self.model_edge_key)) and (self.model_edge_key[idx] != -1)
+        return (0 <= idx < len(self.model_edge_key)) and bool(self.model_edge_key[idx] != -1)
 
     def has_model_proxy(self, idx):
         """True if proxy presence is present at idx."""
@@ -619,6 +820,138 @@ class ViewRaster:
         self.depth_test_rejects += 1
         return False
 
+    def try_write_span(self, j, x0, x1, w_depth, source="HOST", tie_breaker_eps=0.0, key_index=None):
+        """Bulk depth-tested write of the half-open row span [x0, x1) at row j.
+
+        Per-cell semantics are identical to calling try_write_cell() for every
+        cell in the span (same depth test, tie-breaker, occupancy layers and
+        attribution), but:
+          - bounds and model clip are applied once to the whole span
+          - the depth comparison runs over the span at once (numpy mask when
+            the layers are numpy-backed, a tight loop otherwise)
+          - TileMap filled_count / w_min_tile / w_max_tile are updated once per
+            tile touched instead of once per cell
+
+        Args:
+            j: Cell row index
+            x0, x1: Half-open column range
+            w_depth: W-depth for every cell in the span
+            source: Source identifier ("HOST", "LINK", or "DWG")
+            tie_breaker_eps: Same meaning as in try_write_cell
+            key_index: Optional element metadata index for attribution (PR8)
+
+        Returns:
+            Number of cells where depth won and the cell was updated
+        """
+        if not (0 <= j < self.H):
+            return 0
+        x0 = max(0, int(x0))
+        x1 = min(self.W, int(x1))
+
+        # MODEL CLIP GUARD (span form of _cell_in_model_clip)
+        if source in ("HOST", "LINK", "DWG") and self.model_clip_bounds is not None:
+            ci0, ci1, cj0, cj1 = self._model_clip_window()
+            if not (cj0 <= j < cj1):
+                return 0
+            x0 = max(x0, ci0)
+            x1 = min(x1, ci1)
+
+        n = x1 - x0
+        if n <= 0:
+            return 0
+
+        self.depth_test_attempted += n
+
+        eps = float(tie_breaker_eps or 0.0)
+        try:
+            key = int(key_index) if key_index is not None else -1
+        except Exception:
+            key = -1
+        is_host = source == "HOST"
+        is_link = source == "LINK"
+        is_dwg = source == "DWG"
+
+        base = j * self.W
+        a = base + x0
+        b = base + x1
+        tile = self.tile
+        ts = tile.tile_size
+        tile_row = (j // ts) * tile.tiles_x
+        inf = float("inf")
+
+        # Per-tile (first column, win count, newly-filled count)
+        tile_hits = []
+        won = 0
+
+        if self.layer_backend == "numpy":
+            seg = self.w_occ[a:b]
+            win = seg > w_depth
+            if eps > 0.0:
+                win |= abs(seg - float(w_depth)) <= eps
+            newly = win & (seg == inf)
+
+            if win.any():
+                seg[win] = w_depth
+                self.w_occ_key[a:b][win] = key
+                self.model_mask[a:b][win] = True
+                self.occ_host[a:b][win] = is_host
+                self.occ_link[a:b][win] = is_link
+                self.occ_dwg[a:b][win] = is_dwg
+
+                c0 = x0
+                while c0 < x1:
+                    c1 = min(x1, (c0 // ts + 1) * ts)
+                    w_n = int(win[c0 - x0:c1 - x0].sum())
+                    if w_n:
+                        tile_hits.append((c0, w_n, int(newly[c0 - x0:c1 - x0].sum())))
+                        won += w_n
+                    c0 = c1
+        else:
+            w_occ = self.w_occ
+            w_occ_key = self.w_occ_key
+            model_mask = self.model_mask
+            occ_host = self.occ_host
+            occ_link = self.occ_link
+            occ_dwg = self.occ_dwg
+
+            c0 = x0
+            while c0 < x1:
+                c1 = min(x1, (c0 // ts + 1) * ts)
+                w_n = 0
+                f_n = 0
+                for idx in range(base + c0, base + c1):
+                    occ = w_occ[idx]
+                    if (w_depth < occ) or (eps > 0.0 and abs(float(w_depth) - float(occ)) <= eps):
+                        if occ == inf:
+                            f_n += 1
+                        w_occ[idx] = w_depth
+                        w_occ_key[idx] = key
+                        model_mask[idx] = True
+                        occ_host[idx] = is_host
+                        occ_link[idx] = is_link
+                        occ_dwg[idx] = is_dwg
+                        w_n += 1
+                if w_n:
+                    tile_hits.append((c0, w_n, f_n))
+                    won += w_n
+                c0 = c1
+
+        # Tile statistics: once per touched tile
+        for (c0, _w_n, f_n) in tile_hits:
+            tile.update_tile(tile_row + c0 // ts, w_depth, filled_increment=f_n)
+
+        # PR8 attribution (best-effort; never throws)
+        if won and key_index is not None:
+            try:
+                if 0 <= key_index < len(self.element_meta):
+                    self.element_meta[key_index]["occlusion_cells"] += won
+            except Exception:
+                pass
+
+        self.depth_test_wins += won
+        self.depth_test_rejects += n - won
+        return won
+
     def get_or_create_element_meta_index(self, elem_id, category, source_id, source_type="HOST", source_label=None):
         """Get or create metadata index for element.
 
@@ -701,15 +1034,18 @@ class ViewRaster:
             self.anno_over_model[i] = has_anno and has_model
 
         # DIAG: model vs anno occupancy counts (helps catch "frame rectangles")
+        if not tracing.enabled(tracing.LEVEL_DEBUG):
+            return
         try:
             n_model_occ = sum(1 for b in self.model_mask if bool(b))
             n_model_edge = sum(1 for k in self.model_edge_key if k != -1)
             n_model_proxy = sum(1 for k in self.model_proxy_key if k != -1)
             n_anno = sum(1 for k in self.anno_key if k != -1)
             n_overlap = sum(1 for b in self.anno_over_model if b)
-            print("[diag][raster] model_occ={0} model_edge={1} model_proxy={2} anno={3} overlap={4} W={5} H={6}".format(
+            tracing.debug(
+                "[diag][raster] model_occ={0} model_edge={1} model_proxy={2} anno={3} overlap={4} W={5} H={6}",
                 n_model_occ, n_model_edge, n_model_proxy, n_anno, n_overlap, self.W, self.H
-            ))
+            )
         except Exception:
             pass
 
@@ -877,9 +1213,9 @@ class ViewRaster:
 
         filled_count = 0
 
-        # Collect fill cells for outers and holes
-        outer_cells = set()
-        hole_cells = set()
+        # Collect fill spans for outers and holes
+        outer_spans = {}
+        hole_spans = {}
 
         for loop in loops:
             points_uv = loop.get("points", [])
@@ -951,38 +1287,38 @@ class ViewRaster:
             if len(points_ij) < 4:
                 continue
 
-            # Get interior cells using scanline algorithm
-            cells = self._scanline_cells(points_ij)
-            if cells:
+            # Get interior row spans using scanline algorithm
+            spans = self._scanline_spans(points_ij)
+            if spans:
                 if is_hole:
-                    hole_cells |= cells
+                    hole_spans = union_spans(hole_spans, spans)
                 else:
-                    outer_cells |= cells
+                    outer_spans = union_spans(outer_spans, spans)
 
-        # Compute target cells (outer minus holes)
-        target_cells = outer_cells - hole_cells
+        # Compute target spans (outer minus holes)
+        target_spans = subtract_spans(outer_spans, hole_spans)
 
-        if not target_cells:
+        if not target_spans:
             return 0
 
-        # Write to model_proxy_key WITHOUT updating w_occ
-        for (i, j) in target_cells:
-            # Apply model clip guard
-            if source in ("HOST", "LINK", "DWG") and (not self._cell_in_model_clip(i, j)):
-                continue
+        # Apply model clip guard to whole spans (same cells as _cell_in_model_clip)
+        if source in ("HOST", "LINK", "DWG"):
+            i0, i1, j0, j1 = self._model_clip_window()
+            target_spans = clip_spans(target_spans, i0, i1, j0, j1)
 
-            idx = self.get_cell_index(i, j)
-            if idx is None:
-                continue
+        # Write to model_proxy_key WITHOUT updating w_occ (one slice write per span)
+        for j, row in target_spans.items():
+            base = j * self.W
+            for (x0, x1) in row:
+                a = base + x0
+                b = base + x1
 
-            # Write to proxy layer (no occlusion check, no w_occ write)
-            if 0 <= idx < len(self.model_proxy_key):
-                if self.model_proxy_key[idx] != key_index:
-                    self.model_proxy_key[idx] = key_index
-                    filled_count += 1
+                # Count only cells whose proxy key actually changes
+                filled_count += (x1 - x0) - count_equal(self.model_proxy_key, a, b, key_index)
+                fill_range(self.model_proxy_key, a, b, key_index)
 
                 # Mark proxy presence
-                self.model_proxy_mask[idx] = True
+                fill_range(self.model_proxy_mask, a, b, True)
 
         return filled_count
 
@@ -1129,7 +1465,7 @@ class ViewRaster:
 
         return stamped
 
-    def rasterize_silhouette_loops(self, loops, key_index, depth=0.0, source="HOST", occlude_edges=False):
+    def rasterize_silhouette_loops(self, loops, key_index, depth=0.0, source="HOST", occlude_edges=False, depth_field=None):
         """Rasterize element silhouette loops into model layers with depth testing.
 
         Transactional semantics:
@@ -1139,14 +1475,17 @@ class ViewRaster:
 
         If occlude_edges=True, edge cells also write to occlusion (w_occ/model_mask)
         via try_write_cell, so perimeters participate in occlusion.
+
+        depth_field ({j: {i: w}}, see core.tri_zbuffer.loop_depth_field) overrides
+        `depth` per cell; cells not in the field keep the constant-depth span write.
         """
 
         if not loops:
             return 0
 
-        # Collect fill cells for outers and holes (no writes yet)
-        outer_cells = set()
-        hole_cells = set()
+        # Collect fill spans for outers and holes (no writes yet)
+        outer_spans = {}
+        hole_spans = {}
 
         # Keep edge point chains for later edge stamping (only if commit succeeds)
         edge_chains = []
@@ -1221,82 +1560,78 @@ class ViewRaster:
             if len(points_ij) < 4:
                 continue
 
-            # Collect interior cells
-            cells = self._scanline_cells(points_ij)
-            if cells:
+            # Collect interior row spans
+            spans = self._scanline_spans(points_ij)
+            if spans:
                 if is_hole:
-                    hole_cells |= cells
+                    hole_spans = union_spans(hole_spans, spans)
                 else:
-                    outer_cells |= cells
+                    outer_spans = union_spans(outer_spans, spans)
 
             # Preserve edge chain for possible stamping after commit
             edge_chains.append((points_ij, is_hole))
 
         # Commit: outer minus holes
-        target_cells = outer_cells - hole_cells
-        
+        target_spans = subtract_spans(outer_spans, hole_spans)
+        n_target = span_cell_count(target_spans)
+
         # TEMP DEBUG: identify element for this silhouette fill
-        try:
-            meta = None
-            em = getattr(self, "element_meta", None)
-            if isinstance(em, dict):
-                meta = em.get(key_index)
-            elif isinstance(em, list):
-                if 0 <= int(key_index) < len(em):
-                    meta = em[int(key_index)]
-            elem_id_dbg = meta.get("elem_id") if isinstance(meta, dict) else None
-            cat_dbg = meta.get("category") if isinstance(meta, dict) else None
-        except Exception:
-            elem_id_dbg = None
-            cat_dbg = None
+        trace_debug = tracing.enabled(tracing.LEVEL_DEBUG)
+        if trace_debug:
+            try:
+                meta = None
+                em = getattr(self, "element_meta", None)
+                if isinstance(em, dict):
+                    meta = em.get(key_index)
+                elif isinstance(em, list):
+                    if 0 <= int(key_index) < len(em):
+                        meta = em[int(key_index)]
+                elem_id_dbg = meta.get("elem_id") if isinstance(meta, dict) else None
+                cat_dbg = meta.get("category") if isinstance(meta, dict) else None
+            except Exception:
+                elem_id_dbg = None
+                cat_dbg = None
 
-        print(
-            "thin_runner: [DEBUG] silhouette cells elem={} cat='{}' key_index={} target={} outer={} holes={}".format(
-                elem_id_dbg, cat_dbg, key_index, len(target_cells), len(outer_cells), len(hole_cells)
+            tracing.debug(
+                "thin_runner: [DEBUG] silhouette cells elem={} cat='{}' key_index={} target={} outer={} holes={}",
+                elem_id_dbg, cat_dbg, key_index, n_target, span_cell_count(outer_spans), span_cell_count(hole_spans)
             )
-        )
 
 
-        if not target_cells:
+        if not target_spans:
             return 0
 
+        # Mirror try_write_cell's clip guard on whole spans so we can count it
+        # without changing try_write_cell.
+        write_spans = target_spans
+        if source in ("HOST", "LINK", "DWG"):
+            ci0, ci1, cj0, cj1 = self._model_clip_window()
+            write_spans = clip_spans(target_spans, ci0, ci1, cj0, cj1)
+
         # TEMP DEBUG: classify why try_write_cell rejects (clip vs depth)
-        _clip_rejects = 0
+        _clip_rejects = n_target - span_cell_count(write_spans)
         _depth_rejects = 0
 
         filled = 0
-        for (i, j) in target_cells:
-            # Mirror try_write_cell's clip guard so we can count it without changing try_write_cell.
-            if source in ("HOST", "LINK", "DWG") and (not self._cell_in_model_clip(i, j)):
-                _clip_rejects += 1
-                continue
-
-            idx = self.get_cell_index(i, j)
-            if idx is None:
-                _clip_rejects += 1
-                continue
-
-            # Depth pre-check must match try_write_cell tie-break behavior.
-            occ = self.w_occ[idx]
-            eps = 1e-6
-
-            if not ((depth < occ) or (abs(float(depth) - float(occ)) <= eps)):
-                _depth_rejects += 1
-                continue
-
-            if self.try_write_cell(i, j, w_depth=depth, source=source, tie_breaker_eps=eps, key_index=key_index):
-                filled += 1
-            else:
-                # Keep attribution (depth/tie or other guard inside try_write_cell)
-                _depth_rejects += 1
+        eps = 1e-6
+        for j, row in write_spans.items():
+            row_w = depth_field.get(j) if depth_field else None
+            for (x0, x1) in row:
+                # Bulk depth test; tie-break behavior matches try_write_cell(eps).
+                if row_w:
+                    won = self._write_span_resolved(j, x0, x1, depth, row_w, source, eps, key_index)
+                else:
+                    won = self.try_write_span(j, x0, x1, depth, source=source, tie_breaker_eps=eps, key_index=key_index)
+                filled += won
+                _depth_rejects += (x1 - x0) - won
 
         # TEMP DEBUG: if silhouette is fully depth-rejected, identify which existing element(s)
         # own the w_occ cells inside this polygon.
-        if filled == 0 and len(target_cells) > 0:
+        if trace_debug and filled == 0 and n_target > 0:
             try:
                 counts = {}
                 samples = 0
-                for (i, j) in target_cells:
+                for (i, j) in iter_span_cells(target_spans):
                     idx = self.get_cell_index(i, j)
                     if idx is None:
                         continue
@@ -1334,17 +1669,17 @@ class ViewRaster:
                         }
                     )
 
-                print(f"thin_runner: [DEBUG] silhouette occluders top={top_pretty} samples={samples}")
+                tracing.debug("thin_runner: [DEBUG] silhouette occluders top={} samples={}", top_pretty, samples)
 
                 try:
                     depths = []
-                    for (i, j) in target_cells:
+                    for (i, j) in iter_span_cells(target_spans):
                         idx = self.get_cell_index(i, j)
                         if idx is None:
                             continue
                         depths.append(float(self.w_occ[idx]))
                     if depths:
-                        print(f"thin_runner: [DEBUG] silhouette w_occ in target: min={min(depths)} max={max(depths)} floor_depth={depth}")
+                        tracing.debug("thin_runner: [DEBUG] silhouette w_occ in target: min={} max={} floor_depth={}", min(depths), max(depths), depth)
                 except Exception:
                     pass
 
@@ -1363,89 +1698,57 @@ class ViewRaster:
                         if idx is None:
                             continue
 
+                        w_edge = depth
+                        if depth_field:
+                            w_edge = depth_field.get(j, {}).get(i, depth)
+
                         # Optional: make the perimeter participate in occlusion too.
                         if occlude_edges:
                             try:
-                                self.try_write_cell(i, j, w_depth=depth, source=source, key_index=key_index)
+                                self.try_write_cell(i, j, w_depth=w_edge, source=source, key_index=key_index)
                             except Exception:
                                 pass
 
-                        self.stamp_model_edge_idx(idx, key_index, depth=depth)
+                        self.stamp_model_edge_idx(idx, key_index, depth=w_edge)
 
         return filled
 
+    def _write_span_resolved(self, j, x0, x1, depth, row_w, source, eps, key_index):
+        """try_write_span over [x0, x1) with per-cell W from row_w ({i: w}) where present."""
+        won = 0
+        run0 = x0
+        for i in range(x0, x1):
+            w = row_w.get(i)
+            if w is None:
+                continue
+            if run0 < i:
+                won += self.try_write_span(j, run0, i, depth, source=source, tie_breaker_eps=eps, key_index=key_index)
+            if self.try_write_cell(i, j, w, source=source, tie_breaker_eps=eps, key_index=key_index):
+                won += 1
+            run0 = i + 1
+        if run0 < x1:
+            won += self.try_write_span(j, run0, x1, depth, source=source, tie_breaker_eps=eps, key_index=key_index)
+        return won
+
+    def _scanline_spans(self, points_ij):
+        """Return interior row spans {j: [(i0, i1), ...]} for a polygon (no writes).
+
+        Spans are half-open and clipped to the raster. Coverage is identical to
+        the legacy per-cell scanline (half-open edge rule, ceil/floor interval
+        ends, odd scanlines skipped). points_ij is expected to be CLOSED
+        (last == first). Never raises.
+        """
+        if not points_ij or len(points_ij) < 4:
+            return {}
+        return polygon_spans([points_ij], self.W, self.H)
+
     def _scanline_cells(self, points_ij):
         """Return set of interior (i,j) cells for polygon using scanline (no writes).
 
-        points_ij is expected to be CLOSED (last == first). Never raises.
+        Compatibility wrapper over _scanline_spans(); hot paths consume spans
+        directly. points_ij is expected to be CLOSED (last == first). Never raises.
         """
-        try:
-            if not points_ij or len(points_ij) < 4:
-                return set()
-
-            # Ensure closure
-            if points_ij[0] != points_ij[-1]:
-                points_ij = list(points_ij) + [points_ij[0]]
-
-            # Vertical extent
-            j_coords = [j for i, j in points_ij]
-            j_min = min(j_coords)
-            j_max = max(j_coords)
-
-            filled = set()
-
-            for j in range(j_min, j_max + 1):
-                intersections = []
-
-                for k in range(len(points_ij) - 1):
-                    i0, j0 = points_ij[k]
-                    i1, j1 = points_ij[k + 1]
-
-                    # Skip horizontal edges
-                    if j0 == j1:
-                        continue
-
-                    # Half-open rule to avoid double-counting shared vertices:
-                    # Count intersection when the scanline crosses an edge with j strictly above one endpoint.
-                    if (j0 < j <= j1) or (j1 < j <= j0):
-                        try:
-                            t = float(j - j0) / float(j1 - j0)
-                        except Exception:
-                            continue
-                        i_intersect = float(i0 + t * (i1 - i0))
-                        intersections.append(i_intersect)
-
-                intersections.sort()
-
-                # If odd, skip this scanline (should be rare once half-open rule is applied)
-                if len(intersections) % 2 != 0:
-                    continue
-
-                for k in range(0, len(intersections), 2):
-                    # Use ceil on left, floor on right to avoid over-filling concave notches
-                    try:
-                        import math
-                        x_left = float(intersections[k])
-                        x_right = float(intersections[k + 1])
-                    except Exception:
-                        continue
-
-                    if x_right < x_left:
-                        x_left, x_right = x_right, x_left
-
-                    i_start = int(math.ceil(x_left))
-                    i_end = int(math.floor(x_right))
-
-                    if i_end < i_start:
-                        continue
-
-                    for i in range(i_start, i_end + 1):
-                        if self._is_valid_cell(i, j):
-                            filled.add((i, j))
-
-            return filled
-        except Exception:
-            return set()
+        return set(iter_span_cells(self._scanline_spans(points_ij)))
 
     def _scanline_fill(self, points_ij, key_index, depth, source):
         """Fill polygon interior using scanline algorithm with depth testing.
@@ -1460,70 +1763,21 @@ class ViewRaster:
             Number of cells filled
 
         Commentary:
-            - Uses try_write_cell for depth-tested occlusion
+            - Uses try_write_span (bulk try_write_cell) for depth-tested occlusion
             - Sets w_occ and per-source occupancy for OCCLUSION (interior blocks visibility)
             - Does NOT set model_edge_key (only boundary marks occupancy)
         """
         if len(points_ij) < 3:
             return 0
 
-        filled = 0
-
-        # Find vertical extent
-        j_coords = [j for i, j in points_ij]
-        j_min = min(j_coords)
-        j_max = max(j_coords)
-
-        # For each scanline
-        for j in range(j_min, j_max + 1):
-            # Find intersections with polygon edges
-            intersections = []
-
-            for k in range(len(points_ij) - 1):
-                i0, j0 = points_ij[k]
-                i1, j1 = points_ij[k + 1]
-
-                # Skip horizontal edges
-                if j0 == j1:
-                    continue
-
-                # Half-open rule: avoid double-counting shared vertices
-                if (j0 < j <= j1) or (j1 < j <= j0):
-                    try:
-                        t = float(j - j0) / float(j1 - j0)
-                    except Exception:
-                        continue
-                    i_intersect = float(i0 + t * (i1 - i0))
-                    intersections.append(i_intersect)
-
-            # Sort intersections
-            intersections.sort()
-
-            # Defensive: if odd, skip this scanline (should be rare after half-open rule)
-            if len(intersections) % 2 != 0:
-                continue
-
-            for k in range(0, len(intersections), 2):
-                # Use ceil on left, floor on right to avoid over-filling concave notches
-                try:
-                    import math
-                    x_left = float(intersections[k])
-                    x_right = float(intersections[k + 1])
-                except Exception:
-                    continue
-
-                if x_right < x_left:
-                    x_left, x_right = x_right, x_left
-
-                i_start = int(math.ceil(x_left))
-                i_end = int(math.floor(x_right))
-
-                if i_end < i_start:
-                    continue
+        points_ij = list(points_ij)
+        if points_ij[0] != points_ij[-1]:
+            points_ij.append(points_ij[0])
 
-                for i in range(i_start, i_end + 1):
-                    if self._is_valid_cell(i, j):
-                        filled.add((i, j))
+        filled = 0
+        for j, row in self._scanline_spans(points_ij).items():
+            for (x0, x1) in row:
+                filled += self.try_write_span(j, x0, x1, depth, source=source, key_index=key_index)
 
         return filled
 
@@ -1652,17 +1906,18 @@ class ViewRaster:
             # Bounds/resolution metadata (small, required for CSV contract)
             "bounds_meta": getattr(self, "bounds_meta", None),
 
-            # Large per-cell arrays (required for PNG/CSV correctness)
+            # Large per-cell arrays (required for PNG/CSV correctness).
+            # Always plain lists so the payload stays JSON-safe on every layer backend.
             "w_occ": [w if w != float("inf") else None for w in self.w_occ],
-            "occ_host": self.occ_host,
-            "occ_link": self.occ_link,
-            "occ_dwg": self.occ_dwg,
-            "model_mask": self.model_mask,
-            "model_edge_key": self.model_edge_key,
-            "model_proxy_key": self.model_proxy_key,
-            "model_proxy_mask": self.model_proxy_mask,
-            "anno_key": self.anno_key,
-            "anno_over_model": self.anno_over_model,
+            "occ_host": layer_to_list(self.occ_host, LAYER_BOOL),
+            "occ_link": layer_to_list(self.occ_link, LAYER_BOOL),
+            "occ_dwg": layer_to_list(self.occ_dwg, LAYER_BOOL),
+            "model_mask": layer_to_list(self.model_mask, LAYER_BOOL),
+            "model_edge_key": layer_to_list(self.model_edge_key, LAYER_INT),
+            "model_proxy_key": layer_to_list(self.model_proxy_key, LAYER_INT),
+            "model_proxy_mask": layer_to_list(self.model_proxy_mask, LAYER_BOOL),
+            "anno_key": layer_to_list(self.anno_key, LAYER_INT),
+            "anno_over_model": layer_to_list(self.anno_over_model, LAYER_BOOL),
             # Meta (can be large-ish, but not per-cell dense)
             "element_meta": self.element_meta,
             "anno_meta": self.anno_meta,
@@ -1707,17 +1962,21 @@ class ViewRaster:
                 pass
 
         # w_occ uses None as sentinel for +inf in JSON
-        w_occ_in = d.get("w_occ") or []
-        if w_occ_in:
-            r.w_occ = [float("inf") if (w is None) else float(w) for w in w_occ_in]
-
-        # Dense layers
-        for k in ("occ_host", "occ_link", "occ_dwg",
-                  "model_mask", "model_edge_key", "model_proxy_key",
-                  "model_proxy_mask", "anno_key", "anno_over_model"):
+        w_occ_in = d.get("w_occ")
+        if w_occ_in is not None and len(w_occ_in) > 0:
+            r.w_occ = coerce_layer(
+                [float("inf") if (w is None) else float(w) for w in w_occ_in],
+                LAYER_FLOAT,
+                r.layer_backend,
+            )
+
+        # Dense layers (copied onto the raster's own storage backend)
+        for k, kind in _DENSE_LAYER_KINDS:
+            if k in ("w_occ", "w_occ_key"):
+                continue
             v = d.get(k)
             if v is not None:
-                setattr(r, k, v)
+                setattr(r, k, coerce_layer(v, kind, r.layer_backend))
 
         # Meta lists
         r.element_meta = d.get("element_meta") or []
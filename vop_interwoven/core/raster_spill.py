@@ -0,0 +1,277 @@
+"""
+Memory-mapped spill store for finished view rasters.
+
+Batch runs keep every view's raster payload (ViewRaster.to_dict()) alive until
+PNG/CSV export, so peak memory grows with the number of views. A
+RasterSpillStore writes the dense per-cell layers of a finished view to
+fixed-width binary files (one per layer) in a temporary directory and hands
+back a SpilledRaster: the same dict payload, with each dense layer replaced
+by a read-only SpilledLayer that mmaps its file on first access.
+
+File format (native byte order, no header):
+    w_occ                                   float64 ('d'), +inf = empty
+    model_edge_key, model_proxy_key,
+    anno_key                                int32 ('i'), -1 = empty
+    occ_*, model_mask, model_proxy_mask,
+    anno_over_model                         int8 ('b'), 0/1
+
+Example:
+    >>> store = RasterSpillStore()
+    >>> spilled = store.spill(raster.to_dict(), name="view_101")
+    >>> spilled["model_mask"][42]            # maps model_mask.bin lazily
+    True
+    >>> spilled.release()                    # unmap after export (optional)
+
+Commentary:
+    ✔ Element access follows the to_dict() contract (w_occ empty -> None,
+      masks -> bool), so exporters need no changes
+    ✔ np.asarray(layer) is zero-copy over the mapping (numpy fast paths)
+    ✔ SpilledLayers pickle as (path, kind, length): small IPC payloads
+    ✔ The directory is removed when the store is closed or garbage-collected
+    ⚠ Spilled layers are read-only; use to_dict() for a JSON-safe copy
+"""
+
+import array as _array
+import mmap
+import os
+import shutil
+import tempfile
+import weakref
+
+from .raster_storage import LAYER_BOOL, LAYER_FLOAT, LAYER_INT, _ARRAY_TYPECODES
+
+try:
+    import numpy as _np
+except Exception:
+    _np = None
+
+
+# Dense to_dict() keys spilled to disk, with their storage kind
+SPILL_LAYERS = (
+    ("w_occ", LAYER_FLOAT),
+    ("occ_host", LAYER_BOOL),
+    ("occ_link", LAYER_BOOL),
+    ("occ_dwg", LAYER_BOOL),
+    ("model_mask", LAYER_BOOL),
+    ("model_edge_key", LAYER_INT),
+    ("model_proxy_key", LAYER_INT),
+    ("model_proxy_mask", LAYER_BOOL),
+    ("anno_key", LAYER_INT),
+    ("anno_over_model", LAYER_BOOL),
+)
+
+_NUMPY_DTYPES = {LAYER_FLOAT: "<f8", LAYER_INT: "<i4", LAYER_BOOL: "i1"}
+
+_INF = float("inf")
+
+
+def _write_layer(path, values, kind):
+    tc = _ARRAY_TYPECODES[kind]
+    if kind == LAYER_FLOAT:
+        buf = _array.array(tc, (_INF if v is None else float(v) for v in values))
+    elif kind == LAYER_BOOL:
+        buf = _array.array(tc, (1 if v else 0 for v in values))
+    else:
+        buf = _array.array(tc, (int(v) for v in values))
+    with open(path, "wb") as f:
+        buf.tofile(f)
+    return len(buf), len(buf) * buf.itemsize
+
+
+class SpilledLayer(object):
+    """Read-only sequence over one spilled layer file (mapped on first access)."""
+
+    __slots__ = ("path", "kind", "n", "_mm", "_view", "_store", "__weakref__")
+
+    def __init__(self, path, kind, n, store=None):
+        self.path = path
+        self.kind = kind
+        self.n = int(n)
+        self._mm = None
+        self._view = None
+        self._store = store  # keeps the spill directory alive while referenced
+
+    def _load(self):
+        if self._view is None:
+            if self.n == 0:
+                self._view = memoryview(_array.array(_ARRAY_TYPECODES[self.kind]))
+            else:
+                with open(self.path, "rb") as f:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._mm).cast(_ARRAY_TYPECODES[self.kind])
+        return self._view
+
+    @property
+    def mapped(self):
+        return self._view is not None
+
+    def release(self):
+        """Unmap the file (the next access maps it again)."""
+        view, mm = self._view, self._mm
+        self._view = None
+        self._mm = None
+        try:
+            if view is not None:
+                view.release()
+            if mm is not None:
+                mm.close()
+        except Exception:
+            pass
+
+    def __len__(self):
+        return self.n
+
+    def _convert(self, v):
+        if self.kind == LAYER_FLOAT:
+            return None if v == _INF else v
+        if self.kind == LAYER_BOOL:
+            return v != 0
+        return v
+
+    def __getitem__(self, idx):
+        view = self._load()
+        if isinstance(idx, slice):
+            return [self._convert(v) for v in view[idx].tolist()]
+        return self._convert(view[idx])
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def tolist(self):
+        """Plain list with to_dict() semantics (w_occ empty -> None, masks -> bool)."""
+        return [self._convert(v) for v in self._load().tolist()]
+
+    def __array__(self, dtype=None, copy=None):
+        if _np is None:
+            raise TypeError("numpy is not available")
+        arr = _np.frombuffer(self._load(), dtype=_NUMPY_DTYPES[self.kind])
+        if self.kind == LAYER_BOOL:
+            arr = arr.view(_np.bool_)
+        if dtype is not None:
+            arr = arr.astype(dtype, copy=bool(copy))
+        elif copy:
+            arr = arr.copy()
+        return arr
+
+    def __getstate__(self):
+        return {"path": self.path, "kind": self.kind, "n": self.n}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], state["kind"], state["n"])
+
+    def __repr__(self):
+        return "SpilledLayer({0!r}, {1}, n={2})".format(os.path.basename(self.path), self.kind, self.n)
+
+
+class SpilledRaster(dict):
+    """ViewRaster.to_dict() payload whose dense layers live in spill files."""
+
+    def layers(self):
+        return [v for v in self.values() if isinstance(v, SpilledLayer)]
+
+    def release(self):
+        """Unmap every layer (files stay on disk until the store is closed)."""
+        for layer in self.layers():
+            layer.release()
+
+    def to_dict(self):
+        """Plain, JSON-safe copy (dense layers materialized as lists)."""
+        return {k: (v.tolist() if isinstance(v, SpilledLayer) else v) for k, v in self.items()}
+
+
+class RasterSpillStore(object):
+    """Directory of spilled view rasters.
+
+    Args:
+        root_dir: Parent directory for the spill directory (None = system temp)
+    """
+
+    def __init__(self, root_dir=None):
+        self.root_dir = root_dir
+        self.path = None
+        self.views_spilled = 0
+        self.bytes_written = 0
+        self._names = set()
+        self._layers = weakref.WeakSet()
+        self._cleanup = None
+
+    def _ensure_dir(self):
+        if self.path is None:
+            if self.root_dir:
+                os.makedirs(self.root_dir, exist_ok=True)
+            self.path = tempfile.mkdtemp(prefix="vop_spill_", dir=self.root_dir or None)
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self.path, True)
+        return self.path
+
+    def spill(self, raster_dict, name):
+        """Write the dense layers of `raster_dict` to disk and return a SpilledRaster.
+
+        Args:
+            raster_dict: ViewRaster.to_dict() payload (not modified)
+            name: Unique-ish label (e.g. "view_<id>"); used in file names
+
+        Returns:
+            SpilledRaster (non-dense keys are shared with raster_dict)
+        """
+        base = self._ensure_dir()
+        stem = "".join(c if (c.isalnum() or c in "-_") else "_" for c in str(name)) or "view"
+        unique = stem
+        k = 1
+        while unique in self._names:
+            k += 1
+            unique = "{0}_{1}".format(stem, k)
+        self._names.add(unique)
+
+        out = SpilledRaster(raster_dict)
+        for key, kind in SPILL_LAYERS:
+            values = raster_dict.get(key)
+            if values is None or isinstance(values, SpilledLayer):
+                continue
+            path = os.path.join(base, "{0}.{1}.bin".format(unique, key))
+            n, nbytes = _write_layer(path, values, kind)
+            layer = SpilledLayer(path, kind, n, store=self)
+            self._layers.add(layer)
+            out[key] = layer
+            self.bytes_written += nbytes
+
+        self.views_spilled += 1
+        return out
+
+    def close(self):
+        """Unmap all layers and delete the spill directory."""
+        for layer in list(self._layers):
+            layer.release()
+        if self._cleanup is not None:
+            self._cleanup()
+        self.path = None
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "views_spilled": self.views_spilled,
+            "bytes_written": self.bytes_written,
+        }
+
+
+def json_default(obj):
+    """json.dump `default=` hook: spilled layers as lists, anything else as str()."""
+    if isinstance(obj, SpilledLayer):
+        return obj.tolist()
+    return str(obj)
+
+
+def spill_view_result(view_result, store):
+    """Replace view_result['raster'] with a SpilledRaster (in place); True on success.
+
+    Never raises: on any failure the in-memory payload is kept.
+    """
+    try:
+        raster_dict = view_result.get("raster")
+        if not isinstance(raster_dict, dict) or isinstance(raster_dict, SpilledRaster):
+            return False
+        name = "view_{0}".format(view_result.get("view_id"))
+        view_result["raster"] = store.spill(raster_dict, name)
+        return True
+    except Exception as e:
+        print("[WARN] vop.raster_spill: Spill failed, keeping raster in memory: {0}".format(e))
+        return False
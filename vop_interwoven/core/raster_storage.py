@@ -0,0 +1,214 @@
+"""
+Dense layer storage backends for ViewRaster.
+
+ViewRaster keeps a handful of dense W*H per-cell layers (depth buffer,
+occupancy masks, key rasters). Plain Python lists cost one 8-byte pointer
+per cell plus a boxed object for every distinct value, so this module
+allocates those layers on the most compact backend available:
+
+- "numpy": numpy.ndarray (float64 / int32 / bool_), when numpy is importable
+- "array": stdlib array.array ('d' / 'i' / 'b'), always available
+- "list" : plain Python lists (legacy behavior)
+
+All backends support the same indexing API used throughout the pipeline
+(len(), layer[idx], layer[idx] = value, iteration), so callers never need
+to branch on the backend. Vectorized callers can check layer_backend() to
+opt into contiguous-buffer fast paths.
+
+Layer kinds:
+- LAYER_FLOAT: depth values (w_occ). Stored as float64, never float32, so
+  depth-test comparisons are bit-identical to the list backend.
+- LAYER_INT: key rasters (-1 == empty). Stored as int32.
+- LAYER_BOOL: masks. Stored as one byte per cell.
+"""
+
+import array as _array
+
+try:
+    import numpy as _np
+except Exception:
+    _np = None
+
+
+BACKEND_AUTO = "auto"
+BACKEND_NUMPY = "numpy"
+BACKEND_ARRAY = "array"
+BACKEND_LIST = "list"
+
+LAYER_FLOAT = "float"
+LAYER_INT = "int"
+LAYER_BOOL = "bool"
+
+_ARRAY_TYPECODES = {
+    LAYER_FLOAT: "d",
+    LAYER_INT: "i",
+    LAYER_BOOL: "b",
+}
+
+
+def numpy_available():
+    """True if numpy was importable in this interpreter."""
+    return _np is not None
+
+
+def resolve_backend(name=None):
+    """Resolve a requested backend name to a concrete backend.
+
+    Args:
+        name: "auto" (default), "numpy", "array" or "list"
+
+    Returns:
+        One of BACKEND_NUMPY, BACKEND_ARRAY, BACKEND_LIST
+
+    Commentary:
+        ✔ "auto" prefers numpy, then array.array
+        ✔ "numpy" silently degrades to "array" when numpy is not importable
+          (Dynamo CPython environments frequently ship without it)
+    """
+    n = (name or BACKEND_AUTO).strip().lower()
+    if n == BACKEND_AUTO:
+        return BACKEND_NUMPY if _np is not None else BACKEND_ARRAY
+    if n == BACKEND_NUMPY:
+        return BACKEND_NUMPY if _np is not None else BACKEND_ARRAY
+    if n in (BACKEND_ARRAY, BACKEND_LIST):
+        return n
+    raise ValueError("Unknown raster layer backend: {0}".format(name))
+
+
+def _numpy_dtype(kind):
+    if kind == LAYER_FLOAT:
+        return _np.float64
+    if kind == LAYER_INT:
+        return _np.int32
+    if kind == LAYER_BOOL:
+        return _np.bool_
+    raise ValueError("Unknown layer kind: {0}".format(kind))
+
+
+def make_layer(kind, n, fill, backend=BACKEND_AUTO):
+    """Allocate a dense layer of n cells initialized to fill.
+
+    Args:
+        kind: LAYER_FLOAT, LAYER_INT or LAYER_BOOL
+        n: Number of cells (W*H)
+        fill: Initial value for every cell
+        backend: Requested backend name (resolved via resolve_backend)
+
+    Returns:
+        Layer object supporting len/indexing/iteration
+    """
+    b = resolve_backend(backend)
+    n = int(n)
+
+    if b == BACKEND_NUMPY:
+        return _np.full(n, fill, dtype=_numpy_dtype(kind))
+
+    if b == BACKEND_ARRAY:
+        tc = _ARRAY_TYPECODES.get(kind)
+        if tc is None:
+            raise ValueError("Unknown layer kind: {0}".format(kind))
+        if kind == LAYER_BOOL:
+            fill = 1 if fill else 0
+        # Repetition of a 1-element array is a single C-level memset-like copy.
+        return _array.array(tc, [fill]) * n
+
+    return [fill] * n
+
+
+def coerce_layer(values, kind, backend=BACKEND_AUTO):
+    """Copy an arbitrary sequence (e.g. a JSON list) into a backend layer.
+
+    Used by ViewRaster.from_dict() so restored rasters use the same storage
+    as freshly rendered ones.
+    """
+    b = resolve_backend(backend)
+
+    if b == BACKEND_NUMPY:
+        return _np.array(values, dtype=_numpy_dtype(kind))
+
+    if b == BACKEND_ARRAY:
+        tc = _ARRAY_TYPECODES.get(kind)
+        if tc is None:
+            raise ValueError("Unknown layer kind: {0}".format(kind))
+        if kind == LAYER_BOOL:
+            return _array.array(tc, (1 if v else 0 for v in values))
+        if kind == LAYER_INT:
+            return _array.array(tc, (int(v) for v in values))
+        return _array.array(tc, (float(v) for v in values))
+
+    return list(values)
+
+
+def layer_backend(layer):
+    """Return the backend name a layer object is stored on."""
+    if _np is not None and isinstance(layer, _np.ndarray):
+        return BACKEND_NUMPY
+    if isinstance(layer, _array.array):
+        return BACKEND_ARRAY
+    return BACKEND_LIST
+
+
+def layer_to_list(layer, kind):
+    """Return a plain-list view of a layer for JSON-safe payloads.
+
+    List layers are returned as-is (no copy), matching legacy to_dict().
+    Bool layers always come back as Python bools regardless of backend.
+    """
+    if layer is None:
+        return None
+    b = layer_backend(layer)
+    if b == BACKEND_LIST:
+        return layer
+    if b == BACKEND_NUMPY:
+        return layer.tolist()
+    if kind == LAYER_BOOL:
+        return list(map(bool, layer))
+    return layer.tolist()
+
+
+def fill_range(layer, start, stop, value):
+    """Assign value to cells [start, stop) of a layer (contiguous span write).
+
+    Uses slice assignment on every backend so a whole scanline span is written
+    in one C-level operation instead of one Python index store per cell.
+    """
+    start = int(start)
+    stop = int(stop)
+    n = stop - start
+    if n <= 0:
+        return
+    b = layer_backend(layer)
+    if b == BACKEND_NUMPY:
+        layer[start:stop] = value
+    elif b == BACKEND_ARRAY:
+        if layer.typecode == "b":
+            value = 1 if value else 0
+        layer[start:stop] = _array.array(layer.typecode, [value]) * n
+    else:
+        layer[start:stop] = [value] * n
+
+
+def count_equal(layer, start, stop, value):
+    """Count cells in [start, stop) of a layer equal to value."""
+    start = int(start)
+    stop = int(stop)
+    if stop <= start:
+        return 0
+    b = layer_backend(layer)
+    if b == BACKEND_NUMPY:
+        return int(_np.count_nonzero(layer[start:stop] == value))
+    return layer[start:stop].count(value)
+
+
+def layer_nbytes(layer):
+    """Approximate payload size of a layer in bytes (diagnostics only)."""
+    try:
+        b = layer_backend(layer)
+        if b == BACKEND_NUMPY:
+            return int(layer.nbytes)
+        if b == BACKEND_ARRAY:
+            return int(layer.itemsize * len(layer))
+        # One pointer per cell; shared boxed values are not counted.
+        return int(8 * len(layer))
+    except Exception:
+        return 0
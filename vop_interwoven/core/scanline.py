@@ -0,0 +1,267 @@
+"""
+Edge-table scanline polygon rasterizer emitting per-row spans.
+
+Replaces per-cell (i, j) tuple sets with half-open row spans [x0, x1).
+Polygons are given in integer cell coordinates (points_ij), exactly as the
+ViewRaster rasterizers produce them after UV clipping and quantization.
+
+Coverage convention (identical to the legacy ViewRaster scanline):
+  - Row j intersects an edge (i0, j0) -> (i1, j1) iff min(j0, j1) < j <= max(j0, j1)
+    (half-open rule; horizontal edges never intersect)
+  - Intersection x = i0 + (j - j0) / (j1 - j0) * (i1 - i0), evaluated from the
+    edge's original start point so results are bit-identical
+  - Each interior interval [xl, xr] covers cells ceil(xl) .. floor(xr)
+
+Fill rules:
+  - FILL_EVENODD: pair sorted crossings (legacy behavior)
+  - FILL_NONZERO: accumulate edge winding (+1 upward, -1 downward)
+
+Spans are returned as {row: [(x0, x1), ...]} with sorted, disjoint,
+non-adjacent spans per row, clipped to [0, width) x [0, height).
+"""
+
+import math
+
+FILL_EVENODD = "evenodd"
+FILL_NONZERO = "nonzero"
+
+
+def _closed(points_ij):
+    if not points_ij:
+        return []
+    pts = list(points_ij)
+    if pts[0] != pts[-1]:
+        pts.append(pts[0])
+    return pts
+
+
+def build_edge_table(loops_ij):
+    """Bucket non-horizontal edges of all loops by their first covered row.
+
+    Args:
+        loops_ij: Iterable of (i, j) point lists (open or closed rings)
+
+    Returns:
+        (buckets, row_min, row_max) where buckets maps a start row to a list of
+        edges (row_lo, row_hi, i0, j0, i1, j1, winding). Edge covers rows
+        row_lo < j <= row_hi. Returns ({}, None, None) if no edges exist.
+    """
+    buckets = {}
+    row_min = None
+    row_max = None
+
+    for pts in loops_ij:
+        pts = _closed(pts)
+        for k in range(len(pts) - 1):
+            i0, j0 = pts[k]
+            i1, j1 = pts[k + 1]
+            if j0 == j1:
+                continue
+            if j0 < j1:
+                lo, hi, winding = j0, j1, 1
+            else:
+                lo, hi, winding = j1, j0, -1
+            start = lo + 1
+            buckets.setdefault(start, []).append((lo, hi, i0, j0, i1, j1, winding))
+            if row_min is None or start < row_min:
+                row_min = start
+            if row_max is None or hi > row_max:
+                row_max = hi
+
+    return buckets, row_min, row_max
+
+
+def _row_intervals(active, j, fill_rule):
+    """Return interior [xl, xr] float intervals for row j (None if odd/invalid)."""
+    if fill_rule == FILL_NONZERO:
+        xs = []
+        for (_lo, _hi, i0, j0, i1, j1, winding) in active:
+            t = float(j - j0) / float(j1 - j0)
+            xs.append((float(i0 + t * (i1 - i0)), winding))
+        xs.sort(key=lambda p: p[0])
+
+        out = []
+        wind = 0
+        x_start = None
+        for x, w in xs:
+            prev = wind
+            wind += w
+            if prev == 0 and wind != 0:
+                x_start = x
+            elif prev != 0 and wind == 0:
+                out.append((x_start, x))
+        return out
+
+    xs = []
+    for (_lo, _hi, i0, j0, i1, j1, _winding) in active:
+        t = float(j - j0) / float(j1 - j0)
+        xs.append(float(i0 + t * (i1 - i0)))
+    xs.sort()
+
+    # Defensive: an odd crossing count means the ring was not closed; skip row.
+    if len(xs) % 2 != 0:
+        return None
+
+    return [(xs[k], xs[k + 1]) for k in range(0, len(xs), 2)]
+
+
+def polygon_spans(loops_ij, width, height, fill_rule=FILL_EVENODD):
+    """Rasterize one or more rings (sharing one edge table) into row spans.
+
+    Args:
+        loops_ij: Iterable of (i, j) rings
+        width, height: Raster dimensions in cells (spans are clipped)
+        fill_rule: FILL_EVENODD or FILL_NONZERO
+
+    Returns:
+        Dict {row: [(x0, x1), ...]} of half-open spans. Never raises.
+    """
+    try:
+        buckets, row_min, row_max = build_edge_table(loops_ij)
+        if row_min is None:
+            return {}
+
+        W = int(width)
+        H = int(height)
+        out = {}
+        active = []
+
+        for j in range(row_min, row_max + 1):
+            started = buckets.get(j)
+            if started:
+                active.extend(started)
+            if active:
+                active = [e for e in active if j <= e[1]]
+            if not active or j < 0 or j >= H:
+                continue
+
+            intervals = _row_intervals(active, j, fill_rule)
+            if not intervals:
+                continue
+
+            row = []
+            for x_left, x_right in intervals:
+                if x_right < x_left:
+                    x_left, x_right = x_right, x_left
+                x0 = int(math.ceil(x_left))
+                x1 = int(math.floor(x_right)) + 1
+                if x0 < 0:
+                    x0 = 0
+                if x1 > W:
+                    x1 = W
+                if x1 > x0:
+                    row.append((x0, x1))
+
+            if row:
+                out[j] = _normalize(row)
+
+        return out
+    except Exception:
+        return {}
+
+
+def _normalize(spans):
+    """Sort and merge overlapping/adjacent half-open spans."""
+    if len(spans) < 2:
+        return list(spans)
+    spans = sorted(spans)
+    merged = [spans[0]]
+    for x0, x1 in spans[1:]:
+        m0, m1 = merged[-1]
+        if x0 <= m1:
+            if x1 > m1:
+                merged[-1] = (m0, x1)
+        else:
+            merged.append((x0, x1))
+    return merged
+
+
+def union_spans(a, b):
+    """Row-wise union of two span dicts (returns a new dict)."""
+    out = dict(a)
+    for j, spans in b.items():
+        cur = out.get(j)
+        out[j] = _normalize(cur + spans) if cur else list(spans)
+    return out
+
+
+def subtract_spans(a, b):
+    """Row-wise difference a - b of two span dicts (returns a new dict)."""
+    out = {}
+    for j, spans in a.items():
+        cut = b.get(j)
+        if not cut:
+            out[j] = list(spans)
+            continue
+
+        row = []
+        k = 0
+        for x0, x1 in spans:
+            cur = x0
+            while k < len(cut) and cut[k][1] <= cur:
+                k += 1
+            kk = k
+            while kk < len(cut) and cut[kk][0] < x1:
+                c0, c1 = cut[kk]
+                if c0 > cur:
+                    row.append((cur, c0))
+                if c1 > cur:
+                    cur = c1
+                if cur >= x1:
+                    break
+                kk += 1
+            if cur < x1:
+                row.append((cur, x1))
+        if row:
+            out[j] = row
+    return out
+
+
+def clip_spans(spans, col_lo, col_hi, row_lo, row_hi):
+    """Clip a span dict to the half-open cell window [col_lo, col_hi) x [row_lo, row_hi)."""
+    out = {}
+    for j, row in spans.items():
+        if j < row_lo or j >= row_hi:
+            continue
+        clipped = []
+        for x0, x1 in row:
+            if x0 < col_lo:
+                x0 = col_lo
+            if x1 > col_hi:
+                x1 = col_hi
+            if x1 > x0:
+                clipped.append((x0, x1))
+        if clipped:
+            out[j] = clipped
+    return out
+
+
+def span_cell_count(spans):
+    """Total number of cells covered by a span dict."""
+    return sum(x1 - x0 for row in spans.values() for (x0, x1) in row)
+
+
+def iter_span_cells(spans):
+    """Yield (i, j) for every covered cell, row by row (diagnostics/compat only)."""
+    for j in sorted(spans):
+        for x0, x1 in spans[j]:
+            for i in range(x0, x1):
+                yield (i, j)
+
+
+def outer_minus_holes_spans(outer_loops_ij, hole_loops_ij, width, height, fill_rule=FILL_EVENODD):
+    """Spans covered by any outer ring and by no hole ring.
+
+    Each ring is rasterized on its own and combined with span arithmetic, so
+    the result equals the legacy union(outer cells) - union(hole cells).
+
+    Returns:
+        (target_spans, outer_spans, hole_spans)
+    """
+    outer = {}
+    for pts in outer_loops_ij:
+        outer = union_spans(outer, polygon_spans([pts], width, height, fill_rule))
+    holes = {}
+    for pts in hole_loops_ij:
+        holes = union_spans(holes, polygon_spans([pts], width, height, fill_rule))
+    return subtract_spans(outer, holes), outer, holes
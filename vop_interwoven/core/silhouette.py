@@ -12,6 +12,16 @@ Compatible with IronPython (no logging module, no f-strings).
 """
 
 import math
+import time
+
+from . import tracing
+from .geometry_handle import (
+    GeometryHandle,
+    PROFILE_CAD,
+    PROFILE_CAD_VIEW,
+    PROFILE_SOLID,
+    PROFILE_SYMBOLIC,
+)
 
 # -----------------------------------------------------------------------------
 # Family-definition outline fallback (FilledRegion / 2D region edges)
@@ -745,13 +755,13 @@ def _detail_line_band_silhouette(elem, view, view_basis, cfg=None, diag=None):
         cat = getattr(elem, 'Category', None)
         cat_name = cat.Name if cat else ""
 
-        # DEBUG: Log category names for LINEAR elements (first 10)
+        # DEBUG: Log category names for LINEAR elements (first 10, trace level 'debug' only)
         if not hasattr(_detail_line_band_silhouette, '_debug_count'):
             _detail_line_band_silhouette._debug_count = 0
-        if _detail_line_band_silhouette._debug_count < 10:
+        if _detail_line_band_silhouette._debug_count < 10 and tracing.enabled(tracing.LEVEL_DEBUG):
             try:
                 elem_id = getattr(getattr(elem, 'Id', None), 'IntegerValue', 'unknown')
-                print("[DEBUG detail_line_band] Elem {}: category='{}'".format(elem_id, cat_name))
+                tracing.debug("[DEBUG detail_line_band] Elem {}: category='{}'", elem_id, cat_name)
                 _detail_line_band_silhouette._debug_count += 1
             except Exception:
                 pass
@@ -825,16 +835,16 @@ def _detail_line_band_silhouette(elem, view, view_basis, cfg=None, diag=None):
             "strategy": "detail_line_band"
         }
 
-        # DEBUG: Log successful band creation (first 5)
+        # DEBUG: Log successful band creation (first 5, trace level 'debug' only)
         if not hasattr(_detail_line_band_silhouette, '_success_count'):
             _detail_line_band_silhouette._success_count = 0
-        if _detail_line_band_silhouette._success_count < 5:
+        if _detail_line_band_silhouette._success_count < 5 and tracing.enabled(tracing.LEVEL_DEBUG):
             try:
                 elem_id = getattr(getattr(elem, 'Id', None), 'IntegerValue', 'unknown')
-                print("[DEBUG detail_line_band] SUCCESS elem {}: band created, {} points, length={:.1f} cells".format(
-                    elem_id, len(band_loop['points']), length))
-                print("  UV endpoints: ({:.1f},{:.1f}) → ({:.1f},{:.1f})".format(x0, y0, x1, y1))
-                print("  Band width: {:.2f} cells (half={:.2f})".format(band_cells, band_half_cells))
+                tracing.debug("[DEBUG detail_line_band] SUCCESS elem {}: band created, {} points, length={:.1f} cells",
+                              elem_id, len(band_loop['points']), length)
+                tracing.debug("  UV endpoints: ({:.1f},{:.1f}) → ({:.1f},{:.1f})", x0, y0, x1, y1)
+                tracing.debug("  Band width: {:.2f} cells (half={:.2f})", band_cells, band_half_cells)
                 _detail_line_band_silhouette._success_count += 1
             except Exception:
                 pass
@@ -850,33 +860,18 @@ def _detail_line_band_silhouette(elem, view, view_basis, cfg=None, diag=None):
         return []
 
 
-def _symbolic_curves_silhouette(elem, view, view_basis, cfg=None, diag=None):
+def _symbolic_curves_silhouette(elem, view, view_basis, cfg=None, diag=None, handle=None):
     """
     For FamilyInstance (and similar): extract curve primitives visible in the view.
     Returns OPEN polylines (edges only). Intended to show symbolic linework instead of extents rects.
     """
     try:
-        from Autodesk.Revit.DB import Options, ViewDetailLevel
-        opts = Options()
-        opts.ComputeReferences = False
-        opts.IncludeNonVisibleObjects = False
-
-        # View-specific geometry (symbolic lines) often requires Options.View
-        # CRITICAL: Never set opts.View for linked elements - causes geometry extraction failure
-        if not hasattr(elem, 'transform'):  # Host element only
-            try:
-                opts.View = view
-            except Exception:
-                pass
-        # For linked elements: leave opts.View = None (extract in link coordinates)
-
-        try:
-            opts.DetailLevel = ViewDetailLevel.Fine
-        except Exception:
-            pass
-
+        # View-specific geometry (symbolic lines) often requires Options.View (Fine detail).
+        # The handle never sets opts.View for linked elements (extracted in link coordinates).
         base_elem = _unwrap_elem(elem)
-        geom = base_elem.get_Geometry(opts)
+        if handle is None:
+            handle = GeometryHandle(elem, view)
+        geom = handle.geometry(PROFILE_SYMBOLIC)
         if geom is None:
             return []
 
@@ -1264,7 +1259,7 @@ def _merge_paths_by_endpoints(paths, eps=1e-6, max_iters=500):
 
     return out
 
-def _cad_curves_silhouette(elem, view, view_basis, raster, cfg=None):
+def _cad_curves_silhouette(elem, view, view_basis, raster, cfg=None, handle=None):
     """
     Extract curve primitives from DWG/DXF ImportInstance geometry and return OPEN polylines.
     Intended to avoid bbox/obb rectangles for imports.
@@ -1541,31 +1536,12 @@ def _cad_curves_silhouette(elem, view, view_basis, raster, cfg=None):
         loops.append({"points": pts, "is_hole": False, "open": True, "strategy": "cad_text_bbox"})
         return True
 
-    def _get_geom(bind_view):
-        try:
-            opts = Options()
-            opts.ComputeReferences = False
-
-            # Imports can hide curve primitives unless this is True in some cases
-            try:
-                opts.IncludeNonVisibleObjects = True
-            except Exception:
-                pass
-
-            try:
-                opts.DetailLevel = ViewDetailLevel.Fine
-            except Exception:
-                pass
-
-            if bind_view:
-                try:
-                    opts.View = view
-                except Exception:
-                    pass
+    if handle is None:
+        handle = GeometryHandle(elem, view)
 
-            return base_elem.get_Geometry(opts)
-        except Exception:
-            return None
+    def _get_geom(bind_view):
+        # Fine detail incl. non-visible objects (imports can hide curve primitives otherwise)
+        return handle.geometry(PROFILE_CAD_VIEW if bind_view else PROFILE_CAD)
 
     # Attempt 1: NO view binding (preferred for ImportInstance curve primitives)
     geom1 = _get_geom(bind_view=False)
@@ -1612,7 +1588,7 @@ def _unwrap_elem(elem):
     except Exception:
         return elem
 
-def get_element_silhouette(elem, view, view_basis, raster, cfg=None, cache=None, cache_key=None, diag=None):
+def get_element_silhouette(elem, view, view_basis, raster, cfg=None, cache=None, cache_key=None, diag=None, handle=None):
     """Extract element silhouette as 2D loops.
 
     Args:
@@ -1621,6 +1597,7 @@ def get_element_silhouette(elem, view, view_basis, raster, cfg=None, cache=None,
         view_basis: ViewBasis object for coordinate transformation
         raster: ViewRaster (provides cell size for UV mode classification)
         cfg: Optional Config object (provides strategy settings)
+        handle: Optional GeometryHandle for elem (shared with other extraction paths)
 
     Returns:
         List of loop dicts, each with:
@@ -1646,55 +1623,8 @@ def get_element_silhouette(elem, view, view_basis, raster, cfg=None, cache=None,
     except Exception:
         elem_id = 0
 
-    # Best-effort face collection for planar-face selection strategy.
-    # In non-Revit unit tests this will remain [], and the strategy can be monkeypatched.
-    element_faces = []
-    try:
-        from Autodesk.Revit.DB import Options, ViewDetailLevel
-    except Exception:
-        Options = None
-        ViewDetailLevel = None
-
-    if Options is not None and hasattr(elem, "get_Geometry"):
-        try:
-            opts = Options()
-            opts.ComputeReferences = False
-            opts.IncludeNonVisibleObjects = False
-            try:
-                if ViewDetailLevel is not None:
-                    opts.DetailLevel = ViewDetailLevel.Medium
-            except Exception:
-                pass
-
-            # Same linked-element guard as elsewhere: don't bind opts.View for linked proxies
-            if not hasattr(elem, "transform"):
-                try:
-                    opts.View = view
-                except Exception:
-                    pass
-
-            geom = elem.get_Geometry(opts)
-            if geom is not None:
-                # Collect faces from solids (PlanarFace filtering happens downstream in face_selection)
-                for solid in _iter_solids(geom):
-                    try:
-                        faces = getattr(solid, "Faces", None)
-                    except Exception:
-                        faces = None
-                    if not faces:
-                        continue
-                    try:
-                        for f in faces:
-                            if f is not None:
-                                element_faces.append(f)
-                    except Exception:
-                        continue
-        except Exception:
-            # Best-effort only; keep element_faces empty on failure.
-            element_faces = []
-
-
     # PR12: geometry cache (caller provides bounded LRU; this function treats it as optional).
+    # Consulted before any Revit call so cache hits never fetch geometry.
     if cache is not None and cache_key is not None:
         try:
             cached = cache.get(cache_key, default=None)
@@ -1702,6 +1632,13 @@ def get_element_silhouette(elem, view, view_basis, raster, cfg=None, cache=None,
                 return cached
         except Exception:
             pass
+    # Recompute cost reported to cost-aware caches (WeightedLRUCache) on insert
+    t_compute0 = time.perf_counter()
+
+    # One lazily-fetched geometry handle shared by every strategy below; bbox/obb-only
+    # strategies never touch it, so TINY/LINEAR bbox winners skip get_Geometry entirely.
+    if handle is None:
+        handle = GeometryHandle(elem, view)
 
     # Special-cases first (DWG + family symbolic)
     base_elem = _unwrap_elem(elem)
@@ -1798,7 +1735,7 @@ def get_element_silhouette(elem, view, view_basis, raster, cfg=None, cache=None,
                 loops = _obb_silhouette(elem, view, view_basis)
             elif strategy_name == 'planar_face_loops':
                 loops = _planar_face_loops_silhouette(
-                    element_faces,
+                    handle.faces(),
                     view_basis,
                     elem=elem,
                     diag=diag,
@@ -1806,13 +1743,13 @@ def get_element_silhouette(elem, view, view_basis, raster, cfg=None, cache=None,
                     elem_id=elem_id,
                 )
             elif strategy_name == 'silhouette_edges':
-                loops = _silhouette_edges(elem, view, view_basis, cfg)
+                loops = _silhouette_edges(elem, view, view_basis, cfg, handle=handle)
             elif strategy_name == 'front_face_loops':
-                loops = _front_face_loops_silhouette(elem, view, view_basis, cfg)
+                loops = _front_face_loops_silhouette(elem, view, view_basis, cfg, handle=handle)
             elif strategy_name == 'cad_curves':
-                loops = _cad_curves_silhouette(elem, view, view_basis, raster, cfg)
+                loops = _cad_curves_silhouette(elem, view, view_basis, raster, cfg, handle=handle)
             elif strategy_name == 'symbolic_curves':
-                loops = _symbolic_curves_silhouette(elem, view, view_basis, cfg, diag=diag)
+                loops = _symbolic_curves_silhouette(elem, view, view_basis, cfg, diag=diag, handle=handle)
             else:
                 continue
 
@@ -1849,7 +1786,7 @@ def get_element_silhouette(elem, view, view_basis, raster, cfg=None, cache=None,
 
                 if cache is not None and cache_key is not None:
                     try:
-                        cache.set(cache_key, [dict(loop) for loop in loops])
+                        cache.set(cache_key, [dict(loop) for loop in loops], cost=time.perf_counter() - t_compute0)
                     except Exception:
                         pass
 
@@ -2058,14 +1995,14 @@ def _obb_silhouette(elem, view, view_basis):
     except Exception:
         return []
 
-def _front_face_loops_silhouette(elem, view, view_basis, cfg=None):
+def _front_face_loops_silhouette(elem, view, view_basis, cfg=None, handle=None):
     """
     Extract loops from the most relevant front-facing planar face(s).
     Unlike _silhouette_edges(), this preserves multiple loops + holes without point-cloud ordering.
     Intended for AREAL elements (floors with openings, etc.).
     """
     try:
-        from Autodesk.Revit.DB import Options, ViewDetailLevel, UV, PlanarFace
+        from Autodesk.Revit.DB import UV, PlanarFace
     except Exception:
         return []
 
@@ -2074,33 +2011,17 @@ def _front_face_loops_silhouette(elem, view, view_basis, cfg=None):
     except Exception:
         return []
 
-    try:
-        opts = Options()
-        opts.ComputeReferences = False
-        opts.IncludeNonVisibleObjects = False
-        try:
-            opts.DetailLevel = ViewDetailLevel.Medium
-        except Exception:
-            pass
-
-        # Same linked-element rule as elsewhere
-        if not hasattr(elem, 'transform'):
-            try:
-                opts.View = view
-            except Exception:
-                pass
-
-        geom = elem.get_Geometry(opts)
-        if geom is None:
-            return []
-    except Exception:
+    # Medium detail, view-bound for host elements only (same linked-element rule as elsewhere)
+    if handle is None:
+        handle = GeometryHandle(elem, view)
+    if handle.geometry(PROFILE_SOLID) is None:
         return []
 
     loops_out = []
 
     # Find candidate planar faces that are front-facing
     faces = []
-    for solid in _iter_solids(geom):
+    for solid in handle.solids():
         if not solid or getattr(solid, 'Volume', 0) <= 1e-9:
             continue
         try:
@@ -2218,7 +2139,7 @@ def _front_face_loops_silhouette(elem, view, view_basis, cfg=None):
     return loops_out
 
 
-def _silhouette_edges(elem, view, view_basis, cfg):
+def _silhouette_edges(elem, view, view_basis, cfg, handle=None):
     """Extract true silhouette edges based on view direction.
 
     This preserves concave shapes (L, U, C, etc.) by extracting actual
@@ -2234,7 +2155,7 @@ def _silhouette_edges(elem, view, view_basis, cfg):
         List with loops representing actual silhouette (preserves concavity)
     """
     try:
-        from Autodesk.Revit.DB import Options, ViewDetailLevel, UV
+        from Autodesk.Revit.DB import UV
     except Exception:
         return []
 
@@ -2248,32 +2169,18 @@ def _silhouette_edges(elem, view, view_basis, cfg):
         # Can't determine view direction, fall back
         return []
 
-    # Get geometry with appropriate detail level
-    try:
-        opts = Options()
-        opts.ComputeReferences = False
-        opts.IncludeNonVisibleObjects = False
-        opts.DetailLevel = ViewDetailLevel.Medium
-
-        # CRITICAL: Never set opts.View for linked elements - causes geometry extraction failure
-        # Linked elements (LinkedElementProxy) have .transform attribute
-        if not hasattr(elem, 'transform'):  # Host element only
-            try:
-                opts.View = view
-            except Exception:
-                pass
-        # For linked elements: leave opts.View = None (extract in link coordinates)
-
-        geom = elem.get_Geometry(opts)
-        if geom is None:
-            return []
-    except Exception:
+    # Medium detail; the handle never sets opts.View for linked elements
+    # (LinkedElementProxy geometry is extracted in link coordinates)
+    if handle is None:
+        handle = GeometryHandle(elem, view)
+    if handle.geometry(PROFILE_SOLID) is None:
         return []
 
-    # Collect silhouette edges
+    # Collect silhouette edges (one UVW polyline per edge)
     silhouette_points = []
+    edge_polylines = []
 
-    for solid in _iter_solids(geom):
+    for solid in handle.solids():
         if not solid or getattr(solid, 'Volume', 0) <= 1e-9:
             continue
 
@@ -2375,10 +2282,14 @@ def _silhouette_edges(elem, view, view_basis, cfg):
 
                     # Project to view UVW (with depth)
                     from vop_interwoven.revit.view_basis import world_to_view
+                    polyline = []
                     for pt in points_3d:
                         pt_h = _to_host_point(elem, pt)
                         uvw = world_to_view((pt_h.X, pt_h.Y, pt_h.Z), view_basis)
                         silhouette_points.append(uvw)
+                        polyline.append(uvw)
+                    if len(polyline) >= 2:
+                        edge_polylines.append(polyline)
 
                 except Exception:
                     continue
@@ -2386,9 +2297,12 @@ def _silhouette_edges(elem, view, view_basis, cfg):
     if len(silhouette_points) < 3:
         return []
 
-    # Build polygon from silhouette points
-    # For now, use simplified approach: order by connectivity
-    # TODO: Implement proper edge chaining for multiple loops
+    # Preferred: chain edges into closed loops by endpoint snapping
+    loops = _chain_edge_loops(edge_polylines)
+    if loops:
+        return loops
+
+    # Fallback: order the point cloud by connectivity into a single loop
     loop_points = _order_points_by_connectivity(silhouette_points)
 
     if len(loop_points) >= 3:
@@ -2483,22 +2397,15 @@ def _planar_face_loops_silhouette(
             return points_uv + [points_uv[0]]
         return points_uv
 
-    # 1) front-facing planar faces
-    front_faces = list(
-        fs.iter_front_facing_planar_faces(
-            element_faces,
-            view_basis.forward,
-            diag=diag,
-            view_id=view_id,
-            elem_id=elem_id,
-            callsite="silhouette.planar_face_loops",
-        )
+    # 1) + 2) front-facing planar faces grouped by plane (one plane extraction per face)
+    plane_groups = fs.front_facing_plane_groups(
+        element_faces,
+        view_basis.forward,
+        diag=diag,
+        view_id=view_id,
+        elem_id=elem_id,
+        callsite="silhouette.planar_face_loops",
     )
-    if not front_faces:
-        return []
-
-    # 2) plane grouping
-    plane_groups = fs.group_faces_by_plane(front_faces)
     if not plane_groups:
         return []
 
@@ -2557,6 +2464,69 @@ def _planar_face_loops_silhouette(
     return loops_dicts
 
 
+# Endpoint snapping tolerance (feet, UV) when chaining silhouette edges
+EDGE_CHAIN_TOL_FT = 1e-4
+
+
+def _chain_edge_loops(edge_polylines, tol=EDGE_CHAIN_TOL_FT):
+    """Chain silhouette edge polylines into closed loops (holes labeled by nesting).
+
+    Args:
+        edge_polylines: List of UVW point lists, one per silhouette edge
+        tol: Endpoint snapping tolerance (UV)
+
+    Returns:
+        List of loop dicts [{'points': [...], 'is_hole': bool}], or [] when the
+        edges do not close into loops (caller falls back to point ordering)
+
+    Commentary:
+        ✔ Endpoint matching uses a PointGrid (no linear scan per endpoint)
+        ✔ A loop is a hole when it sits inside an odd number of other loops
+        ⚠ Any dangling edge rejects the result: a partial outline would fill wrong
+    """
+    from .spatial_index import chain_polylines
+
+    closed, open_chains = chain_polylines(edge_polylines, tol=tol)
+    if open_chains or not closed:
+        return []
+
+    rings = []
+    for pts in closed:
+        if len(pts) < 4:
+            continue
+        area2 = 0.0
+        for k in range(len(pts) - 1):
+            area2 += pts[k][0] * pts[k + 1][1] - pts[k + 1][0] * pts[k][1]
+        if abs(area2) <= tol * tol:
+            continue
+        rings.append(pts)
+    if not rings:
+        return []
+
+    loops = []
+    for a, pts in enumerate(rings):
+        probe = pts[0]
+        depth = 0
+        for b, other in enumerate(rings):
+            if b != a and _point_in_ring_uv(probe[0], probe[1], other):
+                depth += 1
+        loops.append({'points': pts, 'is_hole': (depth % 2) == 1})
+    return loops
+
+
+def _point_in_ring_uv(u, v, ring):
+    """Even-odd point-in-polygon test on a closed UV(W) ring."""
+    inside = False
+    for k in range(len(ring) - 1):
+        u0, v0 = ring[k][0], ring[k][1]
+        u1, v1 = ring[k + 1][0], ring[k + 1][1]
+        if (v0 > v) != (v1 > v):
+            x = u0 + (v - v0) * (u1 - u0) / (v1 - v0)
+            if u < x:
+                inside = not inside
+    return inside
+
+
 def _order_points_by_connectivity(points):
     """Order points by spatial connectivity (simple greedy approach).
 
@@ -2565,45 +2535,24 @@ def _order_points_by_connectivity(points):
 
     Returns:
         Ordered list of points forming a closed loop
+
+    Commentary:
+        ✔ Duplicate removal and nearest-neighbour search go through a PointGrid
+          (O(n) expected instead of O(n^2)); ties still resolve to the earliest point
     """
     if len(points) < 3:
         return []
 
+    from .spatial_index import dedupe_points, order_points_greedy
+
     # Remove duplicates (use UV for comparison, preserve W if present)
-    unique_points = []
-    seen = set()
-    for p in points:
-        key = (round(p[0], 6), round(p[1], 6))
-        if key not in seen:
-            seen.add(key)
-            unique_points.append(p)
+    unique_points = dedupe_points(points, tol=1e-6)
 
     if len(unique_points) < 3:
         return []
 
     # Greedy nearest-neighbor ordering (use UV distance only)
-    ordered = [unique_points[0]]
-    remaining = set(range(1, len(unique_points)))
-
-    while remaining:
-        current = ordered[-1]
-        best_idx = None
-        best_dist = float('inf')
-
-        for idx in remaining:
-            pt = unique_points[idx]
-            # Distance in UV plane only
-            dist = (pt[0] - current[0]) ** 2 + (pt[1] - current[1]) ** 2
-
-            if dist < best_dist:
-                best_dist = dist
-                best_idx = idx
-
-        if best_idx is not None:
-            ordered.append(unique_points[best_idx])
-            remaining.remove(best_idx)
-        else:
-            break
+    ordered = order_points_greedy(unique_points)
 
     # Close the loop
     if len(ordered) >= 3:
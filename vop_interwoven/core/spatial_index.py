@@ -0,0 +1,350 @@
+"""
+Uniform-grid spatial hashes for 2D point and rectangle queries (pure Python).
+
+Silhouette work repeatedly asks "which remaining point is nearest to this
+one?" and "which endpoints lie within tol of this one?". A linear scan makes
+both O(n) per query (O(n^2) per loop); PointGrid buckets points into square
+cells sized for ~1 point per cell so queries only visit nearby buckets.
+
+Points may carry extra coordinates (u, v, w); only the first two are indexed.
+RectGrid does the same for axis-aligned rectangles ("which rects overlap this
+one?"), e.g. view crop regions hit by a changed element.
+
+Example:
+    >>> grid = PointGrid([(0.0, 0.0), (1.0, 0.0), (5.0, 5.0)])
+    >>> grid.nearest(0.9, 0.1)[0]
+    1
+    >>> grid.remove(1)
+    >>> grid.nearest(0.9, 0.1)[0]
+    0
+
+Commentary:
+    ✔ nearest() breaks distance ties by lowest point index (deterministic,
+      matches a first-wins linear scan in index order)
+    ✔ Removal is O(1); empty buckets are dropped so sparse late queries scan
+      occupied buckets instead of growing rings
+    ⚠ Cell size is fixed at construction; heavily clustered inputs degrade
+      towards a linear scan, never below it
+"""
+
+import math
+
+
+class PointGrid(object):
+    """Uniform-grid hash over 2D points supporting removal.
+
+    Args:
+        points: Sequence of (x, y, ...) points; point ids are their positions
+        cell_size: Optional bucket size (default: sized for ~1 point per cell)
+    """
+
+    def __init__(self, points, cell_size=None):
+        self.points = points
+        n = len(points)
+
+        xs = [float(p[0]) for p in points] or [0.0]
+        ys = [float(p[1]) for p in points] or [0.0]
+        self.x0 = min(xs)
+        self.y0 = min(ys)
+        span_x = max(xs) - self.x0
+        span_y = max(ys) - self.y0
+
+        if cell_size is None or not (cell_size > 0.0):
+            area = span_x * span_y
+            if area > 0.0:
+                cell_size = math.sqrt(area / max(1, n))
+            else:
+                cell_size = max(span_x, span_y) / max(1, n)
+        self.cell_size = float(cell_size) if cell_size > 0.0 else 1.0
+        self._inv = 1.0 / self.cell_size
+
+        self._buckets = {}
+        self._alive = [True] * n
+        self._count = 0
+        self._ix_max = int(span_x * self._inv)
+        self._iy_max = int(span_y * self._inv)
+        for idx in range(n):
+            key = self._key(xs[idx], ys[idx])
+            self._buckets.setdefault(key, []).append(idx)
+            self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, idx):
+        return 0 <= idx < len(self._alive) and self._alive[idx]
+
+    def _key(self, x, y):
+        return (int(math.floor((x - self.x0) * self._inv)), int(math.floor((y - self.y0) * self._inv)))
+
+    def remove(self, idx):
+        """Remove point `idx` (no-op if already removed)."""
+        if idx not in self:
+            return
+        self._alive[idx] = False
+        self._count -= 1
+        p = self.points[idx]
+        key = self._key(float(p[0]), float(p[1]))
+        bucket = self._buckets[key]
+        bucket.remove(idx)
+        if not bucket:
+            del self._buckets[key]
+
+    def _scan(self, bucket, x, y, best, best_d2):
+        pts = self.points
+        for idx in bucket:
+            p = pts[idx]
+            dx = p[0] - x
+            dy = p[1] - y
+            d2 = dx * dx + dy * dy
+            if d2 < best_d2 or (d2 == best_d2 and best is not None and idx < best):
+                best = idx
+                best_d2 = d2
+        return best, best_d2
+
+    def nearest(self, x, y, max_dist=None):
+        """Nearest remaining point to (x, y).
+
+        Args:
+            x, y: Query position
+            max_dist: Optional inclusive search radius
+
+        Returns:
+            (idx, squared_distance), or (None, inf) if nothing qualifies
+        """
+        inf = float("inf")
+        if self._count <= 0:
+            return (None, inf)
+
+        limit_d2 = inf if max_dist is None else float(max_dist) * float(max_dist)
+        buckets = self._buckets
+        cx, cy = self._key(x, y)
+
+        # Rings needed to reach every occupied cell from (cx, cy)
+        max_r = max(cx, self._ix_max - cx, cy, self._iy_max - cy, 0)
+        if max_dist is not None:
+            max_r = min(max_r, int(float(max_dist) * self._inv) + 1)
+
+        best = None
+        best_d2 = inf
+        r = 0
+        while r <= max_r:
+            # Sparse grid: scanning occupied buckets beats walking empty rings
+            if (2 * r + 1) * (2 * r + 1) > len(buckets):
+                for bucket in buckets.values():
+                    best, best_d2 = self._scan(bucket, x, y, best, best_d2)
+                break
+
+            if r == 0:
+                bucket = buckets.get((cx, cy))
+                if bucket:
+                    best, best_d2 = self._scan(bucket, x, y, best, best_d2)
+            else:
+                for ix in range(cx - r, cx + r + 1):
+                    for iy in (cy - r, cy + r):
+                        bucket = buckets.get((ix, iy))
+                        if bucket:
+                            best, best_d2 = self._scan(bucket, x, y, best, best_d2)
+                for iy in range(cy - r + 1, cy + r):
+                    for ix in (cx - r, cx + r):
+                        bucket = buckets.get((ix, iy))
+                        if bucket:
+                            best, best_d2 = self._scan(bucket, x, y, best, best_d2)
+
+            # Anything in ring r + 1 is at least r cells away
+            reach = r * self.cell_size
+            if best is not None and best_d2 < reach * reach:
+                break
+            r += 1
+
+        if best is None or best_d2 > limit_d2:
+            return (None, inf)
+        return (best, best_d2)
+
+    def within(self, x, y, radius):
+        """Sorted ids of remaining points within `radius` (inclusive) of (x, y)."""
+        if self._count <= 0:
+            return []
+        r2 = float(radius) * float(radius)
+        i0, j0 = self._key(x - radius, y - radius)
+        i1, j1 = self._key(x + radius, y + radius)
+        pts = self.points
+        out = []
+        for ix in range(i0, i1 + 1):
+            for iy in range(j0, j1 + 1):
+                for idx in self._buckets.get((ix, iy), ()):
+                    p = pts[idx]
+                    dx = p[0] - x
+                    dy = p[1] - y
+                    if dx * dx + dy * dy <= r2:
+                        out.append(idx)
+        out.sort()
+        return out
+
+
+def dedupe_points(points, tol=1e-6):
+    """Drop points within `tol` (UV) of an earlier kept point; order preserved."""
+    if not points:
+        return []
+    grid = PointGrid(points, cell_size=max(float(tol), 1e-12) * 4.0)
+    kept = []
+    for idx, p in enumerate(points):
+        if idx not in grid:
+            continue
+        kept.append(p)
+        for other in grid.within(p[0], p[1], tol):
+            grid.remove(other)
+    return kept
+
+
+def order_points_greedy(points):
+    """Greedy nearest-neighbour ordering starting at points[0] (UV distance)."""
+    n = len(points)
+    if n == 0:
+        return []
+    grid = PointGrid(points)
+    grid.remove(0)
+    ordered = [points[0]]
+    current = points[0]
+    while len(grid):
+        idx, _d2 = grid.nearest(current[0], current[1])
+        if idx is None:
+            break
+        grid.remove(idx)
+        current = points[idx]
+        ordered.append(current)
+    return ordered
+
+
+def chain_polylines(polylines, tol=1e-6):
+    """Chain polylines into loops by snapping endpoints within `tol` (UV).
+
+    Args:
+        polylines: List of point lists (each >= 2 points, (u, v) or (u, v, w))
+        tol: Endpoint snapping tolerance
+
+    Returns:
+        (closed_loops, open_chains): point lists; closed loops end on their
+        first point. Shared endpoints appear once.
+    """
+    lines = [list(pl) for pl in polylines if pl and len(pl) >= 2]
+    if not lines:
+        return ([], [])
+
+    # Endpoint 2k is the start of line k, 2k + 1 its end
+    ends = []
+    for pl in lines:
+        ends.append(pl[0])
+        ends.append(pl[-1])
+    grid = PointGrid(ends)
+    tol2 = float(tol) * float(tol)
+
+    def _close(a, b):
+        dx = a[0] - b[0]
+        dy = a[1] - b[1]
+        return dx * dx + dy * dy <= tol2
+
+    def _take(k):
+        grid.remove(2 * k)
+        grid.remove(2 * k + 1)
+
+    def _extend(chain):
+        while True:
+            tail = chain[-1]
+            if len(chain) >= 3 and _close(tail, chain[0]):
+                return True
+            hit, _d2 = grid.nearest(tail[0], tail[1], max_dist=tol)
+            if hit is None:
+                return False
+            k = hit // 2
+            seg = lines[k] if hit % 2 == 0 else list(reversed(lines[k]))
+            _take(k)
+            chain.extend(seg[1:])
+
+    closed = []
+    open_chains = []
+    for k in range(len(lines)):
+        if (2 * k) not in grid:
+            continue
+        _take(k)
+        chain = list(lines[k])
+        if _extend(chain):
+            chain[-1] = chain[0]
+            closed.append(chain)
+            continue
+        # Dead end: grow the other direction, then try to close again
+        chain.reverse()
+        if _extend(chain):
+            chain[-1] = chain[0]
+            closed.append(chain)
+        else:
+            open_chains.append(chain)
+
+    return (closed, open_chains)
+
+
+class RectGrid(object):
+    """Uniform-grid hash over axis-aligned rectangles (static).
+
+    Args:
+        rects: Sequence of (xmin, ymin, xmax, ymax); rect ids are their positions
+        cell_size: Optional bucket size (default: mean rect extent)
+        max_cells_per_rect: Rects spanning more buckets are kept in an
+            always-scanned overflow list instead (default: 256)
+    """
+
+    def __init__(self, rects, cell_size=None, max_cells_per_rect=256):
+        self.rects = [tuple(float(c) for c in r) for r in rects]
+
+        if cell_size is None or not (cell_size > 0.0):
+            extents = [max(r[2] - r[0], r[3] - r[1]) for r in self.rects]
+            extents = [e for e in extents if e > 0.0 and math.isfinite(e)]
+            cell_size = (sum(extents) / len(extents)) if extents else 1.0
+        self.cell_size = float(cell_size)
+        self._inv = 1.0 / self.cell_size
+
+        self._buckets = {}
+        self._overflow = []
+        for idx, (x0, y0, x1, y1) in enumerate(self.rects):
+            if not all(math.isfinite(c) for c in (x0, y0, x1, y1)):
+                self._overflow.append(idx)
+                continue
+            i0, j0 = self._key(x0, y0)
+            i1, j1 = self._key(x1, y1)
+            if (i1 - i0 + 1) * (j1 - j0 + 1) > max_cells_per_rect:
+                self._overflow.append(idx)
+                continue
+            for ix in range(i0, i1 + 1):
+                for iy in range(j0, j1 + 1):
+                    self._buckets.setdefault((ix, iy), []).append(idx)
+
+    def __len__(self):
+        return len(self.rects)
+
+    def _key(self, x, y):
+        return (int(math.floor(x * self._inv)), int(math.floor(y * self._inv)))
+
+    def query(self, xmin, ymin, xmax, ymax):
+        """Sorted ids of rects overlapping [xmin, xmax] x [ymin, ymax] (edges inclusive)."""
+        rects = self.rects
+        candidates = set(self._overflow)
+        if all(math.isfinite(c) for c in (xmin, ymin, xmax, ymax)):
+            i0, j0 = self._key(xmin, ymin)
+            i1, j1 = self._key(xmax, ymax)
+            if (i1 - i0 + 1) * (j1 - j0 + 1) > len(self._buckets):
+                for bucket in self._buckets.values():
+                    candidates.update(bucket)
+            else:
+                for ix in range(i0, i1 + 1):
+                    for iy in range(j0, j1 + 1):
+                        candidates.update(self._buckets.get((ix, iy), ()))
+        else:
+            candidates = set(range(len(rects)))
+
+        out = []
+        for idx in candidates:
+            x0, y0, x1, y1 = rects[idx]
+            if x0 <= xmax and xmin <= x1 and y0 <= ymax and ymin <= y1:
+                out.append(idx)
+        out.sort()
+        return out
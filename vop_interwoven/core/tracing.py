@@ -0,0 +1,264 @@
+"""
+Low-overhead structured tracing for the VOP pipeline.
+
+Named spans (view -> phase -> element batch), monotonic counters and gated
+debug messages, recorded into a ring buffer by the installed Tracer and
+exported as Chrome trace JSON (chrome://tracing, Perfetto, speedscope).
+
+With no tracer installed (the default) every entry point is a global lookup
+and a return: span() hands back a shared no-op context manager, debug() never
+formats its message, and hot loops can test enabled() once up front.
+
+Levels:
+    LEVEL_OFF    nothing recorded
+    LEVEL_INFO   spans + counters
+    LEVEL_DEBUG  spans + counters + debug messages (echoed to stdout) and
+                 per-view Diagnostics DEBUG events
+
+Example:
+    >>> tracer = Tracer(level=LEVEL_DEBUG)
+    >>> prev = install(tracer)
+    >>> with span("model", cat="phase"):
+    ...     debug("[DEBUG] Element {0}: Tier 1A", 123)
+    >>> install(prev)
+    >>> tracer.write_chrome_trace("vop_trace.json")
+
+Commentary:
+    ✔ Timestamps come from time.perf_counter (same clock as pipeline timings),
+      so complete() can turn existing t0/t1 pairs into spans for free
+    ✔ Bounded: the ring buffer keeps the newest `capacity` events
+    ⚠ One tracer per process; render-pool workers do not trace
+"""
+
+import collections
+import json
+import threading
+import time
+
+
+LEVEL_OFF = 0
+LEVEL_INFO = 1
+LEVEL_DEBUG = 2
+
+LEVEL_NAMES = {"off": LEVEL_OFF, "info": LEVEL_INFO, "debug": LEVEL_DEBUG}
+
+_active = None  # installed Tracer, or None (tracing disabled)
+
+
+def parse_level(value):
+    """Level constant for 'off' | 'info' | 'debug' (or an int level)."""
+    if isinstance(value, int):
+        return max(LEVEL_OFF, min(LEVEL_DEBUG, value))
+    name = str(value or "off").strip().lower()
+    if name not in LEVEL_NAMES:
+        raise ValueError("trace level must be 'off', 'info' or 'debug'")
+    return LEVEL_NAMES[name]
+
+
+class Tracer(object):
+    """Ring-buffered span/counter/message recorder.
+
+    Args:
+        level: LEVEL_INFO or LEVEL_DEBUG
+        capacity: Max retained events (oldest dropped first)
+        echo: Print debug messages as they are recorded (default: True)
+    """
+
+    def __init__(self, level=LEVEL_INFO, capacity=65536, echo=True):
+        self.level = parse_level(level)
+        self.capacity = max(1, int(capacity))
+        self.echo = bool(echo)
+        self.events = collections.deque(maxlen=self.capacity)
+        self.counters = {}
+        self.recorded = 0
+        self._t_origin = time.perf_counter()
+
+    def _us(self, t):
+        return (float(t) - self._t_origin) * 1e6
+
+    def complete(self, name, t0, t1, cat="phase", args=None):
+        """Record a finished span from two perf_counter() readings."""
+        self.recorded += 1
+        self.events.append(("X", name, cat, self._us(t0), max(0.0, (float(t1) - float(t0)) * 1e6), threading.get_ident(), args))
+
+    def instant(self, name, cat="log", args=None):
+        self.recorded += 1
+        self.events.append(("i", name, cat, self._us(time.perf_counter()), None, threading.get_ident(), args))
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def log(self, level, fmt, args=()):
+        if level > self.level:
+            return
+        msg = fmt.format(*args) if args else fmt
+        self.instant("log", cat="debug" if level >= LEVEL_DEBUG else "info", args={"msg": msg})
+        if self.echo:
+            print(msg)
+
+    @property
+    def dropped(self):
+        return max(0, self.recorded - len(self.events))
+
+    def to_chrome_trace(self):
+        """Chrome trace dict ({'traceEvents': [...], ...})."""
+        trace = []
+        for ph, name, cat, ts, dur, tid, args in self.events:
+            ev = {"name": name, "cat": cat, "ph": ph, "ts": round(ts, 3), "pid": 0, "tid": tid}
+            if ph == "X":
+                ev["dur"] = round(dur, 3)
+            else:
+                ev["s"] = "t"
+            if args:
+                ev["args"] = args
+            trace.append(ev)
+
+        if self.counters:
+            end_ts = round(self._us(time.perf_counter()), 3)
+            for name in sorted(self.counters):
+                trace.append({"name": name, "cat": "counter", "ph": "C", "ts": end_ts, "pid": 0, "tid": 0,
+                              "args": {"value": self.counters[name]}})
+
+        return {
+            "traceEvents": trace,
+            "displayTimeUnit": "ms",
+            "otherData": {"counters": dict(self.counters), "dropped_events": self.dropped},
+        }
+
+    def write_chrome_trace(self, path):
+        """Write to_chrome_trace() to `path`; returns True on success (never raises)."""
+        try:
+            with open(path, "w") as f:
+                json.dump(self.to_chrome_trace(), f, default=str)
+            return True
+        except Exception as e:
+            print("[WARN] vop.tracing: Failed to write trace {0}: {1}".format(path, e))
+            return False
+
+    def stats(self):
+        return {
+            "level": self.level,
+            "events": len(self.events),
+            "dropped_events": self.dropped,
+            "counters": dict(self.counters),
+        }
+
+
+class _Span(object):
+    __slots__ = ("_tracer", "_name", "_cat", "_args", "_t0")
+
+    def __init__(self, tracer, name, cat, args):
+        self._tracer = tracer
+        self._name = name
+        self._cat = cat
+        self._args = args
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._tracer.complete(self._name, self._t0, time.perf_counter(), cat=self._cat, args=self._args)
+        return False
+
+
+class _NullSpan(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def tick(self, n=1):
+        pass
+
+    def close(self):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Batches(object):
+    """Emit one span per `size` ticks (element batches inside a hot loop)."""
+
+    __slots__ = ("_tracer", "_name", "_cat", "_size", "_n", "_first", "_t0")
+
+    def __init__(self, tracer, name, cat, size):
+        self._tracer = tracer
+        self._name = name
+        self._cat = cat
+        self._size = max(1, int(size))
+        self._n = 0
+        self._first = 0
+        self._t0 = time.perf_counter()
+
+    def tick(self, n=1):
+        self._n += n
+        if self._n - self._first >= self._size:
+            self._flush()
+
+    def _flush(self):
+        t1 = time.perf_counter()
+        self._tracer.complete(self._name, self._t0, t1, cat=self._cat, args={"first": self._first, "count": self._n - self._first})
+        self._first = self._n
+        self._t0 = t1
+
+    def close(self):
+        if self._n > self._first:
+            self._flush()
+
+
+def install(tracer):
+    """Install `tracer` (or None to disable) for this process; returns the previous one."""
+    global _active
+    prev = _active
+    _active = tracer if (tracer is not None and tracer.level > LEVEL_OFF) else None
+    return prev
+
+
+def get_tracer():
+    return _active
+
+
+def enabled(level=LEVEL_INFO):
+    t = _active
+    return t is not None and t.level >= level
+
+
+def span(name, cat="phase", args=None):
+    """Context manager timing a named span (shared no-op when tracing is off)."""
+    t = _active
+    if t is None:
+        return _NULL_SPAN
+    return _Span(t, name, cat, args)
+
+
+def batches(name, size=64, cat="elements"):
+    """Batch span emitter for hot loops: call .tick() per item and .close() at the end."""
+    t = _active
+    if t is None:
+        return _NULL_SPAN
+    return _Batches(t, name, cat, size)
+
+
+def complete(name, t0, t1, cat="phase", args=None):
+    """Record a span from existing perf_counter() readings (no-op when off)."""
+    t = _active
+    if t is not None:
+        t.complete(name, t0, t1, cat=cat, args=args)
+
+
+def count(name, n=1):
+    t = _active
+    if t is not None:
+        t.count(name, n)
+
+
+def debug(fmt, *args):
+    """Gated debug message: formatted, recorded and echoed only at LEVEL_DEBUG."""
+    t = _active
+    if t is not None and t.level >= LEVEL_DEBUG:
+        t.log(LEVEL_DEBUG, fmt, args)
@@ -0,0 +1,262 @@
+"""
+Triangle z-buffer for ambiguous tiles (selective per-cell W resolution).
+
+AREAL elements normally write one W-depth for every cell they cover (the
+nearest loop/bbox depth). That is exact for faces parallel to the view plane
+and conservative elsewhere, but where depth ranges of overlapping elements
+interleave (sloped roofs over walls, ramps, stacked slabs) a single depth can
+resolve occlusion the wrong way round.
+
+This module tessellates an element's UVW loops into triangles and
+interpolates W per cell, restricted to the tiles flagged as ambiguous by the
+pipeline's tile binning. The result is a sparse depth field {j: {i: w}} that
+ViewRaster.rasterize_silhouette_loops() consults per cell; every other cell
+keeps the cheap constant-depth span write.
+
+Cell coordinates:
+    x = (u - bounds.xmin) / cell_size,  y = (v - bounds.ymin) / cell_size
+    cell (i, j) is sampled at its centre (i + 0.5, j + 0.5)
+
+Commentary:
+    ✔ Loops without W variation return None (no per-cell work, identical output)
+    ✔ Per-cell W is clamped to the triangle's W range and to `floor_w`, so it
+      is never nearer than the element depth used by early-out
+    ✔ Triangles are dilated by TRI_DILATE_CELLS so quantized boundary cells
+      still get a depth; overlapping triangles keep the nearest W (z-buffer)
+    ⚠ Holes are not tessellated: coverage (outer minus holes) stays with the
+      scanline rasterizer, the field only supplies depths
+"""
+
+import math
+
+# Conservative dilation (in cells) applied to every triangle when sampling
+TRI_DILATE_CELLS = 1.0
+
+# Loops whose W spread is below this are treated as view-parallel
+FLAT_W_EPS = 1e-9
+
+
+def _signed_area2(pts):
+    a = 0.0
+    n = len(pts)
+    for k in range(n):
+        x0, y0 = pts[k]
+        x1, y1 = pts[(k + 1) % n]
+        a += x0 * y1 - x1 * y0
+    return a
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _point_in_tri(p, a, b, c):
+    d1 = _cross(a, b, p)
+    d2 = _cross(b, c, p)
+    d3 = _cross(c, a, p)
+    return d1 >= 0.0 and d2 >= 0.0 and d3 >= 0.0
+
+
+def triangulate_polygon(points_xy):
+    """Ear-clipping triangulation of a simple polygon.
+
+    Args:
+        points_xy: Open or closed ring [(x, y), ...]
+
+    Returns:
+        List of index triples into the (open) ring; a fan is used if the
+        polygon is not simple enough for ear clipping. Never raises.
+    """
+    try:
+        pts = list(points_xy)
+        if len(pts) >= 2 and pts[0] == pts[-1]:
+            pts = pts[:-1]
+        n = len(pts)
+        if n < 3:
+            return []
+        if n == 3:
+            return [(0, 1, 2)]
+
+        # Work counter-clockwise
+        idx = list(range(n))
+        if _signed_area2(pts) < 0.0:
+            idx.reverse()
+
+        tris = []
+        guard = 0
+        k = 0
+        while len(idx) > 3 and guard < 2 * n * n:
+            guard += 1
+            m = len(idx)
+            ia, ib, ic = idx[(k - 1) % m], idx[k % m], idx[(k + 1) % m]
+            a, b, c = pts[ia], pts[ib], pts[ic]
+
+            is_ear = _cross(a, b, c) > 0.0
+            if is_ear:
+                for other in idx:
+                    if other in (ia, ib, ic):
+                        continue
+                    if _point_in_tri(pts[other], a, b, c):
+                        is_ear = False
+                        break
+
+            if is_ear:
+                tris.append((ia, ib, ic))
+                del idx[k % m]
+                k = max(0, (k % m) - 1)
+            else:
+                k += 1
+
+        if len(idx) == 3:
+            tris.append(tuple(idx))
+            return tris
+
+        # Degenerate / self-intersecting: fall back to a fan
+        return [(0, t, t + 1) for t in range(1, n - 1)]
+    except Exception:
+        return []
+
+
+def _loop_triangles(points, x0, y0, inv_cell):
+    """Triangles [((x, y, w), (x, y, w), (x, y, w)), ...] in cell coordinates."""
+    ring = []
+    for p in points:
+        if len(p) < 3:
+            return []
+        pt = ((float(p[0]) - x0) * inv_cell, (float(p[1]) - y0) * inv_cell, float(p[2]))
+        if not ring or (ring[-1][0], ring[-1][1]) != (pt[0], pt[1]):
+            ring.append(pt)
+    if len(ring) >= 2 and (ring[0][0], ring[0][1]) == (ring[-1][0], ring[-1][1]):
+        ring.pop()
+    if len(ring) < 3:
+        return []
+
+    tris = []
+    for (ia, ib, ic) in triangulate_polygon([(p[0], p[1]) for p in ring]):
+        tris.append((ring[ia], ring[ib], ring[ic]))
+    return tris
+
+
+def _splat_triangle(tri, field, tile_map, ambiguous_tiles, width, height, floor_w):
+    """Write min(field, W) for dilated-triangle cells inside ambiguous tiles."""
+    (ax, ay, aw), (bx, by, bw), (cx, cy, cw) = tri
+
+    det = (by - cy) * (ax - cx) + (cx - bx) * (ay - cy)
+    w_lo = min(aw, bw, cw)
+    w_hi = max(aw, bw, cw)
+    flat = (w_hi - w_lo) <= FLAT_W_EPS
+    if abs(det) < 1e-12 and not flat:
+        return 0
+
+    pad = TRI_DILATE_CELLS
+    i_lo = max(0, int(math.floor(min(ax, bx, cx) - pad)))
+    i_hi = min(width - 1, int(math.floor(max(ax, bx, cx) + pad)))
+    j_lo = max(0, int(math.floor(min(ay, by, cy) - pad)))
+    j_hi = min(height - 1, int(math.floor(max(ay, by, cy) + pad)))
+    if i_hi < i_lo or j_hi < j_lo:
+        return 0
+
+    # Edge functions normalized to cell distance (positive inside for CCW)
+    ccw = _cross((ax, ay), (bx, by), (cx, cy)) >= 0.0
+    edges = []
+    for (px, py), (qx, qy) in (((ax, ay), (bx, by)), ((bx, by), (cx, cy)), ((cx, cy), (ax, ay))):
+        ex = qx - px
+        ey = qy - py
+        ln = math.hypot(ex, ey)
+        if ln <= 0.0:
+            continue
+        if not ccw:
+            ex, ey = -ex, -ey
+        edges.append((px, py, ex / ln, ey / ln))
+
+    ts = tile_map.tile_size
+    tiles_x = tile_map.tiles_x
+    written = 0
+
+    for tj in range(j_lo // ts, j_hi // ts + 1):
+        for ti in range(i_lo // ts, i_hi // ts + 1):
+            if (tj * tiles_x + ti) not in ambiguous_tiles:
+                continue
+            for j in range(max(j_lo, tj * ts), min(j_hi, tj * ts + ts - 1) + 1):
+                y = j + 0.5
+                row = None
+                for i in range(max(i_lo, ti * ts), min(i_hi, ti * ts + ts - 1) + 1):
+                    x = i + 0.5
+                    inside = True
+                    for (px, py, ux, uy) in edges:
+                        if ux * (y - py) - uy * (x - px) < -pad:
+                            inside = False
+                            break
+                    if not inside:
+                        continue
+
+                    if flat:
+                        w = aw
+                    else:
+                        l1 = ((by - cy) * (x - cx) + (cx - bx) * (y - cy)) / det
+                        l2 = ((cy - ay) * (x - cx) + (ax - cx) * (y - cy)) / det
+                        w = l1 * aw + l2 * bw + (1.0 - l1 - l2) * cw
+                        if w < w_lo:
+                            w = w_lo
+                        elif w > w_hi:
+                            w = w_hi
+                    if floor_w is not None and w < floor_w:
+                        w = floor_w
+
+                    if row is None:
+                        row = field.setdefault(j, {})
+                    prev = row.get(i)
+                    if prev is None or w < prev:
+                        row[i] = w
+                        written += 1
+    return written
+
+
+def loop_depth_field(loops, raster, ambiguous_tiles, floor_w=None):
+    """Per-cell W for closed UVW loops, restricted to ambiguous tiles.
+
+    Args:
+        loops: Loop dicts [{'points': [(u, v, w), ...], 'is_hole': bool, ...}]
+        raster: ViewRaster (bounds_xy, cell_size_ft, W, H, tile)
+        ambiguous_tiles: Set of tile indices needing per-cell resolution
+        floor_w: Optional lower bound for every resolved W (element depth)
+
+    Returns:
+        {j: {i: w}} sparse depth field, or None when nothing needs resolving
+        (no ambiguous tiles touched, 2D-only loops, or loops with constant W).
+        Never raises.
+    """
+    if not loops or not ambiguous_tiles:
+        return None
+
+    try:
+        outers = [lp for lp in loops if not lp.get("is_hole", False) and not lp.get("open", False)]
+
+        # View-parallel loops: constant depth is already exact
+        w_lo = float("inf")
+        w_hi = float("-inf")
+        for lp in outers:
+            for p in lp.get("points", []):
+                if len(p) < 3:
+                    return None
+                w = float(p[2])
+                if w < w_lo:
+                    w_lo = w
+                if w > w_hi:
+                    w_hi = w
+        if not (w_hi - w_lo > FLAT_W_EPS) or not math.isfinite(w_hi - w_lo):
+            return None
+
+        cell = float(raster.cell_size_ft)
+        inv_cell = 1.0 / cell
+        x0 = float(raster.bounds_xy.xmin)
+        y0 = float(raster.bounds_xy.ymin)
+
+        field = {}
+        for lp in outers:
+            for tri in _loop_triangles(lp.get("points", []), x0, y0, inv_cell):
+                _splat_triangle(tri, field, raster.tile, ambiguous_tiles, raster.W, raster.H, floor_w)
+
+        return field or None
+    except Exception:
+        return None
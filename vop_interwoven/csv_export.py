@@ -34,73 +34,359 @@ def _is_from_cache(view_result):
         pass
     return False
 
-def compute_external_cell_metrics(raster):
-    """Compute external-cell metrics for VOP CSV.
+def _layer_or_empty(raster, name):
+    """Return a dense raster layer, or [] if absent.
 
-    Definitions:
-        - DWG: cells with any model ink from elements whose source_type == "DWG"
-        - RVT: cells with any model ink from elements whose source_type == "LINK" (link only)
-        - Any: cells with any external model ink (DWG or LINK)
-        - Only: cells with external model ink and NO HOST model ink
-
-    Notes:
-        - Uses model ink keys (edge/proxy). Annotation ink is ignored for ext-cell metrics.
-        - Tolerates missing element_meta or key arrays by returning zeros.
+    Never use `getattr(...) or []` on layers: numpy-backed layers do not
+    support truth-value testing.
     """
-    def _get_source_type(key_index):
-        if not key_index:
-            return None
+    v = getattr(raster, name, None)
+    return [] if v is None else v
+
+_EXT_NONE = 0
+_EXT_HOST = 1
+_EXT_DWG = 2
+_EXT_LINK = 3
+
+_EXT_CODES = {"HOST": _EXT_HOST, "DWG": _EXT_DWG, "LINK": _EXT_LINK}
+
+_ANNO_BUCKETS = ("TEXT", "TAG", "DIM", "DETAIL", "LINES", "REGION", "OTHER")
+
+_MODEL_PRESENCE_MODES = ("occ", "edge", "proxy", "ink", "any")
+
+_EXT_ZERO = {"Ext_Cells_Any": 0, "Ext_Cells_Only": 0, "Ext_Cells_DWG": 0, "Ext_Cells_RVT": 0}
+
+
+def _element_source_code(raster, key_index):
+    """Map a model key to its element source code (_EXT_*), or _EXT_NONE."""
+    if not key_index:
+        return _EXT_NONE
+    meta = None
+    em = getattr(raster, "element_meta", None)
+    if em is None:
+        return _EXT_NONE
+    # element_meta may be list-like (index == key_index) or dict-like.
+    try:
+        if isinstance(em, dict):
+            meta = em.get(key_index, None)
+            if meta is None:
+                meta = em.get(str(key_index), None)
+        else:
+            # Guard: some rasters reserve 0 for "none"
+            if 0 <= int(key_index) < len(em):
+                meta = em[int(key_index)]
+    except Exception:
         meta = None
-        em = getattr(raster, "element_meta", None)
-        if em is None:
-            return None
-        # element_meta may be list-like (index == key_index) or dict-like.
-        try:
-            if isinstance(em, dict):
-                meta = em.get(key_index, None)
-                if meta is None:
-                    meta = em.get(str(key_index), None)
-            else:
-                # Guard: some rasters reserve 0 for "none"
-                if 0 <= int(key_index) < len(em):
-                    meta = em[int(key_index)]
-        except Exception:
-            meta = None
-        if isinstance(meta, dict):
-            return meta.get("source_type")
+    if isinstance(meta, dict):
+        return _EXT_CODES.get(meta.get("source_type"), _EXT_NONE)
+    return _EXT_NONE
+
+
+def _anno_bucket(raster, anno_idx):
+    """Map an annotation key to its CSV bucket (TEXT/TAG/.../OTHER), or None."""
+    anno_meta = getattr(raster, "anno_meta", None) or []
+    if not (0 <= anno_idx < len(anno_meta)):
         return None
+    meta = anno_meta[anno_idx]
+
+    # Base type from annotation pass
+    anno_type = (meta.get("type") or "OTHER").upper()
+
+    # Remap FilledRegion to REGION for CSV metrics
+    try:
+        from Autodesk.Revit.DB import BuiltInCategory
+        cat_id = meta.get("cat_id", None)
+        if cat_id is not None and int(cat_id) == int(BuiltInCategory.OST_FilledRegion):
+            anno_type = "REGION"
+    except Exception:
+        pass
+
+    return anno_type if anno_type in _ANNO_BUCKETS else "OTHER"
+
 
-    edge_keys = getattr(raster, "model_edge_key", None) or []
-    proxy_keys = getattr(raster, "model_proxy_key", None) or []
+def _fused_metrics_numpy(np, raster, total, mode, layers, want_cells, want_anno, want_ext):
+    """NumPy implementation of compute_all_cell_metrics (boolean masks + bincount)."""
+    model_mask, model_edge_key, model_proxy_key, model_proxy_mask, anno_over_model, anno_key = layers
 
-    n = max(len(edge_keys), len(proxy_keys))
-    if n == 0:
-        return {"Ext_Cells_Any": 0, "Ext_Cells_Only": 0, "Ext_Cells_DWG": 0, "Ext_Cells_RVT": 0}
+    def _fit(layer, n, fill, dtype):
+        arr = np.asarray(layer)
+        if arr.dtype == object:
+            arr = np.array(list(layer), dtype=dtype)
+        if len(arr) >= n:
+            return arr[:n].astype(dtype, copy=False)
+        out = np.full(n, fill, dtype=dtype)
+        out[:len(arr)] = arr
+        return out
 
+    out = {}
+
+    if want_cells:
+        def _key(layer):
+            return _fit(layer, total, -1, np.int64) != -1
+
+        def _mask(layer):
+            return _fit(layer, total, False, bool)
+
+        if mode == "occ":
+            has_model = _mask(model_mask)
+        elif mode == "edge":
+            has_model = _key(model_edge_key)
+        elif mode == "proxy":
+            has_model = _key(model_proxy_key) | _mask(model_proxy_mask)
+        elif mode == "ink":
+            has_model = _key(model_edge_key) | _key(model_proxy_key) | _mask(model_proxy_mask)
+        else:
+            has_model = _mask(model_mask) | _key(model_edge_key) | _key(model_proxy_key) | _mask(model_proxy_mask)
+
+        has_anno = _key(anno_key)
+        has_aom = _mask(anno_over_model)
+
+        overlap = int(np.count_nonzero(has_model & has_aom))
+        model_only = int(np.count_nonzero(has_model)) - overlap
+        anno_only = int(np.count_nonzero(has_anno & ~has_model))
+        out["cells"] = (total - overlap - model_only - anno_only, model_only, anno_only, overlap)
+
+    if want_anno:
+        counts = dict.fromkeys(_ANNO_BUCKETS, 0)
+        keys = _fit(anno_key, len(anno_key), -1, np.int64)
+        keys = keys[keys >= 0]
+        if len(keys):
+            per_key = np.bincount(keys)
+            for k in np.flatnonzero(per_key):
+                bucket = _anno_bucket(raster, int(k))
+                if bucket is not None:
+                    counts[bucket] += int(per_key[k])
+        out["anno"] = counts
+
+    if want_ext:
+        n = max(len(model_edge_key), len(model_proxy_key))
+        out["ext"] = dict(_EXT_ZERO)
+        if n:
+            try:
+                def _codes(layer):
+                    keys = _fit(layer, n, 0, np.int64)
+                    uniq, inverse = np.unique(keys, return_inverse=True)
+                    table = np.array([_element_source_code(raster, int(k)) for k in uniq], dtype=np.int8)
+                    return table[inverse.reshape(-1)]
+
+                c_edge = _codes(model_edge_key)
+                c_proxy = _codes(model_proxy_key)
+
+                host = (c_edge == _EXT_HOST) | (c_proxy == _EXT_HOST)
+                dwg = (c_edge == _EXT_DWG) | (c_proxy == _EXT_DWG)
+                rvt = (c_edge == _EXT_LINK) | (c_proxy == _EXT_LINK)
+                ext = dwg | rvt
+
+                out["ext"] = {
+                    "Ext_Cells_Any": int(np.count_nonzero(ext)),
+                    "Ext_Cells_Only": int(np.count_nonzero(ext & ~host)),
+                    "Ext_Cells_DWG": int(np.count_nonzero(dwg)),
+                    "Ext_Cells_RVT": int(np.count_nonzero(rvt)),
+                }
+            except Exception as e:
+                out["ext_error"] = e
+
+    return out
+
+
+def _fused_metrics_python(raster, total, mode, layers, want_cells, want_anno, want_ext):
+    """Pure-Python implementation of compute_all_cell_metrics (one fused loop)."""
+    model_mask, model_edge_key, model_proxy_key, model_proxy_mask, anno_over_model, anno_key = layers
+
+    n_mask = len(model_mask)
+    n_edge = len(model_edge_key)
+    n_pkey = len(model_proxy_key)
+    n_pmask = len(model_proxy_mask)
+    n_aom = len(anno_over_model)
+    n_anno = len(anno_key)
+    n_ext = max(n_edge, n_pkey) if want_ext else 0
+
+    use_occ = mode in ("occ", "any")
+    use_edge = mode in ("edge", "ink", "any")
+    use_proxy = mode in ("proxy", "ink", "any")
+
+    empty = model_only = anno_only = overlap = 0
     ext_any = ext_only = ext_dwg = ext_rvt = 0
+    ext_error = None
+    anno_key_counts = {}
+    src_cache = {}
+
+    n_loop = max(total if want_cells else 0, n_anno if want_anno else 0, n_ext)
+    for idx in range(n_loop):
+        k_anno = anno_key[idx] if idx < n_anno else -1
+
+        if want_anno and k_anno >= 0:
+            anno_key_counts[k_anno] = anno_key_counts.get(k_anno, 0) + 1
+
+        k_edge = model_edge_key[idx] if idx < n_edge else -1
+        k_proxy = model_proxy_key[idx] if idx < n_pkey else -1
+
+        if want_cells and idx < total:
+            has_model = (
+                (use_edge and k_edge != -1)
+                or (use_proxy and (k_proxy != -1 or (idx < n_pmask and bool(model_proxy_mask[idx]))))
+                or (use_occ and idx < n_mask and bool(model_mask[idx]))
+            )
+            if has_model:
+                if idx < n_aom and bool(anno_over_model[idx]):
+                    overlap += 1
+                else:
+                    model_only += 1
+            elif k_anno != -1:
+                anno_only += 1
+            else:
+                empty += 1
+
+        if idx < n_ext:
+            # Missing key entries count as 0 ("none") like the legacy loop.
+            ke = k_edge if idx < n_edge else 0
+            kp = k_proxy if idx < n_pkey else 0
+            try:
+                ce = src_cache.get(ke)
+                if ce is None:
+                    ce = src_cache[ke] = _element_source_code(raster, ke)
+                cp = src_cache.get(kp)
+                if cp is None:
+                    cp = src_cache[kp] = _element_source_code(raster, kp)
+            except Exception as e:
+                # Ext counts soft-fail to zero; the other metrics keep accumulating
+                ext_error = e
+                n_ext = 0
+                continue
+
+            dwg = ce == _EXT_DWG or cp == _EXT_DWG
+            rvt = ce == _EXT_LINK or cp == _EXT_LINK
+            if dwg or rvt:
+                ext_any += 1
+                if not (ce == _EXT_HOST or cp == _EXT_HOST):
+                    ext_only += 1
+            if dwg:
+                ext_dwg += 1
+            if rvt:
+                ext_rvt += 1
+
+    out = {}
+    if want_cells:
+        out["cells"] = (empty, model_only, anno_only, overlap)
+    if want_anno:
+        counts = dict.fromkeys(_ANNO_BUCKETS, 0)
+        for k, c in anno_key_counts.items():
+            bucket = _anno_bucket(raster, k)
+            if bucket is not None:
+                counts[bucket] += c
+        out["anno"] = counts
+    if want_ext:
+        if ext_error is not None:
+            out["ext"] = dict(_EXT_ZERO)
+            out["ext_error"] = ext_error
+        else:
+            out["ext"] = {"Ext_Cells_Any": ext_any, "Ext_Cells_Only": ext_only, "Ext_Cells_DWG": ext_dwg, "Ext_Cells_RVT": ext_rvt}
+    return out
+
+
+def _fused_metrics(raster, model_presence_mode="ink", diag=None, want_cells=True, want_anno=True, want_ext=True):
+    total = raster.W * raster.H
+    mode = (model_presence_mode or "ink").lower()
+    if want_cells and mode not in _MODEL_PRESENCE_MODES:
+        raise ValueError("Unknown model_presence_mode: {0}".format(mode))
+
+    # Pull arrays defensively (tests / reconstructed rasters may be partial)
+    model_proxy_mask = _layer_or_empty(raster, "model_proxy_mask")
+    if len(model_proxy_mask) == 0:
+        model_proxy_mask = _layer_or_empty(raster, "model_proxy_presence")
+    layers = (
+        _layer_or_empty(raster, "model_mask"),
+        _layer_or_empty(raster, "model_edge_key"),
+        _layer_or_empty(raster, "model_proxy_key"),
+        model_proxy_mask,
+        _layer_or_empty(raster, "anno_over_model"),
+        _layer_or_empty(raster, "anno_key"),
+    )
+
+    try:
+        import numpy as np
+    except Exception:
+        np = None
+
+    if np is not None:
+        out = _fused_metrics_numpy(np, raster, total, mode, layers, want_cells, want_anno, want_ext)
+    else:
+        out = _fused_metrics_python(raster, total, mode, layers, want_cells, want_anno, want_ext)
+
+    if want_cells:
+        empty, model_only, anno_only, overlap = out["cells"]
+        computed_total = empty + model_only + anno_only + overlap
+        if total != computed_total:
+            msg = (
+                "CSV invariant failed: TotalCells ({0}) != "
+                "Empty + ModelOnly + AnnoOnly + Overlap ({1})"
+            ).format(total, computed_total)
+            if diag is not None:
+                diag.error(
+                    phase="export_csv",
+                    callsite="compute_cell_metrics",
+                    message=msg,
+                    extra={"model_presence_mode": mode},
+                )
+            raise AssertionError(msg)
+
+        out["cells"] = {
+            "TotalCells": total,
+            "Empty": empty,
+            "ModelOnly": model_only,
+            "AnnoOnly": anno_only,
+            "Overlap": overlap,
+        }
 
-    for i in range(n):
-        k_edge = edge_keys[i] if i < len(edge_keys) else 0
-        k_proxy = proxy_keys[i] if i < len(proxy_keys) else 0
+    if want_anno:
+        out["anno"] = {f"AnnoCells_{k}": v for k, v in out["anno"].items()}
 
-        src_edge = _get_source_type(k_edge)
-        src_proxy = _get_source_type(k_proxy)
+    return out
 
-        host = (src_edge == "HOST") or (src_proxy == "HOST")
-        dwg = (src_edge == "DWG") or (src_proxy == "DWG")
-        rvt = (src_edge == "LINK") or (src_proxy == "LINK")
 
-        ext = dwg or rvt
-        if ext:
-            ext_any += 1
-            if not host:
-                ext_only += 1
-        if dwg:
-            ext_dwg += 1
-        if rvt:
-            ext_rvt += 1
+def compute_all_cell_metrics(raster, model_presence_mode="ink", diag=None, ext_errors=None):
+    """Compute every per-cell count the VOP CSV row needs in one pass.
 
-    return {"Ext_Cells_Any": ext_any, "Ext_Cells_Only": ext_only, "Ext_Cells_DWG": ext_dwg, "Ext_Cells_RVT": ext_rvt}
+    Fuses compute_cell_metrics, compute_annotation_type_metrics and
+    compute_external_cell_metrics: the occupancy/annotation layers are read
+    once, using NumPy boolean masks + bincount when NumPy is importable and a
+    single fused Python loop otherwise. Per-key lookups (element source type,
+    annotation type) run once per distinct key instead of once per cell.
+
+    Args:
+        ext_errors: Optional list; when given, a failure in the external-cell
+            counts zeroes ext_metrics and appends the exception here instead
+            of raising (the other counts are unaffected)
+
+    Returns:
+        (metrics, anno_metrics, ext_metrics) with exactly the keys of the
+        three individual functions.
+    """
+    out = _fused_metrics(raster, model_presence_mode=model_presence_mode, diag=diag)
+    if "ext_error" in out:
+        if ext_errors is None:
+            raise out["ext_error"]
+        ext_errors.append(out["ext_error"])
+    return out["cells"], out["anno"], out["ext"]
+
+
+def compute_external_cell_metrics(raster):
+    """Compute external-cell metrics for VOP CSV.
+
+    Definitions:
+        - DWG: cells with any model ink from elements whose source_type == "DWG"
+        - RVT: cells with any model ink from elements whose source_type == "LINK" (link only)
+        - Any: cells with any external model ink (DWG or LINK)
+        - Only: cells with external model ink and NO HOST model ink
+
+    Notes:
+        - Uses model ink keys (edge/proxy). Annotation ink is ignored for ext-cell metrics.
+        - Tolerates missing element_meta or key arrays by returning zeros.
+    """
+    out = _fused_metrics(raster, want_cells=False, want_anno=False)
+    if "ext_error" in out:
+        raise out["ext_error"]
+    return out["ext"]
 
 
 def compute_cell_metrics(raster, model_presence_mode="ink", diag=None):
@@ -115,102 +401,14 @@ def compute_cell_metrics(raster, model_presence_mode="ink", diag=None):
             - "ink"  : edge OR proxy (DEFAULT; ink-on-screen occupancy)
             - "any"  : occ OR edge OR proxy
         diag: optional diagnostics collector
-    """
-    total = raster.W * raster.H
-    empty = 0
-    model_only = 0
-    anno_only = 0
-    overlap = 0
-
-    mode = (model_presence_mode or "ink").lower()
 
-    # Pull arrays defensively (tests / reconstructed rasters may be partial)
-    model_mask = getattr(raster, "model_mask", []) or []
-    model_edge_key = getattr(raster, "model_edge_key", []) or []
-    model_proxy_key = getattr(raster, "model_proxy_key", []) or []
-    model_proxy_mask = getattr(raster, "model_proxy_mask", []) or getattr(raster, "model_proxy_presence", []) or []
-
-    def _has_model(idx):
-        if mode == "occ":
-            return (idx < len(model_mask)) and bool(model_mask[idx])
-
-        if mode == "edge":
-            return (idx < len(model_edge_key)) and (model_edge_key[idx] != -1)
-
-        if mode == "proxy":
-            present = False
-            if idx < len(model_proxy_key):
-                present = present or (model_proxy_key[idx] != -1)
-            if idx < len(model_proxy_mask):
-                present = present or bool(model_proxy_mask[idx])
-            return present
-
-        if mode == "ink":
-            present = False
-            if idx < len(model_edge_key):
-                present = present or (model_edge_key[idx] != -1)
-            if idx < len(model_proxy_key):
-                present = present or (model_proxy_key[idx] != -1)
-            if idx < len(model_proxy_mask):
-                present = present or bool(model_proxy_mask[idx])
-            return present
-
-        if mode == "any":
-            present = False
-            if idx < len(model_mask):
-                present = present or bool(model_mask[idx])
-            if idx < len(model_edge_key):
-                present = present or (model_edge_key[idx] != -1)
-            if idx < len(model_proxy_key):
-                present = present or (model_proxy_key[idx] != -1)
-            if idx < len(model_proxy_mask):
-                present = present or bool(model_proxy_mask[idx])
-            return present
-
-        raise ValueError("Unknown model_presence_mode: {0}".format(mode))
-
-    anno_over_model = getattr(raster, "anno_over_model", []) or []
-    anno_key = getattr(raster, "anno_key", []) or []
-
-    for idx in range(total):
-        has_model = _has_model(idx)
-
-        # "Any annotation ink" should be driven by anno_key presence.
-        # Keep anno_over_model as a separate concept (overlap channel).
-        has_anno = (idx < len(anno_key)) and (anno_key[idx] != -1)
-        has_anno_over_model = (idx < len(anno_over_model)) and bool(anno_over_model[idx])
-
-        if has_model and has_anno_over_model:
-            overlap += 1
-        elif has_model:
-            model_only += 1
-        elif has_anno:
-            anno_only += 1
-        else:
-            empty += 1
-
-    computed_total = empty + model_only + anno_only + overlap
-    if total != computed_total:
-        msg = (
-            "CSV invariant failed: TotalCells ({0}) != "
-            "Empty + ModelOnly + AnnoOnly + Overlap ({1})"
-        ).format(total, computed_total)
-        if diag is not None:
-            diag.error(
-                phase="export_csv",
-                callsite="compute_cell_metrics",
-                message=msg,
-                extra={"model_presence_mode": mode},
-            )
-        raise AssertionError(msg)
-
-    return {
-        "TotalCells": total,
-        "Empty": empty,
-        "ModelOnly": model_only,
-        "AnnoOnly": anno_only,
-        "Overlap": overlap,
-    }
+    Commentary:
+        "Any annotation ink" is driven by anno_key presence; anno_over_model
+        stays a separate concept (overlap channel).
+    """
+    return _fused_metrics(
+        raster, model_presence_mode=model_presence_mode, diag=diag, want_anno=False, want_ext=False
+    )["cells"]
 
 
 def compute_annotation_type_metrics(raster):
@@ -233,40 +431,7 @@ def compute_annotation_type_metrics(raster):
         ✔ Matches SSM classification: TEXT, TAG, DIM, DETAIL, LINES, REGION, OTHER
         ✔ Includes keynotes: Material Element Keynotes→TAG, User Keynotes→TEXT
     """
-    counts = {
-        "TEXT": 0,
-        "TAG": 0,
-        "DIM": 0,
-        "DETAIL": 0,
-        "LINES": 0,
-        "REGION": 0,
-        "OTHER": 0
-    }
-
-    # Count cells by annotation type
-    for i, anno_idx in enumerate(raster.anno_key):
-        if anno_idx >= 0:  # Cell has annotation
-            if anno_idx < len(raster.anno_meta):
-                meta = raster.anno_meta[anno_idx]
-
-                # Base type from annotation pass
-                anno_type = (meta.get("type") or "OTHER").upper()
-
-                # Remap FilledRegion to REGION for CSV metrics
-                try:
-                    from Autodesk.Revit.DB import BuiltInCategory
-                    cat_id = meta.get("cat_id", None)
-                    if cat_id is not None and int(cat_id) == int(BuiltInCategory.OST_FilledRegion):
-                        anno_type = "REGION"
-                except Exception:
-                    pass
-
-                if anno_type in counts:
-                    counts[anno_type] += 1
-                else:
-                    counts["OTHER"] += 1
-
-    return {f"AnnoCells_{k}": v for k, v in counts.items()}
+    return _fused_metrics(raster, want_cells=False, want_ext=False)["anno"]
 
 def _coerce_view_id_int(view_id):
     """
@@ -1071,8 +1236,13 @@ def export_pipeline_to_csv(pipeline_result, output_dir, config, doc=None, diag=N
         else:
             try:
                 model_presence_mode = getattr(config, "model_presence_mode", "ink")
-                metrics = compute_cell_metrics(raster, model_presence_mode=model_presence_mode, diag=diag)
-                anno_metrics = compute_annotation_type_metrics(raster)
+                # Single fused pass over the raster layers; an ext-cell failure
+                # only zeroes the Ext_* columns (reported below)
+                ext_errors = []
+                metrics, anno_metrics, ext_metrics = compute_all_cell_metrics(
+                    raster, model_presence_mode=model_presence_mode, diag=diag, ext_errors=ext_errors
+                )
+                metrics.update(ext_metrics)
             except Exception as e:
                 if diag is not None:
                     try:
@@ -1093,19 +1263,20 @@ def export_pipeline_to_csv(pipeline_result, output_dir, config, doc=None, diag=N
                         pass
                 raise
 
-        # External-cell metrics
+        # External-cell metrics soft-fail to zeros
         if not metrics_only:
-            try:
-                metrics.update(compute_external_cell_metrics(raster))
-            except Exception as e:
+            for e in ext_errors:
                 if diag is not None:
                     try:
                         diag.warn(
                             phase="export_csv",
                             callsite="export_pipeline_to_csv.ext_cells",
                             message="Failed to compute external-cell metrics; using zeros",
-                            exc=e,
-                            extra={"view_id": view_result.get("view_id", 0)},
+                            extra={
+                                "view_id": view_result.get("view_id", 0),
+                                "exc_type": type(e).__name__,
+                                "exc_message": str(e),
+                            },
                         )
                     except Exception:
                         pass
@@ -1468,9 +1639,9 @@ def view_result_to_vop_row(view_result, config, doc, date_override=None, run_id=
 
         # Compute metrics
         model_presence_mode = getattr(config, "model_presence_mode", "ink")
-        metrics = compute_cell_metrics(raster, model_presence_mode=model_presence_mode)
-        anno_metrics = compute_annotation_type_metrics(raster)
-        ext_metrics = compute_external_cell_metrics(raster)
+        metrics, anno_metrics, ext_metrics = compute_all_cell_metrics(
+            raster, model_presence_mode=model_presence_mode
+        )
 
 
     # Get view object
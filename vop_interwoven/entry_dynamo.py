@@ -47,10 +47,12 @@ from datetime import datetime
 try:
     from .config import Config
     from .pipeline import process_document_views
+    from .core.raster_spill import json_default
 except Exception:
     # Dynamo sometimes imports modules without package context; fall back to absolute.
     from vop_interwoven.config import Config
     from vop_interwoven.pipeline import process_document_views
+    from vop_interwoven.core.raster_spill import json_default
 
 import copy
 
@@ -68,6 +70,10 @@ def _prune_view_raster_for_json(view_result, detail):
         d = "full"
 
     if d == "full":
+        if hasattr(r, "to_dict"):
+            # SpilledRaster (cfg.raster_spill_enabled): materialize the layers for JSON
+            r = r.to_dict()
+            view_result["raster"] = r
         r["debug_detail"] = "full"
         return
 
@@ -575,7 +581,7 @@ def run_vop_pipeline_json(doc, view_ids, cfg=None, output_path=None):
     if output_path:
         try:
             with open(output_path, "w") as f:
-                json.dump(result, f, indent=2, default=str)
+                json.dump(result, f, indent=2, default=json_default)
             result["json_export_path"] = output_path
         except Exception as e:
             result["errors"].append(f"JSON export error: {str(e)}")
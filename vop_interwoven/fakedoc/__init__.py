@@ -0,0 +1,185 @@
+"""
+Offline Revit stand-in ("FakeDoc") for replaying the pipeline without Revit.
+
+The pipeline imports the Revit API lazily (``from Autodesk.Revit.DB import ...``
+inside functions), so installing pure-Python modules under those names in
+sys.modules is enough to drive collection, view basis, silhouettes, rasterization
+and export end-to-end from a recorded scene.
+
+Example:
+    >>> from vop_interwoven.fakedoc import FakeRevit
+    >>> with FakeRevit("scene.json") as fake:
+    ...     results = process_document_views(fake.doc, fake.view_ids, Config())
+
+Commentary:
+    ✔ install()/uninstall() are reversible; prior sys.modules entries are restored
+    ✔ Modules with import-time optional bindings are re-bound on install/uninstall
+    ✔ Deterministic: element iteration order is scene order
+    ⚠ Only the API surface used by vop_interwoven is modelled
+"""
+
+import importlib
+import sys
+import types
+
+from . import api
+from .scene import build_document, load_scene, save_scene
+
+
+# Modules that bind Revit names at import time (try/except at module level)
+_REBIND_MODULES = ("vop_interwoven.revit.linked_documents",)
+
+_FAKE_MODULE_NAMES = (
+    "Autodesk",
+    "Autodesk.Revit",
+    "Autodesk.Revit.DB",
+    "Autodesk.Revit.UI",
+    "System",
+    "System.Collections",
+    "System.Collections.Generic",
+    "clr",
+)
+
+_saved = None
+
+
+def _make_modules(link_collector_2024=True):
+    mods = {name: types.ModuleType(name) for name in _FAKE_MODULE_NAMES}
+
+    db = mods["Autodesk.Revit.DB"]
+    for name in dir(api):
+        if not name.startswith("_"):
+            setattr(db, name, getattr(api, name))
+    db.__fakedoc__ = True
+
+    ui = mods["Autodesk.Revit.UI"]
+
+    class TaskDialog(object):
+        @staticmethod
+        def Show(title, message):
+            return None
+
+    ui.TaskDialog = TaskDialog
+
+    mods["Autodesk"].Revit = mods["Autodesk.Revit"]
+    mods["Autodesk.Revit"].DB = db
+    mods["Autodesk.Revit"].UI = ui
+
+    system = mods["System"]
+    system.Enum = api.Enum
+    system.Collections = mods["System.Collections"]
+    mods["System.Collections"].Generic = mods["System.Collections.Generic"]
+    mods["System.Collections.Generic"].List = api.List
+
+    clr = mods["clr"]
+    clr.AddReference = lambda *a, **k: None
+    clr.GetClrType = lambda t: _ClrType(t, link_collector_2024)
+    return mods
+
+
+class _ClrParam(object):
+    def __init__(self, full_name):
+        self.ParameterType = types.SimpleNamespace(FullName=full_name)
+
+
+class _ClrType(object):
+    """Just enough reflection for linked_documents' collector-overload probe."""
+
+    def __init__(self, t, link_collector_2024):
+        self._t = t
+        self._link_2024 = link_collector_2024
+
+    def GetConstructors(self):
+        ctors = [("Document",), ("Document", "ElementId")]
+        if self._t is api.FilteredElementCollector and self._link_2024:
+            ctors.append(("Document", "ElementId", "ElementId"))
+        return [
+            types.SimpleNamespace(GetParameters=(lambda ps=ps: [_ClrParam("Autodesk.Revit.DB." + p) for p in ps]))
+            for ps in ctors
+        ]
+
+
+def _rebind():
+    for name in _REBIND_MODULES:
+        mod = sys.modules.get(name)
+        if mod is not None:
+            importlib.reload(mod)
+
+
+def is_installed():
+    return _saved is not None
+
+
+def install(link_collector_2024=True):
+    """Expose the fake API as Autodesk.Revit.DB / System / clr (idempotent).
+
+    Args:
+        link_collector_2024: advertise the Revit 2024+ FilteredElementCollector
+            (doc, viewId, linkId) overload; False exercises the legacy link path
+    """
+    global _saved
+    if _saved is not None:
+        return
+    _saved = {name: sys.modules.get(name) for name in _FAKE_MODULE_NAMES}
+    sys.modules.update(_make_modules(link_collector_2024))
+    _rebind()
+
+
+def uninstall():
+    """Restore whatever was in sys.modules before install()."""
+    global _saved
+    if _saved is None:
+        return
+    for name, mod in _saved.items():
+        if mod is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = mod
+    _saved = None
+    _rebind()
+
+
+class FakeRevit(object):
+    """Context manager: install the fake API and load a scene.
+
+    Args:
+        scene: scene dict, or path to a .json / .msgpack scene file
+        link_collector_2024: see install()
+
+    Attributes:
+        doc: api.Document
+        view_ids: [int] view ids in scene order
+    """
+
+    def __init__(self, scene, link_collector_2024=True):
+        if not isinstance(scene, dict):
+            scene = load_scene(scene)
+        self.scene = scene
+        self.link_collector_2024 = bool(link_collector_2024)
+        self.doc = None
+        self.view_ids = []
+        self._owns_install = False
+
+    def __enter__(self):
+        self._owns_install = not is_installed()
+        install(link_collector_2024=self.link_collector_2024)
+        self.doc = build_document(self.scene)
+        self.view_ids = [int(v["id"]) for v in self.scene.get("views", ())]
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._owns_install:
+            uninstall()
+        return False
+
+
+__all__ = [
+    "api",
+    "FakeRevit",
+    "install",
+    "uninstall",
+    "is_installed",
+    "build_document",
+    "load_scene",
+    "save_scene",
+]
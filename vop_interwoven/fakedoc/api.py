@@ -0,0 +1,1275 @@
+"""
+Pure-Python stand-ins for the Autodesk.Revit.DB surface used by the pipeline.
+
+Only the members the pipeline actually touches are modelled. Semantics follow
+the Revit API closely enough for deterministic offline replay:
+
+    - XYZ / UV / Transform / BoundingBoxXYZ are immutable value types
+    - ElementId compares and hashes by IntegerValue (Value alias for 2024+)
+    - enums (BuiltInCategory, ViewType, ...) are IntEnums, so int(bic) works
+    - .NET collections expose Size / Count / GetEnumerator() / get_Item()
+    - FilteredElementCollector filters lazily and is re-iterable
+
+Nothing here imports Revit, clr or System; install() in the package __init__
+exposes this module as Autodesk.Revit.DB.
+"""
+
+import math
+from enum import IntEnum
+
+
+# ---------------------------------------------------------------------------
+# .NET-ish collections
+# ---------------------------------------------------------------------------
+
+
+class _Enumerator(object):
+    def __init__(self, items):
+        self._items = list(items)
+        self._i = -1
+
+    def MoveNext(self):
+        self._i += 1
+        return self._i < len(self._items)
+
+    @property
+    def Current(self):
+        return self._items[self._i]
+
+    def Reset(self):
+        self._i = -1
+
+
+class NetList(list):
+    """list with the .NET collection members the pipeline calls."""
+
+    @property
+    def Size(self):
+        return len(self)
+
+    @property
+    def Count(self):
+        return len(self)
+
+    @property
+    def IsEmpty(self):
+        return len(self) == 0
+
+    def GetEnumerator(self):
+        return _Enumerator(self)
+
+    def get_Item(self, i):
+        return self[i]
+
+    def Add(self, item):
+        self.append(item)
+
+
+class _GenericList(object):
+    """System.Collections.Generic.List: List[T]() -> NetList."""
+
+    def __getitem__(self, _t):
+        return NetList
+
+    def __call__(self, items=()):
+        return NetList(items)
+
+
+List = _GenericList()
+
+
+class Enum(object):
+    """System.Enum.GetName for IntEnum stand-ins."""
+
+    @staticmethod
+    def GetName(enum_type, value):
+        try:
+            return enum_type(int(value)).name
+        except Exception:
+            return None
+
+
+# ---------------------------------------------------------------------------
+# Value types
+# ---------------------------------------------------------------------------
+
+
+class XYZ(object):
+    __slots__ = ("X", "Y", "Z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.X = float(x)
+        self.Y = float(y)
+        self.Z = float(z)
+
+    def __repr__(self):
+        return "XYZ({0:g}, {1:g}, {2:g})".format(self.X, self.Y, self.Z)
+
+    def __eq__(self, other):
+        return isinstance(other, XYZ) and (self.X, self.Y, self.Z) == (other.X, other.Y, other.Z)
+
+    def __hash__(self):
+        return hash((self.X, self.Y, self.Z))
+
+    def __add__(self, o):
+        return XYZ(self.X + o.X, self.Y + o.Y, self.Z + o.Z)
+
+    def __sub__(self, o):
+        return XYZ(self.X - o.X, self.Y - o.Y, self.Z - o.Z)
+
+    def __mul__(self, s):
+        return XYZ(self.X * s, self.Y * s, self.Z * s)
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return self.Negate()
+
+    def Add(self, o):
+        return self + o
+
+    def Subtract(self, o):
+        return self - o
+
+    def Multiply(self, s):
+        return self * s
+
+    def Divide(self, s):
+        return XYZ(self.X / s, self.Y / s, self.Z / s)
+
+    def Negate(self):
+        return XYZ(-self.X, -self.Y, -self.Z)
+
+    def DotProduct(self, o):
+        return self.X * o.X + self.Y * o.Y + self.Z * o.Z
+
+    def CrossProduct(self, o):
+        return XYZ(
+            self.Y * o.Z - self.Z * o.Y,
+            self.Z * o.X - self.X * o.Z,
+            self.X * o.Y - self.Y * o.X,
+        )
+
+    def GetLength(self):
+        return math.sqrt(self.DotProduct(self))
+
+    def Normalize(self):
+        n = self.GetLength()
+        return XYZ(self.X / n, self.Y / n, self.Z / n) if n > 0 else XYZ(0.0, 0.0, 0.0)
+
+    def DistanceTo(self, o):
+        return (self - o).GetLength()
+
+    def IsAlmostEqualTo(self, o, tol=1e-9):
+        return self.DistanceTo(o) <= tol
+
+    @property
+    def IsZeroLength(self):
+        return self.GetLength() == 0.0
+
+    def __getitem__(self, i):
+        return (self.X, self.Y, self.Z)[i]
+
+
+XYZ.Zero = XYZ(0.0, 0.0, 0.0)
+XYZ.BasisX = XYZ(1.0, 0.0, 0.0)
+XYZ.BasisY = XYZ(0.0, 1.0, 0.0)
+XYZ.BasisZ = XYZ(0.0, 0.0, 1.0)
+
+
+class UV(object):
+    __slots__ = ("U", "V")
+
+    def __init__(self, u=0.0, v=0.0):
+        self.U = float(u)
+        self.V = float(v)
+
+    def __repr__(self):
+        return "UV({0:g}, {1:g})".format(self.U, self.V)
+
+
+class BoundingBoxUV(object):
+    def __init__(self, umin, vmin, umax, vmax):
+        self.Min = UV(umin, vmin)
+        self.Max = UV(umax, vmax)
+
+
+class Transform(object):
+    """Rigid/affine transform with Revit's Origin + BasisX/Y/Z columns."""
+
+    def __init__(self, origin=None, basis_x=None, basis_y=None, basis_z=None):
+        self.Origin = origin or XYZ(0.0, 0.0, 0.0)
+        self.BasisX = basis_x or XYZ(1.0, 0.0, 0.0)
+        self.BasisY = basis_y or XYZ(0.0, 1.0, 0.0)
+        self.BasisZ = basis_z or XYZ(0.0, 0.0, 1.0)
+
+    @staticmethod
+    def CreateTranslation(v):
+        return Transform(origin=XYZ(v.X, v.Y, v.Z))
+
+    @staticmethod
+    def CreateRotation(axis, angle):
+        # Only Z-axis rotation is needed by the scene format
+        c, s = math.cos(angle), math.sin(angle)
+        return Transform(basis_x=XYZ(c, s, 0.0), basis_y=XYZ(-s, c, 0.0))
+
+    @property
+    def IsIdentity(self):
+        return (
+            self.Origin.GetLength() == 0.0
+            and self.BasisX == XYZ.BasisX
+            and self.BasisY == XYZ.BasisY
+            and self.BasisZ == XYZ.BasisZ
+        )
+
+    def OfVector(self, v):
+        return self.BasisX * v.X + self.BasisY * v.Y + self.BasisZ * v.Z
+
+    def OfPoint(self, p):
+        return self.Origin + self.OfVector(p)
+
+    def Multiply(self, right):
+        """self * right (apply right first)."""
+        return Transform(
+            origin=self.OfPoint(right.Origin),
+            basis_x=self.OfVector(right.BasisX),
+            basis_y=self.OfVector(right.BasisY),
+            basis_z=self.OfVector(right.BasisZ),
+        )
+
+    def __mul__(self, right):
+        return self.Multiply(right)
+
+    @property
+    def Inverse(self):
+        # 3x3 inverse via adjugate (handles non-orthonormal bases)
+        a, b, c = self.BasisX, self.BasisY, self.BasisZ
+        det = a.DotProduct(b.CrossProduct(c))
+        if abs(det) < 1e-15:
+            raise ValueError("Transform is not invertible")
+        r0 = b.CrossProduct(c) * (1.0 / det)
+        r1 = c.CrossProduct(a) * (1.0 / det)
+        r2 = a.CrossProduct(b) * (1.0 / det)
+        bx = XYZ(r0.X, r1.X, r2.X)
+        by = XYZ(r0.Y, r1.Y, r2.Y)
+        bz = XYZ(r0.Z, r1.Z, r2.Z)
+        inv = Transform(basis_x=bx, basis_y=by, basis_z=bz)
+        o = inv.OfVector(self.Origin)
+        inv.Origin = XYZ(-o.X, -o.Y, -o.Z)
+        return inv
+
+    def __repr__(self):
+        return "Transform(O={0}, X={1}, Y={2}, Z={3})".format(self.Origin, self.BasisX, self.BasisY, self.BasisZ)
+
+
+Transform.Identity = Transform()
+
+
+class BoundingBoxXYZ(object):
+    def __init__(self, min_pt=None, max_pt=None, transform=None):
+        self.Min = min_pt
+        self.Max = max_pt
+        self.Transform = transform or Transform()
+        self.Enabled = True
+
+    def __repr__(self):
+        return "BoundingBoxXYZ({0}, {1})".format(self.Min, self.Max)
+
+
+class Outline(object):
+    def __init__(self, min_pt, max_pt):
+        self.MinimumPoint = min_pt
+        self.MaximumPoint = max_pt
+
+    def Intersects(self, other, tol=0.0):
+        return not (
+            other.MaximumPoint.X < self.MinimumPoint.X - tol
+            or other.MinimumPoint.X > self.MaximumPoint.X + tol
+            or other.MaximumPoint.Y < self.MinimumPoint.Y - tol
+            or other.MinimumPoint.Y > self.MaximumPoint.Y + tol
+            or other.MaximumPoint.Z < self.MinimumPoint.Z - tol
+            or other.MinimumPoint.Z > self.MaximumPoint.Z + tol
+        )
+
+
+# ---------------------------------------------------------------------------
+# Enums
+# ---------------------------------------------------------------------------
+
+
+class BuiltInCategory(IntEnum):
+    INVALID = -1
+    OST_Walls = -2000011
+    OST_Floors = -2000032
+    OST_Roofs = -2000035
+    OST_Ceilings = -2000038
+    OST_Doors = -2000023
+    OST_Windows = -2000014
+    OST_Columns = -2000100
+    OST_StructuralColumns = -2001330
+    OST_StructuralFraming = -2001320
+    OST_Stairs = -2000120
+    OST_Railings = -2000126
+    OST_Casework = -2001000
+    OST_Furniture = -2000080
+    OST_GenericModel = -2000151
+    OST_MechanicalEquipment = -2001140
+    OST_ElectricalEquipment = -2001040
+    OST_PlumbingFixtures = -2001160
+    OST_DuctCurves = -2008000
+    OST_PipeCurves = -2008044
+    OST_Rooms = -2000160
+    OST_Areas = -2003200
+    OST_MEPSpaces = -2003600
+    OST_Lines = -2000051
+    OST_Reveals = -2000999
+    OST_Levels = -2000240
+    OST_Grids = -2000220
+    OST_LevelHeads = -2000026
+    OST_GridHeads = -2000027
+    OST_Cameras = -2000500
+    OST_Viewers = -2000279
+    OST_SectionBox = -2000301
+    OST_SectionHeads = -2000200
+    OST_SectionMarks = -2000201
+    OST_ElevationMarks = -2000535
+    OST_CalloutHeads = -2000202
+    OST_ReferenceViewer = -2000198
+    OST_SunPath = -2001590
+    OST_AdaptivePoints = -2001500
+    OST_PointClouds = -2010001
+    OST_TextNotes = -2000300
+    OST_Dimensions = -2000260
+    OST_RoomTags = -2000480
+    OST_SpaceTags = -2003602
+    OST_AreaTags = -2003201
+    OST_DoorTags = -2000460
+    OST_WindowTags = -2000600
+    OST_WallTags = -2000225
+    OST_MEPSpaceTags = -2003603
+    OST_GenericAnnotation = -2000150
+    OST_KeynoteTags = -2000400
+    OST_FilledRegion = -2000394
+    OST_DetailComponents = -2002000
+    OST_RvtLinks = -2001352
+    OST_ImportObjectStyles = -2000028
+
+
+class CategoryType(IntEnum):
+    Invalid = 0
+    Model = 1
+    Annotation = 2
+    Internal = 3
+    AnalyticalModel = 4
+
+
+class ViewType(IntEnum):
+    # Codes match view_basis._view_type_name's numeric fallback map
+    Undefined = 0
+    FloorPlan = 1
+    CeilingPlan = 2
+    Elevation = 3
+    ThreeD = 4
+    Schedule = 5
+    DrawingSheet = 6
+    ProjectBrowser = 7
+    Report = 8
+    DraftingView = 9
+    Legend = 10
+    Section = 11
+    Detail = 12
+    Rendering = 13
+    Walkthrough = 14
+    SystemBrowser = 15
+    CostReport = 16
+    LoadReport = 17
+    ColumnSchedule = 18
+    PanelSchedule = 19
+    PresureLossReport = 20
+    AreaPlan = 21
+    EngineeringPlan = 22
+
+
+class ViewFamily(IntEnum):
+    Invalid = 0
+    FloorPlan = 1
+    CeilingPlan = 2
+    Section = 3
+    Elevation = 4
+    Drafting = 5
+    ThreeDimensional = 6
+    Legend = 7
+    AreaPlan = 8
+    StructuralPlan = 9
+    Detail = 10
+
+
+class ViewDetailLevel(IntEnum):
+    Undefined = 0
+    Coarse = 1
+    Medium = 2
+    Fine = 3
+
+
+class PlanViewPlane(IntEnum):
+    CutPlane = 0
+    TopClipPlane = 1
+    BottomClipPlane = 2
+    UnderlayBottom = 3
+    ViewDepthPlane = 4
+
+
+class BuiltInParameter(IntEnum):
+    INVALID = -1
+    VIEW_PHASE = -1012101
+    VIEW_DISCIPLINE = -1006010
+    VIEWER_BOUND_OFFSET_FAR = -1007003
+    VIEWER_ANNOTATION_CROP_ACTIVE = -1007004
+    VIEWER_SHEET_NUMBER = -1005500
+    VIEW_NAME = -1005100
+    ELEM_FAMILY_AND_TYPE_PARAM = -1002052
+    ALL_MODEL_TYPE_NAME = -1002002
+
+
+# ---------------------------------------------------------------------------
+# Ids, categories, parameters
+# ---------------------------------------------------------------------------
+
+
+class ElementId(object):
+    __slots__ = ("IntegerValue",)
+
+    def __init__(self, value):
+        self.IntegerValue = int(value)
+
+    @property
+    def Value(self):
+        return self.IntegerValue
+
+    def __eq__(self, other):
+        if isinstance(other, ElementId):
+            return self.IntegerValue == other.IntegerValue
+        return NotImplemented
+
+    def __ne__(self, other):
+        r = self.__eq__(other)
+        return r if r is NotImplemented else not r
+
+    def __hash__(self):
+        return hash(self.IntegerValue)
+
+    def __int__(self):
+        return self.IntegerValue
+
+    def __repr__(self):
+        return "ElementId({0})".format(self.IntegerValue)
+
+    def ToString(self):
+        return str(self.IntegerValue)
+
+
+ElementId.InvalidElementId = ElementId(-1)
+
+
+class Category(object):
+    def __init__(self, bic, name=None, category_type=CategoryType.Model):
+        self.BuiltInCategory = bic
+        self.Id = ElementId(int(bic))
+        self.Name = name or bic.name.replace("OST_", "")
+        self.CategoryType = category_type
+
+    def __repr__(self):
+        return "Category({0})".format(self.Name)
+
+
+class Parameter(object):
+    def __init__(self, name, value):
+        self.Definition = type("Definition", (), {"Name": name})()
+        self._v = value
+
+    @property
+    def HasValue(self):
+        return self._v is not None
+
+    def AsString(self):
+        return None if self._v is None else str(self._v)
+
+    def AsValueString(self):
+        return self.AsString()
+
+    def AsInteger(self):
+        try:
+            return int(self._v)
+        except Exception:
+            return 0
+
+    def AsDouble(self):
+        try:
+            return float(self._v)
+        except Exception:
+            return 0.0
+
+    def AsElementId(self):
+        try:
+            return ElementId(int(self._v))
+        except Exception:
+            return ElementId.InvalidElementId
+
+
+class _Categories(object):
+    def __init__(self, doc):
+        self._doc = doc
+
+    def get_Item(self, key):
+        try:
+            return self._doc._category_for(BuiltInCategory(int(key)))
+        except Exception:
+            return None
+
+    def __iter__(self):
+        for bic in BuiltInCategory:
+            if bic != BuiltInCategory.INVALID:
+                yield self._doc._category_for(bic)
+
+    @property
+    def Size(self):
+        return len(BuiltInCategory) - 1
+
+
+class _Settings(object):
+    def __init__(self, doc):
+        self.Categories = _Categories(doc)
+
+
+# ---------------------------------------------------------------------------
+# Geometry
+# ---------------------------------------------------------------------------
+
+
+class GeometryObject(object):
+    Visibility = 0
+    GraphicsStyleId = ElementId.InvalidElementId
+
+
+class Curve(GeometryObject):
+    IsBound = True
+
+    def Tessellate(self):
+        return NetList(self._points())
+
+    def GetEndPoint(self, i):
+        pts = self._points()
+        return pts[0] if int(i) == 0 else pts[-1]
+
+    def Evaluate(self, t, normalized=True):
+        pts = self._points()
+        if len(pts) < 2:
+            return pts[0]
+        if not normalized:
+            t = t / self.Length if self.Length > 0 else 0.0
+        a, b = pts[0], pts[-1]
+        return a + (b - a) * float(t)
+
+    @property
+    def Length(self):
+        pts = self._points()
+        return sum(pts[i].DistanceTo(pts[i + 1]) for i in range(len(pts) - 1))
+
+    def CreateTransformed(self, trf):
+        return _PointCurve([trf.OfPoint(p) for p in self._points()])
+
+
+class _PointCurve(Curve):
+    def __init__(self, points):
+        self._pts = list(points)
+
+    def _points(self):
+        return list(self._pts)
+
+
+class Line(_PointCurve):
+    @staticmethod
+    def CreateBound(a, b):
+        return Line([a, b])
+
+    @property
+    def Direction(self):
+        return (self._pts[-1] - self._pts[0]).Normalize()
+
+    def CreateTransformed(self, trf):
+        return Line([trf.OfPoint(p) for p in self._pts])
+
+
+class Arc(_PointCurve):
+    """Arc stored as its tessellation (start, ..., end)."""
+
+
+class PolyLine(GeometryObject):
+    def __init__(self, points):
+        self._pts = list(points)
+
+    def GetCoordinates(self):
+        return NetList(self._pts)
+
+    @property
+    def NumberOfCoordinates(self):
+        return len(self._pts)
+
+    def GetTransformed(self, trf):
+        return PolyLine([trf.OfPoint(p) for p in self._pts])
+
+
+class Edge(GeometryObject):
+    def __init__(self, a, b):
+        self._curve = Line([a, b])
+
+    def AsCurve(self):
+        return self._curve
+
+    def Tessellate(self):
+        return self._curve.Tessellate()
+
+    def Evaluate(self, t):
+        return self._curve.Evaluate(t, True)
+
+
+class MeshTriangle(object):
+    def __init__(self, a, b, c):
+        self._v = (a, b, c)
+
+    def get_Vertex(self, i):
+        return self._v[i]
+
+
+class Mesh(GeometryObject):
+    def __init__(self, triangles):
+        self._tris = [MeshTriangle(*t) for t in triangles]
+        verts = []
+        seen = set()
+        for t in triangles:
+            for p in t:
+                if p not in seen:
+                    seen.add(p)
+                    verts.append(p)
+        self.Vertices = NetList(verts)
+
+    @property
+    def NumTriangles(self):
+        return len(self._tris)
+
+    def get_Triangle(self, i):
+        return self._tris[i]
+
+    def GetTriangles(self):
+        return NetList(self._tris)
+
+
+class Face(GeometryObject):
+    pass
+
+
+class PlanarFace(Face):
+    """Planar polygon face (outer loop first, then holes)."""
+
+    def __init__(self, loops):
+        self._loops = [list(loop) for loop in loops if len(loop) >= 3]
+        outer = self._loops[0]
+        n = XYZ(0.0, 0.0, 0.0)
+        # Newell normal of the outer loop
+        for i, p in enumerate(outer):
+            q = outer[(i + 1) % len(outer)]
+            n = n + XYZ((p.Y - q.Y) * (p.Z + q.Z), (p.Z - q.Z) * (p.X + q.X), (p.X - q.X) * (p.Y + q.Y))
+        self._area_outer = 0.5 * n.GetLength()
+        self.FaceNormal = n.Normalize()
+        self.Origin = outer[0]
+        # In-plane axes for the UV parameterization
+        ref = XYZ.BasisZ if abs(self.FaceNormal.Z) < 0.9 else XYZ.BasisX
+        self.XVector = ref.CrossProduct(self.FaceNormal).Normalize()
+        self.YVector = self.FaceNormal.CrossProduct(self.XVector)
+
+    def _uv(self, p):
+        d = p - self.Origin
+        return (d.DotProduct(self.XVector), d.DotProduct(self.YVector))
+
+    @property
+    def EdgeLoops(self):
+        loops = NetList()
+        for loop in self._loops:
+            loops.Add(NetList(Edge(loop[i], loop[(i + 1) % len(loop)]) for i in range(len(loop))))
+        return loops
+
+    def GetEdgesAsCurveLoops(self):
+        return NetList(NetList(e.AsCurve() for e in loop) for loop in self.EdgeLoops)
+
+    @property
+    def Area(self):
+        area = self._area_outer
+        for hole in self._loops[1:]:
+            area -= abs(_polygon_area_uv([self._uv(p) for p in hole]))
+        return area
+
+    def GetBoundingBox(self):
+        uvs = [self._uv(p) for p in self._loops[0]]
+        return BoundingBoxUV(
+            min(u for u, _ in uvs), min(v for _, v in uvs),
+            max(u for u, _ in uvs), max(v for _, v in uvs),
+        )
+
+    def ComputeNormal(self, _uv):
+        return self.FaceNormal
+
+    def Evaluate(self, uv):
+        return self.Origin + self.XVector * uv.U + self.YVector * uv.V
+
+    def Triangulate(self, level_of_detail=None):
+        outer = self._loops[0]
+        return Mesh([(outer[0], outer[i], outer[i + 1]) for i in range(1, len(outer) - 1)])
+
+    def Transformed(self, trf):
+        return PlanarFace([[trf.OfPoint(p) for p in loop] for loop in self._loops])
+
+
+def _polygon_area_uv(pts):
+    a = 0.0
+    for i, (x0, y0) in enumerate(pts):
+        x1, y1 = pts[(i + 1) % len(pts)]
+        a += x0 * y1 - x1 * y0
+    return 0.5 * a
+
+
+class Solid(GeometryObject):
+    def __init__(self, faces, volume=None):
+        self.Faces = NetList(faces)
+        edges = NetList()
+        for f in self.Faces:
+            for loop in f.EdgeLoops:
+                for e in loop:
+                    edges.Add(e)
+        self.Edges = edges
+        self._volume = volume
+
+    @property
+    def Volume(self):
+        if self._volume is not None:
+            return self._volume
+        # Divergence theorem over planar faces
+        v = 0.0
+        for f in self.Faces:
+            v += f.Origin.DotProduct(f.FaceNormal) * f.Area
+        return abs(v) / 3.0
+
+    @property
+    def SurfaceArea(self):
+        return sum(f.Area for f in self.Faces)
+
+    def GetBoundingBox(self):
+        pts = [p for f in self.Faces for loop in f._loops for p in loop]
+        if not pts:
+            return None
+        return BoundingBoxXYZ(
+            XYZ(min(p.X for p in pts), min(p.Y for p in pts), min(p.Z for p in pts)),
+            XYZ(max(p.X for p in pts), max(p.Y for p in pts), max(p.Z for p in pts)),
+        )
+
+    def Transformed(self, trf):
+        return Solid([f.Transformed(trf) for f in self.Faces], volume=self._volume)
+
+
+def make_prism(profile_xy, z0, z1):
+    """Closed prism solid from a CCW XY polygon extruded between z0 and z1."""
+    pts = [(float(x), float(y)) for x, y in profile_xy]
+    if _polygon_area_uv(pts) < 0:
+        pts.reverse()
+    bottom = [XYZ(x, y, z0) for x, y in reversed(pts)]   # normal -Z
+    top = [XYZ(x, y, z1) for x, y in pts]                # normal +Z
+    faces = [PlanarFace([bottom]), PlanarFace([top])]
+    for i, (x0, y0) in enumerate(pts):
+        x1, y1 = pts[(i + 1) % len(pts)]
+        faces.append(PlanarFace([[XYZ(x0, y0, z0), XYZ(x1, y1, z0), XYZ(x1, y1, z1), XYZ(x0, y0, z1)]]))
+    area = _polygon_area_uv(pts)
+    return Solid(faces, volume=abs(area) * abs(z1 - z0))
+
+
+def make_box(mn, mx):
+    return make_prism([(mn[0], mn[1]), (mx[0], mn[1]), (mx[0], mx[1]), (mn[0], mx[1])], mn[2], mx[2])
+
+
+class GeometryElement(NetList, GeometryObject):
+    def GetTransformed(self, trf):
+        return GeometryElement(_transform_geometry(g, trf) for g in self)
+
+    def GetBoundingBox(self):
+        return _geometry_bbox(self)
+
+
+class GeometryInstance(GeometryObject):
+    def __init__(self, symbol_geometry, transform):
+        self._symbol = GeometryElement(symbol_geometry)
+        self.Transform = transform
+
+    def GetSymbolGeometry(self, trf=None):
+        return self._symbol if trf is None else self._symbol.GetTransformed(trf)
+
+    def GetInstanceGeometry(self, trf=None):
+        t = self.Transform if trf is None else trf.Multiply(self.Transform)
+        return self._symbol.GetTransformed(t)
+
+    def GetBoundingBox(self):
+        return self.GetInstanceGeometry().GetBoundingBox()
+
+
+def _transform_geometry(g, trf):
+    if isinstance(g, Solid):
+        return g.Transformed(trf)
+    if isinstance(g, PolyLine):
+        return g.GetTransformed(trf)
+    if isinstance(g, Curve):
+        return g.CreateTransformed(trf)
+    if isinstance(g, GeometryInstance):
+        return GeometryInstance(list(g._symbol), trf.Multiply(g.Transform))
+    if isinstance(g, Mesh):
+        return Mesh([tuple(trf.OfPoint(t.get_Vertex(i)) for i in range(3)) for t in g._tris])
+    return g
+
+
+def _geometry_points(geom):
+    for g in geom:
+        if isinstance(g, Solid):
+            for f in g.Faces:
+                for loop in f._loops:
+                    for p in loop:
+                        yield p
+        elif isinstance(g, PolyLine):
+            for p in g.GetCoordinates():
+                yield p
+        elif isinstance(g, Curve):
+            for p in g.Tessellate():
+                yield p
+        elif isinstance(g, GeometryInstance):
+            for p in _geometry_points(g.GetInstanceGeometry()):
+                yield p
+        elif isinstance(g, Mesh):
+            for p in g.Vertices:
+                yield p
+
+
+def _geometry_bbox(geom):
+    pts = list(_geometry_points(geom))
+    if not pts:
+        return None
+    return BoundingBoxXYZ(
+        XYZ(min(p.X for p in pts), min(p.Y for p in pts), min(p.Z for p in pts)),
+        XYZ(max(p.X for p in pts), max(p.Y for p in pts), max(p.Z for p in pts)),
+    )
+
+
+class Options(object):
+    def __init__(self):
+        self.ComputeReferences = False
+        self.IncludeNonVisibleObjects = False
+        self.DetailLevel = ViewDetailLevel.Medium
+        self.View = None
+
+
+# ---------------------------------------------------------------------------
+# Elements
+# ---------------------------------------------------------------------------
+
+
+class Element(object):
+    """Scene-backed element. Geometry/bbox are model-space (host coordinates)."""
+
+    def __init__(self, doc, elem_id, category=None, name="", bbox=None, geometry=None,
+                 view_specific=False, owner_view_id=None, level_id=None, type_id=None,
+                 parameters=None, unique_id=None):
+        self.Document = doc
+        self.Id = ElementId(elem_id)
+        self.Category = category
+        self.Name = name or ""
+        self.ViewSpecific = bool(view_specific)
+        self.OwnerViewId = ElementId(owner_view_id) if owner_view_id is not None else ElementId.InvalidElementId
+        self.LevelId = ElementId(level_id) if level_id is not None else ElementId.InvalidElementId
+        self._type_id = ElementId(type_id) if type_id is not None else ElementId.InvalidElementId
+        self.UniqueId = unique_id or "fake-{0}".format(elem_id)
+        self._geometry = list(geometry or [])
+        self._bbox = bbox
+        self._params = dict(parameters or {})
+        self.geometry_fetches = 0
+
+    def __repr__(self):
+        return "{0}({1})".format(type(self).__name__, self.Id.IntegerValue)
+
+    def GetTypeId(self):
+        return self._type_id
+
+    def get_Geometry(self, options=None):
+        self.geometry_fetches += 1
+        if not self._geometry:
+            return None
+        return GeometryElement(self._geometry)
+
+    def get_BoundingBox(self, view=None):
+        bb = self._bbox
+        if bb is None:
+            bb = _geometry_bbox(self._geometry)
+        if bb is None:
+            return None
+        return BoundingBoxXYZ(XYZ(bb.Min.X, bb.Min.Y, bb.Min.Z), XYZ(bb.Max.X, bb.Max.Y, bb.Max.Z))
+
+    def get_Parameter(self, bip):
+        try:
+            key = BuiltInParameter(int(bip)).name
+        except Exception:
+            key = str(bip)
+        if key in self._params:
+            return Parameter(key, self._params[key])
+        return None
+
+    def LookupParameter(self, name):
+        if name in self._params:
+            return Parameter(name, self._params[name])
+        return None
+
+    def GetParameters(self, name):
+        p = self.LookupParameter(name)
+        return NetList([p] if p is not None else [])
+
+
+class FamilyInstance(Element):
+    pass
+
+
+class ProjectInfo(Element):
+    def __init__(self, doc, unique_id="fakedoc-project", name="", number=""):
+        Element.__init__(self, doc, -2, name=name, unique_id=unique_id)
+        self.Number = number
+
+
+class Level(Element):
+    def __init__(self, doc, elem_id, elevation=0.0, name=""):
+        Element.__init__(self, doc, elem_id, category=doc._category_for(BuiltInCategory.OST_Levels), name=name)
+        self.Elevation = float(elevation)
+        self.ProjectElevation = float(elevation)
+
+
+class TextNote(Element):
+    pass
+
+
+class Dimension(Element):
+    pass
+
+
+class IndependentTag(Element):
+    pass
+
+
+class FilledRegion(Element):
+    def __init__(self, doc, elem_id, boundaries=None, **kw):
+        Element.__init__(self, doc, elem_id, **kw)
+        self._boundaries = [list(b) for b in (boundaries or [])]
+
+    def GetBoundaries(self):
+        out = NetList()
+        for loop in self._boundaries:
+            out.Add(NetList(Line([loop[i], loop[(i + 1) % len(loop)]]) for i in range(len(loop))))
+        return out
+
+
+class ImportInstance(Element):
+    def __init__(self, doc, elem_id, transform=None, **kw):
+        Element.__init__(self, doc, elem_id, **kw)
+        self._transform = transform or Transform()
+        self.IsLinked = False
+
+    def GetTransform(self):
+        return self._transform
+
+    def GetTotalTransform(self):
+        return self._transform
+
+
+class RevitLinkInstance(Element):
+    def __init__(self, doc, elem_id, link_doc=None, transform=None, **kw):
+        Element.__init__(self, doc, elem_id, **kw)
+        self._link_doc = link_doc
+        self._transform = transform or Transform()
+
+    def GetLinkDocument(self):
+        return self._link_doc
+
+    def GetTransform(self):
+        return self._transform
+
+    def GetTotalTransform(self):
+        return self._transform
+
+
+class PlanViewRange(object):
+    def __init__(self, level_ids, offsets):
+        self._levels = dict(level_ids)
+        self._offsets = dict(offsets)
+
+    def GetLevelId(self, plane):
+        lid = self._levels.get(PlanViewPlane(int(plane)))
+        return ElementId(lid) if lid is not None else ElementId.InvalidElementId
+
+    def GetOffset(self, plane):
+        return float(self._offsets.get(PlanViewPlane(int(plane)), 0.0))
+
+
+class View(Element):
+    def __init__(self, doc, elem_id, name="", view_type=ViewType.FloorPlan, scale=96,
+                 origin=None, right=None, up=None, view_direction=None, crop_box=None,
+                 crop_active=True, view_range=None, detail_level=ViewDetailLevel.Medium,
+                 is_template=False, visible_ids=None, hidden_categories=None, parameters=None):
+        Element.__init__(self, doc, elem_id, name=name, parameters=parameters)
+        self.ViewType = view_type
+        self.Scale = int(scale)
+        self.Origin = origin or XYZ(0.0, 0.0, 0.0)
+        self.RightDirection = right or XYZ(1.0, 0.0, 0.0)
+        self.UpDirection = up or XYZ(0.0, 1.0, 0.0)
+        self.ViewDirection = view_direction or XYZ(0.0, 0.0, 1.0)
+        self.CropBox = crop_box
+        self.CropBoxActive = bool(crop_active)
+        self.CropBoxVisible = bool(crop_active)
+        self.DetailLevel = detail_level
+        self.IsTemplate = bool(is_template)
+        self.ViewTemplateId = ElementId.InvalidElementId
+        self._view_range = view_range
+        self._visible_ids = None if visible_ids is None else [int(i) for i in visible_ids]
+        self._hidden_categories = set(int(c) for c in (hidden_categories or ()))
+
+    def GetViewRange(self):
+        return self._view_range
+
+    def GetCategoryHidden(self, category_id):
+        return int(getattr(category_id, "IntegerValue", category_id)) in self._hidden_categories
+
+
+class ViewPlan(View):
+    pass
+
+
+class ViewSection(View):
+    pass
+
+
+class ViewDrafting(View):
+    pass
+
+
+class View3D(View):
+    pass
+
+
+class Viewport(Element):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Filters / collector
+# ---------------------------------------------------------------------------
+
+
+class ElementFilter(object):
+    def PassesFilter(self, elem):
+        raise NotImplementedError
+
+
+class ElementCategoryFilter(ElementFilter):
+    def __init__(self, bic):
+        self._cat = int(bic)
+
+    def PassesFilter(self, elem):
+        cat = getattr(elem, "Category", None)
+        return cat is not None and cat.Id.IntegerValue == self._cat
+
+
+class ElementMulticategoryFilter(ElementFilter):
+    def __init__(self, category_ids):
+        self._cats = set(int(getattr(c, "IntegerValue", c)) for c in category_ids)
+
+    def PassesFilter(self, elem):
+        cat = getattr(elem, "Category", None)
+        return cat is not None and cat.Id.IntegerValue in self._cats
+
+
+class ElementClassFilter(ElementFilter):
+    def __init__(self, cls):
+        self._cls = cls
+
+    def PassesFilter(self, elem):
+        return isinstance(elem, self._cls)
+
+
+class BoundingBoxIntersectsFilter(ElementFilter):
+    def __init__(self, outline, tolerance=0.0):
+        self._outline = outline
+        self._tol = float(tolerance)
+
+    def PassesFilter(self, elem):
+        bb = elem.get_BoundingBox(None)
+        if bb is None:
+            return False
+        return self._outline.Intersects(Outline(bb.Min, bb.Max), self._tol)
+
+
+class _TypeFilter(ElementFilter):
+    def __init__(self, want_types):
+        self._want = want_types
+
+    def PassesFilter(self, elem):
+        return bool(getattr(elem, "_is_type", False)) == self._want
+
+
+class FilteredElementCollector(object):
+    """Lazy, re-iterable collector over a FakeDocument.
+
+    FilteredElementCollector(doc) scans the whole document;
+    FilteredElementCollector(doc, view_id) scans elements visible in the view.
+    Filters are applied in order; WhereElementIsNotElementType() etc. mutate
+    and return self like the Revit API.
+    """
+
+    def __init__(self, doc, view_id=None, link_instance_id=None):
+        if link_instance_id is not None:
+            # Revit 2024+ (doc, viewId, linkId): elements of the link visible in the host view
+            inst = doc.GetElement(link_instance_id)
+            self._source = lambda: list(inst.GetLinkDocument()._elements_in_order()) if inst is not None else []
+        elif view_id is not None:
+            self._source = lambda: doc._visible_in_view(view_id)
+        else:
+            self._source = lambda: list(doc._elements_in_order())
+        self._filters = []
+        doc.collector_calls += 1
+
+    def _add(self, f):
+        self._filters.append(f)
+        return self
+
+    def WhereElementIsNotElementType(self):
+        return self._add(_TypeFilter(False))
+
+    def WhereElementIsElementType(self):
+        return self._add(_TypeFilter(True))
+
+    def OfCategory(self, bic):
+        return self._add(ElementCategoryFilter(bic))
+
+    def OfCategoryId(self, cat_id):
+        return self._add(ElementCategoryFilter(cat_id.IntegerValue))
+
+    def OfClass(self, cls):
+        return self._add(ElementClassFilter(cls))
+
+    def WherePasses(self, flt):
+        return self._add(flt)
+
+    def _items(self):
+        out = []
+        for e in self._source():
+            if all(f.PassesFilter(e) for f in self._filters):
+                out.append(e)
+        return out
+
+    def __iter__(self):
+        return iter(self._items())
+
+    def GetEnumerator(self):
+        return _Enumerator(self._items())
+
+    def ToElements(self):
+        return NetList(self._items())
+
+    def ToElementIds(self):
+        return NetList(e.Id for e in self._items())
+
+    def GetElementCount(self):
+        return len(self._items())
+
+    def FirstElement(self):
+        items = self._items()
+        return items[0] if items else None
+
+
+# ---------------------------------------------------------------------------
+# Document
+# ---------------------------------------------------------------------------
+
+
+class Document(object):
+    def __init__(self, title="FakeDoc", path_name="", is_linked=False, project_guid="fakedoc-project"):
+        self.Title = title
+        self.PathName = path_name
+        self.IsLinked = bool(is_linked)
+        self.IsModified = False
+        self.IsFamilyDocument = False
+        self.ActiveView = None
+        self.Settings = _Settings(self)
+        self._elements = {}
+        self._order = []
+        self._categories = {}
+        self.collector_calls = 0
+        self.ProjectInformation = ProjectInfo(self, unique_id=project_guid, name=title)
+
+    def __repr__(self):
+        return "Document({0!r})".format(self.Title)
+
+    def _category_for(self, bic):
+        cat = self._categories.get(bic)
+        if cat is None:
+            annotation = bic in _ANNOTATION_BICS
+            cat = Category(bic, category_type=CategoryType.Annotation if annotation else CategoryType.Model)
+            self._categories[bic] = cat
+        return cat
+
+    def add(self, elem):
+        eid = elem.Id.IntegerValue
+        if eid not in self._elements:
+            self._order.append(eid)
+        self._elements[eid] = elem
+        return elem
+
+    def _elements_in_order(self):
+        return [self._elements[i] for i in self._order]
+
+    def _visible_in_view(self, view_id):
+        view = self.GetElement(view_id)
+        if view is None:
+            return []
+        vid = view.Id.IntegerValue
+        if view._visible_ids is not None:
+            return [self._elements[i] for i in view._visible_ids if i in self._elements]
+        out = []
+        for e in self._elements_in_order():
+            if isinstance(e, (View, Level)):
+                continue
+            if e.ViewSpecific:
+                if e.OwnerViewId.IntegerValue != vid:
+                    continue
+            elif isinstance(view, ViewDrafting):
+                continue
+            cat = e.Category
+            if cat is not None and view.GetCategoryHidden(cat.Id):
+                continue
+            out.append(e)
+        return out
+
+    def GetElement(self, elem_id):
+        try:
+            key = int(getattr(elem_id, "IntegerValue", elem_id))
+        except Exception:
+            return None
+        return self._elements.get(key)
+
+
+_ANNOTATION_BICS = frozenset(
+    getattr(BuiltInCategory, n)
+    for n in (
+        "OST_TextNotes", "OST_Dimensions", "OST_RoomTags", "OST_SpaceTags", "OST_AreaTags",
+        "OST_DoorTags", "OST_WindowTags", "OST_WallTags", "OST_MEPSpaceTags",
+        "OST_GenericAnnotation", "OST_KeynoteTags", "OST_LevelHeads", "OST_GridHeads",
+        "OST_SectionHeads", "OST_CalloutHeads",
+    )
+)
@@ -0,0 +1,259 @@
+"""
+Scene files -> FakeDocument.
+
+A scene is a plain dict (JSON, or msgpack when the optional ``msgpack``
+package is importable) describing one host document:
+
+    {
+      "schema": 1,
+      "title": "Typical floor",
+      "levels":   [{"id": 1, "name": "L1", "elevation": 0.0}],
+      "views":    [{"id": 100, "name": "L1 Plan", "view_type": "FloorPlan",
+                    "scale": 96, "origin": [0, 0, 0],
+                    "right": [1, 0, 0], "up": [0, 1, 0], "view_direction": [0, 0, 1],
+                    "crop_box": {"min": [0, 0, -10], "max": [50, 40, 0]},
+                    "crop_active": true,
+                    "view_range": {"level": 1, "cut": 4.0, "top": 8.0,
+                                   "bottom": 0.0, "depth": 0.0},
+                    "visible": [10, 11]}],                    # optional
+      "elements": [{"id": 10, "category": "OST_Walls", "class": "FamilyInstance",
+                    "geometry": [{"type": "box", "min": [0, 0, 0], "max": [20, 1, 10]}]},
+                   {"id": 20, "category": "OST_TextNotes", "class": "TextNote",
+                    "view_specific": true, "owner_view": 100,
+                    "bbox": {"min": [5, 5, 0], "max": [9, 6, 0]}}],
+      "links":    [{"id": 500, "transform": {"origin": [100, 0, 0]},
+                    "document": { ...nested scene without views... }}]
+    }
+
+Geometry entries:
+    box       {"min": [x, y, z], "max": [x, y, z]}
+    prism     {"profile": [[x, y], ...], "z0": z, "z1": z}
+    line      {"points": [[x, y, z], [x, y, z]]}
+    polyline  {"points": [[x, y, z], ...]}
+    instance  {"transform": {...}, "geometry": [...]}    # GeometryInstance
+
+Views with no "visible" list see every model element plus the view-specific
+elements they own (drafting views see only their own elements).
+"""
+
+import json
+
+from . import api
+
+
+_ELEMENT_CLASSES = {
+    "Element": api.Element,
+    "FamilyInstance": api.FamilyInstance,
+    "TextNote": api.TextNote,
+    "Dimension": api.Dimension,
+    "IndependentTag": api.IndependentTag,
+    "FilledRegion": api.FilledRegion,
+    "ImportInstance": api.ImportInstance,
+}
+
+_VIEW_CLASSES = {
+    api.ViewType.FloorPlan: api.ViewPlan,
+    api.ViewType.CeilingPlan: api.ViewPlan,
+    api.ViewType.AreaPlan: api.ViewPlan,
+    api.ViewType.EngineeringPlan: api.ViewPlan,
+    api.ViewType.Section: api.ViewSection,
+    api.ViewType.Elevation: api.ViewSection,
+    api.ViewType.Detail: api.ViewSection,
+    api.ViewType.DraftingView: api.ViewDrafting,
+    api.ViewType.ThreeD: api.View3D,
+}
+
+
+def _xyz(v, default=None):
+    if v is None:
+        return default
+    return api.XYZ(float(v[0]), float(v[1]), float(v[2]) if len(v) > 2 else 0.0)
+
+
+def _transform(d):
+    if not d:
+        return api.Transform()
+    trf = api.Transform(
+        origin=_xyz(d.get("origin")),
+        basis_x=_xyz(d.get("basis_x")),
+        basis_y=_xyz(d.get("basis_y")),
+        basis_z=_xyz(d.get("basis_z")),
+    )
+    if "rotation_deg" in d:
+        import math
+
+        rot = api.Transform.CreateRotation(api.XYZ.BasisZ, math.radians(float(d["rotation_deg"])))
+        trf = trf.Multiply(rot)
+    return trf
+
+
+def _geometry(entries):
+    out = []
+    for g in entries or ():
+        kind = g.get("type")
+        if kind == "box":
+            out.append(api.make_box(g["min"], g["max"]))
+        elif kind == "prism":
+            out.append(api.make_prism(g["profile"], float(g["z0"]), float(g["z1"])))
+        elif kind == "line":
+            pts = [_xyz(p) for p in g["points"]]
+            out.append(api.Line([pts[0], pts[-1]]))
+        elif kind == "polyline":
+            out.append(api.PolyLine([_xyz(p) for p in g["points"]]))
+        elif kind == "instance":
+            out.append(api.GeometryInstance(_geometry(g.get("geometry")), _transform(g.get("transform"))))
+        else:
+            raise ValueError("Unknown scene geometry type: {0!r}".format(kind))
+    return out
+
+
+def _bbox(d):
+    if not d:
+        return None
+    return api.BoundingBoxXYZ(_xyz(d["min"]), _xyz(d["max"]))
+
+
+def _enum(enum_type, value, default):
+    if value is None:
+        return default
+    if isinstance(value, int):
+        return enum_type(value)
+    return getattr(enum_type, str(value))
+
+
+def _build_element(doc, d):
+    bic = _enum(api.BuiltInCategory, d.get("category"), None)
+    cls_name = d.get("class") or "FamilyInstance"
+    kw = dict(
+        category=doc._category_for(bic) if bic is not None else None,
+        name=d.get("name", ""),
+        bbox=_bbox(d.get("bbox")),
+        geometry=_geometry(d.get("geometry")),
+        view_specific=bool(d.get("view_specific", False)),
+        owner_view_id=d.get("owner_view"),
+        level_id=d.get("level"),
+        type_id=d.get("type_id"),
+        parameters=d.get("parameters"),
+    )
+    if cls_name == "FilledRegion":
+        boundaries = [[_xyz(p) for p in loop] for loop in d.get("boundaries", ())]
+        return api.FilledRegion(doc, d["id"], boundaries=boundaries, **kw)
+    if cls_name == "ImportInstance":
+        return api.ImportInstance(doc, d["id"], transform=_transform(d.get("transform")), **kw)
+    try:
+        cls = _ELEMENT_CLASSES[cls_name]
+    except KeyError:
+        raise ValueError("Unknown scene element class: {0!r}".format(cls_name))
+    return cls(doc, d["id"], **kw)
+
+
+def _build_view(doc, d):
+    vt = _enum(api.ViewType, d.get("view_type"), api.ViewType.FloorPlan)
+    right = _xyz(d.get("right"), api.XYZ(1.0, 0.0, 0.0))
+    up = _xyz(d.get("up"), api.XYZ(0.0, 1.0, 0.0))
+    vdir = _xyz(d.get("view_direction"), right.CrossProduct(up))
+
+    crop = None
+    cd = d.get("crop_box")
+    if cd:
+        # Revit crop boxes are expressed in the view's local frame
+        trf = _transform(cd.get("transform")) if cd.get("transform") else api.Transform(
+            origin=_xyz(cd.get("origin"), api.XYZ(0.0, 0.0, 0.0)),
+            basis_x=right,
+            basis_y=up,
+            basis_z=vdir,
+        )
+        crop = api.BoundingBoxXYZ(_xyz(cd["min"]), _xyz(cd["max"]), trf)
+
+    vr = None
+    vrd = d.get("view_range")
+    if vrd:
+        lvl = vrd.get("level")
+        P = api.PlanViewPlane
+        vr = api.PlanViewRange(
+            {P.CutPlane: lvl, P.TopClipPlane: lvl, P.BottomClipPlane: lvl, P.ViewDepthPlane: lvl},
+            {
+                P.CutPlane: vrd.get("cut", 4.0),
+                P.TopClipPlane: vrd.get("top", 8.0),
+                P.BottomClipPlane: vrd.get("bottom", 0.0),
+                P.ViewDepthPlane: vrd.get("depth", vrd.get("bottom", 0.0)),
+            },
+        )
+
+    hidden = [int(_enum(api.BuiltInCategory, c, None)) for c in d.get("hidden_categories", ())]
+    cls = _VIEW_CLASSES.get(vt, api.View)
+    return cls(
+        doc,
+        d["id"],
+        name=d.get("name", "View {0}".format(d["id"])),
+        view_type=vt,
+        scale=d.get("scale", 96),
+        origin=_xyz(d.get("origin"), api.XYZ(0.0, 0.0, 0.0)),
+        right=right,
+        up=up,
+        view_direction=vdir,
+        crop_box=crop,
+        crop_active=d.get("crop_active", crop is not None),
+        view_range=vr,
+        detail_level=_enum(api.ViewDetailLevel, d.get("detail_level"), api.ViewDetailLevel.Medium),
+        is_template=d.get("is_template", False),
+        visible_ids=d.get("visible"),
+        hidden_categories=hidden,
+        parameters=d.get("parameters"),
+    )
+
+
+def build_document(scene, is_linked=False):
+    """Build a FakeDocument (api.Document) from a scene dict."""
+    if int(scene.get("schema", 1)) != 1:
+        raise ValueError("Unsupported scene schema: {0!r}".format(scene.get("schema")))
+
+    doc = api.Document(
+        title=scene.get("title", "FakeDoc"),
+        path_name=scene.get("path_name", ""),
+        is_linked=is_linked,
+        project_guid=scene.get("project_guid", "fakedoc-project"),
+    )
+    for d in scene.get("levels", ()):
+        doc.add(api.Level(doc, d["id"], elevation=d.get("elevation", 0.0), name=d.get("name", "")))
+    for d in scene.get("elements", ()):
+        doc.add(_build_element(doc, d))
+    for d in scene.get("links", ()):
+        link_doc = build_document(d.get("document") or {}, is_linked=True)
+        doc.add(api.RevitLinkInstance(
+            doc,
+            d["id"],
+            link_doc=link_doc,
+            transform=_transform(d.get("transform")),
+            category=doc._category_for(api.BuiltInCategory.OST_RvtLinks),
+            name=d.get("name", link_doc.Title),
+        ))
+    for d in scene.get("views", ()):
+        doc.add(_build_view(doc, d))
+    views = [doc.GetElement(d["id"]) for d in scene.get("views", ())]
+    doc.ActiveView = views[0] if views else None
+    return doc
+
+
+def load_scene(path):
+    """Read a scene dict from .json or .msgpack."""
+    if str(path).lower().endswith((".msgpack", ".mpk")):
+        import msgpack  # optional dependency
+
+        with open(path, "rb") as f:
+            return msgpack.unpackb(f.read(), raw=False, strict_map_key=False)
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_scene(scene, path):
+    """Write a scene dict as .json or .msgpack."""
+    if str(path).lower().endswith((".msgpack", ".mpk")):
+        import msgpack  # optional dependency
+
+        with open(path, "wb") as f:
+            f.write(msgpack.packb(scene, use_bin_type=True))
+        return path
+    with open(path, "w") as f:
+        json.dump(scene, f, sort_keys=True, indent=1)
+    return path
@@ -0,0 +1,442 @@
+"""
+Incremental, change-driven re-export planning for the VOP pipeline.
+
+A root-cache hit already skips rendering, but deciding "hit" means computing
+the view signature, i.e. one view-scoped collector pass + fingerprints per
+view. For nightly exports of thousands of views where a handful of elements
+moved, fingerprinting every view's contents dominates the run.
+
+IncrementalPlanner works from the other direction:
+
+    1. One document-wide fingerprint pass fills the planner's own
+       fingerprint table (an ElementCache sized by incremental_max_elements,
+       saved as .vop_planner_fingerprints.json)
+    2. ElementCache.detect_changes() vs the previous run's table gives the
+       added / removed / moved / resized element keys
+    3. Changed elements are mapped to views through the previous run's
+       ViewIndex (.vop_view_index.json, saved next to the element cache):
+         - element membership (the view's element keys last run)
+         - owner view of view-specific elements (annotations)
+         - old/new bbox vs the view's crop rect in view UV, queried through a
+           RectGrid per view orientation
+    4. Views no change can reach and whose element set is unchanged reuse
+       last run's signature (collector id list only, no fingerprints) and are
+       served from the RootStyleCache; the rest go through the normal
+       signature + render path
+
+Example:
+    >>> planner = IncrementalPlanner(doc, cfg, ElementCache(cap), fps_prev, ViewIndex.load(path))
+    >>> planner.prepare()
+    >>> sig = planner.clean_signature(view, view_mode)   # None -> compute signature
+    >>> planner.index.save(path)
+
+Commentary:
+    ✔ Conservative: unknown views, view/crop/config changes (signature header)
+      and added elements without a bbox or owner view force the normal path
+    ✔ The view-scoped collector still runs and its id list is hashed into the
+      header, so edits that change which elements a view shows (hide/unhide,
+      VG or filter visibility, phase, view range) dirty the view
+    ✔ Views without an active crop are dirtied by any located add/move/resize
+      (their extents come from their contents)
+    ✔ Entries the planner could not validate are never carried into the next
+      index, so a view skipped this run cannot hide older changes
+    ⚠ Change detection is bbox-based like the signature itself: edits that
+      keep both an element's bbox and the view's element set are not seen
+      (type/parameter changes, graphics-only VG/filter overrides such as
+      colour, line weight or halftone)
+    ⚠ Disabled for the run when the document has more elements than
+      incremental_max_elements (evictions would look like removals); the
+      table is independent of element_cache_max_items
+"""
+
+import hashlib
+import json
+import os
+
+from .core.spatial_index import RectGrid
+
+
+VIEW_INDEX_FILENAME = ".vop_view_index.json"
+PLANNER_FINGERPRINTS_FILENAME = ".vop_planner_fingerprints.json"
+VIEW_INDEX_SCHEMA = 2
+
+
+def _key_str(key):
+    return "{0}:{1}".format(key[0], key[1])
+
+
+def _parse_key(s):
+    elem_id, source_id = str(s).split(":", 1)
+    return (int(elem_id), source_id)
+
+
+def view_element_keys(doc, view, snapshot=None):
+    """Sorted "elem_id:HOST" keys of the view-scoped collector (no fingerprints).
+
+    Same element set as _view_signature: taken from the DocumentSnapshot when
+    one is supplied, else from a FilteredElementCollector on the view.
+    """
+    if snapshot is not None:
+        col = snapshot.view_elements(view)
+    else:
+        from Autodesk.Revit.DB import FilteredElementCollector
+
+        col = FilteredElementCollector(doc, view.Id).WhereElementIsNotElementType()
+    keys = []
+    for elem in col:
+        elem_id = getattr(getattr(elem, "Id", None), "IntegerValue", None)
+        if elem_id is not None:
+            keys.append(_key_str((elem_id, "HOST")))
+    return sorted(keys)
+
+
+def view_header_hash(view, view_mode, cfg, keys=None):
+    """SHA1 of the view-level signature fields plus the view's element keys.
+
+    Args:
+        keys: Sorted element key strings of the view (view_element_keys());
+            None hashes the view-level fields only
+    """
+    from .pipeline import _view_signature_header
+
+    header = _view_signature_header(view, view_mode, cfg_obj=cfg)
+    if keys is not None:
+        header["elem_keys"] = hashlib.sha1("|".join(keys).encode("utf-8")).hexdigest()
+    blob = json.dumps(header, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()
+
+
+def view_crop_region(view):
+    """Crop rect in view UV plus the basis used to project into it, or None.
+
+    Returns:
+        {"origin": [x, y, z], "right": [...], "up": [...], "rect": [u0, v0, u1, v1]}
+        when the view has an active crop box; None otherwise.
+    """
+    try:
+        if not bool(getattr(view, "CropBoxActive", False)) or getattr(view, "CropBox", None) is None:
+            return None
+        from .revit.view_basis import make_view_basis, xy_bounds_from_crop_box_all_corners
+
+        basis = make_view_basis(view)
+        b = xy_bounds_from_crop_box_all_corners(view, basis)
+        return {
+            "origin": [float(c) for c in basis.origin],
+            "right": [float(c) for c in basis.right],
+            "up": [float(c) for c in basis.up],
+            "rect": [float(b.xmin), float(b.ymin), float(b.xmax), float(b.ymax)],
+        }
+    except Exception:
+        return None
+
+
+def _fp_box(fp):
+    """Model AABB (min, max) of an ElementFingerprint, or None if it has no bbox."""
+    if fp is None:
+        return None
+    try:
+        cx, cy, cz = fp.centroid
+        w, h, d = fp.size
+    except Exception:
+        return None
+    if (w, h, d) == (0.0, 0.0, 0.0) and (cx, cy, cz) == (0.0, 0.0, 0.0):
+        return None
+    return ((cx - w / 2.0, cy - h / 2.0, cz - d / 2.0), (cx + w / 2.0, cy + h / 2.0, cz + d / 2.0))
+
+
+def _box_uv_rect(box, origin, right, up):
+    (x0, y0, z0), (x1, y1, z1) = box
+    us = []
+    vs = []
+    for x in (x0, x1):
+        for y in (y0, y1):
+            for z in (z0, z1):
+                dx, dy, dz = x - origin[0], y - origin[1], z - origin[2]
+                us.append(dx * right[0] + dy * right[1] + dz * right[2])
+                vs.append(dx * up[0] + dy * up[1] + dz * up[2])
+    return (min(us), min(vs), max(us), max(vs))
+
+
+class ViewIndex(object):
+    """Per-view records (signature, header hash, element keys, crop region) of one run.
+
+    Args:
+        views: Optional dict view_id(int) -> entry dict
+    """
+
+    def __init__(self, views=None):
+        self.views = dict(views or {})
+
+    def __len__(self):
+        return len(self.views)
+
+    def __contains__(self, view_id):
+        return view_id in self.views
+
+    def get(self, view_id):
+        return self.views.get(view_id)
+
+    def set(self, view_id, entry):
+        self.views[int(view_id)] = entry
+
+    def to_dict(self):
+        return {"schema": VIEW_INDEX_SCHEMA, "views": {str(k): v for k, v in self.views.items()}}
+
+    def save(self, file_path):
+        """Write the index as JSON; returns True on success (never raises)."""
+        try:
+            parent = os.path.dirname(file_path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            with open(file_path, "w") as f:
+                json.dump(self.to_dict(), f, sort_keys=True)
+            return True
+        except Exception:
+            return False
+
+    @classmethod
+    def load(cls, file_path):
+        """Load an index; returns an empty index if missing, stale or unreadable."""
+        try:
+            if not file_path or not os.path.exists(file_path):
+                return cls()
+            with open(file_path, "r") as f:
+                data = json.load(f)
+            if data.get("schema") != VIEW_INDEX_SCHEMA:
+                return cls()
+            return cls({int(k): v for k, v in (data.get("views") or {}).items()})
+        except Exception:
+            return cls()
+
+
+class IncrementalPlanner(object):
+    """Decides which views can skip the signature pass and be served from the root cache.
+
+    Args:
+        doc: Revit Document
+        cfg: Config
+        elem_cache: The planner's fingerprint table for this run (ElementCache,
+            filled by prepare(); not the session element cache)
+        elem_cache_prev: Previous run's fingerprint table (or None)
+        index_prev: Previous run's ViewIndex
+        diag: Optional Diagnostics
+    """
+
+    def __init__(self, doc, cfg, elem_cache, elem_cache_prev, index_prev, diag=None):
+        self.doc = doc
+        self.cfg = cfg
+        self.elem_cache = elem_cache
+        self.elem_cache_prev = elem_cache_prev
+        self.index_prev = index_prev if index_prev is not None else ViewIndex()
+        self.diag = diag
+
+        self.index = ViewIndex()   # this run's records (saved for the next run)
+        self.prepared = False
+        self.fingerprinted = False  # True once the whole document fit the table
+        self.ready = False         # True once changes were mapped to views
+        self.reason = None
+        self.changes = None
+        self.dirty = set()
+        self.all_dirty = False
+        self.reused = 0
+        self.recorded = 0
+        self._owner = {}           # (elem_id, source_id) -> owner view id
+
+    # ------------------------------------------------------------------
+
+    def prepare(self):
+        """Fingerprint the document, detect changes and map them to views (idempotent)."""
+        if self.prepared:
+            return self.ready
+        self.prepared = True
+        try:
+            if self.elem_cache is None:
+                self.reason = "no_element_cache"
+                return False
+
+            n = self._fingerprint_document()
+            if n > self.elem_cache.max_elements:
+                self.reason = "fingerprint_capacity"
+                return False
+            self.fingerprinted = True
+            if self.elem_cache_prev is None or not self.elem_cache_prev.cache or not len(self.index_prev):
+                self.reason = "no_previous_run"
+                return False
+
+            self.changes = self.elem_cache.detect_changes(self.elem_cache_prev, tolerance=0.0)
+            self._map_changes()
+
+            # Clean entries stay valid for the next run even if not exported now
+            if not self.all_dirty:
+                for vid, entry in self.index_prev.views.items():
+                    if vid not in self.dirty:
+                        self.index.set(vid, entry)
+
+            self.ready = True
+            return True
+        except Exception as e:
+            self.reason = "error: {0}".format(e)
+            self.ready = False
+            return False
+        finally:
+            self._log()
+
+    def _fingerprint_document(self):
+        from Autodesk.Revit.DB import FilteredElementCollector
+
+        count = 0
+        for elem in FilteredElementCollector(self.doc).WhereElementIsNotElementType():
+            try:
+                if hasattr(elem, "ViewType"):
+                    continue  # views are not view content
+                elem_id = getattr(getattr(elem, "Id", None), "IntegerValue", None)
+                if elem_id is None:
+                    continue
+                count += 1
+                if count > self.elem_cache.max_elements:
+                    continue  # keep counting; prepare() bails out
+                self.elem_cache.get_or_create_fingerprint(elem=elem, elem_id=elem_id, source_id="HOST", view=None)
+                owner = getattr(getattr(elem, "OwnerViewId", None), "IntegerValue", -1)
+                if owner is not None and int(owner) > 0:
+                    self._owner[(int(elem_id), "HOST")] = int(owner)
+            except Exception:
+                continue
+        return count
+
+    def _map_changes(self):
+        """Fill self.dirty (view ids) / self.all_dirty from self.changes."""
+        entries = self.index_prev.views
+        members = {}
+        uncropped = []
+        groups = {}
+        for vid, entry in entries.items():
+            for k in entry.get("keys") or ():
+                members.setdefault(k, []).append(vid)
+            region = entry.get("region")
+            if not region:
+                uncropped.append(vid)
+                continue
+            orient = tuple(round(c, 6) for c in region["origin"] + region["right"] + region["up"])
+            groups.setdefault(orient, (region, [], []))
+            groups[orient][1].append(vid)
+            groups[orient][2].append(region["rect"])
+        grids = [(region, vids, RectGrid(rects)) for (region, vids, rects) in groups.values()]
+
+        dirty = self.dirty
+        cur = self.elem_cache.cache
+        prev = self.elem_cache_prev.cache
+
+        def _members(key):
+            dirty.update(members.get(_key_str(key), ()))
+
+        def _touch(box):
+            for region, vids, grid in grids:
+                rect = _box_uv_rect(box, region["origin"], region["right"], region["up"])
+                for i in grid.query(*rect):
+                    dirty.add(vids[i])
+            dirty.update(uncropped)
+
+        for key in self.changes.get("removed", ()):
+            _members(key)
+
+        for key in self.changes.get("added", ()):
+            owner = self._owner.get(key)
+            if owner is not None:
+                dirty.add(owner)
+                continue
+            box = _fp_box(cur.get(key))
+            if box is None:
+                self.all_dirty = True
+                return
+            _touch(box)
+
+        for elem_id, source_id, _delta in list(self.changes.get("moved", ())) + list(self.changes.get("resized", ())):
+            key = (elem_id, source_id)
+            _members(key)
+            owner = self._owner.get(key)
+            if owner is not None:
+                dirty.add(owner)
+                continue
+            for box in (_fp_box(prev.get(key)), _fp_box(cur.get(key))):
+                if box is not None:
+                    _touch(box)
+
+    # ------------------------------------------------------------------
+
+    def clean_signature(self, view, view_mode, snapshot=None):
+        """Last run's signature if no change can reach `view`, else None.
+
+        Runs the view-scoped collector (ids only) so a changed element set
+        (hidden element, VG/filter visibility, phase, view range) is a miss.
+        """
+        if not self.ready or self.all_dirty:
+            return None
+        try:
+            vid = int(view.Id.IntegerValue)
+            if vid in self.dirty:
+                return None
+            entry = self.index_prev.get(vid)
+            if not entry:
+                return None
+            keys = view_element_keys(self.doc, view, snapshot=snapshot)
+            if entry.get("header") != view_header_hash(view, view_mode, self.cfg, keys=keys):
+                return None
+            self.index.set(vid, entry)
+            self.reused += 1
+            return entry.get("signature")
+        except Exception:
+            return None
+
+    def view_keys(self, view_id):
+        """Last run's (elem_id, source_id) list for a reused view (CSV element tracking)."""
+        entry = self.index.get(view_id) or {}
+        out = []
+        for k in entry.get("keys") or ():
+            try:
+                out.append(_parse_key(k))
+            except Exception:
+                continue
+        return out
+
+    def record(self, view, view_mode, signature, keys):
+        """Store this run's signature/header/elements/crop for `view` (for the next run)."""
+        try:
+            vid = int(view.Id.IntegerValue)
+            keys = sorted(_key_str(k) for k in (keys or ()))
+            self.index.set(vid, {
+                "signature": signature,
+                "header": view_header_hash(view, view_mode, self.cfg, keys=keys),
+                "keys": keys,
+                "region": view_crop_region(view),
+            })
+            self.recorded += 1
+        except Exception:
+            pass
+
+    def stats(self):
+        changes = self.changes or {}
+        return {
+            "ready": self.ready,
+            "reason": self.reason,
+            "added": len(changes.get("added", ())),
+            "removed": len(changes.get("removed", ())),
+            "moved": len(changes.get("moved", ())),
+            "resized": len(changes.get("resized", ())),
+            "dirty_views": len(self.dirty),
+            "all_dirty": self.all_dirty,
+            "reused": self.reused,
+            "recorded": self.recorded,
+        }
+
+    def _log(self):
+        if self.diag is None:
+            return
+        try:
+            self.diag.info(
+                phase="pipeline",
+                callsite="IncrementalPlanner.prepare",
+                message="Incremental re-export plan",
+                extra=self.stats(),
+            )
+        except Exception:
+            pass
@@ -97,7 +97,9 @@ from .core.raster import ViewRaster, TileMap
 from .core.geometry import Mode, classify_by_uv, make_uv_aabb, make_obb_or_skinny_aabb
 from .core.math_utils import Bounds2D, CellRect
 from .core.silhouette import get_element_silhouette
-from .core.areal_extraction import extract_areal_geometry
+from .core.areal_extraction import areal_cache_key, areal_view_signature, extract_areal_geometry
+from .core.geometry_handle import handle_for
+from .core import tracing
 from .revit.view_basis import make_view_basis, resolve_view_bounds
 from .revit.collection import (
     collect_view_elements,
@@ -259,10 +261,13 @@ def _cfg_hash(cfg_obj, exclude_cache_wiring=False):
     except Exception:
         return None
 
-def _view_signature(doc_obj, view_obj, view_mode_val, cfg_obj=None, elem_cache=None, track_elements=None):
+def _view_signature(doc_obj, view_obj, view_mode_val, cfg_obj=None, elem_cache=None, track_elements=None, snapshot=None):
     """Enhanced signature with element fingerprints for position/size tracking.
 
     Must be module-level: imported by vop_interwoven.streaming.
+
+    When a DocumentSnapshot is supplied, the view's element list is taken from it
+    (one shared collector pass per view) instead of a dedicated collector.
     """
     import json
     import hashlib
@@ -271,9 +276,12 @@ def _view_signature(doc_obj, view_obj, view_mode_val, cfg_obj=None, elem_cache=N
     elem_fps = []
     elem_ids_for_tracking = []  # For view_elements tracking
     try:
-        from Autodesk.Revit.DB import FilteredElementCollector
+        if snapshot is not None:
+            col = snapshot.view_elements(view_obj)
+        else:
+            from Autodesk.Revit.DB import FilteredElementCollector
 
-        col = FilteredElementCollector(doc_obj, view_obj.Id).WhereElementIsNotElementType()
+            col = FilteredElementCollector(doc_obj, view_obj.Id).WhereElementIsNotElementType()
         for elem in col:
             try:
                 elem_id = getattr(getattr(elem, "Id", None), "IntegerValue", None)
@@ -313,8 +321,18 @@ def _view_signature(doc_obj, view_obj, view_mode_val, cfg_obj=None, elem_cache=N
             pass
 
     # Sort for deterministic signature
-    elem_fps_str = "|".join(sorted(elem_fps))
+    sig = _view_signature_header(view_obj, view_mode_val, cfg_obj=cfg_obj)
+    sig["elem_fps"] = "|".join(sorted(elem_fps))
 
+    blob = json.dumps(sig, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest(), sig
+
+def _view_signature_header(view_obj, view_mode_val, cfg_obj=None):
+    """View-level part of _view_signature (everything except element fingerprints).
+
+    Cheap (no collector pass); used on its own by the incremental planner to
+    detect view property / crop / config changes.
+    """
     def _safe_prop_str(getter):
         try:
             v = getter()
@@ -329,7 +347,7 @@ def _view_signature(doc_obj, view_obj, view_mode_val, cfg_obj=None, elem_cache=N
         except Exception:
             return None
 
-    sig = {
+    return {
         "schema": 4,
         "view_id": _safe_int(getattr(getattr(view_obj, "Id", None), "IntegerValue", None)),
         "view_uid": getattr(view_obj, "UniqueId", None),
@@ -342,13 +360,9 @@ def _view_signature(doc_obj, view_obj, view_mode_val, cfg_obj=None, elem_cache=N
         "discipline": _safe_prop_str(lambda: view_obj.Discipline),
         "display_style": _safe_prop_str(lambda: view_obj.DisplayStyle),
         "crop": _cropbox_fingerprint(view_obj),
-        "elem_fps": elem_fps_str,
         "cfg_sha1": _cfg_hash(cfg_obj, exclude_cache_wiring=True),
     }
 
-    blob = json.dumps(sig, sort_keys=True, separators=(",", ":")).encode("utf-8")
-    return hashlib.sha1(blob).hexdigest(), sig
-
 def _extract_view_identity_for_csv(doc, view):
     """
     Best-effort extraction of view identity fields needed for CSV slicing (DAX).
@@ -447,7 +461,7 @@ def _extract_view_identity_for_csv(doc, view):
 
     return out
 
-def process_document_views(doc, view_ids, cfg, diag=None, root_cache=None):
+def process_document_views(doc, view_ids, cfg, diag=None, root_cache=None, session=None):
     """Process multiple views through the VOP interwoven pipeline.
 
     Args:
@@ -455,6 +469,8 @@ def process_document_views(doc, view_ids, cfg, diag=None, root_cache=None):
         view_ids: List of Revit View ElementIds (or ints) to process
         cfg: Config object
         root_cache: Optional RootStyleCache instance for metrics caching
+        session: Optional PipelineSession supplying run-scoped caches; the caller
+            finalizes it (default: a private session finalized before returning)
 
     Returns:
         List of results (one per view), each containing:
@@ -484,9 +500,6 @@ def process_document_views(doc, view_ids, cfg, diag=None, root_cache=None):
     import time
     import tempfile
 
-    # Output directory (used for element cache persistence/export). Must be defined here.
-    output_dir = getattr(cfg, "output_dir", None)
-
     view_cache_enabled = bool(getattr(cfg, "view_cache_enabled", False))
     view_cache_dir = getattr(cfg, "view_cache_dir", None)
     require_doc_clean = bool(getattr(cfg, "view_cache_require_doc_unmodified", True))
@@ -549,72 +562,140 @@ def process_document_views(doc, view_ids, cfg, diag=None, root_cache=None):
         except Exception:
             pass
 
-    # Guardrail: cfg must be vop_interwoven.config.Config (attribute-based), not a dict.
-    # This prevents silent drift when new code accidentally uses cfg.get(...).
-    if isinstance(cfg, dict):
-        raise TypeError("cfg must be vop_interwoven.config.Config (not dict)")
-
-    # PR12: bounded geometry cache shared across all views in this call.
-    # Scoped to this run to avoid cross-run semantic drift.
-    try:
-        from .core.cache import LRUCache
-        geometry_cache = LRUCache(max_items=getattr(cfg, "geometry_cache_max_items", 0))
-    except Exception:
-        geometry_cache = None
+    def _finish_view_result(out, ident, view_id_int, sig_hex, timings, t_view0):
+        """Identity fill, cache write-through and timings for one exported view.
 
-    # PR13: Document-scoped element cache for bbox reuse across views
-    elem_cache = None
-    elem_cache_prev = None  # Previous run cache (for change detection)
-    elem_cache_path = None
-    if getattr(cfg, "use_element_cache", True):
+        Shared by the in-process path and the render-pool collection loop.
+        """
+        # Ensure identity fields exist on first-run results so CSV + cache row_payload are complete
         try:
-            from .core.element_cache import ElementCache
-            max_items = int(getattr(cfg, "element_cache_max_items", 10000))
+            if isinstance(out, dict):
+                if out.get("view_type") in (None, ""):
+                    out["view_type"] = ident.get("view_type", "")
+                if out.get("discipline") in (None, ""):
+                    out["discipline"] = ident.get("discipline", "")
+                if out.get("phase") in (None, ""):
+                    out["phase"] = ident.get("phase", "")
+                if out.get("sheet_number") in (None, ""):
+                    out["sheet_number"] = ident.get("sheet_number", "")
+                if out.get("view_template_name") in (None, ""):
+                    out["view_template_name"] = ident.get("view_template_name", "")
+        except Exception:
+            pass
 
-            # Determine cache file path (stored with output files)
-            if output_dir is not None:
-                elem_cache_path = os.path.join(output_dir, ".vop_element_cache.json")
-            else:
-                elem_cache_path = None
+        # Root cache write-through (metrics only; requires out+raster)
+        if root_cache and out and out.get("success", True) and ("raster" in out):
+            try:
+                from .root_cache import extract_metrics_from_view_result
 
-            # Load previous cache if persistence enabled
-            if getattr(cfg, "element_cache_persist", True) and elem_cache_path is not None:
-                try:
-                    elem_cache_prev = ElementCache.load_from_json(elem_cache_path, max_elements=max_items)
-                    # Start with previous cache (pre-populated)
-                    elem_cache = elem_cache_prev
-                    if diag is not None:
+                metadata, metrics, elem_summary, timings2 = extract_metrics_from_view_result(out, cfg)
+
+                root_cache.set_view(
+                    view_id=view_id_int,
+                    signature=sig_hex,
+                    metadata=metadata,
+                    metrics=metrics,
+                    element_summary=elem_summary,
+                    timings=timings2,
+                )
+            except Exception as e:
+                print(f"[Pipeline] Root cache save failed: {e}")
+
+        # Write-through persistent cache on successful export
+        try:
+            if view_cache_enabled:
+                if view_id_int is not None:
+                    _save_cached_view(view_id_int, sig_hex, out)
+                    try:
+                        out["cache"] = {"view_cache": "MISS_SAVED", "signature": sig_hex, "dir": view_cache_dir}
+                        # Attach canonical signature for downstream consumers (streaming/CSV/debug).
+                        # Never recompute signature outside this function.
                         try:
-                            prev_size = len(elem_cache.cache)
-                            diag.info(
-                                phase="pipeline",
-                                callsite="process_document_views.element_cache_load",
-                                message=f"Loaded element cache from previous run ({prev_size} elements)",
-                                extra={"cache_path": elem_cache_path, "prev_size": prev_size}
-                            )
+                            if out is not None:
+                                c = out.setdefault("cache", {})
+                                if isinstance(c, dict):
+                                    c.setdefault("signature", sig_hex)
                         except Exception:
                             pass
-                except Exception:
-                    # Failed to load - start fresh
-                    elem_cache = ElementCache(max_elements=max_items)
-            else:
-                # No persistence - start fresh
-                elem_cache = ElementCache(max_elements=max_items)
 
+                    except Exception:
+                        pass
         except Exception:
-            elem_cache = None  # Graceful degradation
+            pass
 
-    # Track element-view relationships for CSV export
-    view_elements = {}  # view_id -> list of (elem_id, source_id)
+        t_view1 = _perf_now()
+        if getattr(cfg, "perf_collect_timings", True):
+            timings["total_ms"] = round(_perf_ms(t_view0, t_view1), 3)
+        tracing.complete("view", t_view0, t_view1, cat="view", args={"view_id": view_id_int, "view_name": out.get("view_name") if isinstance(out, dict) else None})
+
+        # Always expose a wall-clock elapsed seconds for this view, even if timing collection is disabled
+        try:
+            out["elapsed_sec"] = round((_perf_ms(t_view0, t_view1) / 1000.0), 3)
+        except Exception:
+            pass
+
+        # Convenience mirror at top-level for callers that don't dive into diagnostics
+        try:
+            out["timings"] = dict(timings)
+        except Exception:
+            pass
+
+        # Memory management: conditionally retain or discard raster data
+        if getattr(cfg, 'retain_rasters_in_memory', True):
+            # Keep full raster (needed for streaming exports or debug); batch sessions
+            # may spill it to mmap-backed files so only one view stays resident
+            if spill_store is not None and isinstance(out, dict):
+                from .core.raster_spill import spill_view_result
+                spill_view_result(out, spill_store)
+            return out
+        # Discard raster, keep only lightweight summary
+        return _extract_view_summary(out)
+
+    # Guardrail: cfg must be vop_interwoven.config.Config (attribute-based), not a dict.
+    # This prevents silent drift when new code accidentally uses cfg.get(...).
+    if isinstance(cfg, dict):
+        raise TypeError("cfg must be vop_interwoven.config.Config (not dict)")
+
+    # Run-scoped caches, snapshot and render pool live on the session; a call
+    # without one builds its own and finalizes it (persists caches) on return.
+    if session is None:
+        from .session import PipelineSession
+        session = PipelineSession(doc, cfg, diag=diag)
+        completed = False
+        try:
+            results = process_document_views(doc, view_ids, cfg, diag=diag, root_cache=root_cache, session=session)
+            completed = True
+        finally:
+            # Even if the run raised: uninstall the tracer, shut the render pool down,
+            # persist caches; a failed run returns no results mapping spill files.
+            session.finalize(diag=diag)
+            if not completed and session.spill_store is not None:
+                session.spill_store.close()
+        return results
+    if root_cache is None:
+        root_cache = session.root_cache
+
+    geometry_cache = session.geometry_cache
+    geometry_handles = session.geometry_handles
+    link_index = getattr(session, "link_index", None)
+    areal_cache = session.areal_cache
+    elem_cache = session.elem_cache
+    view_elements = session.view_elements
+    snapshot = session.snapshot
+    render_pool = session.render_pool
+    spill_store = getattr(session, "spill_store", None)
+    planner = getattr(session, "planner", None)
+    pending_renders = []  # (result_index, future, view_name, ident, view_id_int, sig_hex, t_view0)
 
     for view_id in view_ids:
-        diag = Diagnostics()  # per-view diag
+        diag = Diagnostics(debug_enabled=tracing.enabled(tracing.LEVEL_DEBUG))  # per-view diag
         timings = {}
         t_view0 = _perf_now()
 
         def _tmark(name, t0, t1):
             if getattr(cfg, "perf_collect_timings", True):
                 timings[name] = round(_perf_ms(t0, t1), 3)
+            tracing.complete(name[:-3] if name.endswith("_ms") else name, t0, t1)
 
         view = None
 
@@ -708,13 +789,31 @@ def process_document_views(doc, view_ids, cfg, diag=None, root_cache=None):
                 except Exception:
                     pass
 
-            # Compute signature ONCE (and populate view_elements consistently)
-            sig_hex, sig_obj = _view_signature(
-                doc, view, view_mode,
-                cfg_obj=cfg,
-                elem_cache=elem_cache,
-                track_elements=view_elements
-            )
+            def _compute_signature():
+                # Compute signature ONCE (and populate view_elements consistently)
+                sig, _sig_obj = _view_signature(
+                    doc, view, view_mode,
+                    cfg_obj=cfg,
+                    elem_cache=elem_cache,
+                    track_elements=view_elements,
+                    snapshot=snapshot,
+                )
+                if use_planner:
+                    planner.record(view, view_mode, sig, view_elements.get(view_id_int))
+                return sig
+
+            # Incremental re-export: views no changed element can reach reuse last
+            # run's signature (collector ids only, no fingerprints) and hit the
+            # root cache below
+            use_planner = bool(planner is not None and root_cache)
+            if use_planner:
+                planner.prepare()
+            sig_hex = planner.clean_signature(view, view_mode, snapshot=snapshot) if use_planner else None
+            planned_sig = sig_hex is not None
+            if planned_sig:
+                view_elements[view_id_int] = planner.view_keys(view_id_int)
+            else:
+                sig_hex = _compute_signature()
 
             # Compute identity fields once for CSV slicing and cache row_payload completeness
             ident = _extract_view_identity_for_csv(doc, view)
@@ -723,6 +822,10 @@ def process_document_views(doc, view_ids, cfg, diag=None, root_cache=None):
             if root_cache:
                 t_cache0 = _perf_now()
                 cached = root_cache.get_view(view_id_int, sig_hex)
+                if not cached and planned_sig:
+                    # Root cache lost the entry: fall back to the full signature
+                    sig_hex = _compute_signature()
+                    cached = root_cache.get_view(view_id_int, sig_hex)
                 t_cache1 = _perf_now()
 
                 if cached:
@@ -776,7 +879,7 @@ def process_document_views(doc, view_ids, cfg, diag=None, root_cache=None):
 
             # 1) Init raster bounds/resolution
             t0 = _perf_now()
-            raster = init_view_raster(doc, view, cfg, diag=diag)
+            raster = init_view_raster(doc, view, cfg, diag=diag, snapshot=snapshot)
             t1 = _perf_now()
             _tmark("raster_init_ms", t0, t1)       
             
@@ -797,16 +900,35 @@ def process_document_views(doc, view_ids, cfg, diag=None, root_cache=None):
                     # Graceful degradation: continue without diagnostics
                     pass
 
+            # Render-pool path: capture here (Revit), replay/finalize/export in a worker
+            if render_pool is not None and strategy_diag is None:
+                from .view_scheduler import capture_view_job
+
+                job = capture_view_job(
+                    doc, view, raster, cfg, view_mode,
+                    diag=diag,
+                    snapshot=snapshot,
+                    timings=timings,
+                    geometry_cache=geometry_cache,
+                    elem_cache=elem_cache,
+                    areal_cache=areal_cache,
+                    geometry_handles=geometry_handles,
+                    link_index=link_index,
+                )
+                pending_renders.append((len(results), render_pool.submit(job), getattr(view, "Name", None), ident, view_id_int, sig_hex, t_view0))
+                results.append(None)  # filled in view order once the render completes
+                continue
+
             if view_mode == VIEW_MODE_MODEL_AND_ANNOTATION:
                 # 2) Broad-phase visible elements
                 t0 = _perf_now()
-                elements = collect_view_elements(doc, view, raster, diag=diag, cfg=cfg)
+                elements = collect_view_elements(doc, view, raster, diag=diag, cfg=cfg, snapshot=snapshot)
                 t1 = _perf_now()
                 _tmark("collect_ms", t0, t1)
                 
                 # 3) MODEL PASS
                 t0 = _perf_now()
-                render_model_front_to_back(doc, view, raster, elements, cfg, diag=diag, geometry_cache=geometry_cache, elem_cache=elem_cache, strategy_diag=strategy_diag)
+                render_model_front_to_back(doc, view, raster, elements, cfg, diag=diag, geometry_cache=geometry_cache, elem_cache=elem_cache, strategy_diag=strategy_diag, areal_cache=areal_cache, geometry_handles=geometry_handles, link_index=link_index)
                 t1 = _perf_now()
                 _tmark("model_ms", t0, t1)
 
@@ -823,7 +945,7 @@ def process_document_views(doc, view_ids, cfg, diag=None, root_cache=None):
         
             # 4) ANNO PASS (always allowed)
             t0 = _perf_now()
-            rasterize_annotations(doc, view, raster, cfg, diag=diag)
+            rasterize_annotations(doc, view, raster, cfg, diag=diag, snapshot=snapshot)
             t1 = _perf_now()
             _tmark("anno_ms", t0, t1)
 
@@ -837,89 +959,10 @@ def process_document_views(doc, view_ids, cfg, diag=None, root_cache=None):
             t0 = _perf_now()
             out = export_view_raster(view, raster, cfg, diag=diag, timings=timings, strategy_diag=strategy_diag)
 
-            # Ensure identity fields exist on first-run results so CSV + cache row_payload are complete
-            try:
-                if isinstance(out, dict):
-                    if out.get("view_type") in (None, ""):
-                        out["view_type"] = ident.get("view_type", "")
-                    if out.get("discipline") in (None, ""):
-                        out["discipline"] = ident.get("discipline", "")
-                    if out.get("phase") in (None, ""):
-                        out["phase"] = ident.get("phase", "")
-                    if out.get("sheet_number") in (None, ""):
-                        out["sheet_number"] = ident.get("sheet_number", "")
-                    if out.get("view_template_name") in (None, ""):
-                        out["view_template_name"] = ident.get("view_template_name", "")
-            except Exception:
-                pass
-
             t1 = _perf_now()
             _tmark("export_ms", t0, t1)
 
-            # Root cache write-through (metrics only; requires out+raster)
-            if root_cache and out and out.get("success", True) and ("raster" in out):
-                try:
-                    from .root_cache import extract_metrics_from_view_result
-
-                    metadata, metrics, elem_summary, timings2 = extract_metrics_from_view_result(out, cfg)
-
-                    root_cache.set_view(
-                        view_id=view_id_int,
-                        signature=sig_hex,
-                        metadata=metadata,
-                        metrics=metrics,
-                        element_summary=elem_summary,
-                        timings=timings2,
-                    )
-                except Exception as e:
-                    print(f"[Pipeline] Root cache save failed: {e}")
-        
-            # Write-through persistent cache on successful export
-            try:
-                if view_cache_enabled:
-                    vid = getattr(getattr(view, "Id", None), "IntegerValue", None)
-                    if vid is not None:
-                        _save_cached_view(vid, sig_hex, out)
-                        try:
-                            out["cache"] = {"view_cache": "MISS_SAVED", "signature": sig_hex, "dir": view_cache_dir}
-                            # Attach canonical signature for downstream consumers (streaming/CSV/debug).
-                            # Never recompute signature outside this function.
-                            try:
-                                if out is not None:
-                                    c = out.setdefault("cache", {})
-                                    if isinstance(c, dict):
-                                        c.setdefault("signature", sig_hex)
-                            except Exception:
-                                pass
-
-                        except Exception:
-                            pass
-            except Exception:
-                pass
-            
-            t_view1 = _perf_now()
-            _tmark("total_ms", t_view0, t_view1)
-
-            # Always expose a wall-clock elapsed seconds for this view, even if timing collection is disabled
-            try:
-                out["elapsed_sec"] = round((_perf_ms(t_view0, t_view1) / 1000.0), 3)
-            except Exception:
-                pass
-
-            # Convenience mirror at top-level for callers that don't dive into diagnostics
-            try:
-                out["timings"] = dict(timings)
-            except Exception:
-                pass
-
-            # Memory management: conditionally retain or discard raster data
-            if getattr(cfg, 'retain_rasters_in_memory', True):
-                # Keep full raster (needed for streaming exports or debug)
-                results.append(out)
-            else:
-                # Discard raster, keep only lightweight summary
-                summary = _extract_view_summary(out)
-                results.append(summary)
+            results.append(_finish_view_result(out, ident, view_id_int, sig_hex, timings, t_view0))
 
         except Exception as e:
             # Never silent: record + continue
@@ -943,114 +986,47 @@ def process_document_views(doc, view_ids, cfg, diag=None, root_cache=None):
                 }
             )
             continue
-
-    # Log element cache statistics
-    if elem_cache is not None and diag is not None:
-        try:
-            diag.info(
-                phase="pipeline",
-                callsite="process_document_views.element_cache_stats",
-                message="Element cache statistics for this run",
-                extra=elem_cache.stats()
-            )
-        except Exception:
-            pass
-
-    # Phase 2.5: Persistent element cache - save/export/detect changes
-    if elem_cache is not None and getattr(cfg, "element_cache_persist", True):
-        try:
-            # Save cache to JSON for next run
-            if elem_cache_path is not None:
+        finally:
+            # Live element references are only needed while the view is processed
+            if snapshot is not None and view is not None:
                 try:
-                    metadata = {
-                        "timestamp": time.time(),
-                        "doc_path": getattr(doc, "PathName", None),
-                        "doc_title": getattr(doc, "Title", None),
-                    }
-                    saved = elem_cache.save_to_json(elem_cache_path, metadata=metadata)
-                    if saved and diag is not None:
-                        diag.info(
-                            phase="pipeline",
-                            callsite="process_document_views.element_cache_save",
-                            message="Saved element cache for next run",
-                            extra={"cache_path": elem_cache_path, "size": len(elem_cache.cache)}
-                        )
+                    snapshot.release_view(view)
                 except Exception:
                     pass
 
-            # Export analysis CSV
-            if getattr(cfg, "element_cache_export_csv", True) and output_dir is not None:
-                try:
-                    csv_path = os.path.join(output_dir, "element_cache_analysis.csv")
-                    exported = elem_cache.export_analysis_csv(csv_path, view_elements=view_elements)
-                    if exported and diag is not None:
-                        diag.info(
-                            phase="pipeline",
-                            callsite="process_document_views.element_cache_export_csv",
-                            message="Exported element cache analysis CSV",
-                            extra={"csv_path": csv_path, "elements": len(elem_cache.cache), "views": len(view_elements)}
-                        )
-                except Exception:
-                    pass
-
-            # Detect changes from previous run
-            if getattr(cfg, "element_cache_detect_changes", True) and elem_cache_prev is not None:
-                try:
-                    tolerance = float(getattr(cfg, "element_cache_change_tolerance", 0.01))
-                    changes = elem_cache.detect_changes(elem_cache_prev, tolerance=tolerance)
-
-                    if diag is not None:
-                        diag.info(
-                            phase="pipeline",
-                            callsite="process_document_views.element_cache_changes",
-                            message="Element changes detected since last run",
-                            extra=changes
-                        )
-
-                    # Also export changes CSV if significant changes detected
-                    if output_dir is not None and (changes["added"] or changes["moved"] or changes["resized"]):
-                        try:
-                            import csv as csv_module
-                            changes_csv_path = os.path.join(output_dir, "element_changes.csv")
-                            with open(changes_csv_path, "w", newline="") as f:
-                                writer = csv_module.writer(f)
-                                writer.writerow(["change_type", "elem_id", "source_id", "distance_or_size_change"])
-
-                                for elem_id, source_id in changes["added"]:
-                                    writer.writerow(["ADDED", elem_id, source_id, ""])
-
-                                for elem_id, source_id in changes["removed"]:
-                                    writer.writerow(["REMOVED", elem_id, source_id, ""])
-
-                                for elem_id, source_id, distance in changes["moved"]:
-                                    writer.writerow(["MOVED", elem_id, source_id, f"{distance:.3f}"])
-
-                                for elem_id, source_id, size_change in changes["resized"]:
-                                    writer.writerow(["RESIZED", elem_id, source_id, f"{size_change:.3f}"])
-
-                            if diag is not None:
-                                diag.info(
-                                    phase="pipeline",
-                                    callsite="process_document_views.element_changes_export",
-                                    message="Exported element changes CSV",
-                                    extra={"csv_path": changes_csv_path}
-                                )
-                        except Exception:
-                            pass
-
-                except Exception:
-                    pass
-        except Exception:
-            pass
+    # Collect render-pool results in view order
+    for result_index, future, view_name, ident, view_id_int, sig_hex, t_view0 in pending_renders:
+        try:
+            out = future.result()
+            results[result_index] = _finish_view_result(out, ident, view_id_int, sig_hex, out.get("timings") or {}, t_view0)
+        except Exception as e:
+            # Same contract as an in-process failure: record + continue
+            render_diag = Diagnostics()
+            render_diag.error(
+                phase="pipeline",
+                callsite="process_document_views.render_pool",
+                message="Failed to render view in worker process",
+                exc=e,
+                view_id=view_id_int,
+                extra={"view_name": view_name},
+            )
+            results[result_index] = {
+                "view_id": view_id_int if view_id_int is not None else 0,
+                "view_name": view_name if view_name is not None else "Unknown",
+                "success": False,
+                "diag": render_diag.to_dict(),
+            }
 
     return results
 
 
 
-def init_view_raster(doc, view, cfg, diag=None):
+def init_view_raster(doc, view, cfg, diag=None, snapshot=None):
     """Initialize ViewRaster for a view.
 
     Centralizes bounds resolution through resolve_view_bounds() so bounds behavior is auditable.
+    An optional DocumentSnapshot is forwarded to the bounds resolvers so they reuse the
+    run-scoped element index instead of issuing their own collectors.
     """
     # Cell size: 1/8" on sheet -> model feet (REQUESTED resolution)
     scale = view.Scale  # e.g., 96 for 1/8" = 1'-0"
@@ -1070,7 +1046,7 @@ def init_view_raster(doc, view, cfg, diag=None):
     view_mode, _mode_reason = resolve_view_mode(view, diag=diag)
 
     if view_mode == VIEW_MODE_ANNOTATION_ONLY:
-        anno_bounds = resolve_annotation_only_bounds(doc, view, basis, cell_size_ft_requested, cfg=cfg, diag=diag)
+        anno_bounds = resolve_annotation_only_bounds(doc, view, basis, cell_size_ft_requested, cfg=cfg, diag=diag, snapshot=snapshot)
 
         if anno_bounds is None:
             # No driver annotations → deterministic small fallback to avoid huge grids
@@ -1106,6 +1082,7 @@ def init_view_raster(doc, view, cfg, diag=None):
                 "cell_size_ft": float(cell_size_ft_requested),
                 "max_W": cfg.max_grid_cells_width,
                 "max_H": cfg.max_grid_cells_height,
+                "snapshot": snapshot,
             },
         )
 
@@ -1235,7 +1212,7 @@ def _extract_view_summary(view_result):
     }
 
 
-def rasterize_areal_loops(loops, raster, key_index, elem_depth, source_type, confidence, strategy, elem_id=None, category=None):
+def rasterize_areal_loops(loops, raster, key_index, elem_depth, source_type, confidence, strategy, elem_id=None, category=None, depth_field=None):
     """Rasterize AREAL element loops with confidence-based occlusion handling.
 
     Args:
@@ -1248,6 +1225,8 @@ def rasterize_areal_loops(loops, raster, key_index, elem_depth, source_type, con
         strategy: Strategy name used for extraction
         elem_id: Optional element ID for debugging
         category: Optional category name for debugging
+        depth_field: Optional per-cell W {j: {i: w}} for ambiguous tiles
+            (core.tri_zbuffer.loop_depth_field); HIGH closed loops only
 
     Returns:
         Tuple of (success, filled_cells):
@@ -1294,15 +1273,15 @@ def rasterize_areal_loops(loops, raster, key_index, elem_depth, source_type, con
 
         # HIGH confidence: Rasterize with occlusion
         if confidence == "HIGH":
-            # DEBUG: Log HIGH confidence rasterization
-            print("[DEBUG RASTER] Element {} ({}): HIGH confidence - rasterizing to model_edge + w_occ".format(
-                elem_id, category))
+            tracing.debug("[DEBUG RASTER] Element {} ({}): HIGH confidence - rasterizing to model_edge + w_occ",
+                          elem_id, category)
 
             # Rasterize closed loops (fills + occlusion)
             if closed_loops:
                 try:
                     filled += raster.rasterize_silhouette_loops(
-                        closed_loops, key_index, depth=elem_depth, source=source_type, occlude_edges=True
+                        closed_loops, key_index, depth=elem_depth, source=source_type, occlude_edges=True,
+                        depth_field=depth_field
                     )
                 except Exception:
                     pass
@@ -1350,7 +1329,7 @@ def rasterize_areal_loops(loops, raster, key_index, elem_depth, source_type, con
         return (False, 0)
 
 
-def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geometry_cache=None, elem_cache=None, strategy_diag=None):
+def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geometry_cache=None, elem_cache=None, strategy_diag=None, areal_cache=None, geometry_handles=None, link_index=None):
     """Render 3D model elements front-to-back with interwoven AreaL/Tiny/Linear handling.
 
     Args:
@@ -1363,9 +1342,12 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
         geometry_cache: Optional geometry cache for silhouettes
         elem_cache: Optional element cache for bbox fingerprints (Phase 2)
         strategy_diag: Optional StrategyDiagnostics instance
+        areal_cache: Optional ArealExtractionCache shared across views
+        geometry_handles: Optional run-scoped registry for linked-proxy GeometryHandles
+        link_index: Optional run-scoped LinkIndex (linked documents, transforms, proxies)
 
     Returns:
-        None (modifies raster in-place)
+        Number of processed elements (modifies raster in-place)
 
     Commentary:
         ✔ Uses silhouette extraction for accurate element boundaries
@@ -1373,6 +1355,203 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
         ✔ Classifies elements as TINY/LINEAR/AREAL
         ✔ Rasterizes silhouette loops with edge tracking
         ✔ Handles linked/imported elements with transforms
+        ✔ Capture (Revit) and replay (raster writes) are interleaved per element, so
+          early-out and Tier-B gating see the live raster exactly as before
+    """
+    header = {}
+    state = _new_model_replay_state()
+    batches = tracing.batches("elements", size=TRACE_ELEMENT_BATCH)
+
+    for item in _iter_model_draw_items(
+        doc, view, raster, elements, cfg, header,
+        diag=diag,
+        geometry_cache=geometry_cache,
+        elem_cache=elem_cache,
+        strategy_diag=strategy_diag,
+        areal_cache=areal_cache,
+        geometry_handles=geometry_handles,
+        link_index=link_index,
+    ):
+        _replay_model_draw_item(raster, item, cfg, state, header, diag=diag, strategy_diag=strategy_diag)
+        batches.tick()
+    batches.close()
+
+    _finish_model_replay(raster, view, header, cfg, state, strategy_diag=strategy_diag)
+    return state["processed"]
+
+
+def capture_model_draw_list(doc, view, raster, elements, cfg, diag=None, geometry_cache=None, elem_cache=None, strategy_diag=None, areal_cache=None, geometry_handles=None, link_index=None):
+    """Capture phase only: run every Revit-dependent model step and return a draw list.
+
+    The draw list is a plain dict (ints, floats, strings, lists, tuples) that
+    replay_model_draw_list() can render into any ViewRaster with the same grid,
+    in this process or another one.
+
+    Args:
+        (as render_model_front_to_back; `raster` supplies grid geometry only)
+
+    Returns:
+        Draw list dict:
+        {
+            'schema': DRAW_LIST_SCHEMA,
+            'header': {view_id, view_name, view_w0, view_wmax, view_wvol_meta,
+                       ambiguous_tiles, skipped_outside_view_volume, skipped},
+            'items': [draw item, ...]   # front-to-back order
+        }
+
+    Commentary:
+        ✔ Replaying the draw list reproduces render_model_front_to_back exactly:
+          early-out tests run at replay time against the replayed raster
+        ⚠ The capture raster holds no model ink, so Tier-B hull sampling runs for
+          every ambiguous element (including ones early-out would later skip)
+    """
+    header = {}
+    items = list(_iter_model_draw_items(
+        doc, view, raster, elements, cfg, header,
+        diag=diag,
+        geometry_cache=geometry_cache,
+        elem_cache=elem_cache,
+        strategy_diag=strategy_diag,
+        areal_cache=areal_cache,
+        geometry_handles=geometry_handles,
+        link_index=link_index,
+    ))
+    return {"schema": DRAW_LIST_SCHEMA, "header": header, "items": items}
+
+
+def replay_model_draw_list(raster, draw_list, cfg, diag=None, strategy_diag=None):
+    """Render phase: replay a captured model draw list into `raster` (no Revit API).
+
+    Args:
+        raster: ViewRaster with the capture raster's grid (modified in-place)
+        draw_list: Dict from capture_model_draw_list()
+        cfg: Config
+        diag: Optional diagnostics
+        strategy_diag: Optional StrategyDiagnostics (classification/confidence records)
+
+    Returns:
+        Number of processed elements
+    """
+    if int(draw_list.get("schema", 0) or 0) != DRAW_LIST_SCHEMA:
+        raise ValueError("Unsupported draw list schema: {0!r}".format(draw_list.get("schema")))
+
+    header = dict(draw_list.get("header") or {})
+    try:
+        raster.view_w0 = header.get("view_w0")
+        raster.view_wmax = header.get("view_wmax")
+        raster.view_wvol_meta = header.get("view_wvol_meta")
+    except Exception:
+        pass
+
+    state = _new_model_replay_state()
+    batches = tracing.batches("replay", size=TRACE_ELEMENT_BATCH)
+    for item in draw_list.get("items") or []:
+        _replay_model_draw_item(raster, item, cfg, state, header, diag=diag, strategy_diag=strategy_diag)
+        batches.tick()
+    batches.close()
+
+    view = ViewRef(header.get("view_id"), header.get("view_name"))
+    _finish_model_replay(raster, view, header, cfg, state, strategy_diag=strategy_diag)
+    return state["processed"]
+
+
+DRAW_LIST_SCHEMA = 1
+
+# Elements per "elements"/"replay" trace span in the model pass
+TRACE_ELEMENT_BATCH = 64
+
+
+class _ElementIdRef(object):
+    def __init__(self, value):
+        self.IntegerValue = value
+
+
+class ViewRef(object):
+    """Picklable stand-in for the View fields read after capture (Id.IntegerValue, Name)."""
+
+    def __init__(self, view_id, name):
+        self.Id = _ElementIdRef(view_id)
+        self.Name = name if name is not None else "view"
+
+    def __getstate__(self):
+        return {"view_id": self.Id.IntegerValue, "name": self.Name}
+
+    def __setstate__(self, state):
+        self.__init__(state.get("view_id"), state.get("name"))
+
+
+# Confidence levels for geometry extraction (match areal_extraction.py output)
+CONF_HIGH = "HIGH"      # Tier 1: planar_face_loops, silhouette_edges
+CONF_MEDIUM = "MEDIUM"  # Tier 2: geometry_polygon extraction
+CONF_LOW = "LOW"        # Tier 2/3: OBB/AABB fallback
+
+
+def _classify_uv_rect(width_cells, height_cells):
+    # Local, explicit classification to avoid dependency on classify_by_uv signature.
+    # Semantics:
+    #   - TINY   : <= 2x2 cells
+    #   - LINEAR : thin in one dimension (<=2) and longer in the other
+    #   - AREAL  : everything else (occlusion-authoritative)
+
+    minor = min(width_cells, height_cells)
+    major = max(width_cells, height_cells)
+
+    if major <= 2 and minor <= 2:
+        return "TINY"
+    if minor <= 2 and major > 2:
+        return "LINEAR"
+    return "AREAL"
+
+
+def _rect_dims_for_classification(rect, raster):
+    """
+    Prefer OBB dimensions when available (diagonals), else fall back to AABB cell rect.
+    Returns (width_cells, height_cells) as floats.
+    """
+    try:
+        obb = getattr(rect, "obb_data", None)
+        if obb and isinstance(obb, dict):
+            # Stored in world/uv units; convert to cells using raster cell size.
+            cell = float(getattr(raster, "cell_size", 1.0) or 1.0)
+            if cell <= 0:
+                cell = 1.0
+            len_u = float(obb.get("len_u", 0.0) or 0.0)
+            len_v = float(obb.get("len_v", 0.0) or 0.0)
+            return (abs(len_u) / cell, abs(len_v) / cell)
+    except Exception:
+        pass
+
+    # Fallback: AABB in cell units
+    try:
+        return (float(rect.width()), float(rect.height()))
+    except Exception:
+        return (0.0, 0.0)
+
+
+def _occlusion_allowed(elem_class, confidence):
+    return (elem_class == "AREAL") and (confidence == CONF_HIGH)
+
+
+def _rect_tuple(rect):
+    if rect is None:
+        return None
+    return (int(rect.i_min), int(rect.j_min), int(rect.i_max), int(rect.j_max))
+
+
+def _iter_model_draw_items(doc, view, raster, elements, cfg, header, diag=None, geometry_cache=None, elem_cache=None, strategy_diag=None, areal_cache=None, geometry_handles=None, link_index=None):
+    """Capture phase of the model pass: yield one draw item per element, front to back.
+
+    Everything that needs the Revit API happens here (link expansion, depth sort,
+    bbox projection, classification, geometry extraction, depth estimation, Tier-B
+    sampling); no model ink is written. `header` is filled with per-view fields
+    (complete once the generator is exhausted).
+
+    Draw item fields:
+        elem_id, category, source_id, source_type, source_label, bbox_source
+        elem_class, loops, confidence, strategy, depth
+        depth_invalid, depth_clamped_to_w0   (element meta flags)
+        rect          (i_min, j_min, i_max, j_max) projected bbox, or None
+        early_out     None (no early-out) or {'hull_uv': [...] | None, 'min_w': float | None}
     """
     from .revit.collection import _project_element_bbox_to_cell_rect, expand_host_link_import_model_elements
 
@@ -1383,6 +1562,17 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
     from .revit.view_basis import resolve_view_w_volume
     W0, Wmax, _wvol_meta = resolve_view_w_volume(view, vb, cfg, diag=diag)
 
+    header["view_id"] = getattr(getattr(view, "Id", None), "IntegerValue", None)
+    header["view_name"] = getattr(view, "Name", None)
+    header["view_w0"] = W0
+    header["view_wmax"] = Wmax
+    header["view_wvol_meta"] = _wvol_meta
+    header["skipped_outside_view_volume"] = 0
+    header["skipped"] = 0
+
+    # Per-element debug output/diagnostics only when tracing at DEBUG level
+    trace_debug = tracing.enabled(tracing.LEVEL_DEBUG)
+
     # Persist for export/diagnostics (safe: optional fields)
     try:
         raster.view_w0 = W0
@@ -1392,7 +1582,7 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
         pass
 
     # Expand to include linked/imported elements
-    expanded_elements = expand_host_link_import_model_elements(doc, view, elements, cfg, diag=diag, elem_cache=elem_cache)
+    expanded_elements = expand_host_link_import_model_elements(doc, view, elements, cfg, diag=diag, elem_cache=elem_cache, link_index=link_index)
 
     # Sort elements front-to-back by depth for proper occlusion
     expanded_elements = sort_front_to_back(expanded_elements, view, raster)
@@ -1430,60 +1620,28 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
             wrapper["depth_range"] = (0.0, 0.0)
             wrapper["uv_bbox_rect"] = None
 
-    # Process each element (host + linked)
-    processed = 0
-    skipped_outside_view_volume = 0
-    skipped = 0
-    silhouette_success = 0
-    bbox_fallback = 0
-
-    def _classify_uv_rect(width_cells, height_cells):
-        # Local, explicit classification to avoid dependency on classify_by_uv signature.
-        # Semantics:
-        #   - TINY   : <= 2x2 cells
-        #   - LINEAR : thin in one dimension (<=2) and longer in the other
-        #   - AREAL  : everything else (occlusion-authoritative)
-    
-        minor = min(width_cells, height_cells)
-        major = max(width_cells, height_cells)
+    # Phase 4.5: Ambiguity detection (selective z-buffer)
+    # Tiles where element depth ranges interleave get per-cell triangle depths at replay
+    header["ambiguous_tiles"] = []
+    if getattr(cfg, 'enable_ambiguity_detection', True):
+        try:
+            tile_bins = _bin_elements_to_tiles(expanded_elements, raster)
+            header["ambiguous_tiles"] = sorted(_get_ambiguous_tiles(tile_bins, cfg))
 
-        if major <= 2 and minor <= 2:
-            return "TINY"
-        if minor <= 2 and major > 2:
-            return "LINEAR"
-        return "AREAL"
+            if getattr(cfg, 'debug_ambiguous_tiles', False) and header["ambiguous_tiles"]:
+                print("[DEBUG] Ambiguous tiles detected: {0}".format(len(header["ambiguous_tiles"])))
 
-    # Confidence levels for geometry extraction (match areal_extraction.py output)
-    CONF_HIGH = "HIGH"      # Tier 1: planar_face_loops, silhouette_edges
-    CONF_MEDIUM = "MEDIUM"  # Tier 2: geometry_polygon extraction
-    CONF_LOW = "LOW"        # Tier 2/3: OBB/AABB fallback
+        except Exception as e:
+            print("[WARN] vop.pipeline: Ambiguity detection failed: {0}".format(e))
 
-    def _rect_dims_for_classification(rect, raster):
-        """
-        Prefer OBB dimensions when available (diagonals), else fall back to AABB cell rect.
-        Returns (width_cells, height_cells) as floats.
-        """
-        try:
-            obb = getattr(rect, "obb_data", None)
-            if obb and isinstance(obb, dict):
-                # Stored in world/uv units; convert to cells using raster cell size.
-                cell = float(getattr(raster, "cell_size", 1.0) or 1.0)
-                if cell <= 0:
-                    cell = 1.0
-                len_u = float(obb.get("len_u", 0.0) or 0.0)
-                len_v = float(obb.get("len_v", 0.0) or 0.0)
-                return (abs(len_u) / cell, abs(len_v) / cell)
-        except Exception:
-            pass
+    # View-volume culling uses the bbox depth ranges above; opt-in because it changes output.
+    cull_view_volume = bool(getattr(cfg, "cull_outside_view_volume", False))
 
-        # Fallback: AABB in cell units
-        try:
-            return (float(rect.width()), float(rect.height()))
-        except Exception:
-            return (0.0, 0.0)
+    # Host AREAL cache keys need the view's visibility / section box / range signature
+    areal_view_sig = areal_view_signature(view) if areal_cache is not None else None
 
-    def _occlusion_allowed(elem_class, confidence):
-        return (elem_class == "AREAL") and (confidence == CONF_HIGH)
+    # Debug-output gate only (replay owns the processed/skipped counters)
+    captured = 0
 
     for elem_wrapper in expanded_elements:
         elem = elem_wrapper["element"]
@@ -1494,7 +1652,7 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
 
         # View-volume gating: skip elements whose bbox W-range does not overlap [W0, Wmax].
         # This is the ONLY intended semantic change: exclude truly-outside elements.
-        if (W0 is not None) and (Wmax is not None):
+        if cull_view_volume and (W0 is not None) and (Wmax is not None):
             try:
                 dmin, dmax = elem_wrapper.get("depth_range", (None, None))
                 if (dmin is None) or (dmax is None):
@@ -1507,10 +1665,9 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
                 # Non-overlap => skip
                 if (dmin is not None) and (dmax is not None):
                     if (dmax < W0) or (dmin > Wmax):
-                        skipped_outside_view_volume += 1
+                        header["skipped_outside_view_volume"] += 1
                         try:
                             # Minimal, auditable tag (no spam)
-                            # key_index may not exist yet here; only write later if available
                             elem_wrapper["_skipped_outside_view_volume"] = True
                             elem_wrapper["_skip_w_range"] = (dmin, dmax)
                         except Exception:
@@ -1526,34 +1683,11 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
             category = elem.Category.Name if elem.Category else "Unknown"
         except Exception as e:
             # Log the error but continue processing other elements
-            skipped += 1
-            if skipped <= 5:  # Log first 5 errors to avoid spam
+            header["skipped"] += 1
+            if header["skipped"] <= 5:  # Log first 5 errors to avoid spam
                 print("[WARN] vop.pipeline: Skipping element from {0}: {1}".format(source_type, e))
             continue
 
-        key_index = raster.get_or_create_element_meta_index(
-            elem_id, category,
-            source_id=source_id,
-            source_type=source_type,
-            source_label=source_label
-        )
-
-        # If wrapper was volume-skipped before meta existed, record it now (auditable).
-        try:
-            if elem_wrapper.get("_skipped_outside_view_volume", False):
-                if 0 <= key_index < len(raster.element_meta):
-                    raster.element_meta[key_index]["skipped_outside_view_volume"] = True
-                    raster.element_meta[key_index]["skip_w_range"] = elem_wrapper.get("_skip_w_range")
-        except Exception:
-            pass
-
-        # PR9: persist bbox provenance into element meta (auditable)
-        try:
-            if 0 <= key_index < len(raster.element_meta):
-                raster.element_meta[key_index]["bbox_source"] = elem_wrapper.get("bbox_source")
-        except Exception:
-            pass
-
         if source_type not in ("HOST", "LINK", "DWG"):
             raise ValueError("Invalid source_type from wrapper: {0} (source_id={1})".format(source_type, source_id))
 
@@ -1568,11 +1702,11 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
             diag_link_ids = set()
 
         # DIAGNOSTIC: Stage 1 - Right after extracting wrapper data
-        if source_type == "LINK" and ((diag_link_ids and elem_id in diag_link_ids) or ((not diag_link_ids) and processed < 3)):
+        if source_type == "LINK" and ((diag_link_ids and elem_id in diag_link_ids) or ((not diag_link_ids) and trace_debug and captured < 3)):
             try:
                 _diagnose_link_geometry_transform(elem, world_transform, vb, "STAGE1_WRAPPER_EXTRACTED")
             except Exception as diag_e:
-                print("[DEBUG] Diagnostic failed at stage 1: {}".format(diag_e))
+                tracing.debug("[DEBUG] Diagnostic failed at stage 1: {}", diag_e)
 
         # PHASE 2.2: Classify element FIRST, then use appropriate extraction strategy
         # AREAL elements use unified extract_areal_geometry() with confidence levels
@@ -1602,6 +1736,9 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
             except Exception:
                 elem_class = "AREAL"  # Safe default on classification failure
 
+        # One fetch-once geometry handle per element, shared by whichever extraction path runs
+        geom_handle = handle_for(elem, view, registry=geometry_handles)
+
         # Extract geometry using appropriate strategy based on classification
         loops = None
         confidence = None
@@ -1611,6 +1748,10 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
         if elem_class == "AREAL":
             # AREAL: Use unified extraction with confidence-based fallback
             try:
+                areal_key = None
+                if areal_cache is not None:
+                    areal_key = areal_cache_key(elem, elem_id, source_id, view, vb, elem_cache=elem_cache,
+                                                 view_signature=areal_view_sig)
                 loops, confidence, strategy = extract_areal_geometry(
                     elem=elem,
                     view=view,
@@ -1618,7 +1759,10 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
                     raster=raster,
                     cfg=cfg,
                     diag=diag,
-                    strategy_diag=strategy_diag
+                    strategy_diag=strategy_diag,
+                    cache=areal_cache,
+                    cache_key=areal_key,
+                    handle=geom_handle
                 )
 
                 # Normalize confidence to uppercase (extract_areal_geometry returns 'HIGH', 'MEDIUM', 'LOW')
@@ -1631,9 +1775,8 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
                 confidence = CONF_LOW
                 strategy = 'failed'
                 silhouette_error = str(e)
-                if processed < 10:
-                    print("[DEBUG] AREAL extraction failed for element {0} ({1}): {2}".format(
-                        elem_id, category, silhouette_error))
+                if captured < 10:
+                    tracing.debug("[DEBUG] AREAL extraction failed for element {0} ({1}): {2}", elem_id, category, silhouette_error)
         else:
             # TINY/LINEAR: Use traditional silhouette extraction (no confidence levels)
             try:
@@ -1653,18 +1796,18 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
                     )
 
                 # DIAGNOSTIC: Stage 2 - Right before calling get_element_silhouette
-                if source_type == "LINK" and processed < 3:  # Only first 3 LINK elements
+                if trace_debug and source_type == "LINK" and captured < 3:  # Only first 3 LINK elements
                     try:
                         _diagnose_link_geometry_transform(elem, world_transform, vb, "STAGE2_BEFORE_SILHOUETTE")
                     except Exception as diag_e:
-                        print("[DEBUG] Diagnostic failed at stage 2: {}".format(diag_e))
+                        tracing.debug("[DEBUG] Diagnostic failed at stage 2: {}", diag_e)
 
-                loops = get_element_silhouette(elem, view, vb, raster, cfg, cache=geometry_cache, cache_key=cache_key, diag=diag)
+                loops = get_element_silhouette(elem, view, vb, raster, cfg, cache=geometry_cache, cache_key=cache_key, diag=diag, handle=geom_handle)
 
                 # =====================================================================
                 # DIAGNOSTIC: Coordinate space check for element 987587
                 # =====================================================================
-                if elem_id == 987587 and loops and len(loops) > 0:
+                if trace_debug and elem_id == 987587 and loops and len(loops) > 0:
                     print(f"\n{'='*80}")
                     print(f"SILHOUETTE COORDINATE DIAGNOSTIC - Element {elem_id}")
                     print(f"{'='*80}")
@@ -1786,9 +1929,9 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
                 confidence = CONF_LOW
                 strategy = 'failed'
                 silhouette_error = str(e)
-                if processed < 10:
-                    print("[DEBUG] Silhouette extraction failed for element {0} ({1}): {2}".format(
-                        elem_id, category, silhouette_error))
+                if captured < 10:
+                    tracing.debug("[DEBUG] Silhouette extraction failed for element {0} ({1}): {2}", elem_id, category, silhouette_error)
+
 
         bbox_link = elem_wrapper.get("bbox_link")
         bbox_for_metrics = bbox_link if bbox_link is not None else elem_wrapper.get("bbox")
@@ -1810,6 +1953,7 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
 
         # Depth must be finite. NaN causes all depth tests to reject (NaN < inf is False),
         # which yields exactly: filled_cells=0, occlusion_cells=0, proxy_edge_cells=0.
+        depth_invalid = False
         if (elem_depth is None) or (not isinstance(elem_depth, (int, float))) or (not math.isfinite(elem_depth)):
             # Fall back to a conservative nearest-depth estimate from bbox.
             try:
@@ -1823,26 +1967,18 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
                 )
             except Exception:
                 elem_depth = 0.0
-
-            try:
-                if key_index < len(raster.element_meta):
-                    raster.element_meta[key_index]["depth_invalid"] = True
-            except Exception:
-                pass
+            depth_invalid = True
 
         # Clamp depth used for early-out comparisons to the view volume (min depth >= W0).
         # Do NOT change silhouette strategy; this only prevents out-of-volume depths from driving occlusion logic.
+        depth_clamped = False
         if (W0 is not None) and isinstance(elem_depth, (int, float)) and math.isfinite(elem_depth):
             if elem_depth < W0:
-                try:
-                    if key_index < len(raster.element_meta):
-                        raster.element_meta[key_index]["depth_clamped_to_w0"] = True
-                except Exception:
-                    pass
+                depth_clamped = True
                 elem_depth = W0
 
         # DEBUG: Log depth values and silhouette status for first few elements
-        if processed < 10:
+        if trace_debug and captured < 10:
             depth_source = "geometry" if loops else "bbox"
             silhouette_status = "SUCCESS ({0} loops)".format(len(loops)) if loops else "FAILED (bbox fallback)"
             
@@ -1853,12 +1989,12 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
                 w_cells, h_cells = _rect_dims_for_classification(rect, raster)
                 classification = _classify_uv_rect(w_cells, h_cells)
             
-            print("[DEBUG] Element {0} ({1}): silhouette={2}, depth={3} (from {4}), source={5}, class={6}".format(
-                elem_id, category, silhouette_status, elem_depth, depth_source, source_type, classification))
+            tracing.debug("[DEBUG] Element {0} ({1}): silhouette={2}, depth={3} (from {4}), source={5}, class={6}", elem_id, category, silhouette_status, elem_depth, depth_source, source_type, classification)
 
-        # Safe early-out occlusion using bbox footprint + tile depth (front-to-back streaming)
+        # Footprint inputs for the replay-time early-out (bbox rect, optional Tier-B hull)
+        rect = elem_wrapper.get("uv_bbox_rect")
+        early_out = None
         try:
-            rect = elem_wrapper.get("uv_bbox_rect")
             if rect is None:
                 rect = _project_element_bbox_to_cell_rect(
                     elem,
@@ -1869,76 +2005,20 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
                     view=view,
                 )
             if rect and (not rect.empty):
-                from .core.footprint import CellRectFootprint
-                fp = CellRectFootprint(rect)
-
-                # Defaults must be defined on the non-ambiguous path
-                uvw_pts = None
-                footprint = fp
-                elem_min_w = elem_depth  # conservative: element depth from loops-or-bbox
+                # Use existing confidence (don't overwrite what extraction set)
+                if confidence is None:
+                    confidence = CONF_LOW  # Safety fallback
 
-                # Stage 1: tile-level conservative occlusion against bbox footprint
-                if _tiles_fully_covered_and_nearer(raster.tile, fp, elem_min_w):
-                    skipped += 1
-                    continue
+                early_out = {"hull_uv": None, "min_w": None}
 
                 # Tier-A ambiguity trigger (selectively enable Tier-B proxy)
                 # NOTE: multiple CellRect implementations exist; derive dimensions via helper.
                 from .core.math_utils import cellrect_dims
                 aabb_w_cells, aabb_h_cells = cellrect_dims(rect)
 
-                # Classification and confidence already set above (Phase 2.2)
-                # elem_class: set before extraction (line ~1620)
-                # confidence: returned by extract_areal_geometry() or assigned for TINY/LINEAR
-
-                # Get dimensions for Tier-A ambiguity check
                 cls_w_cells, cls_h_cells = _rect_dims_for_classification(rect, raster)
                 minor_cells = min(cls_w_cells, cls_h_cells)
 
-                # Use existing confidence (don't overwrite what extraction set)
-                if confidence is None:
-                    confidence = CONF_LOW  # Safety fallback
-
-                occlusion_allowed = _occlusion_allowed(elem_class, confidence)
-
-                if key_index < len(raster.element_meta):
-                    raster.element_meta[key_index]["class"] = elem_class
-                    raster.element_meta[key_index]["confidence"] = confidence
-                    raster.element_meta[key_index]["occluder"] = occlusion_allowed
-
-                # Track element classification and confidence in strategy diagnostics
-                if strategy_diag is not None:
-                    try:
-                        strategy_diag.record_element_classification(
-                            elem_id=elem_id,
-                            elem_class=elem_class,
-                            category=category
-                        )
-
-                        # Phase 2.2: Track confidence level (HIGH, MEDIUM, LOW)
-                        if confidence is not None:
-                            strategy_diag.record_confidence(
-                                elem_id=elem_id,
-                                confidence=confidence,
-                                category=category
-                            )
-                    except Exception:
-                        pass  # Diagnostic failures must not crash pipeline
-
-                # DEBUG: Log classification for diagonal-looking elements (first 10)
-                if not hasattr(render_model_front_to_back, '_classify_debug_count'):
-                    render_model_front_to_back._classify_debug_count = 0
-                if render_model_front_to_back._classify_debug_count < 10:
-                    # Diagonal elements likely have similar width/height
-                    ratio = max(cls_w_cells, cls_h_cells) / max(min(cls_w_cells, cls_h_cells), 0.001)
-                    if 5 < ratio < 50:  # Likely LINEAR diagonal
-                        try:
-                            print("[DEBUG classify] Elem {}: {}x{} cells → class={}, category='{}'".format(
-                                elem_id, width_cells, height_cells, elem_class, category))
-                            render_model_front_to_back._classify_debug_count += 1
-                        except Exception:
-                            pass
-            
                 aabb_area_cells = aabb_w_cells * aabb_h_cells
                 grid_area = raster.W * raster.H
 
@@ -1952,351 +2032,456 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
                     minor_cells, aabb_area_cells, grid_area, cell_size_world, cfg
                 )
 
-                # Tier-B proxy path (geometry-based sampling)
+                # Tier-B proxy path (geometry-based sampling). Skipped when the live raster
+                # already proves the bbox footprint occluded (replay will skip the element).
                 if tier_a_ambig:
-                    from .revit.tierb_proxy import sample_element_uvw_points
-                    uvw_pts = sample_element_uvw_points(elem, view, vb, cfg)
+                    from .core.footprint import CellRectFootprint
+                    if not _tiles_fully_covered_and_nearer(raster.tile, CellRectFootprint(rect), elem_depth):
+                        from .revit.tierb_proxy import sample_element_uvw_points
+                        uvw_pts = sample_element_uvw_points(elem, view, vb, cfg)
 
-                    if uvw_pts:
-                        points_uv = [(u, v) for (u, v, w) in uvw_pts]
+                        if uvw_pts:
+                            points_uv = [(u, v) for (u, v, w) in uvw_pts]
 
-                        from .core.hull import convex_hull_uv
-                        hull_uv = convex_hull_uv(points_uv)
+                            from .core.hull import convex_hull_uv
+                            early_out["hull_uv"] = [tuple(p) for p in convex_hull_uv(points_uv)]
 
-                        from .core.footprint import HullFootprint
-                        footprint = HullFootprint(hull_uv, raster)
+                            # Minimum sampled W becomes the conservative depth for early-out + stamping
+                            early_out["min_w"] = min(w for (_, _, w) in uvw_pts)
 
-                        # Minimum sampled W becomes the conservative depth for early-out + stamping
-                        elem_min_w = min(w for (_, _, w) in uvw_pts)
+        except Exception as e:
+            # Must be observable, and must remain conservative (do not skip element).
+            # Early-out is an optimization; failures must not change raster results.
+            early_out = None
+            _debug_early_out_failed(diag, header.get("view_id"), elem_id, e)
 
-                # Stage 2: depth-aware early-out using chosen footprint (bbox or hull)
-                if _tiles_fully_covered_and_nearer(raster.tile, footprint, elem_min_w):
-                    skipped += 1
-                    continue
+        # DIAGNOSTIC: Stage 3 - Right before rasterization
+        if trace_debug and loops and source_type == "LINK" and captured < 3:  # Only first 3 LINK elements
+            try:
+                _diagnose_link_geometry_transform(elem, world_transform, vb, "STAGE3_BEFORE_RASTER")
+                # Also print first few loop points to see if they're in correct space
+                first_loop = loops[0]
+                pts = first_loop.get('points', [])
+                if pts and len(pts) > 0:
+                    print("First loop point (UV): ({:.3f}, {:.3f})".format(pts[0][0], pts[0][1]))
+            except Exception as diag_e:
+                tracing.debug("[DEBUG] Diagnostic failed at stage 3: {}", diag_e)
+
+        captured += 1
+        yield {
+            "elem_id": elem_id,
+            "category": category,
+            "source_id": source_id,
+            "source_type": source_type,
+            "source_label": source_label,
+            "bbox_source": elem_wrapper.get("bbox_source"),
+            "elem_class": elem_class,
+            "loops": loops,
+            "confidence": confidence,
+            "strategy": strategy,
+            "silhouette_error": silhouette_error,
+            "depth": elem_depth,
+            "depth_invalid": depth_invalid,
+            "depth_clamped_to_w0": depth_clamped,
+            "rect": _rect_tuple(rect),
+            "early_out": early_out,
+        }
 
-                # Stage 3: conservative stamping
-                #
-                # IMPORTANT: Do NOT write occlusion here based on a bbox footprint.
-                # Bbox-footprint occlusion creates false rectangular masks for diagonal/rotated geometry.
-                #
-                # Occlusion truth is written only by the actual rasterization path
-                # (e.g., rasterize_areal_loops -> raster.rasterize_silhouette_loops).
-                #
-                # This block intentionally performs no stamping.
-                pass
 
-                # Note: TINY/LINEAR elements intentionally NOT stamped here
-                # They will be rendered via:
-                #   1. Silhouette extraction (preferred)
-                #   2. OBB fallback (if silhouette fails)
-                #   3. AABB fallback (if OBB fails)
+def _debug_early_out_failed(diag, view_id, elem_id, exc):
+    if diag is None:
+        return
+    try:
+        dedupe_key = "early_out_failed|{}".format(view_id)
+        diag.debug_dedupe(
+            dedupe_key=dedupe_key,
+            phase="pipeline",
+            callsite="render_model_front_to_back.early_out",
+            message="Early-out/stamp block failed; continuing without early-out",
+            view_id=view_id,
+            elem_id=elem_id,
+            extra={
+                # doc_key is not defined in this scope; never allow diagnostics to raise
+                "doc_key": None,
+                "exc": str(exc),
+            },
+        )
+    except Exception:
+        # Diagnostics must never throw.
+        pass
 
-        except Exception as e:
-            # Must be observable, and must remain conservative (do not skip element).
-            # Early-out is an optimization; failures must not change raster results.
-            if diag is not None:
-                try:
-                    view_id = getattr(getattr(view, "Id", None), "IntegerValue", None)
-                    elem_id = getattr(getattr(elem, "Id", None), "IntegerValue", None)
-                    dedupe_key = "early_out_failed|{}".format(view_id)
-                    diag.debug_dedupe(
-                        dedupe_key=dedupe_key,
-                        phase="pipeline",
-                        callsite="render_model_front_to_back.early_out",
-                        message="Early-out/stamp block failed; continuing without early-out",
-                        view_id=view_id,
-                        elem_id=elem_id,
-                        extra={
-                            # doc_key is not defined in this scope; never allow diagnostics to raise
-                            "doc_key": None,
-                            "exc": str(e),
-                        },
-                    )
-                except Exception:
-                    # Diagnostics must never throw.
-                    pass
 
-        # Rasterize silhouette loops if we have them
-        if loops:
-            # DIAGNOSTIC: Stage 3 - Right before rasterization
-            if source_type == "LINK" and processed < 3:  # Only first 3 LINK elements
-                try:
-                    _diagnose_link_geometry_transform(elem, world_transform, vb, "STAGE3_BEFORE_RASTER")
-                    # Also print first few loop points to see if they're in correct space
-                    if loops and len(loops) > 0:
-                        first_loop = loops[0]
-                        pts = first_loop.get('points', [])
-                        if pts and len(pts) > 0:
-                            print("First loop point (UV): ({:.3f}, {:.3f})".format(pts[0][0], pts[0][1]))
-                except Exception as diag_e:
-                    print("[DEBUG] Diagnostic failed at stage 3: {}".format(diag_e))
-
-            # Get strategy from extraction (already set above) or from loop metadata
-            if strategy is None and len(loops) > 0:
-                strategy = loops[0].get('strategy', 'unknown')
-
-            # PHASE 2.2: Use rasterize_areal_loops() for AREAL elements
-            # This handles confidence-based occlusion (HIGH occludes, MEDIUM/LOW don't)
-            if elem_class == "AREAL":
-                try:
-                    success, filled = rasterize_areal_loops(
-                        loops=loops,
-                        raster=raster,
-                        key_index=key_index,
-                        elem_depth=elem_depth,
-                        source_type=source_type,
-                        confidence=confidence,
-                        strategy=strategy,
-                        elem_id=elem_id,
-                        category=category
-                    )
+def _new_model_replay_state():
+    return {"processed": 0, "skipped": 0, "silhouette_success": 0, "bbox_fallback": 0, "zbuffer_resolved": 0}
 
-                    if success:
-                        silhouette_success += 1
-                        processed += 1
-                        continue
-                    else:
-                        # Rasterization failed, fall through to bbox fallback
-                        if processed < 10:
-                            print("[DEBUG] AREAL rasterization failed for element {} ({}), falling through to bbox".format(elem_id, category))
 
-                except Exception as e:
-                    # Rasterization failed, fall through to bbox fallback
-                    if processed < 10:
-                        print("[DEBUG] AREAL rasterization exception for element {} ({}): {}".format(elem_id, category, e))
-                    pass
+def _areal_depth_field(raster, item, cfg, state, header, rect):
+    """Per-cell triangle depths for a HIGH AREAL item overlapping ambiguous tiles, else None."""
+    if not getattr(cfg, "ambiguous_tile_zbuffer", True) or rect is None:
+        return None
 
-            # TINY/LINEAR: Use traditional rasterization (no confidence-based occlusion)
-            else:
-                try:
-                    open_loops = []
-                    closed_loops = []
-                    for lp in loops:
-                        if lp.get("open", False):
-                            open_loops.append(lp)
-                        else:
-                            closed_loops.append(lp)
-
-                    filled = 0
-
-                    # First: rasterize closed loops (fills/occlusion)
-                    if closed_loops:
-                        try:
-                            filled += raster.rasterize_silhouette_loops(
-                                closed_loops, key_index, depth=elem_depth, source=source_type
-                            )
-
-                            if filled == 0 and processed < 10:
-                                print("[DEBUG RASTER FAIL] Element {} closed loops returned 0 filled (loops={}, source={})".format(
-                                    elem_id, len(closed_loops), source_type))
-                        except Exception as e:
-                            if processed < 10:
-                                print("[DEBUG RASTER EXCEPT] Element {} rasterization exception: {}".format(elem_id, e))
-                            pass
+    ambiguous = state.get("ambiguous_tiles")
+    if ambiguous is None:
+        ambiguous = state["ambiguous_tiles"] = frozenset(header.get("ambiguous_tiles") or ())
+    if not ambiguous:
+        return None
 
-                    # Second: rasterize open polylines (edges)
-                    open_polyline_success = False
-                    if open_loops:
-                        try:
-                            filled += raster.rasterize_open_polylines(
-                                open_loops, key_index, depth=elem_depth, source=source_type
-                            )
-                            # CRITICAL: Open polylines succeed even if filled=0
-                            # (Bresenham draws edges, doesn't "fill" cells like closed loops)
-                            if len(open_loops) > 0:
-                                open_polyline_success = True
-                        except Exception:
-                            pass
+    try:
+        if not any(t in ambiguous for t in raster.tile.get_tiles_for_rect(rect.i_min, rect.j_min, rect.i_max, rect.j_max)):
+            return None
 
-                    # Check for any successful rendering (filled cells OR open polylines drawn)
-                    if filled > 0 or open_polyline_success:
-                        # Update confidence if needed (TINY/LINEAR use simple model)
-                        if confidence is None or confidence == CONF_LOW:
-                            confidence = CONF_HIGH if filled > 0 else CONF_LOW
-
-                        if key_index < len(raster.element_meta):
-                            raster.element_meta[key_index]["strategy"] = strategy
-                            raster.element_meta[key_index]["confidence"] = confidence
-                            raster.element_meta[key_index]["occluder"] = _occlusion_allowed(
-                                elem_class,
-                                confidence,
-                            )
-                            if open_polyline_success and filled == 0:
-                                raster.element_meta[key_index]["open_polyline_only"] = True
-
-                        silhouette_success += 1
-                        processed += 1
-                        continue
+        from .core.tri_zbuffer import loop_depth_field
+        field = loop_depth_field(item.get("loops"), raster, ambiguous, floor_w=item["depth"])
+    except Exception:
+        return None
 
-                    else:
-                        if processed < 10:
-                            print("[DEBUG] Element {} loops exist but no successful rendering, falling through to bbox".format(elem_id))
+    if field:
+        state["zbuffer_resolved"] += 1
+        tracing.count("zbuffer_resolved")
+    return field
+
+
+def _replay_model_draw_item(raster, item, cfg, state, header, diag=None, strategy_diag=None):
+    """Render phase for one draw item: early-out, rasterization and fallbacks (no Revit API)."""
+    from .core.math_utils import CellRect
+
+    elem_id = item["elem_id"]
+    category = item["category"]
+    source_type = item["source_type"]
+    elem_class = item["elem_class"]
+    loops = item.get("loops")
+    confidence = item.get("confidence")
+    strategy = item.get("strategy")
+    elem_depth = item["depth"]
+    processed = state["processed"]
+
+    key_index = raster.get_or_create_element_meta_index(
+        elem_id, category,
+        source_id=item["source_id"],
+        source_type=source_type,
+        source_label=item.get("source_label")
+    )
 
-                except Exception as e:
-                    # Rasterization failed, fall through to bbox fallback
-                    if processed < 10:
-                        print("[DEBUG] Rasterization exception for element {} ({}): {}".format(elem_id, category, e))
-                    pass
+    # PR9: persist bbox provenance into element meta (auditable)
+    try:
+        if 0 <= key_index < len(raster.element_meta):
+            raster.element_meta[key_index]["bbox_source"] = item.get("bbox_source")
+    except Exception:
+        pass
 
-        # CRITICAL: Check if silhouette rendering already succeeded
-        # This section is ONLY for elements that failed silhouette extraction
-        # (most successful cases already hit 'continue' above, this is defensive)
-        if key_index < len(raster.element_meta):
-            strategy_used = raster.element_meta[key_index].get('strategy')
-            if strategy_used and strategy_used != 'unknown':
-                # Element already successfully rendered via silhouette
-                processed += 1
-                continue
+    if item.get("depth_invalid"):
+        try:
+            if key_index < len(raster.element_meta):
+                raster.element_meta[key_index]["depth_invalid"] = True
+        except Exception:
+            pass
 
-        # Note: AREAL diagnostic tracking is now handled inside extract_areal_geometry()
-        # No need for additional tracking here
+    if item.get("depth_clamped_to_w0"):
+        try:
+            if key_index < len(raster.element_meta):
+                raster.element_meta[key_index]["depth_clamped_to_w0"] = True
+        except Exception:
+            pass
 
-        # Fallback: AABB-only proxy (skip OBB polygon generation entirely)
-        obb_success = False
-        obb_error = "skipped (proxy-only AABB)"
-        aabb_success = False
-        aabb_error = None
+    rect_t = item.get("rect")
+    rect = CellRect(*rect_t) if rect_t is not None else None
 
-        # Ultimate fallback: axis-aligned rect (AABB)
+    # Safe early-out occlusion using bbox footprint + tile depth (front-to-back streaming)
+    early_out = item.get("early_out")
+    if early_out is not None:
         try:
-            rect = elem_wrapper.get("uv_bbox_rect")
+            from .core.footprint import CellRectFootprint
+            fp = CellRectFootprint(rect)
 
-            # Force a rect attempt here (AABB last resort depends on it).
-            if rect is None:
-                rect = _project_element_bbox_to_cell_rect(
-                    elem,
-                    vb,
-                    raster,
-                    bbox=elem_wrapper.get("bbox"),
-                    diag=diag,
-                    view=view,
-                )
+            footprint = fp
+            elem_min_w = elem_depth  # conservative: element depth from loops-or-bbox
 
-            if rect is None:
-                aabb_error = "CellRect unavailable (bbox missing/unprojectable)"
-            elif rect.empty:
-                aabb_error = "CellRect is empty (element outside bounds?)"
+            # Stage 1: tile-level conservative occlusion against bbox footprint
+            if _tiles_fully_covered_and_nearer(raster.tile, fp, elem_min_w):
+                state["skipped"] += 1
+                return
 
-            # Ultimate fallback: axis-aligned rect (if OBB fails)
-            try:
-                rect = elem_wrapper.get("uv_bbox_rect")
-
-                # Force a rect attempt here (AABB last resort depends on it).
-                if rect is None:
-                    rect = _project_element_bbox_to_cell_rect(
-                        elem,
-                        vb,
-                        raster,
-                        bbox=elem_wrapper.get("bbox"),
-                        diag=diag,
-                        view=view,
+            occlusion_allowed = _occlusion_allowed(elem_class, confidence)
+
+            if key_index < len(raster.element_meta):
+                raster.element_meta[key_index]["class"] = elem_class
+                raster.element_meta[key_index]["confidence"] = confidence
+                raster.element_meta[key_index]["occluder"] = occlusion_allowed
+
+            # Track element classification and confidence in strategy diagnostics
+            if strategy_diag is not None:
+                try:
+                    strategy_diag.record_element_classification(
+                        elem_id=elem_id,
+                        elem_class=elem_class,
+                        category=category
                     )
 
-                if rect is None:
-                    aabb_error = "CellRect unavailable (bbox missing/unprojectable)"
-                elif rect.empty:
-                    aabb_error = "CellRect is empty (element outside bounds?)"
+                    # Phase 2.2: Track confidence level (HIGH, MEDIUM, LOW)
+                    if confidence is not None:
+                        strategy_diag.record_confidence(
+                            elem_id=elem_id,
+                            confidence=confidence,
+                            category=category
+                        )
+                except Exception:
+                    pass  # Diagnostic failures must not crash pipeline
+
+            # Tier-B hull footprint (sampled during capture)
+            hull_uv = early_out.get("hull_uv")
+            if hull_uv:
+                from .core.footprint import HullFootprint
+                footprint = HullFootprint(hull_uv, raster)
+                elem_min_w = early_out.get("min_w")
+
+            # Stage 2: depth-aware early-out using chosen footprint (bbox or hull)
+            if _tiles_fully_covered_and_nearer(raster.tile, footprint, elem_min_w):
+                state["skipped"] += 1
+                return
+
+            # Stage 3: conservative stamping
+            #
+            # IMPORTANT: Do NOT write occlusion here based on a bbox footprint.
+            # Bbox-footprint occlusion creates false rectangular masks for diagonal/rotated geometry.
+            #
+            # Occlusion truth is written only by the actual rasterization path
+            # (e.g., rasterize_areal_loops -> raster.rasterize_silhouette_loops).
+            #
+            # Note: TINY/LINEAR elements intentionally NOT stamped here
+            # They will be rendered via:
+            #   1. Silhouette extraction (preferred)
+            #   2. OBB fallback (if silhouette fails)
+            #   3. AABB fallback (if OBB fails)
+
+        except Exception as e:
+            # Must be observable, and must remain conservative (do not skip element).
+            # Early-out is an optimization; failures must not change raster results.
+            _debug_early_out_failed(diag, header.get("view_id"), elem_id, e)
+
+    # Rasterize silhouette loops if we have them
+    if loops:
+        # Get strategy from extraction (already set above) or from loop metadata
+        if strategy is None and len(loops) > 0:
+            strategy = loops[0].get('strategy', 'unknown')
+
+        # PHASE 2.2: Use rasterize_areal_loops() for AREAL elements
+        # This handles confidence-based occlusion (HIGH occludes, MEDIUM/LOW don't)
+        if elem_class == "AREAL":
+            try:
+                # Phase 4.5: per-cell triangle depths, only inside ambiguous tiles
+                depth_field = None
+                if confidence == CONF_HIGH:
+                    depth_field = _areal_depth_field(raster, item, cfg, state, header, rect)
+
+                success, filled = rasterize_areal_loops(
+                    loops=loops,
+                    raster=raster,
+                    key_index=key_index,
+                    elem_depth=elem_depth,
+                    source_type=source_type,
+                    confidence=confidence,
+                    strategy=strategy,
+                    elem_id=elem_id,
+                    category=category,
+                    depth_field=depth_field
+                )
+
+                if success:
+                    state["silhouette_success"] += 1
+                    state["processed"] += 1
+                    return
                 else:
-                    # AABB fallback: proxy edges only (NO occlusion, NO filled mask)
-                    filled_count = 0
+                    # Rasterization failed, fall through to bbox fallback
+                    if processed < 10:
+                        tracing.debug("[DEBUG] AREAL rasterization failed for element {} ({}), falling through to bbox", elem_id, category)
 
-                    # AABB fallback is LOW confidence by definition; it must never write occlusion.
-                    if key_index < len(raster.element_meta):
-                        raster.element_meta[key_index]["confidence"] = CONF_LOW
-                        raster.element_meta[key_index]["occluder"] = False
-
-                    # Stamp boundary proxy edges
-                    for i, j in rect.cells():
-                        is_boundary = (
-                            i == rect.i_min or i == rect.i_max or
-                            j == rect.j_min or j == rect.j_max
+            except Exception as e:
+                # Rasterization failed, fall through to bbox fallback
+                if processed < 10:
+                    tracing.debug("[DEBUG] AREAL rasterization exception for element {} ({}): {}", elem_id, category, e)
+                pass
+
+        # TINY/LINEAR: Use traditional rasterization (no confidence-based occlusion)
+        else:
+            try:
+                open_loops = []
+                closed_loops = []
+                for lp in loops:
+                    if lp.get("open", False):
+                        open_loops.append(lp)
+                    else:
+                        closed_loops.append(lp)
+
+                filled = 0
+
+                # First: rasterize closed loops (fills/occlusion)
+                if closed_loops:
+                    try:
+                        filled += raster.rasterize_silhouette_loops(
+                            closed_loops, key_index, depth=elem_depth, source=source_type
                         )
-                        if is_boundary:
-                            idx = raster.get_cell_index(i, j)
-                            if idx is not None:
-                                raster.stamp_proxy_edge_idx(idx, key_index, depth=elem_depth)
 
-                    # Tag element metadata with axis-aligned fallback strategy
+                        if filled == 0 and processed < 10:
+                            tracing.debug("[DEBUG RASTER FAIL] Element {} closed loops returned 0 filled (loops={}, source={})", elem_id, len(closed_loops), source_type)
+                    except Exception as e:
+                        if processed < 10:
+                            tracing.debug("[DEBUG RASTER EXCEPT] Element {} rasterization exception: {}", elem_id, e)
+                        pass
+
+                # Second: rasterize open polylines (edges)
+                open_polyline_success = False
+                if open_loops:
+                    try:
+                        filled += raster.rasterize_open_polylines(
+                            open_loops, key_index, depth=elem_depth, source=source_type
+                        )
+                        # CRITICAL: Open polylines succeed even if filled=0
+                        # (Bresenham draws edges, doesn't "fill" cells like closed loops)
+                        if len(open_loops) > 0:
+                            open_polyline_success = True
+                    except Exception:
+                        pass
+
+                # Check for any successful rendering (filled cells OR open polylines drawn)
+                if filled > 0 or open_polyline_success:
+                    # Update confidence if needed (TINY/LINEAR use simple model)
+                    if confidence is None or confidence == CONF_LOW:
+                        confidence = CONF_HIGH if filled > 0 else CONF_LOW
+
                     if key_index < len(raster.element_meta):
-                        raster.element_meta[key_index]["strategy"] = "aabb_fallback"
-                        raster.element_meta[key_index]["filled_cells"] = filled_count
-                        raster.element_meta[key_index]["aabb_used"] = True
-                        if obb_error:
-                            raster.element_meta[key_index]["obb_error"] = obb_error
+                        raster.element_meta[key_index]["strategy"] = strategy
+                        raster.element_meta[key_index]["confidence"] = confidence
+                        raster.element_meta[key_index]["occluder"] = _occlusion_allowed(
+                            elem_class,
+                            confidence,
+                        )
+                        if open_polyline_success and filled == 0:
+                            raster.element_meta[key_index]["open_polyline_only"] = True
 
-                    bbox_fallback += 1
-                    processed += 1
-                    aabb_success = True
+                    state["silhouette_success"] += 1
+                    state["processed"] += 1
+                    return
 
+                else:
+                    if processed < 10:
+                        tracing.debug("[DEBUG] Element {} loops exist but no successful rendering, falling through to bbox", elem_id)
 
             except Exception as e:
-                aabb_error = "AABB fallback failed: {0}".format(e)
+                # Rasterization failed, fall through to bbox fallback
+                if processed < 10:
+                    tracing.debug("[DEBUG] Rasterization exception for element {} ({}): {}", elem_id, category, e)
+                pass
+
+    # CRITICAL: Check if silhouette rendering already succeeded
+    # This section is ONLY for elements that failed silhouette extraction
+    # (most successful cases already hit 'return' above, this is defensive)
+    if key_index < len(raster.element_meta):
+        strategy_used = raster.element_meta[key_index].get('strategy')
+        if strategy_used and strategy_used != 'unknown':
+            # Element already successfully rendered via silhouette
+            state["processed"] += 1
+            return
+
+    # Note: AREAL diagnostic tracking is now handled inside extract_areal_geometry()
+    # No need for additional tracking here
+
+    # Fallback: AABB-only proxy (skip OBB polygon generation entirely)
+    obb_error = "skipped (proxy-only AABB)"
+    aabb_success = False
+    aabb_error = None
 
-            if not aabb_success:
-                # Complete failure - tag element with error info
+    # Ultimate fallback: axis-aligned rect (AABB)
+    try:
+        try:
+            if rect is None:
+                aabb_error = "CellRect unavailable (bbox missing/unprojectable)"
+            elif rect.empty:
+                aabb_error = "CellRect is empty (element outside bounds?)"
+            else:
+                # AABB fallback: proxy edges only (NO occlusion, NO filled mask)
+                filled_count = 0
+
+                # AABB fallback is LOW confidence by definition; it must never write occlusion.
+                if key_index < len(raster.element_meta):
+                    raster.element_meta[key_index]["confidence"] = CONF_LOW
+                    raster.element_meta[key_index]["occluder"] = False
+
+                # Stamp boundary proxy edges
+                for i, j in rect.cells():
+                    is_boundary = (
+                        i == rect.i_min or i == rect.i_max or
+                        j == rect.j_min or j == rect.j_max
+                    )
+                    if is_boundary:
+                        idx = raster.get_cell_index(i, j)
+                        if idx is not None:
+                            raster.stamp_proxy_edge_idx(idx, key_index, depth=elem_depth)
+
+                # Tag element metadata with axis-aligned fallback strategy
                 if key_index < len(raster.element_meta):
-                    raster.element_meta[key_index]['obb_error'] = obb_error
-                    raster.element_meta[key_index]['strategy'] = 'FAILED'
-                    raster.element_meta[key_index]['aabb_error'] = aabb_error
+                    raster.element_meta[key_index]["strategy"] = "aabb_fallback"
+                    raster.element_meta[key_index]["filled_cells"] = filled_count
+                    raster.element_meta[key_index]["aabb_used"] = True
+                    if obb_error:
+                        raster.element_meta[key_index]["obb_error"] = obb_error
 
-                skipped += 1
-                if skipped <= 10:
-                    print("[ERROR] Element {0} ({1}) from {2} completely failed:".format(
-                        elem_id, category, source_type))
-                    print("  OBB error: {0}".format(obb_error))
-                    print("  AABB error: {0}".format(aabb_error))
+                state["bbox_fallback"] += 1
+                state["processed"] += 1
+                aabb_success = True
 
         except Exception as e:
-            # Catastrophic failure
-            try:
-                if key_index < len(raster.element_meta):
-                    raster.element_meta[key_index]['strategy'] = 'CATASTROPHIC_FAILURE'
-                    raster.element_meta[key_index]['error'] = str(e)
-            except Exception:
-                pass
+            aabb_error = "AABB fallback failed: {0}".format(e)
 
-            skipped += 1
+        if not aabb_success:
+            # Complete failure - tag element with error info
+            if key_index < len(raster.element_meta):
+                raster.element_meta[key_index]['obb_error'] = obb_error
+                raster.element_meta[key_index]['strategy'] = 'FAILED'
+                raster.element_meta[key_index]['aabb_error'] = aabb_error
 
-            if skipped <= 10:
-                try:
-                    safe_elem_id = getattr(getattr(elem, "Id", None), "IntegerValue", None)
-                except Exception:
-                    safe_elem_id = None
-                print("[ERROR] vop.pipeline: Catastrophic failure for element {0}: {1}".format(safe_elem_id, e))
+            state["skipped"] += 1
+            if state["skipped"] <= 10:
+                print("[ERROR] Element {0} ({1}) from {2} completely failed:".format(
+                    elem_id, category, source_type))
+                print("  OBB error: {0}".format(obb_error))
+                print("  AABB error: {0}".format(aabb_error))
 
-            # Record structured diagnostic if available
-            try:
-                if diag is not None:
-                    diag.error(
-                        phase="pipeline",
-                        callsite="render_model_front_to_back",
-                        message="Catastrophic failure processing element",
-                        exc=e,
-                        view_id=getattr(getattr(view, "Id", None), "IntegerValue", None),
-                        elem_id=getattr(getattr(elem, "Id", None), "IntegerValue", None),
-                        extra={"doc_key": doc_key if "doc_key" in locals() else None},
-                    )
-            except Exception:
-                pass
+    except Exception as e:
+        # Catastrophic failure
+        try:
+            if key_index < len(raster.element_meta):
+                raster.element_meta[key_index]['strategy'] = 'CATASTROPHIC_FAILURE'
+                raster.element_meta[key_index]['error'] = str(e)
+        except Exception:
+            pass
 
-            # Continue with remaining elements
-            continue
+        state["skipped"] += 1
 
-    # Phase 4.5: Ambiguity detection (selective z-buffer prep)
-    # Build tile bins and detect ambiguous tiles where depth conflicts exist
-    if getattr(cfg, 'enable_ambiguity_detection', True):
+        if state["skipped"] <= 10:
+            print("[ERROR] vop.pipeline: Catastrophic failure for element {0}: {1}".format(elem_id, e))
+
+        # Record structured diagnostic if available
         try:
-            tile_bins = _bin_elements_to_tiles(expanded_elements, raster)
-            ambiguous_tiles = _get_ambiguous_tiles(tile_bins, cfg)
+            if diag is not None:
+                diag.error(
+                    phase="pipeline",
+                    callsite="render_model_front_to_back",
+                    message="Catastrophic failure processing element",
+                    exc=e,
+                    view_id=header.get("view_id"),
+                    elem_id=elem_id,
+                    extra={"doc_key": None},
+                )
+        except Exception:
+            pass
 
-            # TODO: Phase 4.5 triangle resolution will go here
-            # For now, just log ambiguous tile count
-            if getattr(cfg, 'debug_ambiguous_tiles', False) and ambiguous_tiles:
-                print("[DEBUG] Ambiguous tiles detected: {0}".format(len(ambiguous_tiles)))
-                print("[DEBUG] These tiles have depth conflicts and may need triangle resolution")
 
-        except Exception as e:
-            print("[WARN] vop.pipeline: Ambiguity detection failed: {0}".format(e))
+def _finish_model_replay(raster, view, header, cfg, state, strategy_diag=None):
+    """Model pass epilogue: counters, summaries, optional debug dumps and strategy CSVs."""
+    processed = state["processed"]
+    silhouette_success = state["silhouette_success"]
+    bbox_fallback = state["bbox_fallback"]
+    skipped = state["skipped"] + int(header.get("skipped", 0) or 0)
 
     # Log summary
     if processed > 0:
@@ -2305,7 +2490,7 @@ def render_model_front_to_back(doc, view, raster, elements, cfg, diag=None, geom
 
     # Persist view-volume metric for export/diagnostics
     try:
-        raster.skipped_outside_view_volume = int(skipped_outside_view_volume)
+        raster.skipped_outside_view_volume = int(header.get("skipped_outside_view_volume", 0) or 0)
     except Exception:
         pass
 
@@ -2515,7 +2700,21 @@ def _tiles_fully_covered_and_nearer(tile_map, footprint, elem_min_w):
         Element is occluded if ALL tiles overlapping its footprint are:
         1. Fully filled (no empty cells)
         2. Nearer than element's minimum W-depth (w_min_tile < elem_min_w)
+
+        ✔ Fast path: hi-Z pyramid check over the footprint's tile rect, O(log n)
+        ✔ Falls back to the exact per-tile walk when the pyramid cannot prove it,
+          so the result is identical to the tile walk alone
     """
+    tile_rect = getattr(footprint, "tile_rect", None)
+    hiz = getattr(tile_map, "hiz_rect_occluded", None)
+    if tile_rect is not None and hiz is not None:
+        try:
+            r = tile_rect(tile_map)
+            if r is not None and hiz(r[0], r[1], r[2], r[3], elem_min_w):
+                return True
+        except Exception:
+            pass
+
     tiles = footprint.tiles(tile_map)
 
     for t in tiles:
@@ -2608,7 +2807,8 @@ def _get_ambiguous_tiles(tile_bins, cfg):
 
     Commentary:
         Ambiguous tiles are those where depth-based ordering is insufficient.
-        These tiles will use triangle z-buffer resolution in Phase 4.5.
+        AREAL items overlapping them get per-cell triangle depths at replay
+        (_areal_depth_field).
     """
     ambiguous = []
 
@@ -2626,21 +2826,6 @@ def _get_ambiguous_tiles(tile_bins, cfg):
     return ambiguous
 
 
-def _render_areal_element(elem, transform, view, raster, rect, key_index, cfg):
-    """Render AREAL element: triangles + z-buffer + depth-tested edges.
-
-    Commentary:
-        ✔ Fast conservative interior fill by tiles
-        ✔ Refine boundaries using triangle z-buffer
-        ✔ Edges depth-tested vs zMin
-        ⚠ Placeholder implementation - requires geometry API access
-    """
-    raise NotImplementedError(
-        "Areal rasterization must route all writes through ViewRaster.try_write_cell() "
-        "with view-space W-depth per cell (no set_cell_filled fallback)."
-    )
-
-
 def _render_proxy_element(elem, transform, view, raster, rect, mode, key_index, cfg):
     """Render TINY/LINEAR element: proxy edges + optional minimal mask.
 
@@ -2,10 +2,113 @@
 PNG export for VOP interwoven pipeline rasters.
 
 Generates visual representations of raster data with color-coded cells.
+
+PNG files are written by a self-contained encoder (zlib + struct): 8-bit
+palette-indexed scanlines, integer upscaling by byte/row repetition. No
+System.Drawing / pythonnet dependency, so export runs on plain CPython.
 """
 
 import os
+import struct
 import time
+import zlib
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Palette indices (Phase 2.3: Confidence-based color scheme)
+PAL_EMPTY = 0        # White: empty cells
+PAL_MODEL_EDGE = 1   # Bright green: HIGH confidence model ink
+PAL_MODEL_PROXY = 2  # Dark green: MEDIUM/LOW confidence proxy
+PAL_ANNO = 3         # Red: annotations
+
+DEFAULT_PALETTE = (
+    (255, 255, 255),
+    (0, 255, 0),
+    (0, 128, 0),
+    (255, 0, 0),
+)
+
+
+def _png_chunk(tag, data):
+    """Serialize one PNG chunk (length, tag, data, CRC32 over tag+data)."""
+    return (
+        struct.pack(">I", len(data))
+        + tag
+        + data
+        + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+    )
+
+
+def encode_indexed_png(index_rows, width, palette, scale=1, compress_level=6):
+    """Encode palette-indexed rows as PNG bytes (color type 3, bit depth 8).
+
+    Args:
+        index_rows: Iterable of bytes-like rows (top to bottom), one palette
+                    index per cell, each of length width
+        width: Cells per row
+        palette: Sequence of (r, g, b) tuples (max 256)
+        scale: Integer upscale factor (pixels per cell, both axes)
+        compress_level: zlib level (0-9)
+
+    Returns:
+        PNG file contents as bytes
+    """
+    scale = max(1, int(scale))
+    width = int(width)
+
+    # Horizontal upscale via a per-index lookup of repeated bytes.
+    if scale > 1:
+        rep = [bytes((v,)) * scale for v in range(256)]
+
+    comp = zlib.compressobj(int(compress_level))
+    idat = []
+    height = 0
+    for row in index_rows:
+        row = bytes(row)
+        if scale > 1:
+            row = b"".join(map(rep.__getitem__, row))
+        # Filter type 0 (None) per scanline; vertical upscale by row repetition.
+        line = b"\x00" + row
+        idat.append(comp.compress(line * scale))
+        height += 1
+    idat.append(comp.flush())
+
+    ihdr = struct.pack(">IIBBBBB", width * scale, height * scale, 8, 3, 0, 0, 0)
+    plte = b"".join(struct.pack("BBB", *rgb) for rgb in palette)
+
+    return b"".join((
+        _PNG_SIGNATURE,
+        _png_chunk(b"IHDR", ihdr),
+        _png_chunk(b"PLTE", plte),
+        _png_chunk(b"IDAT", b"".join(idat)),
+        _png_chunk(b"IEND", b""),
+    ))
+
+
+def build_index_rows(width, height, model_edge_key, model_proxy_key, anno_key):
+    """Classify raster cells into palette-index rows (top row first).
+
+    Priority (first match wins): model edge > model proxy > annotation > empty.
+    Rows are flipped so j=0 becomes the bottom image row.
+    """
+    n_edge = len(model_edge_key)
+    n_proxy = len(model_proxy_key)
+    n_anno = len(anno_key)
+
+    rows = []
+    for j in range(height - 1, -1, -1):
+        base = j * width
+        row = bytearray(width)
+        for i in range(width):
+            idx = base + i
+            if idx < n_edge and model_edge_key[idx] != -1:
+                row[i] = PAL_MODEL_EDGE
+            elif idx < n_proxy and model_proxy_key[idx] != -1:
+                row[i] = PAL_MODEL_PROXY
+            elif idx < n_anno and anno_key[idx] >= 0:
+                row[i] = PAL_ANNO
+        rows.append(row)
+    return rows
 
 def export_raster_to_png(view_result, output_path, pixels_per_cell=4, cut_vs_projection=False, diag=None):
     """Export VOP raster to PNG image with color-coded occupancy.
@@ -35,16 +138,6 @@ def export_raster_to_png(view_result, output_path, pixels_per_cell=4, cut_vs_pro
         >>> png_path = export_raster_to_png(view_data, r'C:\temp\vop_output.png')
     """
     try:
-        # Import .NET drawing libraries (IronPython/CPython3 compatible)
-        try:
-            import clr
-            clr.AddReference('System.Drawing')
-            from System.Drawing import Bitmap, Color
-            from System.Drawing.Imaging import ImageFormat
-        except ImportError:
-            print("Error: System.Drawing not available. Running outside Revit/Dynamo?")
-            return None
-
         # Extract raster data
         # Accept either:
         #   - full view_result dict: {"width","height","raster",...}
@@ -197,76 +290,13 @@ def export_raster_to_png(view_result, output_path, pixels_per_cell=4, cut_vs_pro
         anno_over_model = raster_dict.get('anno_over_model', [])
         anno_key = raster_dict.get('anno_key', [])
 
-        # Calculate bitmap size
-        width_px = width * pixels_per_cell
-        height_px = height * pixels_per_cell
-
-        # Define colors (Phase 2.3: Confidence-based color scheme)
-        col_empty = Color.White                       # Empty cells
-        col_model_edge = Color.FromArgb(0, 255, 0)    # Bright green (HIGH confidence model ink)
-        col_model_proxy = Color.FromArgb(0, 128, 0)   # Dark green (MEDIUM/LOW confidence proxy)
-        col_anno = Color.FromArgb(255, 0, 0)          # Red (annotations)
-
-        # Legacy colors (keep for backward compatibility)
-        col_projection = Color.FromArgb(192, 192, 192)  # Light gray (RGB: 192, 192, 192)
-        col_cut = Color.FromArgb(64, 64, 64)            # Dark gray (RGB: 64, 64, 64)
-        col_model = col_model_edge                      # Default to bright green
-        col_anno_only = col_anno                        # Red for annotations
-        col_anno_over_model = Color.FromArgb(255, 165, 0)  # Orange (annotation over model)
-
-        # Create bitmap
-        bmp = Bitmap(width_px, height_px)
-
-        # Initialize to white background
-        for x in range(width_px):
-            for y in range(height_px):
-                bmp.SetPixel(x, y, col_empty)
-
-        # Fill cells (flip j so origin is bottom-left visually)
-        for i in range(width):
-            for j in range(height):
-                idx = j * width + i
-
-                # Phase 2.3: Check layers in priority order
-                # 1. model_edge_key (HIGH confidence - bright green)
-                # 2. model_proxy_key (MEDIUM/LOW confidence - dark green)
-                # 3. anno_key (annotations - red)
-                # 4. Empty (white)
-
-                has_model_edge = (idx < len(model_edge_key)) and (model_edge_key[idx] != -1)
-                has_model_proxy = (idx < len(model_proxy_key)) and (model_proxy_key[idx] != -1)
-                has_anno = (idx < len(anno_key)) and (anno_key[idx] >= 0)
-
-                # Skip completely empty cells
-                if not has_model_edge and not has_model_proxy and not has_anno:
-                    continue
-
-                # Determine color based on priority (first match wins)
-                if has_model_edge:
-                    # HIGH confidence model ink - bright green
-                    col = col_model_edge
-                elif has_model_proxy:
-                    # MEDIUM/LOW confidence proxy - dark green
-                    col = col_model_proxy
-                elif has_anno:
-                    # Annotation - red
-                    col = col_anno
-                else:
-                    # Should never reach here, but safety fallback
-                    col = col_empty
-                    continue
-
-                # Map cell (i, j) to pixel block
-                x0 = i * pixels_per_cell
-                # Flip vertically so j=0 is bottom row
-                y0 = (height - 1 - j) * pixels_per_cell
-                x1 = x0 + pixels_per_cell
-                y1 = y0 + pixels_per_cell
-
-                # Fill the block
-                for px in range(x0, min(x1, width_px)):
-                    for py in range(y0, min(y1, height_px)):
-                        bmp.SetPixel(px, py, col)
+        # Classify cells into palette indices (Phase 2.3 priority order):
+        # 1. model_edge_key (HIGH confidence - bright green)
+        # 2. model_proxy_key (MEDIUM/LOW confidence - dark green)
+        # 3. anno_key (annotations - red)
+        # 4. Empty (white)
+        index_rows = build_index_rows(width, height, model_edge_key, model_proxy_key, anno_key)
+        png_bytes = encode_indexed_png(index_rows, width, DEFAULT_PALETTE, scale=pixels_per_cell)
 
         # Ensure output directory exists
         out_dir = os.path.dirname(output_path)
@@ -274,7 +304,8 @@ def export_raster_to_png(view_result, output_path, pixels_per_cell=4, cut_vs_pro
             os.makedirs(out_dir)
 
         # Save PNG
-        bmp.Save(output_path, ImageFormat.Png)
+        with open(output_path, "wb") as f:
+            f.write(png_bytes)
 
         return output_path
 
@@ -4,6 +4,7 @@ Revit-specific integrations for VOP pipeline.
 Modules:
 - view_basis: View coordinate system extraction (O, R, U, F)
 - collection: Element collection and visibility filtering
+- document_snapshot: Per-run element index shared across views
 """
 
 from .view_basis import make_view_basis, ViewBasis
@@ -9,6 +9,76 @@ Phase 8a: Annotation Collection & Rasterization
 """
 
 
+# Tag categories that drive extents (mirrors the tag set used in collect_2d_annotations)
+_DRIVER_TAG_CATEGORIES = (
+    "OST_RoomTags",
+    "OST_SpaceTags",
+    "OST_AreaTags",
+    "OST_DoorTags",
+    "OST_WindowTags",
+    "OST_WallTags",
+    "OST_MEPSpaceTags",
+    "OST_GenericAnnotation",  # IndependentTag often lives here
+    "OST_KeynoteTags",        # keynotes can behave like tags/text
+)
+
+
+def _extent_driver_predicate():
+    """Resolve driver types / category ids once; returns elem -> bool.
+
+    See is_extent_driver_annotation() for the rules.
+    """
+    # 1) Strongest signal: actual runtime types (when Autodesk is available)
+    try:
+        from Autodesk.Revit.DB import TextNote, Dimension, IndependentTag
+        driver_types = (TextNote, Dimension, IndependentTag)
+    except Exception:
+        driver_types = None
+
+    # 2) Stable fallback: BuiltInCategory ids
+    try:
+        from Autodesk.Revit.DB import BuiltInCategory
+
+        driver_cats = set()
+        for n in ("OST_TextNotes", "OST_Dimensions") + _DRIVER_TAG_CATEGORIES:
+            if hasattr(BuiltInCategory, n):
+                driver_cats.add(int(getattr(BuiltInCategory, n)))
+    except Exception:
+        driver_cats = None
+
+    def is_driver(elem):
+        try:
+            if driver_types is not None:
+                try:
+                    if isinstance(elem, driver_types):
+                        return True
+                except Exception:
+                    pass
+
+            cat = getattr(elem, "Category", None)
+            if cat is None or getattr(cat, "Id", None) is None:
+                return False
+
+            try:
+                if driver_cats is None:
+                    raise LookupError("BuiltInCategory unavailable")
+                return int(cat.Id.IntegerValue) in driver_cats
+            except Exception:
+                # Last-resort fallback (keep prior behavior, but only as a final fallback)
+                name = ""
+                try:
+                    name = (cat.Name or "").lower()
+                except Exception:
+                    name = ""
+                return ("tag" in name) or ("dimension" in name) or ("text" in name)
+
+        except Exception as e:
+            print(f"[WARN] revit.annotation:is_extent_driver_annotation: failed ({type(e).__name__}: {e})")
+            return False
+
+    return is_driver
+
+
 def is_extent_driver_annotation(elem):
     """Check if annotation is an extent driver (can exist outside crop).
 
@@ -20,67 +90,87 @@ def is_extent_driver_annotation(elem):
     We avoid category-name substring matching (brittle/localized) and instead:
         1) Prefer type checks when Autodesk classes are available
         2) Fall back to BuiltInCategory id checks (stable)
+
+    Note: collected annotations carry this flag (AnnotationRecord.is_driver);
+    use _extent_driver_predicate() when classifying many elements.
     """
-    try:
-        # 1) Strongest signal: actual runtime types (when Autodesk is available)
+    return _extent_driver_predicate()(elem)
+
+
+class AnnotationRecord(object):
+    """One collected 2D annotation with the per-element facts all consumers need.
+
+    Attributes:
+        elem: Revit element
+        anno_type: TEXT | TAG | DIM | REGION | LINES | DETAIL | OTHER
+        elem_id: int element id (or None)
+        cat_id: int category id (or None)
+        cat_name: category display name (or None)
+        bbox: BoundingBoxXYZ from elem.get_BoundingBox(view) (never None)
+        is_keynote: True if collected from OST_KeynoteTags
+        is_driver: True if the annotation drives grid extents
+    """
+
+    __slots__ = ("elem", "anno_type", "elem_id", "cat_id", "cat_name", "bbox", "is_keynote", "is_driver")
+
+    def __init__(self, elem, anno_type, bbox, is_keynote=False, is_driver=False):
+        self.elem = elem
+        self.anno_type = anno_type
+        self.bbox = bbox
+        self.is_keynote = bool(is_keynote)
+        self.is_driver = bool(is_driver)
+        try:
+            self.elem_id = getattr(getattr(elem, "Id", None), "IntegerValue", None)
+        except Exception:
+            self.elem_id = None
+        self.cat_id = None
+        self.cat_name = None
         try:
-            from Autodesk.Revit.DB import TextNote, Dimension, IndependentTag
-            if isinstance(elem, (TextNote, Dimension, IndependentTag)):
-                return True
+            cat = getattr(elem, "Category", None)
+            if cat is not None:
+                self.cat_name = getattr(cat, "Name", None)
+                if getattr(cat, "Id", None) is not None:
+                    self.cat_id = int(cat.Id.IntegerValue)
         except Exception:
             pass
 
-        cat = getattr(elem, "Category", None)
-        if cat is None or getattr(cat, "Id", None) is None:
-            return False
 
-        # 2) Stable fallback: BuiltInCategory ids
-        try:
-            from Autodesk.Revit.DB import BuiltInCategory
-            cat_id = int(cat.Id.IntegerValue)
-
-            driver_cats = []
-
-            # Text
-            if hasattr(BuiltInCategory, "OST_TextNotes"):
-                driver_cats.append(int(BuiltInCategory.OST_TextNotes))
-
-            # Dimensions
-            if hasattr(BuiltInCategory, "OST_Dimensions"):
-                driver_cats.append(int(BuiltInCategory.OST_Dimensions))
-
-            # Tags (mirror the same tag category set used in collect_2d_annotations)
-            tag_cats = [
-                "OST_RoomTags",
-                "OST_SpaceTags",
-                "OST_AreaTags",
-                "OST_DoorTags",
-                "OST_WindowTags",
-                "OST_WallTags",
-                "OST_MEPSpaceTags",
-                "OST_GenericAnnotation",  # IndependentTag often lives here
-                "OST_KeynoteTags",        # keynotes can behave like tags/text
-            ]
-            for n in tag_cats:
-                if hasattr(BuiltInCategory, n):
-                    driver_cats.append(int(getattr(BuiltInCategory, n)))
+class AnnotationSet(object):
+    """Per-view 2D annotation collection, built once and shared by all consumers.
 
-            return cat_id in set(driver_cats)
-        except Exception:
-            # Last-resort fallback (keep prior behavior, but only as a final fallback)
-            name = ""
-            try:
-                name = (cat.Name or "").lower()
-            except Exception:
-                name = ""
-            return ("tag" in name) or ("dimension" in name) or ("text" in name)
+    compute_annotation_extents(), resolve_annotation_only_bounds() and
+    rasterize_annotations() read element refs, classification, keynote and
+    extent-driver flags and view bboxes from here instead of re-querying
+    the view.
 
-    except Exception as e:
-        print(f"[WARN] revit.annotation:is_extent_driver_annotation: failed ({type(e).__name__}: {e})")
-        return False
+    Commentary:
+        ✔ Memoized per view on the DocumentSnapshot (see collect_annotation_set)
+        ⚠ Without a snapshot every consumer builds its own set
+    """
+
+    def __init__(self, view_id=None):
+        self.view_id = view_id
+        self.records = []
+
+    def add(self, record):
+        self.records.append(record)
+
+    def __len__(self):
+        return len(self.records)
 
+    def __iter__(self):
+        return iter(self.records)
 
-def compute_annotation_extents(doc, view, view_basis, base_bounds_xy, cell_size_ft, cfg=None, diag=None):
+    def pairs(self):
+        """[(element, anno_type), ...] in collection order (collect_2d_annotations shape)."""
+        return [(r.elem, r.anno_type) for r in self.records]
+
+    def drivers(self):
+        """Records that drive grid extents (text, tags, dimensions)."""
+        return [r for r in self.records if r.is_driver]
+
+
+def compute_annotation_extents(doc, view, view_basis, base_bounds_xy, cell_size_ft, cfg=None, diag=None, snapshot=None):
     """Compute annotation extents for grid bounds expansion.
 
     Collects extent-driver annotations (text, tags, dimensions) and computes
@@ -93,6 +183,7 @@ def compute_annotation_extents(doc, view, view_basis, base_bounds_xy, cell_size_
         base_bounds_xy: Bounds2D from crop box (model crop)
         cell_size_ft: Cell size in model units (feet)
         cfg: Config (optional, for cap configuration)
+        snapshot: DocumentSnapshot (optional, shares the per-view AnnotationSet)
 
     Returns:
         Bounds2D with expanded extents, or None if no driver annotations
@@ -168,11 +259,10 @@ def compute_annotation_extents(doc, view, view_basis, base_bounds_xy, cell_size_
     allow_max_y = base_bounds_xy.ymax + cap_ft
 
     # Collect all annotations (thread diag so we can see what was collected)
-    all_annotations = collect_2d_annotations(doc, view, diag=diag)
+    all_annotations = collect_annotation_set(doc, view, diag=diag, snapshot=snapshot)
 
-    # Filter to extent drivers only
-    driver_annotations = [(elem, atype) for elem, atype in all_annotations
-                          if is_extent_driver_annotation(elem)]
+    # Filter to extent drivers only (flag computed at collection)
+    driver_annotations = all_annotations.drivers()
 
     if diag is not None:
         try:
@@ -204,33 +294,27 @@ def compute_annotation_extents(doc, view, view_basis, base_bounds_xy, cell_size_
     sample_limit = 5
     sample_count = 0
 
-    for elem, anno_type in driver_annotations:
+    for rec in driver_annotations:
+        elem = rec.elem
+        anno_type = rec.anno_type
         # Optional sample log (pre-bbox) for first few drivers
         if diag is not None and sample_count < sample_limit:
             try:
-                cat = getattr(elem, "Category", None)
-                cname = getattr(cat, "Name", None) if cat is not None else None
-                cid = None
-                if cat is not None:
-                    try:
-                        cid = int(cat.Id.IntegerValue)
-                    except Exception:
-                        cid = None
                 diag.info(
                     phase="annotation",
                     callsite="compute_annotation_extents.driver_sample.pre_bbox",
                     message="Driver annotation sample (pre-bbox)",
                     view_id=getattr(getattr(view, "Id", None), "IntegerValue", None),
-                    elem_id=getattr(getattr(elem, "Id", None), "IntegerValue", None),
-                    extra={"anno_type": anno_type, "cat_name": cname, "cat_id": cid},
+                    elem_id=rec.elem_id,
+                    extra={"anno_type": anno_type, "cat_name": rec.cat_name, "cat_id": rec.cat_id},
                 )
             except Exception:
                 pass
             sample_count += 1
 
         try:
-            # Get bounding box in view coordinates
-            bbox = elem.get_BoundingBox(view)
+            # Bounding box in view coordinates (read once at collection)
+            bbox = rec.bbox
             if bbox is None:
                 continue
 
@@ -359,7 +443,7 @@ def compute_annotation_extents(doc, view, view_basis, base_bounds_xy, cell_size_
         final_max_y + ann_margin_ft
     )
 
-def collect_2d_annotations(doc, view, diag=None):
+def collect_2d_annotations(doc, view, diag=None, snapshot=None):
     """Collect USER-ADDED 2D annotation elements by whitelist.
 
     IMPORTANT: This collects ONLY user annotations for anno_key layer.
@@ -387,6 +471,11 @@ def collect_2d_annotations(doc, view, diag=None):
     Args:
         doc: Revit Document
         view: Revit View
+        diag: Diagnostics (optional)
+        snapshot: DocumentSnapshot (optional). When given, the underlying
+            AnnotationSet is memoized per view (see collect_annotation_set) and
+            categories are grouped from the snapshot's single view-scoped pass
+            instead of one OfCategory() collector per category.
 
     Returns:
         List of tuples: [(element, anno_type), ...]
@@ -401,13 +490,45 @@ def collect_2d_annotations(doc, view, diag=None):
         ✔ Classifies annotations during collection
         ✔ Handles keynotes via KeynoteElement API
     """
+    return collect_annotation_set(doc, view, diag=diag, snapshot=snapshot).pairs()
+
+
+def collect_annotation_set(doc, view, diag=None, snapshot=None):
+    """Collect the view's 2D annotations once, as an AnnotationSet.
+
+    Same whitelist, ViewSpecific filter and classification as
+    collect_2d_annotations(); each record also keeps the view bbox read during
+    collection, the keynote flag and the extent-driver flag.
+
+    Args:
+        doc: Revit Document
+        view: Revit View
+        diag: Diagnostics (optional)
+        snapshot: DocumentSnapshot (optional); memoizes the set per view so
+            bounds expansion and rasterization share one collection
+
+    Returns:
+        AnnotationSet (shared when memoized: treat as read-only)
+    """
+    if snapshot is not None:
+        return snapshot.memo(
+            view,
+            "annotation_set",
+            lambda: _collect_annotation_set(doc, view, diag=diag, snapshot=snapshot),
+        )
+    return _collect_annotation_set(doc, view, diag=diag)
+
+
+def _collect_annotation_set(doc, view, diag=None, snapshot=None):
+    """Uncached body of collect_annotation_set (see collect_2d_annotations)."""
     from Autodesk.Revit.DB import (
         FilteredElementCollector,
         BuiltInCategory,
         ElementId,
     )
 
-    annotations = []
+    annotations = AnnotationSet(getattr(getattr(view, "Id", None), "IntegerValue", None))
+    is_driver = _extent_driver_predicate()
 
     # Diagnostics accumulators
     type_counts = {}
@@ -432,12 +553,19 @@ def collect_2d_annotations(doc, view, diag=None):
         except Exception:
             pass
 
+    def _category_elements(built_in_cat):
+        """View-scoped, non-type elements of one category (snapshot index or collector)."""
+        if snapshot is not None:
+            return snapshot.view_elements_of_category(view, int(built_in_cat))
+        collector = FilteredElementCollector(doc, view.Id)
+        collector.OfCategory(built_in_cat).WhereElementIsNotElementType()
+        return collector
+
     # Helper to safely collect category
     def collect_category(built_in_cat, anno_type_override=None, label=None):
         """Collect elements from a category and classify them."""
         try:
-            collector = FilteredElementCollector(doc, view.Id)
-            collector.OfCategory(built_in_cat).WhereElementIsNotElementType()
+            collector = _category_elements(built_in_cat)
 
             for elem in collector:
                 # CRITICAL: Only collect view-specific 2D elements
@@ -471,7 +599,7 @@ def collect_2d_annotations(doc, view, diag=None):
                     else:
                         anno_type = classify_annotation(elem)
 
-                annotations.append((elem, anno_type))
+                annotations.add(AnnotationRecord(elem, anno_type, bbox, is_driver=is_driver(elem)))
 
                 # Diag counts
                 try:
@@ -544,8 +672,7 @@ def collect_2d_annotations(doc, view, diag=None):
     # KEYNOTES: Handle keynotes specially
     if hasattr(BuiltInCategory, 'OST_KeynoteTags'):
         try:
-            collector = FilteredElementCollector(doc, view.Id)
-            collector.OfCategory(BuiltInCategory.OST_KeynoteTags).WhereElementIsNotElementType()
+            collector = _category_elements(BuiltInCategory.OST_KeynoteTags)
 
             for elem in collector:
                 bbox = elem.get_BoundingBox(view)
@@ -553,7 +680,7 @@ def collect_2d_annotations(doc, view, diag=None):
                     continue
 
                 anno_type = classify_keynote(elem)
-                annotations.append((elem, anno_type))
+                annotations.add(AnnotationRecord(elem, anno_type, bbox, is_keynote=True, is_driver=is_driver(elem)))
 
                 try:
                     type_counts[anno_type] = type_counts.get(anno_type, 0) + 1
@@ -759,7 +886,7 @@ def get_annotation_bbox(elem, view):
         return None
 
 
-def rasterize_annotations(doc, view, raster, cfg, diag=None):
+def rasterize_annotations(doc, view, raster, cfg, diag=None, snapshot=None):
     """Rasterize 2D annotations to anno_key layer."""
     view_id = None
     try:
@@ -767,18 +894,18 @@ def rasterize_annotations(doc, view, raster, cfg, diag=None):
     except Exception:
         view_id = None
 
-    # Collect all annotations
-    annotations = collect_2d_annotations(doc, view, diag=diag)
+    # Collect all annotations (shared with extents when a snapshot is given)
+    annotations = collect_annotation_set(doc, view, diag=diag, snapshot=snapshot)
 
     if diag is not None:
         try:
             region_samples = []
             region_count = 0
-            for (e, t) in annotations:
-                if str(t).upper() == "REGION":
+            for rec in annotations:
+                if str(rec.anno_type).upper() == "REGION":
                     region_count += 1
                     if len(region_samples) < 5:
-                        region_samples.append(getattr(getattr(e, "Id", None), "IntegerValue", None))
+                        region_samples.append(rec.elem_id)
             diag.info(
                 phase="annotation",
                 callsite="rasterize_annotations.pre_summary",
@@ -803,14 +930,15 @@ def rasterize_annotations(doc, view, raster, cfg, diag=None):
     fail_count = 0
     fail_limit = 10
 
-    for elem, anno_type in annotations:
-        elem_id = None
-        try:
-            elem_id = getattr(getattr(elem, "Id", None), "IntegerValue", None)
-        except Exception:
-            elem_id = None
+    # Stamps are collected as row spans and written once per view (see AnnotationStamper)
+    stamper = AnnotationStamper(raster)
+
+    for rec in annotations:
+        elem = rec.elem
+        anno_type = rec.anno_type
+        elem_id = rec.elem_id
 
-        bbox = get_annotation_bbox(elem, view)
+        bbox = rec.bbox
         if bbox is None:
             continue
 
@@ -821,37 +949,24 @@ def rasterize_annotations(doc, view, raster, cfg, diag=None):
 
             anno_idx = len(raster.anno_meta)
             
-            # Capture category id for downstream export remapping (e.g., FilledRegion -> REGION)
-            cat_id = None
-            try:
-                cat = getattr(elem, "Category", None)
-                if cat is not None and getattr(cat, "Id", None) is not None:
-                    cat_id = int(cat.Id.IntegerValue)
-            except Exception:
-                cat_id = None
-
+            # Category id for downstream export remapping (e.g., FilledRegion -> REGION)
             raster.anno_meta.append({
                 "type": anno_type,
                 "element_id": elem_id,
-                "cat_id": cat_id,
+                "cat_id": rec.cat_id,
                 "bbox_min": (bbox.Min.X, bbox.Min.Y, bbox.Min.Z),
                 "bbox_max": (bbox.Max.X, bbox.Max.Y, bbox.Max.Z),
             })
 
             if diag is not None:
                 try:
-                    cat = getattr(elem, "Category", None)
-                    cname = getattr(cat, "Name", None) if cat is not None else None
-                    cid = None
-                    if cat is not None:
-                        try:
-                            cid = int(cat.Id.IntegerValue)
-                        except Exception:
-                            cid = None
+                    cname = rec.cat_name
+                    cid = rec.cat_id
 
                     stored_type = raster.anno_meta[anno_idx].get("type") if anno_idx < len(raster.anno_meta) else None
                     if str(anno_type).upper() == "REGION" or (cname and "filled" in str(cname).lower()):
-                        diag.info(
+                        diag.debug_dedupe(
+                            dedupe_key="rasterize_annotations.region_stamp|{}".format(view_id),
                             phase="annotation",
                             callsite="rasterize_annotations.region_stamp",
                             message="Stamped REGION-ish annotation into raster.anno_meta",
@@ -892,12 +1007,13 @@ def rasterize_annotations(doc, view, raster, cfg, diag=None):
                             cx0, cy0 = _uv_to_cell(u0, v0, raster)
                             cx1, cy1 = _uv_to_cell(u1, v1, raster)
 
-                            _stamp_line_cells(raster, cx0, cy0, cx1, cy1, anno_idx)
+                            stamper.line(cx0, cy0, cx1, cy1, anno_idx)
                             stamped = True
 
                             if diag is not None:
                                 try:
-                                    diag.info(
+                                    diag.debug_dedupe(
+                                        dedupe_key="rasterize_annotations.dim_line_stamp|{}".format(view_id),
                                         phase="annotation",
                                         callsite="rasterize_annotations.dim_line_stamp",
                                         message="Stamped DIM via Dimension.Curve endpoints",
@@ -934,7 +1050,7 @@ def rasterize_annotations(doc, view, raster, cfg, diag=None):
                             pass
 
                     # Fallback: outline bbox (still not filled)
-                    _stamp_rect_outline(raster, cell_rect, anno_idx)
+                    stamper.rect_outline(cell_rect, anno_idx)
 
             # TEXT: keep as filled (per your request)
             elif mode == "TEXT":
@@ -949,14 +1065,11 @@ def rasterize_annotations(doc, view, raster, cfg, diag=None):
                 if bbox_width > raster.W * 2 or bbox_height > raster.H * 2:
                     continue
 
-                for cy in range(y0, y1):
-                    row = cy * raster.W
-                    for cx in range(x0, x1):
-                        raster.anno_key[row + cx] = anno_idx
+                stamper.fill_rect(x0, y0, x1, y1, anno_idx)
 
             # TAG/KEYNOTE: outline only (cheap + avoids big fills)
             elif mode in ("TAG", "KEYNOTE"):
-                _stamp_rect_outline(raster, cell_rect, anno_idx)
+                stamper.rect_outline(cell_rect, anno_idx)
 
             # LINES: Detail lines need special handling (extract actual curve geometry)
             elif mode == "LINES":
@@ -981,17 +1094,18 @@ def rasterize_annotations(doc, view, raster, cfg, diag=None):
 
                             # Option A: Render as Bresenham line (single-pixel width)
                             # Render as Bresenham line (single-pixel width, simpler but less visible)
-                            _stamp_line_cells(raster, cx0, cy0, cx1, cy1, anno_idx)
+                            stamper.line(cx0, cy0, cx1, cy1, anno_idx)
                             stamped = True
                             
                             # Option B: Render as oriented band (2-cell width, archive parity)
-                            _stamp_detail_line_band(raster, cx0, cy0, cx1, cy1, anno_idx, cfg)
+                            stamper.band(cx0, cy0, cx1, cy1, anno_idx, cfg)
                             
                             stamped = True
 
                             if diag is not None:
                                 try:
-                                    diag.info(
+                                    diag.debug_dedupe(
+                                        dedupe_key="rasterize_annotations.lines_curve_stamp|{}".format(view_id),
                                         phase="annotation",
                                         callsite="rasterize_annotations.lines_curve_stamp",
                                         message="Stamped LINES via Location.Curve endpoints",
@@ -1027,7 +1141,7 @@ def rasterize_annotations(doc, view, raster, cfg, diag=None):
                         except Exception:
                             pass
 
-                    _stamp_rect_outline(raster, cell_rect, anno_idx)
+                    stamper.rect_outline(cell_rect, anno_idx)
 
             # DETAIL/REGION: keep legacy fill unless you want otherwise
             else:
@@ -1042,10 +1156,7 @@ def rasterize_annotations(doc, view, raster, cfg, diag=None):
                 if bbox_width > raster.W * 2 or bbox_height > raster.H * 2:
                     continue
 
-                for cy in range(y0, y1):
-                    row = cy * raster.W
-                    for cx in range(x0, x1):
-                        raster.anno_key[row + cx] = anno_idx
+                stamper.fill_rect(x0, y0, x1, y1, anno_idx)
 
         except Exception as e:
             fail_count += 1
@@ -1060,6 +1171,8 @@ def rasterize_annotations(doc, view, raster, cfg, diag=None):
                 )
             continue
 
+    stamper.commit()
+
     # If failures exceeded the limit, record one aggregated warning
     if diag is not None and fail_count > fail_limit:
         diag.warn(
@@ -1071,9 +1184,14 @@ def rasterize_annotations(doc, view, raster, cfg, diag=None):
         )
     if diag is not None:
         try:
-            anno_key = getattr(raster, "anno_key", []) or []
+            # Dense layers may be numpy-backed: no truth-value tests on them.
+            anno_key = getattr(raster, "anno_key", None)
+            if anno_key is None:
+                anno_key = []
             anno_meta = getattr(raster, "anno_meta", []) or []
-            anno_over_model = getattr(raster, "anno_over_model", []) or []
+            anno_over_model = getattr(raster, "anno_over_model", None)
+            if anno_over_model is None:
+                anno_over_model = []
 
             n_anno = sum(1 for k in anno_key if k is not None and k != -1)
             n_over = sum(1 for b in anno_over_model if bool(b))
@@ -1106,13 +1224,237 @@ def rasterize_annotations(doc, view, raster, cfg, diag=None):
         except Exception:
             pass
  
+class AnnotationStamper(object):
+    """Collects a view's annotation stamps as row spans and commits them in order.
+
+    Shapes (rect fills, rect outlines, Bresenham lines, oriented detail-line
+    bands) are clipped to the raster and turned into [start, stop) spans of
+    the flat anno_key layer as they are added; commit() writes each span with
+    one slice assignment (raster_storage.fill_range).
+
+    Args:
+        raster: ViewRaster (anno_key, W, H)
+
+    Commentary:
+        ✔ Spans are committed in insertion order: later annotations overwrite
+          earlier ones exactly like per-cell stamping did
+        ✔ Bands are filled per scanline from the quad edges instead of a
+          point-in-quad test per bbox cell (same cells, see _band_row_ranges)
+        ⚠ anno_over_model is still derived afterwards by finalize_anno_over_model()
+    """
+
+    def __init__(self, raster):
+        self.raster = raster
+        self.W = int(raster.W)
+        self.H = int(raster.H)
+        self._spans = []
+
+    def __len__(self):
+        return len(self._spans)
+
+    def _row_span(self, cy, x0, x1, anno_idx):
+        """Half-open span [x0, x1) on row cy (clipped)."""
+        if cy < 0 or cy >= self.H:
+            return
+        if x0 < 0:
+            x0 = 0
+        if x1 > self.W:
+            x1 = self.W
+        if x1 > x0:
+            row = cy * self.W
+            self._spans.append((row + x0, row + x1, anno_idx))
+
+    def cell(self, cx, cy, anno_idx):
+        if cx < 0 or cy < 0 or cx >= self.W or cy >= self.H:
+            return
+        i = cy * self.W + cx
+        self._spans.append((i, i + 1, anno_idx))
+
+    def fill_rect(self, x0, y0, x1, y1, anno_idx):
+        """Filled half-open cell rect [x0, x1) x [y0, y1)."""
+        for cy in range(max(0, y0), min(self.H, y1)):
+            self._row_span(cy, x0, x1, anno_idx)
+
+    def rect_outline(self, cell_rect, anno_idx):
+        """Perimeter of a cell rect (clipped to the raster first)."""
+        x0 = max(0, cell_rect.x0)
+        y0 = max(0, cell_rect.y0)
+        x1 = min(self.W, cell_rect.x1)
+        y1 = min(self.H, cell_rect.y1)
+        if x1 <= x0 or y1 <= y0:
+            return
+
+        # top/bottom
+        self._row_span(y0, x0, x1, anno_idx)
+        if y1 - 1 != y0:
+            self._row_span(y1 - 1, x0, x1, anno_idx)
+
+        # left/right
+        for cy in range(y0 + 1, y1 - 1):
+            self.cell(x0, cy, anno_idx)
+            if x1 - 1 != x0:
+                self.cell(x1 - 1, cy, anno_idx)
+
+    def line(self, x0, y0, x1, y1, anno_idx):
+        """Bresenham line (integer cell coords); same-row runs become one span."""
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        cx, cy = x0, y0
+
+        run_y, run_lo, run_hi = cy, cx, cx
+        while True:
+            if cx == x1 and cy == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                cx += sx
+            if e2 <= dx:
+                err += dx
+                cy += sy
+            if cy == run_y:
+                run_lo = min(run_lo, cx)
+                run_hi = max(run_hi, cx)
+            else:
+                self._row_span(run_y, run_lo, run_hi + 1, anno_idx)
+                run_y, run_lo, run_hi = cy, cx, cx
+        self._row_span(run_y, run_lo, run_hi + 1, anno_idx)
+
+    def band(self, cx0, cy0, cx1, cy1, anno_idx, cfg):
+        """Oriented detail-line band (see _stamp_detail_line_band)."""
+        import math
+
+        # Compute line tangent and perpendicular normal
+        dx = float(cx1 - cx0)
+        dy = float(cy1 - cy0)
+        length_sq = dx * dx + dy * dy
+
+        if length_sq < 0.01:  # Degenerate line (< 0.1 cell length)
+            # Fallback: just stamp the start cell
+            self.cell(cx0, cy0, anno_idx)
+            return
+
+        length = math.sqrt(length_sq)
+
+        # Unit normal vector (perpendicular to the unit tangent, rotated 90° CCW)
+        nx = -(dy / length)
+        ny = dx / length
+
+        # Band half-width from config (default 0.5 cells for 1-cell total width)
+        band_cells = getattr(cfg, 'linear_band_thickness_cells', 1.0) if cfg else 1.0
+        band_half_cells = band_cells * 0.5
+
+        # Perpendicular offset in cell space
+        offx = nx * band_half_cells
+        offy = ny * band_half_cells
+
+        # Four corners of oriented band
+        corners = [
+            (cx0 + offx, cy0 + offy),
+            (cx1 + offx, cy1 + offy),
+            (cx1 - offx, cy1 - offy),
+            (cx0 - offx, cy0 - offy),
+        ]
+
+        # Integer bounding box (the candidate cells of the legacy per-cell loop)
+        xs = [int(round(c[0])) for c in corners]
+        ys = [int(round(c[1])) for c in corners]
+        x_min = max(0, min(xs))
+        x_max = min(self.W, max(xs))
+        y_min = max(0, min(ys))
+        y_max = min(self.H, max(ys))
+
+        for cy in range(y_min, y_max + 1):
+            for lo, hi in _band_row_ranges(corners, cy, x_min, x_max):
+                self._row_span(cy, lo, hi + 1, anno_idx)
+
+    def commit(self):
+        """Write all pending spans into raster.anno_key (in order); returns cells written."""
+        from vop_interwoven.core.raster_storage import fill_range
+
+        layer = self.raster.anno_key
+        spans = self._spans
+        self._spans = []
+        n = 0
+        for a, b, anno_idx in spans:
+            if b - a == 1:
+                layer[a] = anno_idx
+            else:
+                fill_range(layer, a, b, anno_idx)
+            n += b - a
+        return n
+
+
+def _cross_sign(ax, ay, bx, by, px, py):
+    """Sign of cross product (a-p) × (b-p)"""
+    return (bx - px) * (ay - py) - (by - py) * (ax - px)
+
+
+def _band_row_ranges(corners, cy, x_min, x_max):
+    """Inclusive cx ranges on row cy where _point_in_quad(cx, cy, corners) holds.
+
+    _point_in_quad accepts a cell unless one edge sign is > 0.01 and another
+    is < -0.01, i.e. it holds where all signs are <= 0.01 OR all are >= -0.01.
+    Each edge sign is linear in cx on a fixed row, so both conditions are
+    intervals; their bounds are solved from the edge equations and then
+    nudged with the exact test so rounding cannot change the cell set.
+    """
+    import math
+
+    edges = [(corners[k], corners[(k + 1) % 4]) for k in range(4)]
+
+    def all_le(px):
+        return all(_cross_sign(a[0], a[1], b[0], b[1], px, cy) <= 0.01 for a, b in edges)
+
+    def all_ge(px):
+        return all(_cross_sign(a[0], a[1], b[0], b[1], px, cy) >= -0.01 for a, b in edges)
+
+    out = []
+    for sign, pred in ((1.0, all_le), (-1.0, all_ge)):
+        # sign * s(px) <= 0.01 with s(px) = slope * px + icpt
+        lo = float(x_min)
+        hi = float(x_max)
+        for a, b in edges:
+            slope = sign * (b[1] - a[1])
+            icpt = sign * (b[0] * (a[1] - cy) - a[0] * (b[1] - cy))
+            if slope > 0.0:
+                hi = min(hi, (0.01 - icpt) / slope)
+            elif slope < 0.0:
+                lo = max(lo, (0.01 - icpt) / slope)
+            elif icpt > 0.01:
+                hi = lo - 1.0
+        if hi < lo - 1.0:
+            continue
+
+        ilo = max(x_min, int(math.ceil(lo)))
+        ihi = min(x_max, int(math.floor(hi)))
+        # The feasible set is an interval: walk the ends onto the exact predicate
+        while ilo > x_min and pred(ilo - 1):
+            ilo -= 1
+        while ilo <= ihi and not pred(ilo):
+            ilo += 1
+        while ihi < x_max and pred(ihi + 1):
+            ihi += 1
+        while ihi >= ilo and not pred(ihi):
+            ihi -= 1
+        if ilo <= ihi:
+            out.append((ilo, ihi))
+
+    if len(out) == 2 and out[1][0] <= out[0][1] + 1 and out[0][0] <= out[1][1] + 1:
+        out = [(min(out[0][0], out[1][0]), max(out[0][1], out[1][1]))]
+    return out
+
+
 def _stamp_detail_line_band(raster, cx0, cy0, cx1, cy1, anno_idx, cfg):
     """
     Stamp detail line as oriented band (2-cell-wide rectangle along line tangent).
-    
+
     This matches archive/refactor1 behavior for detail lines and is more visible
     than single-pixel Bresenham lines.
-    
+
     Args:
         raster: ViewRaster
         cx0, cy0: Start cell coordinates
@@ -1120,62 +1462,9 @@ def _stamp_detail_line_band(raster, cx0, cy0, cx1, cy1, anno_idx, cfg):
         anno_idx: Annotation index
         cfg: Config (for band_thickness_cells)
     """
-    import math
-    
-    # Compute line tangent and perpendicular normal
-    dx = float(cx1 - cx0)
-    dy = float(cy1 - cy0)
-    length_sq = dx*dx + dy*dy
-    
-    if length_sq < 0.01:  # Degenerate line (< 0.1 cell length)
-        # Fallback: just stamp the start cell
-        _stamp_cell(raster, cx0, cy0, anno_idx)
-        return
-    
-    length = math.sqrt(length_sq)
-    
-    # Unit tangent vector
-    ux = dx / length
-    uy = dy / length
-    
-    # Unit normal vector (perpendicular, rotate 90° CCW)
-    nx = -uy
-    ny = ux
-    
-    # Band half-width from config (default 0.5 cells for 1-cell total width)
-    band_cells = getattr(cfg, 'linear_band_thickness_cells', 1.0) if cfg else 1.0
-    band_half_cells = band_cells * 0.5
-    
-    # Perpendicular offset in cell space
-    offx = nx * band_half_cells
-    offy = ny * band_half_cells
-    
-    # Four corners of oriented band
-    p0_plus = (cx0 + offx, cy0 + offy)
-    p0_minus = (cx0 - offx, cy0 - offy)
-    p1_plus = (cx1 + offx, cy1 + offy)
-    p1_minus = (cx1 - offx, cy1 - offy)
-    
-    # Rasterize the band as a filled polygon
-    # Simple scanline fill between the four corners
-    corners = [p0_plus, p1_plus, p1_minus, p0_minus]
-    
-    # Get integer bounding box
-    xs = [int(round(c[0])) for c in corners]
-    ys = [int(round(c[1])) for c in corners]
-    
-    x_min = max(0, min(xs))
-    x_max = min(raster.W, max(xs))
-    y_min = max(0, min(ys))
-    y_max = min(raster.H, max(ys))
-    
-    # For simplicity: stamp all cells in bounding box
-    # (More sophisticated polygon fill could be added later)
-    for cy in range(y_min, y_max + 1):
-        for cx in range(x_min, x_max + 1):
-            # Point-in-polygon test (simple cross product)
-            if _point_in_quad(cx, cy, corners):
-                _stamp_cell(raster, cx, cy, anno_idx)
+    stamper = AnnotationStamper(raster)
+    stamper.band(cx0, cy0, cx1, cy1, anno_idx, cfg)
+    stamper.commit()
 
 
 def _point_in_quad(px, py, corners):
@@ -1186,18 +1475,13 @@ def _point_in_quad(px, py, corners):
     """
     # For a convex quad (which oriented bands are), we can use cross products
     # Point is inside if it's on the same side of all 4 edges
-    
-    def cross_sign(ax, ay, bx, by, px, py):
-        """Sign of cross product (a-p) × (b-p)"""
-        return (bx - px) * (ay - py) - (by - py) * (ax - px)
-    
     c0, c1, c2, c3 = corners
     
     # Check point is on correct side of each edge
-    s0 = cross_sign(c0[0], c0[1], c1[0], c1[1], px, py)
-    s1 = cross_sign(c1[0], c1[1], c2[0], c2[1], px, py)
-    s2 = cross_sign(c2[0], c2[1], c3[0], c3[1], px, py)
-    s3 = cross_sign(c3[0], c3[1], c0[0], c0[1], px, py)
+    s0 = _cross_sign(c0[0], c0[1], c1[0], c1[1], px, py)
+    s1 = _cross_sign(c1[0], c1[1], c2[0], c2[1], px, py)
+    s2 = _cross_sign(c2[0], c2[1], c3[0], c3[1], px, py)
+    s3 = _cross_sign(c3[0], c3[1], c0[0], c0[1], px, py)
     
     # All signs should be the same (all positive or all negative)
     # For simplicity, check if all have same sign or are zero
@@ -1217,53 +1501,18 @@ def _uv_to_cell(x, y, raster):
     return cx, cy
 
 
-def _stamp_cell(raster, cx, cy, anno_idx):
-    """Set a single annotation cell if within bounds."""
-    if cx < 0 or cy < 0 or cx >= raster.W or cy >= raster.H:
-        return
-    raster.anno_key[cy * raster.W + cx] = anno_idx
-
-
 def _stamp_rect_outline(raster, cell_rect, anno_idx):
     """Stamp only the perimeter of a rectangle in cell coordinates."""
-    x0 = max(0, cell_rect.x0)
-    y0 = max(0, cell_rect.y0)
-    x1 = min(raster.W, cell_rect.x1)
-    y1 = min(raster.H, cell_rect.y1)
-    if x1 <= x0 or y1 <= y0:
-        return
-
-    # top/bottom
-    for cx in range(x0, x1):
-        _stamp_cell(raster, cx, y0, anno_idx)
-        _stamp_cell(raster, cx, y1 - 1, anno_idx)
-
-    # left/right
-    for cy in range(y0, y1):
-        _stamp_cell(raster, x0, cy, anno_idx)
-        _stamp_cell(raster, x1 - 1, cy, anno_idx)
+    stamper = AnnotationStamper(raster)
+    stamper.rect_outline(cell_rect, anno_idx)
+    stamper.commit()
 
 
 def _stamp_line_cells(raster, x0, y0, x1, y1, anno_idx):
     """Stamp a line in cell space using Bresenham (integer coords)."""
-    dx = abs(x1 - x0)
-    dy = -abs(y1 - y0)
-    sx = 1 if x0 < x1 else -1
-    sy = 1 if y0 < y1 else -1
-    err = dx + dy
-    cx, cy = x0, y0
-
-    while True:
-        _stamp_cell(raster, cx, cy, anno_idx)
-        if cx == x1 and cy == y1:
-            break
-        e2 = 2 * err
-        if e2 >= dy:
-            err += dy
-            cx += sx
-        if e2 <= dx:
-            err += dx
-            cy += sy
+    stamper = AnnotationStamper(raster)
+    stamper.line(x0, y0, x1, y1, anno_idx)
+    stamper.commit()
 
 def _project_element_bbox_to_cell_rect_for_anno(elem_or_bbox, view_basis, raster):
     """Project element bounding box to cell rectangle (annotation-specific).
@@ -61,13 +61,23 @@ def resolve_element_bbox(elem, view=None, diag=None, context=None):
     return None, "none"
 
 
-def collect_view_elements(doc, view, raster, diag=None, cfg=None):
+def _snapshot_category_id(elem):
+    try:
+        return elem.Category.Id.IntegerValue
+    except Exception:
+        return None
+
+
+def collect_view_elements(doc, view, raster, diag=None, cfg=None, snapshot=None):
     """Collect all potentially visible elements in view (broad-phase).
 
     Performance contract:
         - One view-scoped collector per view (no per-category loops).
         - Optional category filter (ElementMulticategoryFilter) when available.
         - Optional coarse spatial filter (BoundingBoxIntersectsFilter) when available.
+        - With a DocumentSnapshot (and no coarse spatial filter), the snapshot's
+          per-view element list is reused and the category allowlist is applied
+          in Python; no additional collector is issued.
 
     Args:
         doc: Revit Document
@@ -75,12 +85,13 @@ def collect_view_elements(doc, view, raster, diag=None, cfg=None):
         raster: ViewRaster (currently unused; reserved for future spatial hints)
         diag: Diagnostics (optional)
         cfg: config dict (optional)
+        snapshot: DocumentSnapshot (optional)
 
     Returns:
         List[Element] (host elements only; link expansion happens downstream)
     """
     from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory
-    from .collection_policy import included_bic_names_for_source, should_include_element, PolicyStats
+    from .collection_policy import included_bic_names_for_source, compiled_category_policy, PolicyStats
     from .safe_api import safe_call
 
     view_id = None
@@ -109,9 +120,26 @@ def collect_view_elements(doc, view, raster, diag=None, cfg=None):
     enable_coarse_spatial = bool(getattr(cfg, "coarse_spatial_filter_enabled", False))
     coarse_pad_ft = float(getattr(cfg, "coarse_spatial_filter_pad_ft", 0.0))
 
+    # Reuse the run-scoped snapshot pass (coarse spatial filtering still needs a collector)
+    if snapshot is not None and not enable_coarse_spatial:
+        collector = snapshot.view_elements(view)
+        if enable_multicat_filter and model_categories:
+            cat_ids = set()
+            for bic in model_categories:
+                try:
+                    cat_ids.add(int(bic))
+                except Exception:
+                    pass
+            collector = [
+                e for e in collector
+                if _snapshot_category_id(e) in cat_ids
+            ]
+        enable_multicat_filter = False
+
     # Build one view-scoped collector
     try:
-        collector = FilteredElementCollector(doc, view.Id).WhereElementIsNotElementType()
+        if snapshot is None or enable_coarse_spatial:
+            collector = FilteredElementCollector(doc, view.Id).WhereElementIsNotElementType()
     except Exception as e:
         if diag is not None:
             diag.error(
@@ -200,7 +228,8 @@ def collect_view_elements(doc, view, raster, diag=None, cfg=None):
                     extra={"exc_type": type(e).__name__, "exc": str(e)},
                 )
 
-    # Collect and apply policy
+    # Collect and apply policy (category decisions precompiled once per run via the snapshot)
+    category_policy = compiled_category_policy(doc, "HOST", cache=getattr(snapshot, "category_policies", None))
     for elem in collector:
         elem_id = None
         try:
@@ -208,12 +237,7 @@ def collect_view_elements(doc, view, raster, diag=None, cfg=None):
         except Exception:
             elem_id = None
 
-        include, _pol_reason, _pol_cat = should_include_element(
-            elem=elem,
-            doc=doc,
-            source_type="HOST",
-            stats=policy_stats,
-        )
+        include, _pol_reason, _pol_cat = category_policy.decide(elem, stats=policy_stats)
         if not include:
             continue
 
@@ -291,11 +315,12 @@ def is_element_visible_in_view(elem, view):
     return True
 
 
-def expand_host_link_import_model_elements(doc, view, elements, cfg, diag=None, elem_cache=None):
+def expand_host_link_import_model_elements(doc, view, elements, cfg, diag=None, elem_cache=None, link_index=None):
     """Expand element list to include linked/imported model elements.
 
     Args:
         elem_cache: Optional ElementCache for bbox reuse (Phase 2)
+        link_index: Optional run-scoped LinkIndex shared across views
 
     Returns:
         List of element wrappers with transform info plus bbox provenance.
@@ -366,7 +391,7 @@ def expand_host_link_import_model_elements(doc, view, elements, cfg, diag=None,
 
     # Collect and add linked/imported elements
     try:
-        linked_proxies = collect_all_linked_elements(doc, view, cfg, diag=diag)
+        linked_proxies = collect_all_linked_elements(doc, view, cfg, diag=diag, link_index=link_index)
 
         for proxy in linked_proxies:
             bbox, bbox_source = resolve_element_bbox(
@@ -549,10 +574,11 @@ def estimate_depth_from_loops_or_bbox(elem, loops, transform, view, raster, bbox
         bbox_is_link_space=bbox_is_link_space,
     )
 
-def estimate_depth_range_from_bbox(elem, transform, view, raster, bbox=None, diag=None):
+def estimate_depth_range_from_bbox(elem, transform, view, raster, bbox=None, diag=None, bbox_is_link_space=False):
     """Estimate depth range (min, max) of element from its bounding box.
 
     Uses wrapper-provided bbox when available; otherwise resolves bbox via resolve_element_bbox().
+    Link-space bboxes are mapped to host space with `transform` first.
     Never raises; returns (inf, inf) when bbox is unavailable.
     """
     from .view_basis import world_to_view
@@ -604,6 +630,19 @@ def estimate_depth_range_from_bbox(elem, transform, view, raster, bbox=None, dia
         (max_x, max_y, max_z),
     ]
 
+    if bbox_is_link_space:
+        if transform is None:
+            return (float("inf"), float("inf"))
+        try:
+            corners = [transform.OfPoint(c) for c in corners]
+        except Exception:
+            try:
+                from Autodesk.Revit.DB import XYZ
+                corners_xyz = [transform.OfPoint(XYZ(c[0], c[1], c[2])) for c in corners]
+                corners = [(p.X, p.Y, p.Z) for p in corners_xyz]
+            except Exception:
+                return (float("inf"), float("inf"))
+
     min_depth = float("inf")
     max_depth = float("-inf")
 
@@ -186,6 +186,70 @@ def resolve_category_ids(doc, bic_names: Iterable[str]) -> Set[int]:
             pass
     return out
 
+def _mark(stats, include, reason, cname):
+    if stats is None:
+        return
+    if include:
+        stats.mark_included()
+    else:
+        stats.mark_excluded(reason, cname)
+
+
+def _category_decision(cat_id_val, cname, st, lines_id, excluded_ids, included_ids):
+    """Element-independent part of the policy for one category.
+
+    Args:
+        cat_id_val: Category integer id (or None if unreadable)
+        cname: Category name
+        st: Upper-case source type
+        lines_id: Resolved OST_Lines id for the doc (or None)
+        excluded_ids / included_ids: Resolved id sets (empty -> name fallback)
+
+    Returns:
+        (include, reason, probe_view_specific). When probe_view_specific is True
+        (HOST lines) a ViewSpecific element is excluded as "view_specific_line"
+        before this decision applies.
+    """
+    is_lines = cname == "Lines" or (cat_id_val is not None and lines_id is not None and cat_id_val == lines_id)
+
+    probe = False
+    if st == "HOST":
+        probe = is_lines
+    elif is_lines:
+        # LINK/DWG: exclude lines altogether (explicit per-source override).
+        return False, "lines_excluded_for_source", False
+
+    # Global exclusions
+    if cat_id_val is not None:
+        if excluded_ids:
+            if cat_id_val in excluded_ids:
+                return False, "excluded_global", probe
+        elif cname in _FALLBACK_EXCLUDED_CATEGORY_NAMES:
+            # pytest/fake-doc fallback
+            return False, "excluded_global", probe
+
+    # Allowlist
+    if cat_id_val is None:
+        return False, "category_id_unresolved", probe
+
+    if included_ids:
+        if cat_id_val not in included_ids:
+            return False, "not_in_allowlist", probe
+    elif cname not in _FALLBACK_INCLUDED_CATEGORY_NAMES:
+        # pytest/fake-doc fallback
+        return False, "not_in_allowlist", probe
+
+    return True, "included", probe
+
+
+def _is_view_specific(elem):
+    try:
+        return bool(getattr(elem, "ViewSpecific", False))
+    except Exception:
+        # Preserve legacy behavior: if ViewSpecific probe fails, do not exclude.
+        return False
+
+
 def should_include_element(
     *,
     elem,
@@ -206,14 +270,16 @@ def should_include_element(
       - "view_specific_line"
       - "lines_excluded_for_source"
       - "category_id_unresolved"
+
+    Per-element hot loops should use compiled_category_policy(doc, source_type)
+    instead (same decisions and PolicyStats accounting, one lookup per element).
     """
     if stats is not None:
         stats.seen_total += 1
 
     cat = getattr(elem, "Category", None)
     if cat is None:
-        if stats is not None:
-            stats.mark_excluded("no_category", "<NO_CATEGORY>")
+        _mark(stats, False, "no_category", "<NO_CATEGORY>")
         return False, "no_category", "<NO_CATEGORY>"
 
     try:
@@ -230,74 +296,109 @@ def should_include_element(
 
     st = (source_type or "HOST").upper()
 
-    # Lines special case
-    if st == "HOST":
-        is_lines = False
-        if cname == "Lines":
-            is_lines = True
-        if cat_id_val is not None:
-            lines_id = _try_get_category_id(doc, _BIC_LINES)
-            if lines_id is not None:
-                is_lines = (is_lines or (cat_id_val == lines_id))
-        if is_lines:
-            try:
-                if bool(getattr(elem, "ViewSpecific", False)):
-                    if stats is not None:
-                        stats.mark_excluded("view_specific_line", cname)
-                    return False, "view_specific_line", cname
-            except Exception:
-                # Preserve legacy behavior: if ViewSpecific probe fails, do not exclude.
-                pass
-    else:
-        # LINK/DWG: exclude lines altogether (explicit per-source override).
-        # pytest/fake-doc fallback: enforce by name if ids cannot be resolved.
-        if cname == "Lines":
+    lines_id = excluded_ids = included_ids = None
+    if cat_id_val is not None:
+        lines_id = _try_get_category_id(doc, _BIC_LINES)
+        excluded_ids = resolve_category_ids(doc, excluded_bic_names_global())
+        included_ids = resolve_category_ids(doc, included_bic_names_for_source(st))
+
+    include, reason, probe = _category_decision(cat_id_val, cname, st, lines_id, excluded_ids, included_ids)
+    if probe and _is_view_specific(elem):
+        include, reason = False, "view_specific_line"
+
+    _mark(stats, include, reason, cname)
+    return include, reason, cname
+
+
+class CompiledCategoryPolicy(object):
+    """should_include_element() precompiled for one (doc, source_type).
+
+    The Lines id, global exclusions and allowlist are resolved once; each
+    category id maps to a frozen (include, reason, category_name, probe) entry
+    filled on first sight. Per element this leaves elem.Category, cat.Id and
+    one dict lookup, plus the ViewSpecific probe for HOST lines.
+
+    Args:
+        doc: Revit Document (host or link)
+        source_type: "HOST", "LINK" or "DWG"
+
+    Commentary:
+        ✔ Same (include, reason, category_name) and PolicyStats counters as
+          should_include_element()
+        ✔ Categories whose id cannot be read take the uncompiled path
+    """
+
+    def __init__(self, doc, source_type="HOST"):
+        self.doc = doc
+        self.source_type = (source_type or "HOST").upper()
+        self.lines_id = _try_get_category_id(doc, _BIC_LINES)
+        self.excluded_ids = frozenset(resolve_category_ids(doc, excluded_bic_names_global()))
+        self.included_ids = frozenset(resolve_category_ids(doc, included_bic_names_for_source(self.source_type)))
+        self._table: Dict[int, Tuple[bool, str, str, bool]] = {}
+
+    def __len__(self):
+        return len(self._table)
+
+    def _compile(self, cat_id_val, cat):
+        try:
+            cname = getattr(cat, "Name", None) or "<UNKNOWN_CATEGORY>"
+        except Exception:
+            cname = "<UNKNOWN_CATEGORY>"
+        include, reason, probe = _category_decision(
+            cat_id_val, cname, self.source_type, self.lines_id, self.excluded_ids, self.included_ids
+        )
+        entry = (include, reason, cname, probe)
+        self._table[cat_id_val] = entry
+        return entry
+
+    def decide(self, elem, stats: Optional[PolicyStats] = None) -> Tuple[bool, str, str]:
+        """Drop-in for should_include_element(elem=..., doc=..., source_type=..., stats=...)."""
+        cat = getattr(elem, "Category", None)
+        if cat is None:
             if stats is not None:
-                stats.mark_excluded("lines_excluded_for_source", cname)
-            return False, "lines_excluded_for_source", cname
+                stats.seen_total += 1
+            _mark(stats, False, "no_category", "<NO_CATEGORY>")
+            return False, "no_category", "<NO_CATEGORY>"
 
-        if cat_id_val is not None:
-            lines_id = _try_get_category_id(doc, _BIC_LINES)
-            if lines_id is not None and cat_id_val == lines_id:
-                if stats is not None:
-                    stats.mark_excluded("lines_excluded_for_source", cname)
-                return False, "lines_excluded_for_source", cname
+        try:
+            cat_id_val = int(cat.Id.IntegerValue)
+        except Exception:
+            return should_include_element(elem=elem, doc=self.doc, source_type=self.source_type, stats=stats)
 
-    # Global exclusions
-    if cat_id_val is not None:
-        excluded_ids = resolve_category_ids(doc, excluded_bic_names_global())
-        if excluded_ids:
-            if cat_id_val in excluded_ids:
-                if stats is not None:
-                    stats.mark_excluded("excluded_global", cname)
-                return False, "excluded_global", cname
-        else:
-            # pytest/fake-doc fallback
-            if cname in _FALLBACK_EXCLUDED_CATEGORY_NAMES:
-                if stats is not None:
-                    stats.mark_excluded("excluded_global", cname)
-                return False, "excluded_global", cname
+        entry = self._table.get(cat_id_val)
+        if entry is None:
+            entry = self._compile(cat_id_val, cat)
+        include, reason, cname, probe = entry
+
+        if probe and _is_view_specific(elem):
+            include, reason = False, "view_specific_line"
 
-    # Allowlist
-    if cat_id_val is None:
         if stats is not None:
-            stats.mark_excluded("category_id_unresolved", cname)
-        return False, "category_id_unresolved", cname
+            stats.seen_total += 1
+        _mark(stats, include, reason, cname)
+        return include, reason, cname
 
-    included_ids = resolve_category_ids(doc, included_bic_names_for_source(st))
-    if included_ids:
-        if cat_id_val not in included_ids:
-            if stats is not None:
-                stats.mark_excluded("not_in_allowlist", cname)
-            return False, "not_in_allowlist", cname
-    else:
-        # pytest/fake-doc fallback
-        if cname not in _FALLBACK_INCLUDED_CATEGORY_NAMES:
-            if stats is not None:
-                stats.mark_excluded("not_in_allowlist", cname)
-            return False, "not_in_allowlist", cname
 
-    if stats is not None:
-        stats.mark_included()
+def compiled_category_policy(doc, source_type="HOST", cache=None) -> CompiledCategoryPolicy:
+    """CompiledCategoryPolicy for (doc, source_type), shared through a run-scoped cache.
+
+    Args:
+        doc: Revit Document (host or link)
+        source_type: "HOST", "LINK" or "DWG"
+        cache: Optional dict (id(doc), source_type) -> policy owned by a
+            run-scoped object (DocumentSnapshot.category_policies,
+            LinkIndex.category_policies); None builds a fresh policy
 
-    return True, "included", cname
+    Commentary:
+        ✔ Cached policies hold their doc and the cache dies with the run, so an
+          id() cannot be recycled while its entry is alive
+    """
+    st = (source_type or "HOST").upper()
+    if cache is None:
+        return CompiledCategoryPolicy(doc, st)
+    key = (id(doc), st)
+    policy = cache.get(key)
+    if policy is None or policy.doc is not doc:
+        policy = CompiledCategoryPolicy(doc, st)
+        cache[key] = policy
+    return policy
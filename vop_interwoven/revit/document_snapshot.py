@@ -0,0 +1,278 @@
+"""
+Per-run document snapshot shared across all views.
+
+Every view used to pay for several view-scoped FilteredElementCollector
+round-trips: the view signature, synthetic extents bounds, broad-phase
+element collection and (twice) the 2D annotation whitelist, which itself
+runs one collector per annotation category.
+
+DocumentSnapshot is built once per run and memoizes ONE view-scoped
+collector pass per view (WhereElementIsNotElementType). All phases consume
+that element list; category-filtered consumers use the per-view category
+index instead of OfCategory() collectors. It also keeps a lightweight
+element record (id / category) per collected element so the run can be
+serialized. Link instances are resolved by revit.link_index.LinkIndex.
+
+Offline use:
+    A snapshot can be serialized with to_dict() and rebuilt with
+    from_dict() / from_json(). Rebuilt snapshots have no live document and
+    serve ElementRecord objects instead of Revit elements, so phases that
+    only need ids / categories / bboxes can be tested without Revit.
+"""
+
+import json
+
+
+class ElementRecord(object):
+    """Lightweight, JSON-safe per-element record.
+
+    Attributes:
+        elem_id: int element id
+        category_id: int BuiltInCategory value (or None)
+        category: category display name (or None)
+        type_id: int type element id (or None)
+        level_id: int level id (or None)
+        bbox: (xmin, ymin, zmin, xmax, ymax, zmax) model bbox (or None)
+        view_specific: bool (or None if unknown)
+    """
+
+    __slots__ = ("elem_id", "category_id", "category", "type_id", "level_id", "bbox", "view_specific")
+
+    def __init__(self, elem_id, category_id=None, category=None, type_id=None, level_id=None, bbox=None, view_specific=None):
+        self.elem_id = int(elem_id)
+        self.category_id = category_id
+        self.category = category
+        self.type_id = type_id
+        self.level_id = level_id
+        self.bbox = tuple(bbox) if bbox is not None else None
+        self.view_specific = view_specific
+
+    def to_dict(self):
+        return {
+            "elem_id": self.elem_id,
+            "category_id": self.category_id,
+            "category": self.category,
+            "type_id": self.type_id,
+            "level_id": self.level_id,
+            "bbox": list(self.bbox) if self.bbox is not None else None,
+            "view_specific": self.view_specific,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(
+            d.get("elem_id"),
+            category_id=d.get("category_id"),
+            category=d.get("category"),
+            type_id=d.get("type_id"),
+            level_id=d.get("level_id"),
+            bbox=d.get("bbox"),
+            view_specific=d.get("view_specific"),
+        )
+
+    def __repr__(self):
+        return "ElementRecord({0}, category={1!r})".format(self.elem_id, self.category)
+
+
+def _int_id(obj):
+    try:
+        v = getattr(obj, "IntegerValue", None)
+        if v is None:
+            v = getattr(obj, "Value", None)
+        return None if v is None else int(v)
+    except Exception:
+        return None
+
+
+def _elem_id(elem):
+    if isinstance(elem, ElementRecord):
+        return elem.elem_id
+    return _int_id(getattr(elem, "Id", None))
+
+
+def _elem_category_id(elem):
+    if isinstance(elem, ElementRecord):
+        return elem.category_id
+    try:
+        cat = getattr(elem, "Category", None)
+        return _int_id(getattr(cat, "Id", None)) if cat is not None else None
+    except Exception:
+        return None
+
+
+def _view_id(view):
+    if isinstance(view, int):
+        return view
+    return _int_id(getattr(view, "Id", None))
+
+
+class DocumentSnapshot(object):
+    """Run-scoped index of document content shared by all views.
+
+    Args:
+        doc: Revit Document (None for snapshots rebuilt from JSON)
+        diag: Diagnostics (optional; collector failures are recorded, never raised)
+
+    Example:
+        >>> snap = DocumentSnapshot(doc)
+        >>> elems = snap.view_elements(view)          # one collector per view
+        >>> walls = snap.view_elements_of_category(view, int(BuiltInCategory.OST_Walls))
+
+    Commentary:
+        ✔ view_elements() returns the same element set as
+          FilteredElementCollector(doc, view.Id).WhereElementIsNotElementType()
+        ✔ Category-filtered access is equivalent to OfCategory() on that collector
+        ✔ release_view() drops live element references once a view is done;
+          records are kept so to_dict() still describes the whole run
+    """
+
+    SCHEMA = 1
+
+    def __init__(self, doc=None, diag=None):
+        self.doc = doc
+        self.diag = diag
+
+        self._records = {}          # elem_id -> ElementRecord
+        self._view_ids = {}         # view_id -> [elem_id, ...]
+        self._view_elems = {}       # view_id -> [live element or ElementRecord, ...]
+        self._view_by_cat = {}      # view_id -> {category_id: [elem, ...]}
+        self._memo = {}             # (view_id, key) -> value
+        self.category_policies = {}  # collection_policy.compiled_category_policy() cache
+
+        self.collector_calls = 0
+        self.view_hits = 0
+
+    # ------------------------------------------------------------------
+    # Per-view element access
+    # ------------------------------------------------------------------
+
+    def view_elements(self, view):
+        """All non-type elements visible in view (one collector pass per view)."""
+        view_id = _view_id(view)
+        cached = self._view_elems.get(view_id)
+        if cached is not None:
+            self.view_hits += 1
+            return cached
+
+        elems = []
+        if self.doc is None:
+            # Offline snapshot: serve recorded elements
+            for elem_id in self._view_ids.get(view_id, []):
+                rec = self._records.get(elem_id)
+                if rec is not None:
+                    elems.append(rec)
+        else:
+            try:
+                from Autodesk.Revit.DB import FilteredElementCollector
+
+                self.collector_calls += 1
+                col = FilteredElementCollector(self.doc, view.Id).WhereElementIsNotElementType()
+                elems = list(col)
+            except Exception as e:
+                elems = []
+                if self.diag is not None:
+                    try:
+                        self.diag.warn(
+                            phase="snapshot",
+                            callsite="DocumentSnapshot.view_elements",
+                            message="View-scoped collector failed; snapshot has no elements for view",
+                            view_id=view_id,
+                            extra={"exc_type": type(e).__name__, "exc": str(e)},
+                        )
+                    except Exception:
+                        pass
+
+            ids = []
+            for elem in elems:
+                elem_id = _elem_id(elem)
+                if elem_id is None:
+                    continue
+                ids.append(elem_id)
+                if elem_id not in self._records:
+                    self._records[elem_id] = ElementRecord(elem_id, category_id=_elem_category_id(elem))
+            self._view_ids[view_id] = ids
+
+        by_cat = {}
+        for elem in elems:
+            by_cat.setdefault(_elem_category_id(elem), []).append(elem)
+
+        self._view_elems[view_id] = elems
+        self._view_by_cat[view_id] = by_cat
+        return elems
+
+    def view_element_ids(self, view):
+        """Element ids visible in view (collects the view if needed)."""
+        view_id = _view_id(view)
+        if view_id not in self._view_ids:
+            self.view_elements(view)
+        return list(self._view_ids.get(view_id, []))
+
+    def view_elements_of_category(self, view, category_id):
+        """Elements of one BuiltInCategory in view (equivalent to OfCategory())."""
+        view_id = _view_id(view)
+        if view_id not in self._view_by_cat:
+            self.view_elements(view)
+        try:
+            category_id = int(category_id)
+        except Exception:
+            return []
+        return list(self._view_by_cat.get(view_id, {}).get(category_id, []))
+
+    def memo(self, view, key, builder):
+        """Memoize a per-view derived value (e.g. the annotation whitelist)."""
+        k = (_view_id(view), key)
+        if k in self._memo:
+            self.view_hits += 1
+            return self._memo[k]
+        value = builder()
+        self._memo[k] = value
+        return value
+
+    def release_view(self, view):
+        """Drop live element references for a finished view (records are kept)."""
+        view_id = _view_id(view)
+        if self.doc is not None:
+            self._view_elems.pop(view_id, None)
+            self._view_by_cat.pop(view_id, None)
+        for k in [k for k in self._memo if k[0] == view_id]:
+            self._memo.pop(k, None)
+
+    def stats(self):
+        return {
+            "views": len(self._view_ids),
+            "elements": len(self._records),
+            "collector_calls": self.collector_calls,
+            "view_hits": self.view_hits,
+        }
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_dict(self):
+        return {
+            "schema": self.SCHEMA,
+            "elements": {str(k): r.to_dict() for k, r in self._records.items()},
+            "views": {str(k): list(v) for k, v in self._view_ids.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, d, diag=None):
+        snap = cls(doc=None, diag=diag)
+        for k, rd in (d.get("elements") or {}).items():
+            rd = dict(rd)
+            rd.setdefault("elem_id", int(k))
+            rec = ElementRecord.from_dict(rd)
+            snap._records[rec.elem_id] = rec
+        for k, ids in (d.get("views") or {}).items():
+            snap._view_ids[int(k)] = [int(i) for i in ids]
+        return snap
+
+    def to_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, sort_keys=True)
+
+    @classmethod
+    def from_json(cls, path, diag=None):
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f), diag=diag)
@@ -0,0 +1,260 @@
+"""
+Per-run index of linked RVT documents for the VOP interwoven pipeline.
+
+Without it, every view re-resolves each RevitLinkInstance (GetLinkDocument,
+GetTotalTransform), re-runs the collector-overload reflection probe, rebuilds
+a LinkedElementProxy (8-corner bbox transform) for every linked element and,
+on the pre-2024 path, re-walks the link document through a bbox-filtered
+collector. Federated projects show the same links in most plans, so that
+work repeats once per view.
+
+LinkIndex is built lazily and lives for the run:
+
+    - link instances: link document, total transform, source key/label
+      (resolved once per instance)
+    - link documents (pre-2024 path): one collector pass per document keeps
+      the view-independent candidates (model categories, not excluded, not
+      nested links/imports, with a bbox) and a RectGrid over their link-space
+      XY bboxes; a view's clip box is then answered by a grid query + Z test
+    - proxies: one LinkedElementProxy per (link instance, element) per run
+    - DWG import type names per import instance
+    - compiled category policies per link document (Revit 2024+ path)
+
+Example:
+    >>> index = LinkIndex(doc, cfg)
+    >>> link = index.link(link_inst)                  # None if unloaded
+    >>> elems = index.elements_in_box(link.link_doc, min_link, max_link)
+    >>> proxy = index.proxy(link, elem, bbox_link)    # cached host-space proxy
+
+Commentary:
+    ✔ Which elements a view collects is unchanged: per-view visibility
+      (link instances in view, Revit 2024+ (doc, viewId, linkId) collector,
+      host category visibility) still runs per view
+    ✔ Box queries match BoundingBoxIntersectsFilter (inclusive, tolerance 0)
+      and return elements in collector order
+    ⚠ Assumes link documents and instance transforms do not change during
+      the run
+"""
+
+from ..core.spatial_index import RectGrid
+
+
+class LinkRef(object):
+    """Resolved link instance (document, transform, source identity)."""
+
+    __slots__ = ("link_inst", "inst_id", "link_doc", "link_trf", "title", "source_key", "source_label", "proxies")
+
+    def __init__(self, link_inst, link_doc, link_trf, title, source_key, source_label):
+        self.link_inst = link_inst
+        self.inst_id = getattr(getattr(link_inst, "Id", None), "IntegerValue", None)
+        self.link_doc = link_doc
+        self.link_trf = link_trf
+        self.title = title
+        self.source_key = source_key
+        self.source_label = source_label
+        self.proxies = {}  # elem_id -> LinkedElementProxy (or None: no host bbox)
+
+
+class _LinkDocIndex(object):
+    """View-independent link-document candidates + XY grid (pre-2024 path)."""
+
+    def __init__(self, link_doc):
+        from . import linked_documents as ld
+
+        self.link_doc = link_doc
+        self.elements = []  # (elem, cat_id)
+        self.boxes = []     # (xmin, ymin, zmin, xmax, ymax, zmax) link space
+
+        from Autodesk.Revit.DB import CategoryType, FilteredElementCollector, ImportInstance, RevitLinkInstance
+
+        excluded_cat_ids = ld._get_excluded_3d_category_ids(link_doc)
+        for elem in FilteredElementCollector(link_doc).WhereElementIsNotElementType():
+            try:
+                # Skip nested links and imports
+                if isinstance(elem, RevitLinkInstance) or isinstance(elem, ImportInstance):
+                    continue
+                cat = elem.Category
+                if cat is None:
+                    continue
+                cat_id_val = cat.Id.IntegerValue
+                if cat_id_val in excluded_cat_ids:
+                    continue
+                if cat.CategoryType != CategoryType.Model:
+                    continue
+                bb = elem.get_BoundingBox(None)
+                if bb is None or bb.Min is None or bb.Max is None:
+                    continue
+                self.elements.append((elem, cat_id_val))
+                self.boxes.append((bb.Min.X, bb.Min.Y, bb.Min.Z, bb.Max.X, bb.Max.Y, bb.Max.Z))
+            except Exception:
+                continue
+
+        self.grid = RectGrid([(b[0], b[1], b[3], b[4]) for b in self.boxes])
+
+    def query(self, min_pt, max_pt):
+        """Candidates whose link-space bbox intersects [min_pt, max_pt] (inclusive)."""
+        boxes = self.boxes
+        zmin, zmax = min_pt.Z, max_pt.Z
+        out = []
+        for i in self.grid.query(min_pt.X, min_pt.Y, max_pt.X, max_pt.Y):
+            b = boxes[i]
+            if b[5] < zmin or b[2] > zmax:
+                continue
+            out.append(self.elements[i])
+        return out
+
+
+class LinkIndex(object):
+    """Run-scoped cache of link instances, link documents and linked proxies.
+
+    Args:
+        doc: Host Revit Document
+        cfg: Config (optional)
+        diag: Optional Diagnostics
+    """
+
+    def __init__(self, doc, cfg=None, diag=None):
+        self.doc = doc
+        self.cfg = cfg
+        self.diag = diag
+        self._collector_2024 = None
+        self._links = {}     # link instance id -> LinkRef (or None: unloaded / no transform)
+        self._docs = {}      # id(link_doc) -> _LinkDocIndex
+        self._imports = {}   # import instance id -> type name
+        self.category_policies = {}  # collection_policy.compiled_category_policy() cache
+        self.link_hits = 0
+        self.proxy_hits = 0
+        self.proxies_created = 0
+        self.queries = 0
+
+    def has_2024_collector(self, view):
+        """Cached linked_documents._has_revit_2024_link_collector() (one probe per run)."""
+        if self._collector_2024 is None:
+            from .linked_documents import _has_revit_2024_link_collector
+            self._collector_2024 = bool(_has_revit_2024_link_collector(self.doc, view))
+        return self._collector_2024
+
+    def link(self, link_inst):
+        """LinkRef for a RevitLinkInstance, or None if unloaded / without transform."""
+        inst_id = getattr(getattr(link_inst, "Id", None), "IntegerValue", None)
+        if inst_id is not None and inst_id in self._links:
+            self.link_hits += 1
+            return self._links[inst_id]
+
+        from .linked_documents import _log
+
+        ref = None
+        link_doc = link_inst.GetLinkDocument()
+        if link_doc is None:
+            _log("WARN", "Link instance {0} has no linked document (unloaded?)".format(link_inst.Id))
+        else:
+            title = link_doc.Title
+            try:
+                link_trf = link_inst.GetTotalTransform()
+            except Exception:
+                link_trf = link_inst.GetTransform()
+            if link_trf is None:
+                _log("WARN", "Link {0} has no transform".format(title))
+            else:
+                try:
+                    link_doc_uid = link_doc.UniqueId
+                except Exception:
+                    link_doc_uid = title  # Fallback if UniqueId not available
+                ref = LinkRef(
+                    link_inst, link_doc, link_trf, title,
+                    source_key="RVT_LINK:{0}:{1}".format(link_doc_uid, inst_id),
+                    source_label="RVT_LINK:{0}".format(title),
+                )
+
+        if inst_id is not None:
+            self._links[inst_id] = ref
+        return ref
+
+    def proxy(self, link, elem, bbox_link=None):
+        """Host-space LinkedElementProxy for `elem` of `link` (cached per run).
+
+        Args:
+            link: LinkRef from link()
+            elem: Element of link.link_doc
+            bbox_link: elem.get_BoundingBox(None) if already read (fetched on a miss otherwise)
+
+        Returns:
+            LinkedElementProxy, or None if the element has no bbox or it cannot
+            be transformed to host space
+        """
+        elem_id = getattr(getattr(elem, "Id", None), "IntegerValue", None)
+        if elem_id is not None and elem_id in link.proxies:
+            self.proxy_hits += 1
+            return link.proxies[elem_id]
+
+        from .linked_documents import LinkedElementProxy, _transform_bbox_to_host
+
+        if bbox_link is None:
+            bbox_link = elem.get_BoundingBox(None)
+        host_min = host_max = None
+        if bbox_link is not None and bbox_link.Min is not None and bbox_link.Max is not None:
+            host_min, host_max = _transform_bbox_to_host(bbox_link, link.link_trf)
+        proxy = None
+        if host_min is not None and host_max is not None:
+            proxy = LinkedElementProxy(
+                element=elem,
+                link_inst=link.link_inst,
+                host_min=host_min,
+                host_max=host_max,
+                link_trf=link.link_trf,
+                source_type="LINK",
+                source_id=link.source_key,
+                source_label=link.source_label,
+                doc_key=link.source_key,
+                doc_label=link.source_label,
+            )
+            self.proxies_created += 1
+        if elem_id is not None:
+            link.proxies[elem_id] = proxy
+        return proxy
+
+    def _doc_index(self, link_doc):
+        entry = self._docs.get(id(link_doc))
+        if entry is None or entry.link_doc is not link_doc:
+            entry = _LinkDocIndex(link_doc)
+            self._docs[id(link_doc)] = entry
+        return entry
+
+    def elements_in_box(self, link_doc, min_pt=None, max_pt=None):
+        """(elem, cat_id) candidates of a link document, optionally clipped to a link-space box.
+
+        Candidates already passed the view-independent filters of the legacy
+        clip path (nested links/imports, excluded and non-model categories,
+        missing bbox). No box = every candidate.
+        """
+        entry = self._doc_index(link_doc)
+        self.queries += 1
+        if min_pt is None or max_pt is None:
+            return list(entry.elements)
+        return entry.query(min_pt, max_pt)
+
+    def import_name(self, import_inst):
+        """CAD type name of an ImportInstance (cached per instance)."""
+        inst_id = getattr(getattr(import_inst, "Id", None), "IntegerValue", None)
+        if inst_id is not None and inst_id in self._imports:
+            return self._imports[inst_id]
+        try:
+            type_id = import_inst.GetTypeId()
+            import_type = self.doc.GetElement(type_id)
+            name = getattr(import_type, "Name", "DWG_Import")
+        except Exception:
+            name = "DWG_Import"
+        if inst_id is not None:
+            self._imports[inst_id] = name
+        return name
+
+    def stats(self):
+        return {
+            "links": sum(1 for v in self._links.values() if v is not None),
+            "link_docs_indexed": len(self._docs),
+            "elements_indexed": sum(len(d.elements) for d in self._docs.values()),
+            "link_hits": self.link_hits,
+            "proxies_created": self.proxies_created,
+            "proxy_hits": self.proxy_hits,
+            "queries": self.queries,
+        }
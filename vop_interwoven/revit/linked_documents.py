@@ -8,6 +8,8 @@ Provides functions to collect elements from:
 Handles spatial clipping, transform application, and visibility filtering.
 """
 
+from ..core import tracing
+
 # Optional Revit API bindings (allow pytest outside Revit)
 try:
     from Autodesk.Revit.DB import (
@@ -25,7 +27,10 @@ except Exception:
 
 # Logging helper for IronPython compatibility (no logging module)
 def _log(level, msg):
-    """Simple logging function compatible with IronPython."""
+    """Simple logging function compatible with IronPython (DEBUG is trace-gated)."""
+    if level == "DEBUG":
+        tracing.debug("[DEBUG] vop.linked_docs: {0}", msg)
+        return
     print("[{0}] vop.linked_docs: {1}".format(level, msg))
 
 
@@ -94,13 +99,15 @@ class LinkedElementProxy:
             return None
 
 
-def collect_all_linked_elements(doc, view, cfg, diag=None):
+def collect_all_linked_elements(doc, view, cfg, diag=None, link_index=None):
     """Collect all elements from linked RVT files and DWG imports.
 
     Args:
         doc: Revit Document
         view: Revit View
         cfg: Config object with linked document settings
+        link_index: Optional run-scoped link_index.LinkIndex (link instances,
+            link-document candidates and proxies reused across views)
 
     Returns:
         List of LinkedElementProxy objects in host-space coordinates
@@ -122,7 +129,7 @@ def collect_all_linked_elements(doc, view, cfg, diag=None):
     # Collect from RVT links
     if getattr(cfg, 'include_linked_rvt', False):
         try:
-            rvt_elements = _collect_from_revit_links(doc, view, cfg)
+            rvt_elements = _collect_from_revit_links(doc, view, cfg, link_index=link_index)
             elements.extend(rvt_elements)
             _log("INFO", "Collected {0} elements from RVT links".format(len(rvt_elements)))
         except Exception as e:
@@ -131,7 +138,7 @@ def collect_all_linked_elements(doc, view, cfg, diag=None):
     # Collect from DWG/DXF imports
     if getattr(cfg, 'include_dwg_imports', False):
         try:
-            dwg_elements = _collect_from_dwg_imports(doc, view, cfg)
+            dwg_elements = _collect_from_dwg_imports(doc, view, cfg, link_index=link_index)
             elements.extend(dwg_elements)
             _log("INFO", "Collected {0} elements from DWG imports".format(len(dwg_elements)))
         except Exception as e:
@@ -183,7 +190,8 @@ def _has_revit_2024_link_collector(doc, view):
         return False
 
 
-def _collect_visible_link_elements_2024_plus(doc, view, link_inst, link_doc, link_trf, cfg, diag=None):
+def _collect_visible_link_elements_2024_plus(doc, view, link_inst, link_doc, link_trf, cfg, diag=None,
+                                             link_index=None, link=None):
     """Collect visible elements from link using Revit 2024+ collector.
 
     Args:
@@ -193,6 +201,8 @@ def _collect_visible_link_elements_2024_plus(doc, view, link_inst, link_doc, lin
         link_doc: Linked Document
         link_trf: Transform (link → host)
         cfg: Config object
+        link_index, link: Optional LinkIndex and its LinkRef for link_inst
+            (proxies are reused across views)
 
     Returns:
         Tuple of (proxies list, source_key, source_label)
@@ -203,7 +213,7 @@ def _collect_visible_link_elements_2024_plus(doc, view, link_inst, link_doc, lin
         eliminating the need for bbox clipping approximations.
     """
     
-    from .collection_policy import should_include_element, PolicyStats
+    from .collection_policy import compiled_category_policy, PolicyStats
     
     policy_stats = PolicyStats()
     excluded_by_category = {}
@@ -217,6 +227,7 @@ def _collect_visible_link_elements_2024_plus(doc, view, link_inst, link_doc, lin
 
     source_key = "RVT_LINK:{0}:{1}".format(link_doc_uid, link_inst_id)
     source_label = "RVT_LINK:{0}".format(link_doc.Title)
+    category_policy = compiled_category_policy(link_doc, "LINK", cache=getattr(link_index, "category_policies", None))
 
     _log("DEBUG", "Using Revit 2024+ collector for link '{0}'".format(link_doc.Title))
 
@@ -283,12 +294,7 @@ def _collect_visible_link_elements_2024_plus(doc, view, link_inst, link_doc, lin
                     skip["skip_no_category"] += 1
                     continue
 
-                include, pol_reason, pol_cat = should_include_element(
-                    elem=elem,
-                    doc=link_doc,
-                    source_type="LINK",
-                    stats=policy_stats,
-                )
+                include, pol_reason, pol_cat = category_policy.decide(elem, stats=policy_stats)
                 if not include:
                     skip["skip_excluded_by_policy"] += 1
                     excluded_by_category[pol_cat] = excluded_by_category.get(pol_cat, 0) + 1
@@ -335,7 +341,14 @@ def _collect_visible_link_elements_2024_plus(doc, view, link_inst, link_doc, lin
                 # NOTE:
                 # LinkedElementProxy.get_BoundingBox() is defined to return HOST-space bboxes.
                 # Silhouette + raster paths assume this invariant.
-                host_min, host_max = _transform_bbox_to_host(bbox_link, link_trf)
+                proxy = None
+                if link_index is not None and link is not None:
+                    proxy = link_index.proxy(link, elem, bbox_link)
+                    host_bb = proxy.get_BoundingBox(None) if proxy is not None else None
+                    host_min = host_bb.Min if host_bb is not None else None
+                    host_max = host_bb.Max if host_bb is not None else None
+                else:
+                    host_min, host_max = _transform_bbox_to_host(bbox_link, link_trf)
 
                 # DEBUG: compare raw bbox min to transformed min and link origin
                 if dbg_limit > 0 and dbg_seen < dbg_limit:
@@ -373,18 +386,19 @@ def _collect_visible_link_elements_2024_plus(doc, view, link_inst, link_doc, lin
                     continue
 
                 # Create proxy
-                proxy = LinkedElementProxy(
-                    element=elem,
-                    link_inst=link_inst,
-                    host_min=host_min,
-                    host_max=host_max,
-                    link_trf=link_trf,
-                    source_type="LINK",
-                    source_id=source_key,
-                    source_label=source_label,
-                    doc_key=source_key,
-                    doc_label=source_label,
-                )
+                if proxy is None:
+                    proxy = LinkedElementProxy(
+                        element=elem,
+                        link_inst=link_inst,
+                        host_min=host_min,
+                        host_max=host_max,
+                        link_trf=link_trf,
+                        source_type="LINK",
+                        source_id=source_key,
+                        source_label=source_label,
+                        doc_key=source_key,
+                        doc_label=source_label,
+                    )
 
                 proxies.append(proxy)
                 created += 1
@@ -454,13 +468,14 @@ def _collect_visible_link_elements_2024_plus(doc, view, link_inst, link_doc, lin
     return proxies, source_key, source_label
 
 
-def _collect_from_revit_links(doc, view, cfg):
+def _collect_from_revit_links(doc, view, cfg, link_index=None):
     """Collect elements from linked Revit files.
 
     Args:
         doc: Host Revit Document
         view: Host View
         cfg: Config object
+        link_index: Optional run-scoped LinkIndex
 
     Returns:
         List of LinkedElementProxy objects
@@ -503,8 +518,11 @@ def _collect_from_revit_links(doc, view, cfg):
 
     _log("INFO", "Found {0} RVT link instance(s) in view".format(len(link_instances)))
 
-    # Detect if Revit 2024+ collector is available
-    use_2024_collector = _has_revit_2024_link_collector(doc, view)
+    # Detect if Revit 2024+ collector is available (probed once per run with a LinkIndex)
+    if link_index is not None:
+        use_2024_collector = link_index.has_2024_collector(view)
+    else:
+        use_2024_collector = _has_revit_2024_link_collector(doc, view)
 
     # Build clip volume for fallback (Revit < 2024)
     clip_volume = None
@@ -516,29 +534,38 @@ def _collect_from_revit_links(doc, view, cfg):
     # Process each link instance
     for link_inst in link_instances:
         try:
-            # Get linked document
-            link_doc = link_inst.GetLinkDocument()
-            if link_doc is None:
-                _log("WARN", "Link instance {0} has no linked document (unloaded?)".format(link_inst.Id))
-                continue
+            link = None
+            if link_index is not None:
+                # Linked document, transform and source key resolved once per run
+                link = link_index.link(link_inst)
+                if link is None:
+                    continue
+                link_doc, link_trf, link_title = link.link_doc, link.link_trf, link.title
+                _log("DEBUG", "Processing RVT link: {0}".format(link_title))
+            else:
+                # Get linked document
+                link_doc = link_inst.GetLinkDocument()
+                if link_doc is None:
+                    _log("WARN", "Link instance {0} has no linked document (unloaded?)".format(link_inst.Id))
+                    continue
 
-            link_title = link_doc.Title
-            _log("DEBUG", "Processing RVT link: {0}".format(link_title))
+                link_title = link_doc.Title
+                _log("DEBUG", "Processing RVT link: {0}".format(link_title))
 
-            # Get link transform
-            try:
-                link_trf = link_inst.GetTotalTransform()
-            except Exception:
-                link_trf = link_inst.GetTransform()
-            if link_trf is None:
-                _log("WARN", "Link {0} has no transform".format(link_title))
-                continue
+                # Get link transform
+                try:
+                    link_trf = link_inst.GetTotalTransform()
+                except Exception:
+                    link_trf = link_inst.GetTransform()
+                if link_trf is None:
+                    _log("WARN", "Link {0} has no transform".format(link_title))
+                    continue
 
             # Try Revit 2024+ collector first
             link_proxies = []
             if use_2024_collector:
                 link_proxies, source_key, source_label = _collect_visible_link_elements_2024_plus(
-                    doc, view, link_inst, link_doc, link_trf, cfg
+                    doc, view, link_inst, link_doc, link_trf, cfg, link_index=link_index, link=link
                 )
             else:
                 # Fallback: Use clip volume approach for Revit < 2024
@@ -561,7 +588,9 @@ def _collect_from_revit_links(doc, view, cfg):
                     host_visible_cats=host_visible_cats,
                     doc_key=source_key,
                     doc_label=source_label,
-                    cfg=cfg
+                    cfg=cfg,
+                    link_index=link_index,
+                    link=link,
                 )
 
             proxies.extend(link_proxies)
@@ -574,13 +603,14 @@ def _collect_from_revit_links(doc, view, cfg):
     return proxies
 
 
-def _collect_from_dwg_imports(doc, view, cfg):
+def _collect_from_dwg_imports(doc, view, cfg, link_index=None):
     """Collect elements from DWG/DXF imports.
 
     Args:
         doc: Revit Document
         view: Revit View
         cfg: Config object
+        link_index: Optional run-scoped LinkIndex (import type names)
 
     Returns:
         List of LinkedElementProxy objects
@@ -629,13 +659,16 @@ def _collect_from_dwg_imports(doc, view, cfg):
                 continue
 
             # Get import name/path for doc_key and label
-            try:
-                # Try to get CAD link type for name
-                type_id = import_inst.GetTypeId()
-                import_type = doc.GetElement(type_id)
-                import_name = getattr(import_type, "Name", "DWG_Import")
-            except Exception:
-                import_name = "DWG_Import"
+            if link_index is not None:
+                import_name = link_index.import_name(import_inst)
+            else:
+                try:
+                    # Try to get CAD link type for name
+                    type_id = import_inst.GetTypeId()
+                    import_type = doc.GetElement(type_id)
+                    import_name = getattr(import_type, "Name", "DWG_Import")
+                except Exception:
+                    import_name = "DWG_Import"
 
             # Build unique source key (includes instance ID)
             import_inst_id = import_inst.Id.IntegerValue
@@ -672,7 +705,8 @@ def _collect_from_dwg_imports(doc, view, cfg):
 
 
 def _collect_link_elements_with_clipping(link_inst, link_doc, link_trf, view,
-                                          clip_volume, host_visible_cats, doc_key, doc_label, cfg):
+                                          clip_volume, host_visible_cats, doc_key, doc_label, cfg,
+                                          link_index=None, link=None):
     """Collect elements from a link document with spatial clipping.
 
     Args:
@@ -685,6 +719,8 @@ def _collect_link_elements_with_clipping(link_inst, link_doc, link_trf, view,
         doc_key: Unique document key for metadata indexing
         doc_label: Human-friendly document label for logging
         cfg: Config object
+        link_index, link: Optional LinkIndex and its LinkRef for link_inst; the
+            link document is then walked once per run and clipped by grid query
 
     Returns:
         List of LinkedElementProxy objects
@@ -699,6 +735,9 @@ def _collect_link_elements_with_clipping(link_inst, link_doc, link_trf, view,
 
     proxies = []
 
+    if link_index is not None and link is not None:
+        return _collect_indexed_link_elements(link_index, link, clip_volume, host_visible_cats)
+
     # Check if we have a valid clip volume
     if clip_volume is None or not clip_volume.get("is_valid", False):
         _log("WARN", "No valid clip volume; skipping spatial filtering")
@@ -815,6 +854,53 @@ def _collect_link_elements_with_clipping(link_inst, link_doc, link_trf, view,
     return proxies
 
 
+def _collect_indexed_link_elements(link_index, link, clip_volume, host_visible_cats):
+    """_collect_link_elements_with_clipping() served from a LinkIndex.
+
+    Same elements in the same order; the link document is walked once per run
+    and each view's clip box becomes a grid query over the cached candidates.
+    """
+    from Autodesk.Revit.DB import XYZ
+
+    min_link = max_link = None
+    if clip_volume is None or not clip_volume.get("is_valid", False):
+        _log("WARN", "No valid clip volume; skipping spatial filtering")
+    else:
+        corners_host = clip_volume.get("corners_host")
+        if not corners_host or len(corners_host) < 8:
+            _log("WARN", "Clip volume missing corners")
+            return []
+
+        # Transform clip volume corners to link space
+        try:
+            inv_trf = link.link_trf.Inverse
+        except Exception as e:
+            _log("ERROR", "Failed to invert link transform: {0}".format(e))
+            return []
+
+        corners_link = [inv_trf.OfPoint(p) for p in corners_host]
+        xs = [p.X for p in corners_link]
+        ys = [p.Y for p in corners_link]
+        zs = [p.Z for p in corners_link]
+        min_link = XYZ(min(xs), min(ys), min(zs))
+        max_link = XYZ(max(xs), max(ys), max(zs))
+
+    proxies = []
+    for elem, cat_id_val in link_index.elements_in_box(link.link_doc, min_link, max_link):
+        try:
+            # Host VG filter (if By Host View mode)
+            if host_visible_cats is not None and cat_id_val not in host_visible_cats:
+                continue
+            proxy = link_index.proxy(link, elem)
+            if proxy is not None:
+                proxies.append(proxy)
+        except Exception as e:
+            _log("DEBUG", "Error processing link element {0}: {1}".format(getattr(elem, 'Id', '?'), e))
+            continue
+
+    return proxies
+
+
 def _build_clip_volume(view, cfg):
     """Build clip volume for spatial filtering from view crop box.
 
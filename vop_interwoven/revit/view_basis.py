@@ -394,9 +394,13 @@ def synthetic_bounds_from_visible_extents(
     max_elements=None,
     time_budget_s=None,
     time_fn=None,
+    snapshot=None,
 ):
     """Compute synthetic bounds from element extents in a view (crop-off / no-crop views).
 
+    If a DocumentSnapshot is supplied, the view's element list is reused from it
+    instead of issuing another view-scoped collector.
+
     Budget semantics:
         - If max_elements is exceeded OR time_budget_s elapses, the scan stops early.
         - Any early-stop yields confidence='low' and an explicit diagnostic (no silent degradation).
@@ -448,7 +452,10 @@ def synthetic_bounds_from_visible_extents(
     t0 = time_fn()
 
     try:
-        collector = FilteredElementCollector(doc, view.Id).WhereElementIsNotElementType()
+        if snapshot is not None:
+            collector = snapshot.view_elements(view)
+        else:
+            collector = FilteredElementCollector(doc, view.Id).WhereElementIsNotElementType()
 
         for elem in collector:
             scanned += 1
@@ -795,6 +802,7 @@ def resolve_view_bounds(view, diag=None, policy=None):
                     diag=diag,
                     max_elements=max_elements,
                     time_budget_s=time_budget_s,
+                    snapshot=policy.get("snapshot"),
                 )
 
             if isinstance(r_ext, dict):
@@ -843,6 +851,7 @@ def resolve_view_bounds(view, diag=None, policy=None):
                     cell_size_ft,
                     cfg,
                     diag=diag,
+                    snapshot=policy.get("snapshot"),
                 )
             else:
                 anno_bounds = None
@@ -1217,13 +1226,13 @@ def resolve_view_mode(view, diag=None, policy=None):
     return VIEW_MODE_MODEL_AND_ANNOTATION, {**reason, "why": "model_capable_view"}
 
 
-def resolve_annotation_only_bounds(doc, view, basis, cell_size_ft, cfg=None, diag=None):
+def resolve_annotation_only_bounds(doc, view, basis, cell_size_ft, cfg=None, diag=None, snapshot=None):
     """
     Produce bounds from annotation extents ONLY (no union with model/crop).
     This is required for drafting views; otherwise fallback base bounds dominate.
     """
     from ..core.math_utils import Bounds2D
-    from .annotation import collect_2d_annotations, is_extent_driver_annotation
+    from .annotation import collect_annotation_set
 
     view_id = None
     try:
@@ -1233,7 +1242,7 @@ def resolve_annotation_only_bounds(doc, view, basis, cell_size_ft, cfg=None, dia
 
     # Collect view-specific annotations and compute UV extents
     try:
-        annos = collect_2d_annotations(doc, view)
+        annos = collect_annotation_set(doc, view, snapshot=snapshot)
     except Exception as e:
         if diag is not None:
             diag.warn(
@@ -1245,18 +1254,12 @@ def resolve_annotation_only_bounds(doc, view, basis, cell_size_ft, cfg=None, dia
             )
         return None
 
-    drivers = []
-    for elem, _atype in annos:
-        try:
-            if is_extent_driver_annotation(elem):
-                drivers.append(elem)
-        except Exception:
-            continue
+    drivers = annos.drivers()
 
     if not drivers:
         # For Legend/Drafting, be robust: if no extent-driver annotations were detected,
         # fall back to using ALL collected 2D annotations for bounds.
-        drivers = [elem for (elem, _atype) in annos if elem is not None]
+        drivers = [rec for rec in annos if rec.elem is not None]
         if not drivers:
             return None
         if diag is not None:
@@ -1273,9 +1276,9 @@ def resolve_annotation_only_bounds(doc, view, basis, cell_size_ft, cfg=None, dia
 
     min_u = min_v = max_u = max_v = None
 
-    for elem in drivers:
+    for rec in drivers:
         try:
-            bbox = elem.get_BoundingBox(view)
+            bbox = rec.bbox
             if bbox is None:
                 continue
             mn = bbox.Min
@@ -1309,7 +1312,7 @@ def resolve_annotation_only_bounds(doc, view, basis, cell_size_ft, cfg=None, dia
                     callsite="resolve_annotation_only_bounds.bbox",
                     message="Failed to process annotation bbox for annotation-only bounds; skipping element",
                     view_id=view_id,
-                    elem_id=getattr(getattr(elem, "Id", None), "IntegerValue", None),
+                    elem_id=rec.elem_id,
                     extra={"exc_type": type(e).__name__, "exc": str(e)},
                 )
             continue
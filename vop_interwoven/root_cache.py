@@ -3,6 +3,10 @@ Root-style cache: Single file per project, metrics only.
 
 Compatible with streaming mode - stores only computed metrics and metadata,
 never the full raster arrays.
+
+Backends (open_root_cache / cfg.root_cache_backend):
+    json    vop_cache.json, rewritten whole on save()
+    sqlite  vop_cache.sqlite (WAL), one upserted row per view
 """
 
 import os
@@ -17,6 +21,80 @@ def _round6(x):
     except Exception:
         return x
 
+
+def _build_view_entry(view_id, signature, metadata, metrics, element_summary=None, timings=None):
+    """Cache entry for one view (shared by every RootStyleCache backend).
+
+    Stores an additional 'row_payload' dict that is sufficient to rehydrate
+    CSV rows on cache hits (streaming mode), without requiring raster arrays.
+    """
+    element_summary = element_summary or {}
+    timings = timings or {}
+    
+    # CSV-rehydratable payload: flat dict for easy merge into view_result / row builders.
+    row_payload = {}
+    if isinstance(metadata, dict):
+        row_payload.update(metadata)
+    
+    # Warn on collisions: metrics overwriting metadata is almost always unintended.
+    if isinstance(metadata, dict) and isinstance(metrics, dict):
+        for k in metrics.keys():
+            if k in metadata:
+                print(f"[RootCache] WARNING: row_payload key collision (metrics overwrites metadata): {k}")
+    
+    if isinstance(metrics, dict):
+        row_payload.update(metrics)
+    
+    # Keep these nested fields too (some exporters may use them)
+    row_payload["timings"] = timings
+    row_payload["element_summary"] = element_summary
+    
+    # Ensure basic identifiers exist in payload
+    if "view_id" not in row_payload:
+        row_payload["view_id"] = view_id
+    
+    # Normalize view_type to human-readable string before persisting to cache row_payload.
+    # This prevents cached VOP CSV ViewType from reverting to enum ints.
+    try:
+        from vop_interwoven.csv_export import _viewtype_name_from_value
+        _vt_raw = row_payload.get("view_type", None)
+        _vt_name = _viewtype_name_from_value(_vt_raw)
+    
+        # Only replace if we successfully resolved a readable name.
+        # (In non-Revit test environments, enum name resolution may be unavailable.)
+        if _vt_name:
+            row_payload["view_type"] = _vt_name
+    except Exception:
+        pass
+    
+    # CSV invariants for cache-hit rehydration
+    # These are safe defaults; streaming layer may overwrite with actual lookup timing.
+    row_payload.setdefault("FromCache", "Y")
+    row_payload.setdefault("ElapsedSec", 0)
+    
+    # Backward-compatible: add CSV-schema identity keys alongside snake_case keys
+    # so cached row_payload can be reused verbatim by CSV exporters.
+    try:
+        if "ViewId" not in row_payload:
+            row_payload["ViewId"] = metadata.get("view_id", row_payload.get("view_id"))
+        if "ViewName" not in row_payload:
+            row_payload["ViewName"] = metadata.get("view_name", row_payload.get("view_name"))
+        if "ViewType" not in row_payload:
+            row_payload["ViewType"] = row_payload.get("view_type") or metadata.get("view_type", "")
+    except Exception:
+        pass
+
+    return {
+        "view_signature": signature,
+        "cached_utc": time.time(),
+        "metadata": metadata or {},
+        "metrics": metrics or {},
+        "element_summary": element_summary,
+        "timings": timings,
+        "row_payload": row_payload,
+    }
+
+
 class RootStyleCache:
     """Single-file cache storing metrics only (no raster data)."""
     
@@ -147,72 +225,8 @@ class RootStyleCache:
         if self._cache is None:
             self.load()
 
-        element_summary = element_summary or {}
-        timings = timings or {}
-
-        # CSV-rehydratable payload: flat dict for easy merge into view_result / row builders.
-        row_payload = {}
-        if isinstance(metadata, dict):
-            row_payload.update(metadata)
-
-        # Warn on collisions: metrics overwriting metadata is almost always unintended.
-        if isinstance(metadata, dict) and isinstance(metrics, dict):
-            for k in metrics.keys():
-                if k in metadata:
-                    print(f"[RootCache] WARNING: row_payload key collision (metrics overwrites metadata): {k}")
-
-        if isinstance(metrics, dict):
-            row_payload.update(metrics)
-
-        # Keep these nested fields too (some exporters may use them)
-        row_payload["timings"] = timings
-        row_payload["element_summary"] = element_summary
-
-        # Ensure basic identifiers exist in payload
-        if "view_id" not in row_payload:
-            row_payload["view_id"] = view_id
-
-        # Normalize view_type to human-readable string before persisting to cache row_payload.
-        # This prevents cached VOP CSV ViewType from reverting to enum ints.
-        try:
-            from vop_interwoven.csv_export import _viewtype_name_from_value
-            _vt_raw = row_payload.get("view_type", None)
-            _vt_name = _viewtype_name_from_value(_vt_raw)
-
-            # Only replace if we successfully resolved a readable name.
-            # (In non-Revit test environments, enum name resolution may be unavailable.)
-            if _vt_name:
-                row_payload["view_type"] = _vt_name
-        except Exception:
-            pass
-
-        # CSV invariants for cache-hit rehydration
-        # These are safe defaults; streaming layer may overwrite with actual lookup timing.
-        row_payload.setdefault("FromCache", "Y")
-        row_payload.setdefault("ElapsedSec", 0)
-
-        # Backward-compatible: add CSV-schema identity keys alongside snake_case keys
-        # so cached row_payload can be reused verbatim by CSV exporters.
-        try:
-            if "ViewId" not in row_payload:
-                row_payload["ViewId"] = metadata.get("view_id", row_payload.get("view_id"))
-            if "ViewName" not in row_payload:
-                row_payload["ViewName"] = metadata.get("view_name", row_payload.get("view_name"))
-            if "ViewType" not in row_payload:
-                row_payload["ViewType"] = row_payload.get("view_type") or metadata.get("view_type", "")
-        except Exception:
-            pass
-
-        view_key = str(view_id)
-        self._cache.setdefault("views", {})[view_key] = {
-            "view_signature": signature,
-            "cached_utc": time.time(),
-            "metadata": metadata or {},
-            "metrics": metrics or {},
-            "element_summary": element_summary,
-            "timings": timings,
-            "row_payload": row_payload,
-        }
+        entry = _build_view_entry(view_id, signature, metadata, metrics, element_summary, timings)
+        self._cache.setdefault("views", {})[str(view_id)] = entry
 
         self._dirty = True
 
@@ -269,7 +283,8 @@ class RootStyleCache:
             "misses": self.misses,
             "hit_rate": hit_rate,
             "invalidations": self.invalidations,
-            "cached_views": len(self._cache.get("views", {})) if self._cache else 0
+            "cached_views": len(self._cache.get("views", {})) if self._cache else 0,
+            "backend": "json",
         }
     
     def _empty_cache(self):
@@ -283,6 +298,263 @@ class RootStyleCache:
         }
 
 
+class SqliteRootStyleCache(RootStyleCache):
+    """RootStyleCache backed by SQLite (WAL), one row per cached view.
+
+    Rows are keyed by (view_id, config_hash, view_signature), so set_view()
+    is a single-row upsert and get_view()/get_view_any() are indexed lookups;
+    nothing is parsed or rewritten in bulk. Rows for other config hashes
+    coexist in the same file (one shard per config) instead of invalidating it.
+
+    Commentary:
+        ✔ Same public API/stats as RootStyleCache (drop-in for streaming)
+        ✔ One-time migration of an existing vop_cache.json (left in place)
+        ⚠ exporter_version/project_guid mismatch still drops every row
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, output_dir, project_guid, exporter_version, config_hash):
+        RootStyleCache.__init__(self, output_dir, project_guid, exporter_version, config_hash)
+        self.json_path = self.cache_path
+        self.cache_path = os.path.join(output_dir, "vop_cache.sqlite")
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            import sqlite3
+
+            os.makedirs(self.output_dir, exist_ok=True)
+            conn = sqlite3.connect(self.cache_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS views ("
+                " view_id TEXT NOT NULL,"
+                " config_hash TEXT NOT NULL,"
+                " view_signature TEXT NOT NULL,"
+                " cached_utc REAL NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " PRIMARY KEY (view_id, config_hash, view_signature))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS views_latest ON views (view_id, config_hash, cached_utc)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _meta_get(self, conn, key):
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _meta_set(self, conn, key, value):
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, None if value is None else str(value)),
+        )
+
+    def _count_views(self):
+        try:
+            row = self._connect().execute(
+                "SELECT COUNT(*) FROM views WHERE config_hash = ?", (str(self.config_hash),)
+            ).fetchone()
+            return int(row[0]) if row else 0
+        except Exception:
+            return 0
+
+    def load(self):
+        """Open the database, validate version/project, migrate JSON once.
+
+        Returns:
+            True if cached rows for this config are available, False otherwise
+        """
+        try:
+            conn = self._connect()
+            stored_version = self._meta_get(conn, "exporter_version")
+            stored_project = self._meta_get(conn, "project_guid")
+
+            if stored_version is not None and stored_version != str(self.exporter_version):
+                print(f"[RootCache] Version mismatch: {stored_version} != {self.exporter_version}")
+                self.invalidations += 1
+                conn.execute("DELETE FROM views")
+            elif stored_project is not None and stored_project != str(self.project_guid):
+                print(f"[RootCache] Project mismatch: {stored_project} != {self.project_guid}")
+                self.invalidations += 1
+                conn.execute("DELETE FROM views")
+
+            self._meta_set(conn, "schema_version", self.SCHEMA_VERSION)
+            self._meta_set(conn, "exporter_version", self.exporter_version)
+            self._meta_set(conn, "project_guid", self.project_guid)
+            conn.commit()
+
+            if self._meta_get(conn, "migrated_json") is None:
+                migrated = self._migrate_json(conn)
+                self._meta_set(conn, "migrated_json", migrated)
+                conn.commit()
+                if migrated:
+                    print(f"[RootCache] Migrated {migrated} views from {self.json_path}")
+
+            # Keep _cache non-None so inherited lazy-load checks stay satisfied
+            self._cache = {}
+            n = self._count_views()
+            print(f"[RootCache] Loaded cache with {n} views")
+            return n > 0
+
+        except Exception as e:
+            print(f"[RootCache] Load failed: {e}")
+            self._cache = {}
+            return False
+
+    def _migrate_json(self, conn):
+        """Import views from a valid vop_cache.json; returns the number of rows written."""
+        if not os.path.exists(self.json_path):
+            return 0
+        try:
+            with open(self.json_path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"[RootCache] JSON migration skipped: {e}")
+            return 0
+
+        if data.get("exporter_version") != self.exporter_version or data.get("project_guid") != self.project_guid:
+            return 0
+
+        # No config hash: nothing to shard the rows under (str(None) would match any
+        # other hash-less entry), so the JSON views are forced misses instead.
+        config_hash = data.get("config_hash")
+        if config_hash is None or str(config_hash) == "":
+            print("[RootCache] JSON migration skipped: no config_hash")
+            return 0
+        config_hash = str(config_hash)
+        rows = []
+        for view_key, entry in (data.get("views") or {}).items():
+            if not isinstance(entry, dict) or entry.get("view_signature") is None:
+                continue
+            rows.append((
+                str(view_key),
+                config_hash,
+                str(entry.get("view_signature")),
+                float(entry.get("cached_utc") or 0.0),
+                json.dumps(entry),
+            ))
+        conn.executemany(
+            "INSERT OR REPLACE INTO views (view_id, config_hash, view_signature, cached_utc, payload) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    def _latest_row(self, view_id):
+        if self._cache is None:
+            self.load()
+        return self._connect().execute(
+            "SELECT view_signature, payload FROM views WHERE view_id = ? AND config_hash = ? "
+            "ORDER BY cached_utc DESC LIMIT 1",
+            (str(view_id), str(self.config_hash)),
+        ).fetchone()
+
+    def get_view(self, view_id, current_signature):
+        """Get cached view if signature matches (indexed lookup)."""
+        try:
+            row = self._latest_row(view_id)
+        except Exception as e:
+            print(f"[RootCache] Lookup failed: {e}")
+            row = None
+
+        if row is None:
+            self.misses += 1
+            print(f"[RootCache] MISS view {view_id} (not present)")
+            return None
+
+        if row[0] != str(current_signature):
+            self.misses += 1
+            print(f"[RootCache] MISS view {view_id} (signature mismatch)")
+            return None
+
+        self.hits += 1
+        print(f"[RootCache] HIT view {view_id}")
+        return json.loads(row[1])
+
+    def get_view_any(self, view_id):
+        """Get cached view by ID only (no signature check)."""
+        try:
+            row = self._latest_row(view_id)
+        except Exception:
+            return None
+        return json.loads(row[1]) if row is not None else None
+
+    def set_view(self, view_id, signature, metadata, metrics, element_summary=None, timings=None):
+        """Upsert one view's row (committed immediately; older signatures dropped)."""
+        if self._cache is None:
+            self.load()
+
+        entry = _build_view_entry(view_id, signature, metadata, metrics, element_summary, timings)
+        try:
+            conn = self._connect()
+            key = (str(view_id), str(self.config_hash))
+            conn.execute(
+                "DELETE FROM views WHERE view_id = ? AND config_hash = ? AND view_signature != ?",
+                key + (str(signature),),
+            )
+            conn.execute(
+                "INSERT INTO views (view_id, config_hash, view_signature, cached_utc, payload) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(view_id, config_hash, view_signature) DO UPDATE SET "
+                "cached_utc = excluded.cached_utc, payload = excluded.payload",
+                key + (str(signature), entry["cached_utc"], json.dumps(entry)),
+            )
+            conn.commit()
+        except Exception as e:
+            print(f"[RootCache] Upsert failed for view {view_id}: {e}")
+
+    def save(self):
+        """Rows are committed by set_view(); checkpoint the WAL."""
+        if self._conn is None:
+            return True
+        try:
+            self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            print(f"[RootCache] Saved cache with {self._count_views()} views")
+            return True
+        except Exception as e:
+            print(f"[RootCache] Save failed: {e}")
+            return False
+
+    def close(self):
+        """Close the database connection (reopened lazily on next use)."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+            self._cache = None
+
+    def stats(self):
+        """Get cache statistics."""
+        out = RootStyleCache.stats(self)
+        out["cached_views"] = self._count_views() if self._conn is not None else 0
+        out["backend"] = "sqlite"
+        return out
+
+
+def open_root_cache(output_dir, project_guid, exporter_version, config_hash, backend="json"):
+    """Construct the root cache for `backend` ('json' or 'sqlite').
+
+    Falls back to the JSON backend when sqlite3 is unavailable (e.g. some
+    IronPython hosts).
+    """
+    if str(backend or "json").lower() == "sqlite":
+        try:
+            import sqlite3  # noqa: F401
+            return SqliteRootStyleCache(output_dir, project_guid, exporter_version, config_hash)
+        except ImportError:
+            print("[RootCache] sqlite3 unavailable; using JSON backend")
+    return RootStyleCache(output_dir, project_guid, exporter_version, config_hash)
+
+
 def compute_config_hash(cfg):
     """Compute stable hash of config for cache invalidation.
     
@@ -317,11 +589,7 @@ def extract_metrics_from_view_result(view_result, cfg):
     Returns:
         Tuple of (metadata, metrics, element_summary, timings)
     """
-    from vop_interwoven.csv_export import (
-        compute_cell_metrics,
-        compute_external_cell_metrics,
-        compute_annotation_type_metrics
-    )
+    from vop_interwoven.csv_export import compute_all_cell_metrics
     
     # Reconstruct raster object for metric computation (no ViewRaster.from_dict exists)
     from vop_interwoven.core.raster import ViewRaster
@@ -355,9 +623,9 @@ def extract_metrics_from_view_result(view_result, cfg):
  
     # Compute metrics
     model_presence_mode = getattr(cfg, "model_presence_mode", "ink")
-    cell_metrics = compute_cell_metrics(raster, model_presence_mode=model_presence_mode)
-    external_metrics = compute_external_cell_metrics(raster)
-    anno_metrics = compute_annotation_type_metrics(raster)
+    cell_metrics, anno_metrics, external_metrics = compute_all_cell_metrics(
+        raster, model_presence_mode=model_presence_mode
+    )
     
     metrics = {
         **cell_metrics,
@@ -0,0 +1,552 @@
+"""
+Run-scoped pipeline session for the VOP interwoven pipeline.
+
+A PipelineSession owns everything that should live for a whole export run
+rather than for one process_document_views() call:
+
+    geometry_cache      byte-budgeted, cost-weighted geometry cache (PR12)
+    geometry_handles    linked-proxy GeometryHandles shared across views
+    areal_cache         cross-view AREAL extraction cache
+    elem_cache          document-scoped ElementCache (loaded once, saved once)
+    snapshot            per-run DocumentSnapshot
+    link_index          revit.link_index.LinkIndex when cfg.use_link_index and
+                        linked RVT / DWG collection is enabled
+    render_pool         optional process pool for the render phase
+    root_cache          optional RootStyleCache (metrics-only view cache)
+    diag                run-level diagnostics sink (cache stats, persistence)
+    tracer              core.tracing.Tracer when cfg.trace_level != "off"
+    spill_store         core.raster_spill.RasterSpillStore for batch sessions
+                        when cfg.raster_spill_enabled (retained rasters)
+    planner             incremental.IncrementalPlanner when cfg.incremental_reexport
+                        (view index and planner fingerprints saved next to
+                        the element cache)
+
+Streaming exports render one view at a time through render_view(), which
+hands each result to on_view_complete (e.g. StreamingExporter.on_view_complete)
+and keeps only a lightweight summary. Cache persistence happens once in
+finalize(), or every `checkpoint_every` views.
+
+Example:
+    >>> session = PipelineSession(doc, cfg, root_cache=root_cache,
+    ...                           on_view_complete=exporter.on_view_complete)
+    >>> for view_id in view_ids:
+    ...     session.render_view(view_id)
+    >>> session.finalize()
+
+Commentary:
+    ✔ process_document_views() without a session builds and finalizes its own
+      (batch behavior unchanged)
+    ✔ Caches stay warm across views; ElementCache JSON is read and written once
+    ✔ finalize() leaves spill files alone: returned results still map them; the
+      directory goes when the last spilled raster (or spill_store.close()) goes
+    ⚠ finalize() must run for caches to persist (idempotent)
+"""
+
+import os
+import time
+
+
+class PipelineSession(object):
+    """Caches, diagnostics and snapshot shared by every view of one run.
+
+    Args:
+        doc: Revit Document
+        cfg: Config
+        root_cache: Optional RootStyleCache (saved by finalize()/checkpoint())
+        on_view_complete: Optional callback(view_result) used by render_view()
+        diag: Optional run-level Diagnostics (default: new Diagnostics())
+        checkpoint_every: Persist caches every N rendered views (0 = only at finalize)
+    """
+
+    def __init__(self, doc, cfg, root_cache=None, on_view_complete=None, diag=None, checkpoint_every=0):
+        if diag is None:
+            try:
+                from .core.diagnostics import Diagnostics
+                diag = Diagnostics()
+            except Exception:
+                diag = None
+
+        self.doc = doc
+        self.cfg = cfg
+        self.root_cache = root_cache
+        self.on_view_complete = on_view_complete
+        self.diag = diag
+        self.checkpoint_every = max(0, int(checkpoint_every or 0))
+        self.output_dir = getattr(cfg, "output_dir", None)
+
+        self.views_rendered = 0
+        self.checkpoints = 0
+        self._finalized = False
+
+        # Structured tracing for the whole run (installed until finalize())
+        self.tracer = None
+        self._prev_tracer = None
+        self.trace_path = None
+        if str(getattr(cfg, "trace_level", "off") or "off").lower() != "off":
+            try:
+                from .core import tracing
+                self.tracer = tracing.Tracer(
+                    level=tracing.parse_level(cfg.trace_level),
+                    capacity=getattr(cfg, "trace_buffer_events", 65536),
+                )
+                self._prev_tracer = tracing.install(self.tracer)
+            except Exception:
+                self.tracer = None
+
+        # PR12: bounded geometry cache shared across all views in this run.
+        # Scoped to this run to avoid cross-run semantic drift. Byte-budgeted and
+        # cost-weighted: expensive silhouettes outlive cheap bbox/OBB loops.
+        try:
+            from .core.cache import LRUCache, WeightedLRUCache
+            max_items = getattr(cfg, "geometry_cache_max_items", 0)
+            if max_items and max_items > 0:
+                self.geometry_cache = WeightedLRUCache(
+                    max_items=max_items,
+                    max_bytes=getattr(cfg, "geometry_cache_max_bytes", 0),
+                )
+            else:
+                self.geometry_cache = LRUCache(max_items=0)
+        except Exception:
+            self.geometry_cache = None
+
+        # Run-scoped GeometryHandles for linked proxies (fetched without a view, so
+        # one get_Geometry per linked element per run); host handles live per view pass.
+        try:
+            from .core.cache import LRUCache
+            self.geometry_handles = LRUCache(max_items=getattr(cfg, "geometry_cache_max_items", 0))
+        except Exception:
+            self.geometry_handles = None
+
+        # Cross-view AREAL extraction cache (model-space loops, re-projected per view)
+        self.areal_cache = None
+        try:
+            from .core.areal_extraction import ArealExtractionCache
+            if int(getattr(cfg, "areal_cache_max_items", 0) or 0) > 0:
+                self.areal_cache = ArealExtractionCache(max_items=cfg.areal_cache_max_items)
+        except Exception:
+            self.areal_cache = None
+
+        # PR13: Document-scoped element cache for bbox reuse across views
+        self.elem_cache = None
+        self.elem_cache_prev = None  # Previous run cache (for change detection)
+        self.elem_cache_path = None
+        self._load_element_cache()
+
+        # Incremental re-export: map element changes since the last run to views
+        self.planner = None
+        self.view_index_path = None
+        self.planner_fps_path = None
+        if self.elem_cache_path is not None:
+            from .incremental import PLANNER_FINGERPRINTS_FILENAME, VIEW_INDEX_FILENAME
+            cache_dir = os.path.dirname(self.elem_cache_path)
+            self.view_index_path = os.path.join(cache_dir, VIEW_INDEX_FILENAME)
+            self.planner_fps_path = os.path.join(cache_dir, PLANNER_FINGERPRINTS_FILENAME)
+        if getattr(cfg, "incremental_reexport", False) and self.elem_cache is not None and self.view_index_path is not None:
+            try:
+                from .core.element_cache import ElementCache
+                from .incremental import IncrementalPlanner, ViewIndex
+
+                # Own fingerprint table: the whole document must fit, which the
+                # view-sized element cache is not meant to hold
+                cap = int(getattr(cfg, "incremental_max_elements", 1000000))
+                fps_prev = None
+                if os.path.exists(self.planner_fps_path):
+                    fps_prev = ElementCache.load_from_json(self.planner_fps_path, max_elements=cap)
+                self.planner = IncrementalPlanner(
+                    doc, cfg, ElementCache(max_elements=cap), fps_prev,
+                    ViewIndex.load(self.view_index_path), diag=diag,
+                )
+            except Exception:
+                self.planner = None
+
+        # Track element-view relationships for CSV export
+        self.view_elements = {}  # view_id -> list of (elem_id, source_id)
+
+        # Per-run document snapshot: one view-scoped collector pass per view, shared by
+        # signature, bounds, broad-phase collection and annotation phases.
+        self.snapshot = None
+        if getattr(cfg, "use_document_snapshot", True):
+            try:
+                from .revit.document_snapshot import DocumentSnapshot
+                self.snapshot = DocumentSnapshot(doc)
+            except Exception:
+                self.snapshot = None  # Graceful degradation: per-phase collectors
+
+        # Per-run link index: link instances, transforms and linked proxies resolved
+        # once and reused by every view that shows the same links.
+        self.link_index = None
+        if getattr(cfg, "use_link_index", True) and (
+                getattr(cfg, "include_linked_rvt", False) or getattr(cfg, "include_dwg_imports", False)):
+            try:
+                from .revit.link_index import LinkIndex
+                self.link_index = LinkIndex(doc, cfg, diag=diag)
+            except Exception:
+                self.link_index = None  # Graceful degradation: per-view link resolution
+
+        # Batch runs retaining rasters: spill each finished view to mmap-backed files
+        # so peak memory stays near one view. Streaming sessions export each view
+        # immediately and drop it, so there is nothing to spill.
+        self.spill_store = None
+        if (getattr(cfg, "raster_spill_enabled", False) and getattr(cfg, "retain_rasters_in_memory", True)
+                and on_view_complete is None):
+            try:
+                from .core.raster_spill import RasterSpillStore
+                self.spill_store = RasterSpillStore(root_dir=getattr(cfg, "raster_spill_dir", None))
+            except Exception:
+                self.spill_store = None
+
+        # Optional process pool for the render phase (cfg.view_render_workers > 1)
+        self.render_pool = None
+        try:
+            from .view_scheduler import make_render_pool
+            self.render_pool = make_render_pool(cfg, diag=diag)
+        except Exception:
+            self.render_pool = None
+
+    def _load_element_cache(self):
+        cfg = self.cfg
+        diag = self.diag
+        if not getattr(cfg, "use_element_cache", True):
+            return
+        try:
+            from .core.element_cache import ElementCache
+            max_items = int(getattr(cfg, "element_cache_max_items", 10000))
+
+            # Determine cache file path (stored with output files)
+            if self.output_dir is not None:
+                self.elem_cache_path = os.path.join(self.output_dir, ".vop_element_cache.json")
+
+            # Load previous cache if persistence enabled
+            if getattr(cfg, "element_cache_persist", True) and self.elem_cache_path is not None:
+                try:
+                    self.elem_cache_prev = ElementCache.load_from_json(self.elem_cache_path, max_elements=max_items)
+                    # Fresh fingerprints this run: reusing last run's would hide moved
+                    # elements from view signatures and from detect_changes()
+                    self.elem_cache = ElementCache(max_elements=max_items)
+                    if diag is not None:
+                        try:
+                            prev_size = len(self.elem_cache_prev.cache)
+                            diag.info(
+                                phase="pipeline",
+                                callsite="process_document_views.element_cache_load",
+                                message=f"Loaded element cache from previous run ({prev_size} elements)",
+                                extra={"cache_path": self.elem_cache_path, "prev_size": prev_size}
+                            )
+                        except Exception:
+                            pass
+                except Exception:
+                    # Failed to load - start fresh
+                    self.elem_cache = ElementCache(max_elements=max_items)
+            else:
+                # No persistence - start fresh
+                self.elem_cache = ElementCache(max_elements=max_items)
+
+        except Exception:
+            self.elem_cache = None  # Graceful degradation
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def process_views(self, view_ids):
+        """Batch-process views with this session's caches (full results, no callback)."""
+        from .pipeline import process_document_views
+
+        results = process_document_views(self.doc, view_ids, self.cfg, diag=self.diag, root_cache=self.root_cache, session=self)
+        self.views_rendered += len(results)
+        return results
+
+    def render_view(self, view_id):
+        """Render one view, stream it to on_view_complete, and return a lightweight summary.
+
+        Never raises: failures are reported in the summary ('success': False).
+        """
+        from .pipeline import process_document_views
+
+        try:
+            results = process_document_views(self.doc, [view_id], self.cfg, diag=self.diag, root_cache=self.root_cache, session=self)
+            if not results:
+                return None
+            view_result = results[0]
+            self.views_rendered += 1
+
+            if self.on_view_complete is not None:
+                # Verify raster is present before calling export callback.
+                # Cache hits may legitimately return metrics-only results (no raster arrays).
+                is_cache_hit = bool(view_result.get("from_cache"))
+                try:
+                    c = view_result.get("cache", {})
+                    if isinstance(c, dict) and "HIT" in str(c.get("view_cache", "")).upper():
+                        is_cache_hit = True
+                    if isinstance(c, dict) and str(c.get("cache_type", "")).lower() == "root":
+                        is_cache_hit = True
+                except Exception:
+                    pass
+
+                if (("raster" not in view_result) or (view_result.get("raster") is None)) and not is_cache_hit:
+                    print(f"[Streaming] WARNING: No raster in view_result for view {view_id}")
+                    print(f"[Streaming]   This should not happen - check cfg.retain_rasters_in_memory")
+                    return {
+                        "view_id": view_id,
+                        "success": False,
+                        "error": "Missing raster data"
+                    }
+
+                self.on_view_complete(view_result)
+
+            if self.checkpoint_every and self.views_rendered % self.checkpoint_every == 0:
+                self.checkpoint()
+
+            # Retain only lightweight summary
+            return {
+                "view_id": view_result.get("view_id"),
+                "view_name": view_result.get("view_name"),
+                "width": view_result.get("width"),
+                "height": view_result.get("height"),
+                "success": view_result.get("success", True),
+                "timings": view_result.get("timings")
+            }
+
+        except Exception as e:
+            print(f"[Streaming] Error processing view {view_id}: {e}")
+            return {
+                "view_id": view_id,
+                "success": False,
+                "error": str(e)
+            }
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def checkpoint(self):
+        """Persist element + root caches mid-run (no analysis CSVs or change detection)."""
+        self.checkpoints += 1
+        self._save_element_cache(self.diag)
+        self._save_root_cache()
+
+    def finalize(self, diag=None):
+        """Log cache statistics, persist caches and release the render pool (idempotent).
+
+        Args:
+            diag: Diagnostics receiving run statistics (default: session diag)
+        """
+        if self._finalized:
+            return
+        self._finalized = True
+        if diag is None:
+            diag = self.diag
+
+        if self.render_pool is not None:
+            self.render_pool.shutdown()
+            self.render_pool = None
+
+        self._log_stats(diag)
+        self._persist_element_cache(diag)
+        self._save_root_cache()
+        self._finish_trace()
+
+    def _finish_trace(self):
+        """Uninstall the session tracer and write its Chrome trace JSON."""
+        if self.tracer is None:
+            return
+        from .core import tracing
+
+        if tracing.get_tracer() is self.tracer:
+            tracing.install(self._prev_tracer)
+
+        path = getattr(self.cfg, "trace_path", None)
+        if not path and self.output_dir is not None:
+            path = os.path.join(self.output_dir, "vop_trace.json")
+        if path:
+            try:
+                parent = os.path.dirname(path)
+                if parent:
+                    os.makedirs(parent, exist_ok=True)
+            except Exception:
+                pass
+            if self.tracer.write_chrome_trace(path):
+                self.trace_path = path
+
+    def _save_root_cache(self):
+        if self.root_cache is None:
+            return True
+        try:
+            ok = self.root_cache.save()
+            if not ok:
+                print("[Streaming] Root cache save returned False")
+            return ok
+        except Exception as e:
+            print(f"[Streaming] Root cache save failed: {e}")
+            return False
+
+    def _log_stats(self, diag):
+        if diag is None:
+            return
+
+        # Log document snapshot statistics
+        if self.snapshot is not None:
+            try:
+                diag.info(
+                    phase="pipeline",
+                    callsite="process_document_views.document_snapshot_stats",
+                    message="Document snapshot statistics for this run",
+                    extra=self.snapshot.stats()
+                )
+            except Exception:
+                pass
+
+        if self.areal_cache is not None:
+            try:
+                diag.info(
+                    phase="pipeline",
+                    callsite="process_document_views.areal_cache_stats",
+                    message="AREAL extraction cache statistics for this run",
+                    extra=self.areal_cache.stats()
+                )
+            except Exception:
+                pass
+
+        # Log element cache statistics
+        if self.elem_cache is not None:
+            try:
+                diag.info(
+                    phase="pipeline",
+                    callsite="process_document_views.element_cache_stats",
+                    message="Element cache statistics for this run",
+                    extra=self.elem_cache.stats()
+                )
+            except Exception:
+                pass
+
+    def _save_element_cache(self, diag):
+        elem_cache = self.elem_cache
+        if elem_cache is None or self.elem_cache_path is None or not getattr(self.cfg, "element_cache_persist", True):
+            return False
+        try:
+            metadata = {
+                "timestamp": time.time(),
+                "doc_path": getattr(self.doc, "PathName", None),
+                "doc_title": getattr(self.doc, "Title", None),
+            }
+            saved = elem_cache.save_to_json(self.elem_cache_path, metadata=metadata)
+            if saved:
+                self._save_view_index()
+            if saved and diag is not None:
+                diag.info(
+                    phase="pipeline",
+                    callsite="process_document_views.element_cache_save",
+                    message="Saved element cache for next run",
+                    extra={"cache_path": self.elem_cache_path, "size": len(elem_cache.cache)}
+                )
+            return bool(saved)
+        except Exception:
+            return False
+
+    def _save_view_index(self):
+        """Save the planner's view index and fingerprints; drop stale ones (they must match each other)."""
+        path = self.view_index_path
+        if path is None:
+            return
+        fps_path = self.planner_fps_path
+        try:
+            planner = self.planner
+            if planner is not None and planner.fingerprinted:
+                planner.elem_cache.save_to_json(fps_path)
+                planner.index.save(path)
+                return
+            for p in (path, fps_path):
+                if p is not None and os.path.exists(p):
+                    os.remove(p)
+        except Exception:
+            pass
+
+    def _persist_element_cache(self, diag):
+        """Phase 2.5: Persistent element cache - save/export/detect changes."""
+        cfg = self.cfg
+        elem_cache = self.elem_cache
+        output_dir = self.output_dir
+        if elem_cache is None or not getattr(cfg, "element_cache_persist", True):
+            return
+        try:
+            # Save cache to JSON for next run
+            self._save_element_cache(diag)
+
+            # Export analysis CSV
+            if getattr(cfg, "element_cache_export_csv", True) and output_dir is not None:
+                try:
+                    csv_path = os.path.join(output_dir, "element_cache_analysis.csv")
+                    exported = elem_cache.export_analysis_csv(csv_path, view_elements=self.view_elements)
+                    if exported and diag is not None:
+                        diag.info(
+                            phase="pipeline",
+                            callsite="process_document_views.element_cache_export_csv",
+                            message="Exported element cache analysis CSV",
+                            extra={"csv_path": csv_path, "elements": len(elem_cache.cache), "views": len(self.view_elements)}
+                        )
+                except Exception:
+                    pass
+
+            # Detect changes from previous run
+            if getattr(cfg, "element_cache_detect_changes", True) and self.elem_cache_prev is not None:
+                try:
+                    tolerance = float(getattr(cfg, "element_cache_change_tolerance", 0.01))
+                    changes = elem_cache.detect_changes(self.elem_cache_prev, tolerance=tolerance)
+
+                    if diag is not None:
+                        diag.info(
+                            phase="pipeline",
+                            callsite="process_document_views.element_cache_changes",
+                            message="Element changes detected since last run",
+                            extra=changes
+                        )
+
+                    # Also export changes CSV if significant changes detected
+                    if output_dir is not None and (changes["added"] or changes["moved"] or changes["resized"]):
+                        try:
+                            import csv as csv_module
+                            changes_csv_path = os.path.join(output_dir, "element_changes.csv")
+                            with open(changes_csv_path, "w", newline="") as f:
+                                writer = csv_module.writer(f)
+                                writer.writerow(["change_type", "elem_id", "source_id", "distance_or_size_change"])
+
+                                for elem_id, source_id in changes["added"]:
+                                    writer.writerow(["ADDED", elem_id, source_id, ""])
+
+                                for elem_id, source_id in changes["removed"]:
+                                    writer.writerow(["REMOVED", elem_id, source_id, ""])
+
+                                for elem_id, source_id, distance in changes["moved"]:
+                                    writer.writerow(["MOVED", elem_id, source_id, f"{distance:.3f}"])
+
+                                for elem_id, source_id, size_change in changes["resized"]:
+                                    writer.writerow(["RESIZED", elem_id, source_id, f"{size_change:.3f}"])
+
+                            if diag is not None:
+                                diag.info(
+                                    phase="pipeline",
+                                    callsite="process_document_views.element_changes_export",
+                                    message="Exported element changes CSV",
+                                    extra={"csv_path": changes_csv_path}
+                                )
+                        except Exception:
+                            pass
+
+                except Exception:
+                    pass
+        except Exception:
+            pass
+
+    def stats(self):
+        """Run-level cache statistics (for logs/benchmarks)."""
+        out = {
+            "views_rendered": self.views_rendered,
+            "checkpoints": self.checkpoints,
+        }
+        for name in ("geometry_cache", "areal_cache", "elem_cache", "snapshot", "link_index", "root_cache", "tracer", "spill_store", "planner"):
+            obj = getattr(self, name, None)
+            try:
+                out[name] = obj.stats() if obj is not None and hasattr(obj, "stats") else None
+            except Exception:
+                out[name] = None
+        return out
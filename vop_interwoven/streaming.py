@@ -22,17 +22,18 @@ def process_with_streaming(doc, view_ids, cfg, on_view_complete, root_cache=None
     """Process views with per-view callback and cache support."""
     
     from vop_interwoven.pipeline import process_document_views
-    from vop_interwoven.root_cache import RootStyleCache, compute_config_hash
+    from vop_interwoven.root_cache import compute_config_hash, open_root_cache
     
     # Initialize cache
     project_guid = doc.ProjectInformation.UniqueId if doc.ProjectInformation else "unknown"
     config_hash = compute_config_hash(cfg)
     
-    root_cache = RootStyleCache(
+    root_cache = open_root_cache(
         output_dir=getattr(cfg, "output_dir", "C:\\temp\\vop_output"),
         project_guid=project_guid,
         exporter_version="VOP_v2.0",
-        config_hash=config_hash
+        config_hash=config_hash,
+        backend=getattr(cfg, "root_cache_backend", "json"),
     )
     root_cache.load()
     
@@ -485,87 +486,56 @@ class StreamingExporter:
         }
 
 
-def process_document_views_streaming(doc, view_ids, cfg, on_view_complete=None, root_cache=None):
+def process_document_views_streaming(doc, view_ids, cfg, on_view_complete=None, root_cache=None, session=None):
     """Process views with streaming callback support.
     
     Modified version of process_document_views() that calls a callback
-    for each completed view, allowing incremental export.
+    for each completed view, allowing incremental export. All views share one
+    PipelineSession (warm caches, single snapshot); caches persist once at the end.
     
     Args:
         doc: Revit Document
         view_ids: List of view IDs to process
         cfg: Config object
         on_view_complete: Callback function(view_result) called for each view
+        root_cache: Optional RootStyleCache (saved when the session finalizes)
+        session: Optional PipelineSession; the caller finalizes it
+            (default: a private session finalized before returning)
         
     Returns:
         List of lightweight view summaries (no raster data retained)
     """
     from vop_interwoven.pipeline import process_document_views
+    from vop_interwoven.session import PipelineSession
     
     # If no callback, fall back to standard behavior
     if on_view_complete is None:
-        return process_document_views(doc, view_ids, cfg)
+        return process_document_views(doc, view_ids, cfg, root_cache=root_cache, session=session)
 
     # CRITICAL: Ensure rasters are retained for streaming exports
     # Override any user setting to prevent export failures
     original_retain = getattr(cfg, 'retain_rasters_in_memory', True)
     cfg._is_streaming_mode = True
     cfg.retain_rasters_in_memory = True
+
+    own_session = session is None
+    if own_session:
+        session = PipelineSession(doc, cfg, root_cache=root_cache, on_view_complete=on_view_complete)
+    else:
+        session.on_view_complete = on_view_complete
+        if session.root_cache is None:
+            session.root_cache = root_cache
     
     # Process views one at a time with callback
     summaries = []
-    
-    for view_id in view_ids:
-        try:
-            # Process single view (cache miss)
-            results = process_document_views(doc, [view_id], cfg, root_cache=root_cache)
-
-            if results and len(results) > 0:
-                view_result = results[0]
-                
-                # Verify raster is present before calling export callback.
-                # Cache hits may legitimately return metrics-only results (no raster arrays).
-                is_cache_hit = bool(view_result.get("from_cache"))
-                try:
-                    c = view_result.get("cache", {})
-                    if isinstance(c, dict) and "HIT" in str(c.get("view_cache", "")).upper():
-                        is_cache_hit = True
-                    if isinstance(c, dict) and str(c.get("cache_type", "")).lower() == "root":
-                        is_cache_hit = True
-                except Exception:
-                    pass
-
-                if (("raster" not in view_result) or (view_result.get("raster") is None)) and not is_cache_hit:
-                    print(f"[Streaming] WARNING: No raster in view_result for view {view_id}")
-                    print(f"[Streaming]   This should not happen - check cfg.retain_rasters_in_memory")
-                    summaries.append({
-                        "view_id": view_id,
-                        "success": False,
-                        "error": "Missing raster data"
-                    })
-                    continue
-                    
-                # Call user callback
-                on_view_complete(view_result)
-
-                # Retain only lightweight summary
-                summary = {
-                    "view_id": view_result.get("view_id"),
-                    "view_name": view_result.get("view_name"),
-                    "width": view_result.get("width"),
-                    "height": view_result.get("height"),
-                    "success": view_result.get("success", True),
-                    "timings": view_result.get("timings")
-                }
+    try:
+        for view_id in view_ids:
+            summary = session.render_view(view_id)
+            if summary is not None:
                 summaries.append(summary)
-
-        except Exception as e:
-            print(f"[Streaming] Error processing view {view_id}: {e}")
-            summaries.append({
-                "view_id": view_id,
-                "success": False,
-                "error": str(e)
-            })
+    finally:
+        if own_session:
+            session.finalize()
     
     # Restore original setting (though caller usually doesn't reuse cfg)
     cfg.retain_rasters_in_memory = original_retain
@@ -613,7 +583,8 @@ def run_vop_pipeline_streaming(doc, view_ids, cfg=None, output_dir=None,
         >>> print(f"CSVs: {result['core_csv_path']}")
     """
     from vop_interwoven.config import Config
-    from vop_interwoven.root_cache import RootStyleCache, compute_config_hash
+    from vop_interwoven.root_cache import compute_config_hash, open_root_cache
+    from vop_interwoven.session import PipelineSession
   
     # Defaults
     if cfg is None:
@@ -631,11 +602,12 @@ def run_vop_pipeline_streaming(doc, view_ids, cfg=None, output_dir=None,
     exporter_version = "VOP_v2.0"
     config_hash = compute_config_hash(cfg)
     
-    root_cache = RootStyleCache(
+    root_cache = open_root_cache(
         output_dir=output_dir,
         project_guid=project_guid,
         exporter_version=exporter_version,
-        config_hash=config_hash
+        config_hash=config_hash,
+        backend=getattr(cfg, "root_cache_backend", "json"),
     )
     
     # Load existing cache
@@ -654,16 +626,30 @@ def run_vop_pipeline_streaming(doc, view_ids, cfg=None, output_dir=None,
         root_cache=root_cache
     )
     
-    # Process with streaming callback
-    t0 = time.perf_counter()
-    
-    process_document_views_streaming(
-        doc, 
-        view_ids, 
+    # One session for the whole run: caches stay warm across views and
+    # persist (element cache + root cache) once, at finalize
+    session = PipelineSession(
+        doc,
         cfg,
+        root_cache=root_cache,
         on_view_complete=exporter.on_view_complete,
-        root_cache=root_cache
+        checkpoint_every=getattr(cfg, "streaming_checkpoint_every", 0),
     )
+
+    # Process with streaming callback
+    t0 = time.perf_counter()
+    
+    try:
+        process_document_views_streaming(
+            doc, 
+            view_ids, 
+            cfg,
+            on_view_complete=exporter.on_view_complete,
+            root_cache=root_cache,
+            session=session,
+        )
+    finally:
+        session.finalize()
     
     t1 = time.perf_counter()
     
@@ -671,17 +657,10 @@ def run_vop_pipeline_streaming(doc, view_ids, cfg=None, output_dir=None,
     result = exporter.finalize()
     result["total_time_sec"] = t1 - t0
     
-    # Persist root cache
     try:
-        ok = root_cache.save()
-        try:
-            print(f"[Streaming] Root cache stats: {root_cache.stats()}")
-        except Exception:
-            pass
-        if not ok:
-            print("[Streaming] Root cache save returned False")
-    except Exception as e:
-        print(f"[Streaming] Root cache save failed: {e}")
+        print(f"[Streaming] Root cache stats: {root_cache.stats()}")
+    except Exception:
+        pass
     
     print(f"\n[Streaming] Complete:")
     print(f"  Processed: {result['views_processed']} views")
@@ -0,0 +1,284 @@
+"""
+Process-pool view scheduler for the VOP interwoven pipeline.
+
+Splits each view into two phases:
+
+    capture   (in-process, Revit API)  collection, link expansion, geometry
+              extraction, depth estimation, annotation stamping -> view job
+    render    (any process, pure Python)  draw-list replay through ViewRaster,
+              anno-over-model, metrics/export payload
+
+A view job is a plain dict (raster spec, model draw list, sparse annotation
+layer, cfg, per-view diagnostics); it pickles cleanly, so the render phase can
+run in a concurrent.futures.ProcessPoolExecutor, and saved jobs replay offline
+as benchmark fixtures (dump_view_job / load_view_job).
+
+Example:
+    >>> pool = make_render_pool(Config(view_render_workers=4))
+    >>> job = capture_view_job(doc, view, raster, cfg, view_mode)
+    >>> out = pool.submit(job).result()      # same dict as export_view_raster()
+
+Commentary:
+    ✔ Replay reproduces the in-process model pass exactly (early-out runs at
+      replay time against the replayed raster)
+    ✔ cfg.view_render_workers <= 1, or no ProcessPoolExecutor (IronPython/Dynamo),
+      keeps the serial in-process path
+    ⚠ Views with cfg.export_strategy_diagnostics render in-process
+      (StrategyDiagnostics is not picklable)
+"""
+
+import pickle
+
+from .core import tracing
+
+VIEW_JOB_SCHEMA = 1
+
+
+def snapshot_raster_spec(raster):
+    """Grid + metadata needed to rebuild an empty ViewRaster in another process."""
+    b = raster.bounds_xy
+    clip = getattr(raster, "model_clip_bounds", None)
+    return {
+        "width": raster.W,
+        "height": raster.H,
+        "cell_size": raster.cell_size_ft,
+        "bounds": (b.xmin, b.ymin, b.xmax, b.ymax),
+        "tile_size": raster.tile.tile_size,
+        "model_clip_bounds": ((clip.xmin, clip.ymin, clip.xmax, clip.ymax) if clip is not None else None),
+        "bounds_meta": getattr(raster, "bounds_meta", None),
+        "view_basis": getattr(raster, "view_basis", None),
+        "view_mode": getattr(raster, "view_mode", None),
+        "view_mode_reason": getattr(raster, "view_mode_reason", None),
+    }
+
+
+def build_raster(spec, cfg):
+    """Rebuild an empty ViewRaster from snapshot_raster_spec() output."""
+    from .core.math_utils import Bounds2D
+    from .core.raster import ViewRaster
+
+    raster = ViewRaster(
+        width=spec["width"],
+        height=spec["height"],
+        cell_size=spec["cell_size"],
+        bounds=Bounds2D(*spec["bounds"]),
+        tile_size=spec["tile_size"],
+        cfg=cfg,
+    )
+    clip = spec.get("model_clip_bounds")
+    raster.model_clip_bounds = Bounds2D(*clip) if clip is not None else None
+    raster.bounds_meta = spec.get("bounds_meta")
+    raster.view_basis = spec.get("view_basis")
+    raster.view_mode = spec.get("view_mode")
+    raster.view_mode_reason = spec.get("view_mode_reason")
+    return raster
+
+
+def capture_annotation_layer(raster):
+    """Sparse copy of the annotation layer: {'cells': [(idx, anno_idx)], 'anno_meta', ...}."""
+    cells = [(i, int(k)) for i, k in enumerate(raster.anno_key) if k != -1]
+    return {
+        "cells": cells,
+        "anno_meta": list(raster.anno_meta),
+        "anno_meta_index_by_key": dict(raster.anno_meta_index_by_key),
+    }
+
+
+def apply_annotation_layer(raster, layer):
+    """Write a capture_annotation_layer() payload into `raster` (anno layers only)."""
+    if not layer:
+        return
+    anno_key = raster.anno_key
+    for idx, key in layer.get("cells") or []:
+        anno_key[idx] = key
+    raster.anno_meta = list(layer.get("anno_meta") or [])
+    raster.anno_meta_index_by_key = dict(layer.get("anno_meta_index_by_key") or {})
+
+
+def capture_view_job(doc, view, raster, cfg, view_mode, diag=None, snapshot=None, timings=None,
+                     geometry_cache=None, elem_cache=None, areal_cache=None, geometry_handles=None,
+                     link_index=None):
+    """Capture phase for one view: every Revit-dependent step, no model ink.
+
+    Args:
+        doc: Revit Document
+        view: Revit View
+        raster: ViewRaster from init_view_raster() (supplies the grid; receives annotations)
+        cfg: Config
+        view_mode: resolve_view_mode() result for this view
+        diag: Per-view Diagnostics (travels with the job)
+        snapshot: Optional DocumentSnapshot
+        timings: Optional per-view timings dict (collect_ms, capture_ms, anno_ms)
+        geometry_cache, elem_cache, areal_cache, geometry_handles, link_index: run-scoped caches
+
+    Returns:
+        View job dict for render_view_job()
+    """
+    from .pipeline import (
+        _perf_ms,
+        _perf_now,
+        ViewRef,
+        capture_model_draw_list,
+        collect_view_elements,
+        rasterize_annotations,
+    )
+    from .revit.view_basis import VIEW_MODE_MODEL_AND_ANNOTATION, VIEW_MODE_ANNOTATION_ONLY
+
+    collect_timings = timings is not None and getattr(cfg, "perf_collect_timings", True)
+
+    def _tmark(name, t0, t1):
+        if collect_timings:
+            timings[name] = round(_perf_ms(t0, t1), 3)
+        tracing.complete(name[:-3], t0, t1)
+
+    view_id = getattr(getattr(view, "Id", None), "IntegerValue", None)
+    model = None
+
+    if view_mode == VIEW_MODE_MODEL_AND_ANNOTATION:
+        t0 = _perf_now()
+        elements = collect_view_elements(doc, view, raster, diag=diag, cfg=cfg, snapshot=snapshot)
+        t1 = _perf_now()
+        _tmark("collect_ms", t0, t1)
+
+        t0 = _perf_now()
+        model = capture_model_draw_list(
+            doc, view, raster, elements, cfg,
+            diag=diag,
+            geometry_cache=geometry_cache,
+            elem_cache=elem_cache,
+            areal_cache=areal_cache,
+            geometry_handles=geometry_handles,
+            link_index=link_index,
+        )
+        t1 = _perf_now()
+        _tmark("capture_ms", t0, t1)
+
+    elif view_mode == VIEW_MODE_ANNOTATION_ONLY:
+        if diag is not None:
+            diag.warn(
+                phase="pipeline",
+                callsite="process_document_views",
+                message="Annotation-only mode: skipping model pipeline phases",
+                view_id=view_id,
+                extra={"view_name": getattr(view, "Name", None)},
+            )
+
+    # Annotations never read model layers, so they are stamped here and shipped sparse
+    t0 = _perf_now()
+    rasterize_annotations(doc, view, raster, cfg, diag=diag, snapshot=snapshot)
+    anno = capture_annotation_layer(raster)
+    t1 = _perf_now()
+    _tmark("anno_ms", t0, t1)
+
+    return {
+        "schema": VIEW_JOB_SCHEMA,
+        "view": ViewRef(view_id, getattr(view, "Name", None)),
+        "raster": snapshot_raster_spec(raster),
+        "model": model,
+        "anno": anno,
+        "cfg": cfg,
+        "diag": diag,
+        "timings": dict(timings) if timings is not None else None,
+    }
+
+
+def render_view_job(job):
+    """Render phase for one captured view (runs in a worker process; no Revit API).
+
+    Returns:
+        export_view_raster() dict; its 'diag' and 'timings' include the render phase
+    """
+    from .pipeline import _perf_ms, _perf_now, export_view_raster, replay_model_draw_list
+
+    if int(job.get("schema", 0) or 0) != VIEW_JOB_SCHEMA:
+        raise ValueError("Unsupported view job schema: {0!r}".format(job.get("schema")))
+
+    cfg = job["cfg"]
+    diag = job.get("diag")
+    timings = job.get("timings")
+    collect_timings = timings is not None and getattr(cfg, "perf_collect_timings", True)
+
+    def _tmark(name, t0, t1):
+        if collect_timings:
+            timings[name] = round(_perf_ms(t0, t1), 3)
+        tracing.complete(name[:-3], t0, t1)
+
+    raster = build_raster(job["raster"], cfg)
+
+    if job.get("model") is not None:
+        t0 = _perf_now()
+        replay_model_draw_list(raster, job["model"], cfg, diag=diag)
+        t1 = _perf_now()
+        _tmark("model_ms", t0, t1)
+
+    apply_annotation_layer(raster, job.get("anno"))
+
+    t0 = _perf_now()
+    raster.finalize_anno_over_model(cfg)
+    t1 = _perf_now()
+    _tmark("finalize_ms", t0, t1)
+
+    t0 = _perf_now()
+    out = export_view_raster(job["view"], raster, cfg, diag=diag, timings=timings)
+    t1 = _perf_now()
+    _tmark("export_ms", t0, t1)
+    if timings is not None:
+        out["timings"] = dict(timings)
+    return out
+
+
+def dump_view_job(job, path):
+    """Save a captured view job (pickle) for offline replay/benchmarking."""
+    with open(path, "wb") as f:
+        pickle.dump(job, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_view_job(path):
+    """Load a view job saved by dump_view_job()."""
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+class ViewRenderPool(object):
+    """Render-phase executor: submit(job) -> Future of render_view_job(job)."""
+
+    def __init__(self, workers):
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.workers = int(workers)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def submit(self, job):
+        return self._executor.submit(render_view_job, job)
+
+    def shutdown(self, wait=True):
+        try:
+            self._executor.shutdown(wait=wait)
+        except Exception:
+            pass
+
+
+def make_render_pool(cfg, diag=None):
+    """Return a ViewRenderPool for cfg.view_render_workers > 1, else None (serial path).
+
+    Never raises: hosts without a usable ProcessPoolExecutor fall back to None.
+    """
+    workers = int(getattr(cfg, "view_render_workers", 0) or 0)
+    if workers <= 1:
+        return None
+    if getattr(cfg, "export_strategy_diagnostics", False):
+        return None
+    try:
+        return ViewRenderPool(workers)
+    except Exception as e:
+        if diag is not None:
+            try:
+                diag.warn(
+                    phase="pipeline",
+                    callsite="view_scheduler.make_render_pool",
+                    message="Process pool unavailable; rendering views in-process",
+                    extra={"workers": workers, "exc": str(e)},
+                )
+            except Exception:
+                pass
+        return None